@@ -0,0 +1,488 @@
+"""
+Performance benchmarks for the pre-screening backend
+Runs against local stubs only - no Gemini, ElevenLabs or Supabase credentials needed
+
+Usage: python benchmark.py
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI
+
+# Imported first: sets dummy credentials before any service module loads settings
+from test_medical_concurrency import FLOWS, run_concurrent_submissions
+from core.config import settings
+from core.tokens import count_tokens, load_encoding
+from services.llm_gateway import llm_gateway
+from services.context_cache import context_cache
+from services.diagnostics_cache import DiagnosticsCache, diagnostics_cache
+from services.diagnostics_service import DiagnosticsService, diagnostics_service
+from services.followup_service import followup_service
+from services.tts_cache import TTSCache
+from services.tts_service import TTSService
+from models.medical import AnswerSubmission, InterviewSession
+from routers import medical
+
+CONCURRENCY_LEVELS = [1, 5, 20, 50]
+STUB_LATENCY = 0.5
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the services' debug prints and INFO logs while a benchmark runs"""
+    logging.disable(logging.INFO)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+async def benchmark_interview_concurrency():
+    """Submit-answer throughput for the medical and follow-up flows on one worker"""
+    print("=" * 60)
+    print("INTERVIEW TURN CONCURRENCY (stub latency %.1fs)" % STUB_LATENCY)
+    print("=" * 60)
+    print(f"{'flow':<10}{'requests':>10}{'wall (s)':>12}{'serial (s)':>12}{'concurrency':>14}")
+
+    for flow in FLOWS:
+        for count in CONCURRENCY_LEVELS:
+            with quiet():
+                result = await run_concurrent_submissions(flow, count=count, latency=STUB_LATENCY)
+            serial = count * STUB_LATENCY
+            print(f"{flow:<10}{count:>10}{result['elapsed']:>12.2f}{serial:>12.1f}{serial / result['elapsed']:>13.1f}x")
+
+    metrics = llm_gateway.get_metrics()
+    print(f"\nLLM gateway cap: {metrics['max_concurrency']} in flight, queue timeout {metrics['queue_timeout']}s")
+    for call_type in ["question", "followup_question"]:
+        stats = metrics["call_types"][call_type]
+        print(f"  {call_type:<20} avg queue wait {stats['avg_queue_wait_ms']:>7.1f} ms, max {stats['max_queue_wait_ms']:>7.1f} ms")
+
+
+class PacedGeminiModels:
+    """Stub that produces a question over STREAM_CHUNKS chunks spaced STREAM_CHUNK_DELAY apart"""
+
+    text = json.dumps({"question": "How long have you had the knee pain, and does it get worse when you climb stairs?"})
+
+    def _chunks(self):
+        size = -(-len(self.text) // STREAM_CHUNKS)
+        return [self.text[i:i + size] for i in range(0, len(self.text), size)]
+
+    async def generate_content(self, model, contents, config=None):
+        await asyncio.sleep(STREAM_CHUNKS * STREAM_CHUNK_DELAY)
+        return SimpleNamespace(text=self.text)
+
+    async def generate_content_stream(self, model, contents, config=None):
+        async def stream():
+            for chunk in self._chunks():
+                await asyncio.sleep(STREAM_CHUNK_DELAY)
+                yield SimpleNamespace(text=chunk)
+        return stream()
+
+
+STREAM_CHUNKS = 10
+STREAM_CHUNK_DELAY = 0.15
+
+
+async def benchmark_question_streaming():
+    """Time to first visible word: SSE endpoint vs the buffered JSON endpoint"""
+    print("\n" + "=" * 60)
+    print("QUESTION TIME-TO-FIRST-WORD (stub: %d chunks x %.0f ms)" % (STREAM_CHUNKS, STREAM_CHUNK_DELAY * 1000))
+    print("=" * 60)
+
+    original_client = llm_gateway.client
+    original_get_session = medical.get_session
+    llm_gateway.client = SimpleNamespace(aio=SimpleNamespace(models=PacedGeminiModels()))
+
+    async def fake_get_session(session_id):
+        return {"patient_info": {"name": "Bench", "age": 40, "gender": "Female"}}
+
+    medical.get_session = fake_get_session
+    app = FastAPI()
+    app.include_router(medical.router, prefix="/api")
+
+    def new_session(session_id):
+        now = datetime.now().isoformat()
+        medical.interview_sessions[session_id] = InterviewSession(
+            session_id=session_id, patient_id="bench", created_at=now, updated_at=now,
+            last_question_asked="What brings you here today?"
+        )
+
+    body = {"session_id": "bench-stream", "patient_id": "bench", "answer": "My knee hurts"}
+    try:
+        with quiet():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                new_session("bench-stream")
+                start = time.perf_counter()
+                await client.post("/api/medical/submit-answer", json=body)
+                buffered = time.perf_counter() - start
+
+                # httpx's ASGI transport buffers whole bodies, so read the SSE iterator directly
+                new_session("bench-stream")
+                start = time.perf_counter()
+                first_token = None
+                response = await medical.submit_patient_answer_stream(AnswerSubmission(**body))
+                async for frame in response.body_iterator:
+                    if frame.startswith("event: token") and first_token is None:
+                        first_token = time.perf_counter() - start
+                streamed = time.perf_counter() - start
+    finally:
+        llm_gateway.client = original_client
+        medical.get_session = original_get_session
+        medical.interview_sessions.pop("bench-stream", None)
+
+    print(f"{'endpoint':<34}{'first word (ms)':>16}{'complete (ms)':>16}")
+    print(f"{'/medical/submit-answer':<34}{buffered * 1000:>16.0f}{buffered * 1000:>16.0f}")
+    print(f"{'/medical/submit-answer/stream':<34}{first_token * 1000:>16.0f}{streamed * 1000:>16.0f}")
+
+
+TTS_STUB_MS_PER_CHAR = 6  # ElevenLabs stub: first byte after this much time per character of text
+TTS_CHUNK_DELAY = 0.05
+TTS_QUESTION = ("When did the pain in your right knee first start? Does it get worse when you climb the stairs "
+                "or squat down? Have you taken any medicine for it, and did it help?")
+
+
+async def benchmark_tts_streaming():
+    """Time to first playable audio: full-buffer call, one streamed request, and sentence-chunked streaming"""
+    print("\n" + "=" * 60)
+    print("QUESTION AUDIO TIME-TO-FIRST-AUDIO (stub: %d ms/char to first byte, 1 chunk per 20 chars)"
+          % TTS_STUB_MS_PER_CHAR)
+    print("=" * 60)
+
+    async def paced_audio(text):
+        await asyncio.sleep(len(text) * TTS_STUB_MS_PER_CHAR / 1000)
+        for _ in range(max(1, len(text) // 20)):
+            await asyncio.sleep(TTS_CHUNK_DELAY)
+            yield b"\xff" * 4096
+
+    def handler(request):
+        return httpx.Response(200, content=paced_audio(json.loads(request.content)["text"]))
+
+    original_client = httpx.AsyncClient
+    original_concurrency = settings.tts_sentence_concurrency
+    stub_transport = httpx.MockTransport(handler)
+    httpx.AsyncClient = lambda **kwargs: original_client(transport=stub_transport, **kwargs)
+    rows = []
+    try:
+        with quiet():
+            service = TTSService()
+            service.api_key = "bench-key"
+            service.cache = TTSCache(directory="", enabled=False)
+
+            start = time.perf_counter()
+            await service.text_to_speech(TTS_QUESTION)
+            buffered = time.perf_counter() - start
+            rows.append(("/medical/question-tts", buffered, buffered))
+
+            for label, concurrency in (("/medical/question-tts/stream, one request", 0),
+                                       ("/medical/question-tts/stream, per sentence", original_concurrency)):
+                settings.tts_sentence_concurrency = concurrency
+                start = time.perf_counter()
+                first_audio = None
+                result = await service.text_to_speech_stream(TTS_QUESTION)
+                async for _ in result["chunks"]:
+                    if first_audio is None:
+                        first_audio = time.perf_counter() - start
+                rows.append((label, first_audio, time.perf_counter() - start))
+    finally:
+        httpx.AsyncClient = original_client
+        settings.tts_sentence_concurrency = original_concurrency
+
+    print(f"{'endpoint':<44}{'first audio (ms)':>17}{'complete (ms)':>15}")
+    for label, first_audio, complete in rows:
+        print(f"{label:<44}{first_audio * 1000:>17.0f}{complete * 1000:>15.0f}")
+
+
+SAMPLE_PATIENT = {"name": "Bench", "age": 52, "gender": "Male", "chosen_department": "Orthopedics"}
+SAMPLE_HISTORY = [
+    {"question": "What brings you here today?", "answer": "My right knee has been hurting for three weeks"},
+    {"question": "Did anything happen before the pain started?", "answer": "No injury, it started slowly"},
+    {"question": "Is the knee swollen or stiff in the morning?", "answer": "Stiff for about half an hour after waking up"},
+    {"question": "Does the pain get worse when you climb stairs?", "answer": "Yes, stairs and squatting are the worst"},
+    {"question": "Have you taken any medicine for it?", "answer": "Paracetamol sometimes, it helps a little"}
+]
+
+# What the model returns for each call type, as the schema-constrained JSON the services now request
+SAMPLE_RESPONSES = {
+    "question": {"question": "Do you hear a clicking or grinding sound when you bend the knee?"},
+    "assessment": {
+        "investigative_history": "52-year-old male with three weeks of gradual right knee pain, 30 minutes of morning stiffness, "
+                                 "worse on stairs and squatting, partly relieved by paracetamol. No trauma.",
+        "possible_diagnosis": "Osteoarthritis of the right knee",
+        "confidence_level": 75,
+        "recommended_department": "Orthopedics",
+        "recommended_doctor": "Orthopedic surgeon",
+        "doctor_comparison_analysis": "Mechanical knee pain without trauma fits orthopedic review"
+    },
+    "diagnostics": {
+        "matched_condition": "Knee Pain → Osteoarthritis",
+        "imaging": ["X-Ray knee (standing AP and lateral)"],
+        "blood_tests": ["ESR", "CRP"],
+        "clinical_tests": ["Range of motion test"],
+        "other": []
+    },
+    "followup_question": {"question": "Have you been taking the prescribed tablets every day since your last visit?"},
+    "followup_assessment": {
+        "investigative_history": "Taking medicines regularly, knee pain reduced but still present on stairs.",
+        "possible_diagnosis": "Osteoarthritis of the knee, partially responding to treatment"
+    }
+}
+
+# The diagnostics prompt's output section before the response schema replaced it
+LEGACY_DIAGNOSTICS_FORMAT = """RESPONSE FORMAT (JSON only):
+{
+    "matched_condition": "Condition → Sub-Condition" or null,
+    "diagnostics": {
+        "Imaging": ["X-Ray", "MRI"],
+        "Blood Tests": ["CBC", "ESR"],
+        "Clinical Tests": ["Physical examination", "Range of motion test"],
+        "Other": ["Additional tests"]
+    }
+}
+
+If no relevant match is found, return:
+{
+    "matched_condition": null,
+    "diagnostics": {}
+}"""
+SCHEMA_DIAGNOSTICS_FORMAT = 'Set matched_condition to "Condition → Sub-Condition", or to null with empty test lists if no relevant match is found.'
+
+
+def _request_text(contents, config) -> str:
+    """System instruction plus user text of one captured request"""
+    texts = [getattr(config, "system_instruction", None) or ""]
+    if isinstance(contents, str):
+        texts.append(contents)
+    else:
+        texts.extend(part.text or "" for content in contents for part in content.parts)
+    return "\n\n".join(texts)
+
+
+async def benchmark_prompt_tokens():
+    """Input and output tokens per call type before and after de-duplicated, schema-constrained prompts"""
+    print("\n" + "=" * 60)
+    print("PROMPT TOKENS PER CALL TYPE")
+    print("=" * 60)
+
+    requests = {}
+
+    async def capture(call_type, contents, model=None, config=None, prompt_version=None):
+        requests[call_type] = _request_text(contents, config)
+        return SimpleNamespace(text=json.dumps(SAMPLE_RESPONSES[call_type], ensure_ascii=False), usage_metadata=None)
+
+    original_generate = llm_gateway.generate_content
+    original_client = llm_gateway.client
+    original_cache = context_cache.enabled
+    original_diagnostics_cache = diagnostics_cache.enabled
+    original_fast_path = diagnostics_service.fast_path_threshold
+    # Without the context cache the system instruction travels inline, so every prompt token is counted
+    llm_gateway.generate_content = capture
+    llm_gateway.client = llm_gateway.client or SimpleNamespace()
+    context_cache.enabled = False
+    # A cached or fast-path diagnosis match would skip the diagnostics request altogether
+    diagnostics_cache.enabled = False
+    diagnostics_service.fast_path_threshold = 0
+    try:
+        with quiet():
+            expert = medical.MedicalExpertService()
+            await expert.generate_next_question(SAMPLE_PATIENT, SAMPLE_HISTORY, len(SAMPLE_HISTORY) + 1, 0)
+            # Also runs the diagnostics match
+            await expert.generate_final_assessment(SAMPLE_PATIENT, SAMPLE_HISTORY)
+            await followup_service.generate_followup_question(
+                patient_age=52, patient_gender="Male", doctor_department="Orthopedics",
+                last_consultation_date="2026-09-01", previous_medical_record="Knee osteoarthritis, started on analgesics",
+                question_number=2, conversation_history=SAMPLE_HISTORY
+            )
+            await followup_service.generate_followup_assessment(
+                patient_age=52, patient_gender="Male", chief_complaint="Knee pain",
+                previous_visit_summary="Knee osteoarthritis, started on analgesics", follow_up_interview=SAMPLE_HISTORY
+            )
+    finally:
+        llm_gateway.generate_content = original_generate
+        llm_gateway.client = original_client
+        context_cache.enabled = original_cache
+        diagnostics_cache.enabled = original_diagnostics_cache
+        diagnostics_service.fast_path_threshold = original_fast_path
+
+    assessment_system = medical.MedicalExpertService().prompts.get("sytem instructions for assessment", "")
+    print(f"{'call type':<22}{'input before':>14}{'input after':>13}{'output before':>15}{'output after':>14}")
+    for call_type, request in requests.items():
+        before = request
+        if call_type == "assessment":
+            # The system prompt used to be sent twice: as system instruction and again in the user text
+            before = f"{assessment_system}\n\n{request}"
+        elif call_type == "diagnostics":
+            before = request.replace(SCHEMA_DIAGNOSTICS_FORMAT, LEGACY_DIAGNOSTICS_FORMAT)
+
+        response = SAMPLE_RESPONSES[call_type]
+        if call_type == "diagnostics":
+            groups = {"Imaging": response["imaging"], "Blood Tests": response["blood_tests"],
+                      "Clinical Tests": response["clinical_tests"], "Other": response["other"]}
+            response_before = {"matched_condition": response["matched_condition"], "diagnostics": groups}
+        else:
+            response_before = response
+        # Free-form JSON answers came back pretty-printed in a markdown fence
+        output_before = f"```json\n{json.dumps(response_before, indent=4, ensure_ascii=False)}\n```"
+        output_after = json.dumps(response, ensure_ascii=False)
+
+        print(f"{call_type:<22}{count_tokens(before):>14}{count_tokens(request):>13}"
+              f"{count_tokens(output_before):>15}{count_tokens(output_after):>14}")
+
+
+# Synthetic pre-diagnostics rows: every body site crossed with every disorder, on top of the real CSV
+BODY_SITES = [
+    "Hip", "Ankle", "Wrist", "Elbow", "Thoracic Spine", "Liver", "Kidney", "Lung", "Heart", "Thyroid",
+    "Pancreas", "Stomach", "Colon", "Skin", "Eye", "Ear", "Sinus", "Bladder", "Prostate", "Ovary",
+    "Uterus", "Breast", "Spinal Cord", "Peripheral Nerve", "Bone Marrow", "Lymph Node", "Gallbladder", "Esophagus",
+    "Small Intestine", "Adrenal", "Pituitary", "Tendon", "Muscle", "Jaw", "Tonsil", "Larynx", "Retina", "Scalp",
+    "Pelvis", "Rib Cage"
+]
+DISORDERS = [
+    "Inflammation", "Infection", "Chronic Insufficiency", "Benign Tumor", "Malignancy", "Cyst", "Calculus",
+    "Obstruction", "Degeneration", "Contusion", "Autoimmune Disorder", "Congenital Anomaly", "Abscess", "Ulcer",
+    "Fibrosis", "Hemorrhage", "Ischemia", "Atrophy", "Hypertrophy", "Stricture", "Prolapse", "Fistula", "Polyp",
+    "Calcification", "Edema", "Dysfunction", "Failure", "Hyperplasia", "Necrosis", "Spasm", "Laceration",
+    "Dislocation", "Instability", "Deformity", "Neuralgia", "Allergy", "Granuloma", "Sclerosis", "Dysplasia",
+    "Effusion", "Adhesion", "Entrapment", "Rupture", "Torsion", "Varices", "Hypoplasia", "Metaplasia",
+    "Thrombosis", "Embolism", "Aneurysm", "Vasculitis", "Neuropathy", "Myopathy", "Tuberculosis",
+    "Fungal Infection", "Parasitic Infestation", "Radiation Injury", "Burn", "Foreign Body", "Post-operative Complication",
+    "Hernia", "Cystic Degeneration", "Chronic Pain Syndrome", "Sarcoidosis", "Amyloidosis", "Lipoma", "Hemangioma",
+    "Keloid", "Stenosis", "Dilatation", "Perforation", "Sepsis", "Overuse Injury", "Stress Fracture", "Avulsion"
+]
+DIAGNOSTICS_QUERIES = [
+    ("Knee osteoarthritis", "Pain on climbing stairs and morning stiffness", "Osteoarthritis Knee"),
+    ("Uncontrolled type 2 diabetes", "High sugars despite metformin", "Uncontrolled"),
+    ("Migraine", "Throbbing one-sided headache with nausea", "Migraine"),
+    ("Sciatica", "Back pain radiating down the left leg", "Disc Herniation"),
+    ("Possible ACL tear", "Twisted knee playing football", "Ligament Injury (ACL / PCL / MCL)"),
+    ("Frozen shoulder", "Cannot lift the arm above the head", "Frozen Shoulder")
+]
+# Stub model cost: a fixed round trip plus prefill time that grows with the prompt
+DIAGNOSTICS_STUB_BASE = 0.3
+DIAGNOSTICS_STUB_PER_1K_TOKENS = 0.08
+
+
+def _synthetic_diagnostics_csv(path: str) -> int:
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "pre-diagonstics.csv"), encoding="utf-8-sig") as file:
+        lines = file.read().splitlines()
+    for site in BODY_SITES:
+        for number, disorder in enumerate(DISORDERS):
+            tests = f"{site} ultrasound; CBC; {disorder} panel {number}"
+            lines.append(f"{site} Disorders,{site} {disorder},{tests},Specialist review")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+    return len(lines) - 1
+
+
+async def benchmark_diagnostics_retrieval():
+    """Diagnostics prompt tokens and latency: full CSV list vs BM25 top-k candidates"""
+    print("\n" + "=" * 60)
+    print("DIAGNOSTICS PROMPT: FULL LIST VS TOP-K (stub: %.0f ms + %.0f ms per 1k tokens)"
+          % (DIAGNOSTICS_STUB_BASE * 1000, DIAGNOSTICS_STUB_PER_1K_TOKENS * 1000))
+    print("=" * 60)
+
+    prompts = []
+
+    async def paced(call_type, contents, model=None, config=None, prompt_version=None):
+        prompts.append(contents)
+        await asyncio.sleep(DIAGNOSTICS_STUB_BASE + count_tokens(contents) / 1000 * DIAGNOSTICS_STUB_PER_1K_TOKENS)
+        return SimpleNamespace(text=json.dumps(SAMPLE_RESPONSES["diagnostics"]), usage_metadata=None)
+
+    original_generate, original_client = llm_gateway.generate_content, llm_gateway.client
+    llm_gateway.generate_content = paced
+    llm_gateway.client = llm_gateway.client or SimpleNamespace()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            synthetic_path = os.path.join(directory, "pre-diagonstics.csv")
+            synthetic_rows = _synthetic_diagnostics_csv(synthetic_path)
+            with quiet():
+                service = DiagnosticsService()
+                service.cache = DiagnosticsCache(path="", enabled=False)
+            # Every query goes to the (stub) model, so the prompt sizes are comparable
+            service.fast_path_threshold = 0
+            csv_sets = [("real", service.csv_path), ("synthetic", synthetic_path)]
+
+            print(f"{'csv':<11}{'rows':>6}{'mode':>8}{'avg tokens':>12}{'avg latency (ms)':>18}{'search (ms)':>13}{'recall':>8}")
+            for label, path in csv_sets:
+                with quiet():
+                    service.csv_path = path
+                    service._load_diagnostics_data()
+                for mode, top_k in [("full", 0), ("top-k", settings.diagnostics_top_k)]:
+                    service.top_k = top_k
+                    prompts.clear()
+                    latencies, search_times, found = [], [], 0
+                    for diagnosis, history, expected in DIAGNOSTICS_QUERIES:
+                        search_start = time.perf_counter()
+                        candidates = service.candidate_conditions(diagnosis, history)
+                        search_times.append(time.perf_counter() - search_start)
+                        found += any(row["sub_condition"] == expected for row in candidates)
+                        start = time.perf_counter()
+                        with quiet():
+                            await service.get_pre_consultation_diagnostics(diagnosis, history)
+                        latencies.append(time.perf_counter() - start)
+                    avg_tokens = sum(count_tokens(prompt) for prompt in prompts) / len(prompts)
+                    print(f"{label:<11}{len(service.conditions):>6}{mode:>8}{avg_tokens:>12.0f}"
+                          f"{sum(latencies) / len(latencies) * 1000:>18.0f}"
+                          f"{sum(search_times) / len(search_times) * 1000:>13.2f}"
+                          f"{found:>5}/{len(DIAGNOSTICS_QUERIES)}")
+            print(f"\nIndex build for {synthetic_rows} synthetic rows: {service.retrieval_stats['index_build_ms']} ms")
+    finally:
+        llm_gateway.generate_content, llm_gateway.client = original_generate, original_client
+
+
+async def benchmark_diagnostics_fast_path():
+    """Share of diagnoses answered from the parsed CSV, and the latency against the stub model for the rest"""
+    print("\n" + "=" * 60)
+    print("DIAGNOSTICS FAST PATH (real CSV, stub model)")
+    print("=" * 60)
+
+    async def paced(call_type, contents, model=None, config=None, prompt_version=None):
+        await asyncio.sleep(DIAGNOSTICS_STUB_BASE + count_tokens(contents) / 1000 * DIAGNOSTICS_STUB_PER_1K_TOKENS)
+        return SimpleNamespace(text=json.dumps(SAMPLE_RESPONSES["diagnostics"]), usage_metadata=None)
+
+    original_generate, original_client = llm_gateway.generate_content, llm_gateway.client
+    llm_gateway.generate_content = paced
+    llm_gateway.client = llm_gateway.client or SimpleNamespace()
+    try:
+        print(f"{'fast path':<11}{'llm calls':>10}{'avg latency (ms)':>18}")
+        for label, threshold in [("off", 0), ("on", settings.diagnostics_fast_path_threshold)]:
+            with quiet():
+                service = DiagnosticsService()
+                service.cache = DiagnosticsCache(path="", enabled=False)
+            service.fast_path_threshold = threshold
+            # Audits run off the request path; they are left out so the call count is the request path's
+            service.fast_path_audit_rate = 0
+            latencies = []
+            for diagnosis, history, _ in DIAGNOSTICS_QUERIES:
+                start = time.perf_counter()
+                with quiet():
+                    await service.get_pre_consultation_diagnostics(diagnosis, history)
+                latencies.append(time.perf_counter() - start)
+            llm_calls = len(DIAGNOSTICS_QUERIES) - service.fast_path_stats["fast_path"]
+            print(f"{label:<11}{llm_calls:>6}/{len(DIAGNOSTICS_QUERIES)}{sum(latencies) / len(latencies) * 1000:>18.0f}")
+    finally:
+        llm_gateway.generate_content, llm_gateway.client = original_generate, original_client
+
+
+async def main():
+    await load_encoding(settings.token_encoding_load_timeout)
+    await benchmark_interview_concurrency()
+    await benchmark_question_streaming()
+    await benchmark_tts_streaming()
+    await benchmark_prompt_tokens()
+    await benchmark_diagnostics_retrieval()
+    await benchmark_diagnostics_fast_path()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,7 +5,7 @@ Configuration settings for the FastAPI application
 import os
 from pydantic import Field
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     # API Configuration
@@ -16,6 +16,103 @@ class Settings(BaseSettings):
     gemini_api_key: str = Field(..., description="Gemini API key")
     gemini_model: str = "gemini-2.5-flash-lite"
     
+    # Model Routing Configuration
+    gemini_model_preferences: List[str] = []  # Ordered models to route between; empty means gemini_model only
+    gemini_model_routes: Dict[str, List[str]] = {}  # Per call type overrides, e.g. {"assessment": ["gemini-2.5-flash"]}
+    model_circuit_failure_threshold: int = 5  # Consecutive failures that open a model's circuit
+    model_circuit_open_seconds: float = 30.0  # Cool-down before an open circuit gets a recovery probe
+    model_probe_interval: float = 15.0  # Seconds between background probe passes
+    
+    # LLM Gateway Configuration
+    llm_max_concurrency: int = 32  # Gemini calls allowed in flight at once
+    llm_queue_timeout: float = 10.0  # Seconds a call may wait for a free slot
+    
+    # LLM Hedged Requests Configuration
+    llm_hedging_enabled: bool = False
+    llm_hedge_call_types: List[str] = ["question", "followup_question"]
+    llm_hedge_percentile: float = 95.0  # Fire a duplicate once a call is slower than this percentile of recent calls
+    llm_hedge_min_delay: float = 1.0  # Never hedge sooner than this; also the delay until enough samples exist
+    llm_hedge_max_ratio: float = 0.1  # Cost cap - at most this fraction of calls may be hedged
+    
+    # LLM Usage Accounting Configuration
+    llm_token_prices: Dict[str, Dict[str, float]] = {  # USD per million tokens; thinking tokens are billed as output
+        "gemini-2.5-flash-lite": {"input": 0.10, "cached": 0.025, "output": 0.40},
+        "gemini-2.5-flash": {"input": 0.30, "cached": 0.075, "output": 2.50},
+        "gemini-2.5-pro": {"input": 1.25, "cached": 0.31, "output": 10.00}
+    }
+    usage_max_sessions: int = 2000  # Sessions whose token totals are kept in memory until pre-screening is accepted
+    
+    # Gemini Context Cache Configuration
+    gemini_context_cache_enabled: bool = True
+    gemini_context_cache_ttl: int = 3600  # Seconds a cached system instruction lives; extended before it expires
+    gemini_context_cache_min_tokens: Dict[str, int] = {  # Gemini's minimum cacheable size per model; smaller prompts go inline
+        "default": 1024,
+        "gemini-2.5-pro": 4096
+    }
+    
+    # Latency Budget Configuration
+    turn_budget_seconds: float = 4.0  # Deadline for one interview turn, shared by every outbound call in it
+    face_recognition_budget_seconds: float = 15.0  # Deadline for a Luxand face lookup or enrollment request
+    patient_lookup_budget_seconds: float = 15.0  # Deadline for manual patient lookup, OneHat registration included
+    
+    # Prompt Registry Configuration
+    prompt_reload_check_interval: float = 2.0  # Seconds between mtime checks of the prompt files
+    
+    # First Question Pool Configuration
+    first_question_pool_enabled: bool = True
+    first_question_pool_size: int = 5  # Openers kept per (age band, gender, department, prompt version)
+    first_question_pool_low_water: int = 2  # Refill in the background when fewer than this remain
+    first_question_pool_warm: bool = True  # Fill the pools for every age band, warm gender and department at startup
+    first_question_pool_warm_genders: List[str] = ["Male", "Female"]  # Genders warmed at startup
+    first_question_pool_warm_concurrency: int = 4  # Pools warmed at once, so startup does not crowd the shared gateway
+    
+    # Follow-up Plan Configuration
+    # Past the first, plan questions are speculative: their tokens are spent even when an earlier one ends the interview.
+    # 5 generates the whole plan in about one LLM latency; lower trades plan latency for fewer wasted tokens.
+    followup_plan_concurrency: int = 5  # Plan questions generated at once by conduct_followup_interview
+    
+    # Diagnostics Jobs Configuration
+    diagnostics_accept_timeout: float = 15.0  # Longest /api/prescreening/accept waits for a still-running diagnostics job
+    
+    # Diagnostics Retrieval Configuration
+    diagnostics_top_k: int = 8  # Candidate CSV rows sent to the diagnostics matcher; 0 sends the full list
+    diagnostics_full_list_max_rows: int = 60  # With no lexical candidates, CSVs up to this size are still sent whole
+    
+    # Diagnostics Fast Path Configuration
+    diagnostics_fast_path_threshold: float = 0.85  # Local match similarity that skips the LLM; 0 disables the fast path
+    diagnostics_fast_path_audit_rate: float = 0.1  # Share of fast-path matches also checked by the LLM in the background
+    
+    # Diagnostics Cache Configuration
+    diagnostics_cache_enabled: bool = True
+    diagnostics_cache_max_entries: int = 512  # Least recently used matches are evicted beyond this
+    diagnostics_cache_ttl: int = 604800  # Seconds a cached diagnosis match stays valid (7 days)
+    diagnostics_cache_path: str = ".cache/diagnostics_cache.json"  # Disk tier, survives restarts
+    
+    # TTS Cache Configuration
+    tts_cache_enabled: bool = True  # Reuse stored clips for repeated text; clips are stored either way to back their audio URLs
+    tts_cache_dir: str = ".cache/tts"  # Disk tier, survives restarts
+    tts_cache_memory_max_bytes: int = 32 * 1024 * 1024  # Least recently used clips leave memory beyond this
+    tts_cache_disk_max_bytes: int = 512 * 1024 * 1024  # Least recently used clips are deleted beyond this
+    
+    # TTS Audio Pack Configuration
+    tts_pack_enabled: bool = True
+    tts_pack_dir: str = ".cache/tts_pack"  # One directory per pack version; older versions are removed once a new one is complete
+    tts_pack_concurrency: int = 4  # ElevenLabs requests at once while building the pack
+    
+    # TTS Sentence Streaming Configuration
+    tts_sentence_concurrency: int = 3  # Later sentences synthesized at once while the first streams; 0 sends the text as one request
+    tts_sentence_min_chars: int = 20  # Shorter sentences are joined with the next rather than synthesized alone
+    
+    # Prompt Budget Configuration
+    prompt_token_budgets: Dict[str, int] = {  # Input tokens per call type before history is trimmed
+        "question": 4000,
+        "assessment": 8000,
+        "followup_question": 4000,
+        "followup_assessment": 8000
+    }
+    followup_record_token_budget: int = 800  # Previous consultation record inside follow-up prompts
+    token_encoding_load_timeout: float = 10.0  # Startup wait for the tokenizer; byte-length estimates until it loads
+    
     # Session Configuration
     session_timeout: int = 3600  # 1 hour in seconds
     
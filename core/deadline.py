@@ -0,0 +1,174 @@
+"""
+Per-turn latency budgets - one deadline per interview turn, inherited by every outbound call
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from core.config import settings
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the turn's latency budget runs out before an outbound call finishes"""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        super().__init__(f"Turn latency budget exhausted during {stage}")
+
+
+class TurnBudget:
+    def __init__(self, name: str, seconds: Optional[float] = None):
+        self.name = name
+        self.seconds = seconds if seconds is not None else settings.turn_budget_seconds
+        self.started = time.perf_counter()
+        self.deadline = self.started + self.seconds
+        self.stages: List[Dict[str, Any]] = []
+        self.exhausted_by: Optional[str] = None
+        self._finished = False
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.perf_counter())
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 1)
+
+    def record_stage(self, stage: str, duration: float, outcome: str):
+        self.stages.append({"stage": stage, "ms": round(duration * 1000, 1), "outcome": outcome})
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "turn": self.name,
+            "budget_ms": round(self.seconds * 1000),
+            "elapsed_ms": self.elapsed_ms(),
+            "exhausted_by": self.exhausted_by,
+            "stages": self.stages
+        }
+
+    def finish(self):
+        """Record the turn in the budget stats (once)"""
+        if self._finished:
+            return
+        self._finished = True
+        turn_budget_stats.record(self)
+        if self.exhausted_by:
+            stages = ", ".join(f"{s['stage']} {s['ms']}ms ({s['outcome']})" for s in self.stages)
+            print(f"[DEADLINE] {self.name} budget of {self.seconds}s exhausted by {self.exhausted_by} - {stages}")
+
+
+class TurnBudgetStats:
+    """Per-turn counters of how often the budget ran out and which stage consumed it"""
+
+    def __init__(self, recent: int = 20):
+        self.turns: Dict[str, Dict[str, Any]] = {}
+        self.recent_exhausted = deque(maxlen=recent)
+
+    def record(self, budget: TurnBudget):
+        stats = self.turns.setdefault(budget.name, {
+            "turns": 0, "exhausted": 0, "total_ms": 0.0, "max_ms": 0.0, "exhausted_by": {}
+        })
+        elapsed = budget.elapsed_ms()
+        stats["turns"] += 1
+        stats["total_ms"] += elapsed
+        stats["max_ms"] = max(stats["max_ms"], elapsed)
+        if budget.exhausted_by:
+            stats["exhausted"] += 1
+            stats["exhausted_by"][budget.exhausted_by] = stats["exhausted_by"].get(budget.exhausted_by, 0) + 1
+            self.recent_exhausted.append(budget.summary())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "budget_seconds": settings.turn_budget_seconds,
+            "turns": {
+                name: {
+                    "turns": stats["turns"],
+                    "exhausted": stats["exhausted"],
+                    "avg_ms": round(stats["total_ms"] / stats["turns"], 1) if stats["turns"] else 0.0,
+                    "max_ms": stats["max_ms"],
+                    "exhausted_by": stats["exhausted_by"]
+                }
+                for name, stats in self.turns.items()
+            },
+            "recent_exhausted": list(self.recent_exhausted)
+        }
+
+
+turn_budget_stats = TurnBudgetStats()
+
+_current_budget: ContextVar[Optional[TurnBudget]] = ContextVar("turn_budget", default=None)
+
+
+def current_budget() -> Optional[TurnBudget]:
+    return _current_budget.get()
+
+
+def call_timeout(default: Optional[float] = None) -> Optional[float]:
+    """Timeout for an outbound call: the caller's own timeout capped by what is left of the turn"""
+    budget = current_budget()
+    if budget is None:
+        return default
+    remaining = budget.remaining()
+    return remaining if default is None else min(default, remaining)
+
+
+def deadline_passed() -> bool:
+    budget = current_budget()
+    return budget is not None and budget.remaining() <= 0
+
+
+@contextmanager
+def use_budget(budget: TurnBudget):
+    """Make an existing budget the current one, e.g. to carry it into a streaming response generator"""
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+@contextmanager
+def turn_budget(name: str, seconds: Optional[float] = None):
+    """Run one interview turn under a latency budget"""
+    budget = TurnBudget(name, seconds)
+    with use_budget(budget):
+        try:
+            yield budget
+        finally:
+            budget.finish()
+
+
+@asynccontextmanager
+async def budget_stage(stage: str):
+    """
+    Time one outbound stage against the current turn budget.
+    Fails fast if the budget is already spent, and reports asyncio and httpx timeouts caused
+    by the budget as DeadlineExceeded naming the stage that consumed it.
+    """
+    budget = current_budget()
+    if budget is None:
+        yield
+        return
+
+    if budget.remaining() <= 0:
+        budget.record_stage(stage, 0.0, "skipped")
+        budget.exhausted_by = budget.exhausted_by or stage
+        raise DeadlineExceeded(stage)
+
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        out_of_time = budget.remaining() <= 0
+        budget.record_stage(stage, time.perf_counter() - start, "deadline" if out_of_time else "error")
+        if out_of_time:
+            budget.exhausted_by = budget.exhausted_by or stage
+            if isinstance(e, (asyncio.TimeoutError, httpx.TimeoutException)):
+                raise DeadlineExceeded(stage) from e
+        raise
+    else:
+        budget.record_stage(stage, time.perf_counter() - start, "ok")
@@ -0,0 +1,99 @@
+"""
+Helpers for streaming LLM text to the browser as Server-Sent Events
+"""
+
+import json
+import re
+from typing import List
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event frame with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class MarkerHoldback:
+    """
+    Passes streamed text through while holding back anything that could be the start
+    of a control marker (e.g. ASSESSMENT_READY), so patients never see a half-printed marker.
+    Once a marker appears nothing more is released.
+    """
+
+    def __init__(self, markers: List[str]):
+        self.markers = markers
+        self.text = ""
+        self.marker_seen = False
+        self._released = 0
+
+    def feed(self, delta: str) -> str:
+        self.text += delta
+        if self.marker_seen or any(marker in self.text for marker in self.markers):
+            self.marker_seen = True
+            return ""
+
+        # Hold back the longest tail that is a prefix of some marker
+        hold = 0
+        for marker in self.markers:
+            for size in range(min(len(marker) - 1, len(self.text)), 0, -1):
+                if self.text.endswith(marker[:size]):
+                    hold = max(hold, size)
+                    break
+
+        safe_end = len(self.text) - hold
+        released = self.text[self._released:safe_end]
+        self._released = max(self._released, safe_end)
+        return released
+
+
+class PartialJsonStringField:
+    """
+    Incrementally decodes one string field from a JSON object that is still being streamed,
+    e.g. the "question" value of {"question": "..."} from a schema-constrained response.
+    """
+
+    def __init__(self, field: str):
+        self._pattern = re.compile(r'"%s"\s*:\s*"' % re.escape(field))
+        self.buffer = ""
+        self.value = ""
+        self.complete = False
+        self._start = None
+
+    def feed(self, delta: str) -> str:
+        """Add raw response text and return the newly decoded characters of the field"""
+        self.buffer += delta
+        if self.complete:
+            return ""
+
+        if self._start is None:
+            match = self._pattern.search(self.buffer)
+            if not match:
+                return ""
+            self._start = match.end()
+
+        raw = self.buffer[self._start:]
+        end = len(raw)
+        i = 0
+        while i < len(raw):
+            char = raw[i]
+            if char == "\\":
+                # Stop before an escape sequence that has not fully arrived yet
+                needed = 6 if raw[i + 1:i + 2] == "u" else 2
+                if i + needed > len(raw):
+                    end = i
+                    break
+                i += needed
+                continue
+            if char == '"':
+                end = i
+                self.complete = True
+                break
+            i += 1
+
+        try:
+            decoded = json.loads(f'"{raw[:end]}"')
+        except ValueError:
+            return ""
+
+        new_text = decoded[len(self.value):]
+        self.value = decoded
+        return new_text
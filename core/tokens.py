@@ -0,0 +1,53 @@
+"""
+Local prompt token estimates for logging and budgeting prompts before they are sent
+"""
+
+import asyncio
+from functools import lru_cache
+
+# Average UTF-8 bytes per token when no tokenizer is available (~4 for English;
+# Tamil characters are 3 bytes each, which keeps the estimate on the safe side)
+BYTES_PER_TOKEN = 4
+
+# tiktoken's cl100k_base once load_encoding has loaded it; count_tokens never loads it itself
+_encoding = None
+
+
+def _load_encoding():
+    """Blocking: tiktoken downloads its ranks on first use"""
+    global _encoding
+    try:
+        import tiktoken
+        _encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"[TOKENS] tiktoken encoding unavailable, estimating from byte length: {e}")
+        return
+    # Counts cached so far are byte-length estimates
+    count_tokens.cache_clear()
+    print("[TOKENS] tiktoken cl100k_base loaded")
+
+
+async def load_encoding(timeout: float):
+    """
+    Load the tokenizer off the event loop (called from the app lifespan). Until it loads, or if it
+    does not within timeout (e.g. no internet access), count_tokens estimates from byte length.
+    A load that finishes after the timeout is still picked up.
+    """
+    try:
+        await asyncio.wait_for(asyncio.shield(asyncio.to_thread(_load_encoding)), timeout)
+    except asyncio.TimeoutError:
+        print(f"[TOKENS] tiktoken encoding not loaded within {timeout}s, estimating from byte length")
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """
+    Approximate token count. Gemini's tokenizer differs from cl100k, so treat this as an
+    estimate for comparing prompt sizes; usage_metadata has the billed numbers.
+    Cached, since prompt sections such as transcript fragments repeat from turn to turn.
+    """
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return -(-len(text.encode("utf-8")) // BYTES_PER_TOKEN)
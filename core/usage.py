@@ -0,0 +1,166 @@
+"""
+LLM usage accounting - prompt, cached, output and thinking tokens, latency and cost of every Gemini call,
+aggregated per session, per call type and per prompt version
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from core.config import settings
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "prompt_tokens": 0,
+        "cached_tokens": 0,
+        "output_tokens": 0,
+        "thinking_tokens": 0,
+        "total_latency": 0.0,
+        "cost_usd": 0.0,
+        "unpriced_calls": 0
+    }
+
+
+def _add(totals: Dict[str, Any], usage: Dict[str, Any]):
+    totals["calls"] += 1
+    for field in ("prompt_tokens", "cached_tokens", "output_tokens", "thinking_tokens", "total_latency"):
+        totals[field] += usage[field]
+    if usage["cost_usd"] is None:
+        totals["unpriced_calls"] += 1
+    else:
+        totals["cost_usd"] += usage["cost_usd"]
+
+
+def _report(totals: Dict[str, Any]) -> Dict[str, Any]:
+    calls = totals["calls"]
+    return {
+        "calls": calls,
+        "prompt_tokens": totals["prompt_tokens"],
+        "cached_tokens": totals["cached_tokens"],
+        "output_tokens": totals["output_tokens"],
+        "thinking_tokens": totals["thinking_tokens"],
+        "cost_usd": round(totals["cost_usd"], 6),
+        "unpriced_calls": totals["unpriced_calls"],
+        "avg_latency_ms": round(totals["total_latency"] / calls * 1000, 1) if calls else 0.0
+    }
+
+
+def usage_counts(usage_metadata) -> Dict[str, int]:
+    """Token counts from a Gemini usage_metadata; fields the model did not report count as 0"""
+    return {
+        "prompt_tokens": getattr(usage_metadata, "prompt_token_count", None) or 0,
+        "cached_tokens": getattr(usage_metadata, "cached_content_token_count", None) or 0,
+        "output_tokens": getattr(usage_metadata, "candidates_token_count", None) or 0,
+        "thinking_tokens": getattr(usage_metadata, "thoughts_token_count", None) or 0
+    }
+
+
+def thinking_tokens(response) -> int:
+    """Thinking tokens spent on one response (the reasoning_tokens of the interview API)"""
+    return usage_counts(getattr(response, "usage_metadata", None))["thinking_tokens"]
+
+
+def call_cost(model: str, counts: Dict[str, int]) -> Optional[float]:
+    """USD cost of one call from the configured prices; None for a model without a price"""
+    prices = settings.llm_token_prices.get(model.removeprefix("models/"))
+    if not prices:
+        return None
+    fresh_tokens = counts["prompt_tokens"] - counts["cached_tokens"]
+    # Thinking tokens are billed as output
+    billed_output = counts["output_tokens"] + counts["thinking_tokens"]
+    return (fresh_tokens * prices["input"] + counts["cached_tokens"] * prices["cached"]
+            + billed_output * prices["output"]) / 1_000_000
+
+
+class UsageScope:
+    """The calls made inside one usage_session block, e.g. one interview turn"""
+
+    def __init__(self, session_id: Optional[str]):
+        self.session_id = session_id
+        self.totals = _empty_totals()
+
+
+_current_scope: ContextVar[Optional[UsageScope]] = ContextVar("usage_scope", default=None)
+
+
+@contextmanager
+def usage_session(session_id: Optional[str]):
+    """Attribute the Gemini calls made inside the block (and in tasks it spawns) to a session"""
+    scope = UsageScope(session_id)
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+
+
+class UsageTracker:
+    def __init__(self, max_sessions: Optional[int] = None):
+        self.max_sessions = max_sessions if max_sessions is not None else settings.usage_max_sessions
+        self.totals = _empty_totals()
+        self.call_types: Dict[str, Dict[str, Any]] = {}
+        self.prompt_versions: Dict[tuple, Dict[str, Any]] = {}
+        # Most recently active sessions last; the oldest are dropped beyond max_sessions
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def record(self, call_type: str, model: str, usage_metadata, elapsed: float,
+               prompt_version: Optional[str] = None):
+        counts = usage_counts(usage_metadata)
+        usage = {**counts, "total_latency": elapsed, "cost_usd": call_cost(model, counts)}
+
+        _add(self.totals, usage)
+        _add(self.call_types.setdefault(call_type, _empty_totals()), usage)
+        if prompt_version:
+            _add(self.prompt_versions.setdefault((call_type, prompt_version), _empty_totals()), usage)
+
+        scope = _current_scope.get()
+        if scope is None:
+            return
+        _add(scope.totals, usage)
+        if scope.session_id:
+            session = self.sessions.setdefault(scope.session_id, {"totals": _empty_totals(), "call_types": {}})
+            self.sessions.move_to_end(scope.session_id)
+            _add(session["totals"], usage)
+            _add(session["call_types"].setdefault(call_type, _empty_totals()), usage)
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+
+    def session_usage(self, session_id: str) -> Dict[str, Any]:
+        """Totals for one session, in the shape stored with its pre-screening record"""
+        session = self.sessions.get(session_id) or {"totals": _empty_totals(), "call_types": {}}
+        return {
+            **_report(session["totals"]),
+            "call_types": {call_type: _report(totals) for call_type, totals in session["call_types"].items()}
+        }
+
+    def prompt_version_metrics(self):
+        """Per-call averages per (call type, prompt version), to compare prompt revisions"""
+        return [
+            {
+                "call_type": call_type,
+                "prompt_version": prompt_version,
+                **_report(totals),
+                "avg_prompt_tokens": round(totals["prompt_tokens"] / totals["calls"], 1),
+                "avg_output_tokens": round(totals["output_tokens"] / totals["calls"], 1),
+                "avg_thinking_tokens": round(totals["thinking_tokens"] / totals["calls"], 1),
+                "avg_cost_usd": round(totals["cost_usd"] / totals["calls"], 6)
+            }
+            for (call_type, prompt_version), totals in self.prompt_versions.items()
+        ]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        session_costs = [session["totals"]["cost_usd"] for session in self.sessions.values()]
+        return {
+            "totals": _report(self.totals),
+            "call_types": {call_type: _report(totals) for call_type, totals in self.call_types.items()},
+            "prompt_versions": self.prompt_version_metrics(),
+            "sessions_tracked": len(self.sessions),
+            "avg_session_cost_usd": round(sum(session_costs) / len(session_costs), 6) if session_costs else 0.0
+        }
+
+
+# Global usage tracker instance
+usage_tracker = UsageTracker()
@@ -16,16 +16,36 @@ from contextlib import asynccontextmanager
 import uvicorn
 import os
 
-from routers import medical, followup, departments, patients, face_recognition, session, assessment, prescreening, voice, patient_router
+from routers import medical, followup, departments, patients, face_recognition, session, assessment, prescreening, voice, patient_router, admin
 from core.config import settings
+from core.tokens import load_encoding
+from services.llm_gateway import llm_gateway
+from services.model_router import model_router
+from services.first_question_pool import first_question_pool
+from services.department_service import department_service
+from services.assessment_prefetch import assessment_prefetch
+from services.context_cache import context_cache
+from services.diagnostics_jobs import diagnostics_jobs
+from services.audio_pack import audio_pack
+from services.tts_service import tts_service
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Medical Pre-Screening API starting up...")
+    await load_encoding(settings.token_encoding_load_timeout)
+    model_router.start_probing(llm_gateway.probe_model)
+    tts_service.start_audio_pack()
+    first_question_pool.start_warming(department_service.get_available_departments())
     yield
     # Shutdown
     print("🛑 Medical Pre-Screening API shutting down...")
+    await model_router.stop_probing()
+    await first_question_pool.stop()
+    await assessment_prefetch.stop()
+    await diagnostics_jobs.stop()
+    await audio_pack.stop()
+    await context_cache.stop()
 
 app = FastAPI(
     title="Medical Pre-Screening API",
@@ -62,6 +82,7 @@ app.include_router(followup.router, prefix="/api", tags=["followup"])
 app.include_router(session.router, prefix="/api", tags=["session"])
 app.include_router(voice.router, prefix="/api", tags=["voice"])
 app.include_router(prescreening.router, tags=["prescreening"])
+app.include_router(admin.router, prefix="/api", tags=["admin"])
 
 # Mount static files for frontend
 app.mount("/static", StaticFiles(directory="static"), name="static")
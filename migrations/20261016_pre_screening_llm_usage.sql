@@ -0,0 +1,3 @@
+-- Per-session Gemini token and cost totals stored with each accepted pre-screening
+-- (routers/prescreening.py). Until this runs, records are stored without usage.
+ALTER TABLE public.pre_screening_records ADD COLUMN IF NOT EXISTS llm_usage jsonb;
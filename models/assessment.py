@@ -26,3 +26,4 @@ class AssessmentResponse(BaseModel):
     pre_consultation_diagnostics: Optional[dict] = None
     matched_diagnostic_condition: Optional[str] = None
     diagnostics_explanation: Optional[str] = None
+    diagnostics_status: Optional[str] = None  # "pending" until the diagnostics job finishes, then "ready" or "failed"
@@ -3,7 +3,7 @@ Medical interview data models
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 from enum import Enum
 
 class InterviewStatus(str, Enum):
@@ -16,11 +16,52 @@ class QuestionAnswer(BaseModel):
     answer: str = Field(..., description="Patient's response")
     timestamp: str = Field(..., description="When the Q&A occurred")
 
+class ConversationTranscript(BaseModel):
+    """
+    Conversation history rendered once per answer. Prompts, the assessment and
+    pre-screening extraction reuse these fragments instead of re-rendering every turn.
+    """
+    text: str = ""
+    exchanges: List[str] = []  # "Q1: ...\nA1: ...\n\n" per exchange
+    answers: List[str] = []    # "A1: ...\n\n" per exchange, the short form used when trimming prompts
+    records: List[Dict] = []   # {"question", "answer", "timestamp"} per exchange
+
+    def append(self, qa: QuestionAnswer):
+        number = len(self.exchanges) + 1
+        exchange = f"Q{number}: {qa.question}\nA{number}: {qa.answer}\n\n"
+        self.exchanges.append(exchange)
+        self.answers.append(f"A{number}: {qa.answer}\n\n")
+        self.records.append(qa.model_dump())
+        self.text += exchange
+
+    def truncate(self, count: int):
+        """Keep only the first count exchanges"""
+        del self.exchanges[count:], self.answers[count:], self.records[count:]
+        self.text = "".join(self.exchanges)
+
+    def __len__(self) -> int:
+        return len(self.exchanges)
+
+    @classmethod
+    def of(cls, conversation_history: Union["ConversationTranscript", List[Dict]]) -> "ConversationTranscript":
+        """The transcript itself, or one rendered from a list of Q&A dicts"""
+        if isinstance(conversation_history, cls):
+            return conversation_history
+        transcript = cls()
+        for exchange in conversation_history:
+            transcript.append(QuestionAnswer(
+                question=exchange["question"],
+                answer=exchange["answer"],
+                timestamp=exchange.get("timestamp", "")
+            ))
+        return transcript
+
 class InterviewSession(BaseModel):
     session_id: str
     patient_id: str
     status: InterviewStatus = InterviewStatus.ACTIVE
     conversation_history: List[QuestionAnswer] = []
+    transcript: ConversationTranscript = Field(default_factory=ConversationTranscript)
     question_number: int = 1
     unknown_count: int = 0
     max_questions: int = 6
@@ -35,6 +76,24 @@ class InterviewSession(BaseModel):
     previous_response_id: Optional[str] = None
     total_reasoning_tokens: int = 0
 
+    def add_exchange(self, qa: QuestionAnswer):
+        """Append a Q&A pair and render its transcript fragments once"""
+        self.conversation_history.append(qa)
+        self.transcript.append(qa)
+
+    def checkpoint(self) -> Dict:
+        """Session state to restore if a turn is never delivered to the patient"""
+        return {**self.model_dump(exclude={"conversation_history", "transcript"}), "exchanges": len(self.conversation_history)}
+
+    def rollback(self, checkpoint: Dict):
+        """Undo everything a turn changed since checkpoint(), including the answer it recorded"""
+        state = dict(checkpoint)
+        exchanges = state.pop("exchanges")
+        del self.conversation_history[exchanges:]
+        self.transcript.truncate(exchanges)
+        for name, value in state.items():
+            setattr(self, name, value)
+
 class QuestionRequest(BaseModel):
     session_id: str
     patient_id: str
@@ -111,6 +111,7 @@ CREATE TABLE public.pre_screening_records (
   chief_complaint text,
   symptoms_mentioned ARRAY,
   diagnostics jsonb,
+  llm_usage jsonb,
   created_at timestamp with time zone NOT NULL DEFAULT now(),
   updated_at timestamp with time zone NOT NULL DEFAULT now(),
   CONSTRAINT pre_screening_records_pkey PRIMARY KEY (id),
@@ -0,0 +1,178 @@
+"""
+Admin API endpoints for runtime metrics
+"""
+
+from fastapi import APIRouter
+from services.llm_gateway import llm_gateway
+from services.context_cache import context_cache
+from services.model_router import model_router
+from services.prompt_builder import prompt_budget_stats
+from services.prompt_registry import prompt_registry
+from services.first_question_pool import first_question_pool
+from services.assessment_prefetch import assessment_prefetch
+from services.diagnostics_jobs import diagnostics_jobs
+from services.diagnostics_cache import diagnostics_cache
+from services.diagnostics_service import diagnostics_service
+from services.audio_pack import audio_pack
+from services.tts_cache import tts_cache
+from services.tts_service import tts_service
+from core.deadline import turn_budget_stats
+from core.usage import usage_tracker
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("/admin/llm-metrics")
+async def get_llm_metrics():
+    """In-flight Gemini calls, queue depth and queue wait time per call type"""
+    return {
+        "success": True,
+        "metrics": llm_gateway.get_metrics()
+    }
+
+@router.get("/admin/context-cache")
+async def get_context_cache():
+    """Cached system instructions and create/refresh/fallback counters"""
+    return {
+        "success": True,
+        "context_cache": context_cache.get_metrics()
+    }
+
+@router.get("/admin/turn-budgets")
+async def get_turn_budgets():
+    """Per-turn latency budget usage and which stage consumed the budget when it ran out"""
+    return {
+        "success": True,
+        "turn_budgets": turn_budget_stats.get_metrics()
+    }
+
+@router.get("/admin/model-routes")
+async def get_model_routes():
+    """Model selected per call type, with each model's latency, error rate and circuit state"""
+    return {
+        "success": True,
+        "model_routes": model_router.get_route_table()
+    }
+
+@router.get("/admin/prompt-budgets")
+async def get_prompt_budgets():
+    """Prompt token budget per call type, average and max prompt size, and how often history was trimmed"""
+    return {
+        "success": True,
+        "prompt_budgets": prompt_budget_stats.get_metrics()
+    }
+
+@router.get("/admin/prompts")
+async def get_prompts():
+    """Loaded prompt sets with their current version and hot-reload counters"""
+    return {
+        "success": True,
+        "prompts": prompt_registry.get_metrics()
+    }
+
+@router.get("/admin/first-question-pool")
+async def get_first_question_pool():
+    """Pooled openers per (age band, gender, department, prompt version) with hit rate and refill counters"""
+    return {
+        "success": True,
+        "first_question_pool": first_question_pool.get_metrics()
+    }
+
+@router.get("/admin/assessment-prefetch")
+async def get_assessment_prefetch():
+    """Background assessments started on interview completion, and how often the endpoints found them ready"""
+    return {
+        "success": True,
+        "assessment_prefetch": assessment_prefetch.get_metrics()
+    }
+
+@router.get("/admin/diagnostics-jobs")
+async def get_diagnostics_jobs():
+    """Background diagnostics jobs, their duration and how long /api/prescreening/accept waited on them"""
+    return {
+        "success": True,
+        "diagnostics_jobs": diagnostics_jobs.get_metrics()
+    }
+
+@router.get("/admin/diagnostics-cache")
+async def get_diagnostics_cache():
+    """Cached diagnosis -> CSV matches with hit rate, evictions and the CSV version they belong to"""
+    return {
+        "success": True,
+        "diagnostics_cache": diagnostics_cache.get_metrics()
+    }
+
+@router.post("/admin/diagnostics-cache/clear")
+async def clear_diagnostics_cache():
+    """Drop every cached diagnosis match, in memory and on disk"""
+    diagnostics_cache.clear()
+    return {
+        "success": True,
+        "diagnostics_cache": diagnostics_cache.get_metrics()
+    }
+
+@router.get("/admin/diagnostics-index")
+async def get_diagnostics_index():
+    """Size of the pre-diagnostics retrieval index and how many candidate rows each request sent"""
+    return {
+        "success": True,
+        "diagnostics_index": diagnostics_service.get_retrieval_metrics()
+    }
+
+@router.get("/admin/diagnostics-fast-path")
+async def get_diagnostics_fast_path():
+    """How often diagnostics skipped the LLM and how often a sampled LLM check agreed with the local match"""
+    return {
+        "success": True,
+        "diagnostics_fast_path": diagnostics_service.get_fast_path_metrics()
+    }
+
+@router.get("/admin/llm-usage")
+async def get_llm_usage():
+    """Prompt, cached, output and thinking tokens, latency and cost per call type and prompt version"""
+    return {
+        "success": True,
+        "llm_usage": usage_tracker.get_metrics()
+    }
+
+@router.get("/admin/llm-usage/{session_id}")
+async def get_session_llm_usage(session_id: str):
+    """Token and cost totals for one session, as stored with its pre-screening record"""
+    return {
+        "success": True,
+        "llm_usage": usage_tracker.session_usage(session_id)
+    }
+
+@router.get("/admin/tts-cache")
+async def get_tts_cache():
+    """Cached ElevenLabs audio with hit ratio, bytes served from cache and ElevenLabs characters saved"""
+    return {
+        "success": True,
+        "tts_cache": tts_cache.get_metrics()
+    }
+
+@router.post("/admin/tts-cache/clear")
+async def clear_tts_cache():
+    """Drop every cached audio clip, in memory and on disk"""
+    tts_cache.clear()
+    return {
+        "success": True,
+        "tts_cache": tts_cache.get_metrics()
+    }
+
+@router.get("/admin/tts-latency")
+async def get_tts_latency():
+    """Time to first playable audio for ElevenLabs requests, full-buffer JSON versus streamed passthrough"""
+    return {
+        "success": True,
+        "tts_latency": tts_service.get_latency_metrics()
+    }
+
+@router.get("/admin/tts-pack")
+async def get_tts_pack():
+    """Prebuilt audio for the fixed phrases: pack version, completeness and how often it answered a request"""
+    return {
+        "success": True,
+        "tts_pack": audio_pack.get_metrics()
+    }
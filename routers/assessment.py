@@ -3,17 +3,19 @@ Medical assessment API endpoints
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from services.medical_expert_service import MedicalExpertService
+from services.assessment_prefetch import assessment_prefetch
+from services.diagnostics_jobs import diagnostics_jobs
 from services.session_service import get_session, update_session
 from services.export_service import export_service
 from services.prescreening_service import prescreening_service
 from datetime import datetime
-from routers.medical import interview_sessions
+from routers.medical import interview_sessions, final_assessment_job
 from models.assessment import AssessmentRequest, AssessmentResponse
+from core.streaming import sse_event
 
 router = APIRouter()
-medical_expert = MedicalExpertService()
 
 @router.post("/assessment/generate", response_model=AssessmentResponse)
 async def generate_medical_assessment(request: AssessmentRequest):
@@ -41,11 +43,9 @@ async def generate_medical_assessment(request: AssessmentRequest):
         raise HTTPException(status_code=400, detail="Patient information not found")
     
     try:
-        # Generate assessment using medical expert AI with state management
-        assessment_result = await medical_expert.generate_final_assessment(
-            patient=patient_info,
-            conversation_history=[qa.dict() for qa in interview_session.conversation_history],
-            previous_response_id=interview_session.current_response_id
+        # Usually already generated in the background when the interview completed; otherwise generated now
+        assessment_result = await assessment_prefetch.get(
+            "medical", request.session_id, final_assessment_job(interview_session, patient_info)
         )
         
         if not assessment_result or not assessment_result.get("assessment"):
@@ -56,6 +56,16 @@ async def generate_medical_assessment(request: AssessmentRequest):
         recommended_department = assessment_result.get("recommended_department", "General Medicine")
         reasoning_tokens = assessment_result.get("reasoning_tokens", 0)
         
+        # Diagnostics run as their own job; include them only if they have already finished
+        diagnostics = diagnostics_jobs.status(request.session_id)
+        if diagnostics["status"] == "not_found":
+            diagnostics = {
+                "status": "failed" if assessment_result.get("fallback") else "ready",
+                "pre_consultation_diagnostics": assessment_result.get("pre_consultation_diagnostics") or {},
+                "matched_diagnostic_condition": assessment_result.get("matched_diagnostic_condition"),
+                "diagnostics_explanation": assessment_result.get("diagnostics_explanation")
+            }
+        
         # Update interview session with assessment response ID
         interview_session.previous_response_id = interview_session.current_response_id
         interview_session.current_response_id = assessment_result.get("response_id")
@@ -85,8 +95,8 @@ async def generate_medical_assessment(request: AssessmentRequest):
                 },
                 doctor_recommendations=doctor_recs,
                 diagnostics_result={
-                    "matched_condition": assessment_result.get("matched_diagnostic_condition"),
-                    "diagnostics": assessment_result.get("pre_consultation_diagnostics", {})
+                    "matched_condition": diagnostics.get("matched_diagnostic_condition"),
+                    "diagnostics": diagnostics.get("pre_consultation_diagnostics", {})
                 }
             )
             export_service.print_assessment_json(export_data)
@@ -125,9 +135,10 @@ async def generate_medical_assessment(request: AssessmentRequest):
                     "recommended_doctors": doctor_recs.get("recommended_doctors", [])
                 },
                 diagnostics_result={
-                    "diagnostics": assessment_result.get("pre_consultation_diagnostics", {})
+                    # Merged in later by the diagnostics job, or by /api/prescreening/accept, if still pending
+                    "diagnostics": diagnostics.get("pre_consultation_diagnostics", {})
                 },
-                conversation_history=[qa.dict() for qa in interview_session.conversation_history],
+                conversation_history=interview_session.transcript.records,
                 visit_type=visit_type
             )
             
@@ -171,14 +182,51 @@ async def generate_medical_assessment(request: AssessmentRequest):
             recommended_doctor=assessment_result.get("recommended_doctor"),
             recommended_department=assessment_result.get("recommended_department"),
             doctor_comparison_analysis=assessment_result.get("doctor_comparison_analysis"),
-            pre_consultation_diagnostics=assessment_result.get("pre_consultation_diagnostics"),
-            matched_diagnostic_condition=assessment_result.get("matched_diagnostic_condition"),
-            diagnostics_explanation=assessment_result.get("diagnostics_explanation")
+            pre_consultation_diagnostics=diagnostics.get("pre_consultation_diagnostics"),
+            matched_diagnostic_condition=diagnostics.get("matched_diagnostic_condition"),
+            diagnostics_explanation=diagnostics.get("diagnostics_explanation"),
+            diagnostics_status=diagnostics["status"]
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Assessment generation failed: {str(e)}")
 
+@router.get("/assessment/{session_id}/diagnostics")
+async def get_assessment_diagnostics(session_id: str):
+    """Poll the pre-consultation diagnostics job started with the assessment"""
+    
+    diagnostics = diagnostics_jobs.status(session_id)
+    if diagnostics["status"] == "not_found":
+        raise HTTPException(status_code=404, detail="No diagnostics job for this session")
+    
+    return {
+        "success": True,
+        "session_id": session_id,
+        **diagnostics
+    }
+
+@router.get("/assessment/{session_id}/diagnostics/stream")
+async def stream_assessment_diagnostics(session_id: str):
+    """
+    Wait for the pre-consultation diagnostics job as Server-Sent Events.
+    
+    Events:
+        diagnostics - the same body as /assessment/{session_id}/diagnostics, once the job is ready or failed
+    """
+    
+    if diagnostics_jobs.status(session_id)["status"] == "not_found":
+        raise HTTPException(status_code=404, detail="No diagnostics job for this session")
+    
+    async def event_stream():
+        await diagnostics_jobs.wait(session_id)
+        yield sse_event("diagnostics", {"success": True, "session_id": session_id, **diagnostics_jobs.status(session_id)})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/assessment/{session_id}")
 async def get_assessment(session_id: str):
     """Get existing assessment for a session"""
@@ -7,6 +7,8 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from fastapi.responses import JSONResponse
 from services.luxand_face_recognition_service import LuxandFaceRecognitionService
 from models.patient import FaceRecognitionResult
+from core.config import settings
+from core.deadline import turn_budget
 import logging
 
 # Setup logging
@@ -36,7 +38,8 @@ async def recognize_patient(
             raise HTTPException(status_code=400, detail="File must be an image")
         
         # Perform face recognition and get patient details using Luxand
-        result = await luxand_service.recognize_and_get_patient_details(image)
+        with turn_budget("face_recognition", settings.face_recognition_budget_seconds):
+            result = await luxand_service.recognize_and_get_patient_details(image)
         
         if result["success"]:
             logger.info(f"✅ Patient recognized successfully via Luxand")
@@ -74,7 +77,8 @@ async def recognize_patient_luxand(
             raise HTTPException(status_code=400, detail="File must be an image")
         
         # Perform face recognition and get patient details using Luxand
-        result = await luxand_service.recognize_and_get_patient_details(image)
+        with turn_budget("face_recognition", settings.face_recognition_budget_seconds):
+            result = await luxand_service.recognize_and_get_patient_details(image)
         
         if result["success"]:
             logger.info(f"✅ Patient recognized successfully via Luxand")
@@ -113,7 +117,8 @@ async def add_patient_face_luxand(
             raise HTTPException(status_code=400, detail="File must be an image")
         
         # Add patient face to Luxand
-        result = await luxand_service.add_patient_face(onehat_patient_id, image, collections)
+        with turn_budget("face_enrollment", settings.face_recognition_budget_seconds):
+            result = await luxand_service.add_patient_face(onehat_patient_id, image, collections)
         
         if result["success"]:
             logger.info(f"✅ Patient face added to Luxand successfully")
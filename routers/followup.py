@@ -5,15 +5,23 @@ Handles follow-up interviews for returning patients (Option 1)
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
 import uuid
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from models.medical import (
     QuestionRequest, QuestionResponse, AnswerSubmission, AnswerResponse, FollowupAssessmentRequest, 
     InterviewSession, QuestionAnswer, InterviewStatus
 )
+from core.streaming import sse_event, MarkerHoldback
+from core.deadline import DeadlineExceeded, TurnBudget, budget_stage, turn_budget, use_budget
+from core.usage import usage_session
 from services.followup_service import followup_service
+from services.patient_phrases import (
+    FOLLOWUP_COMPLETE_MESSAGE, FOLLOWUP_FIRST_QUESTION_FALLBACK, FOLLOWUP_NEXT_QUESTION_FALLBACK
+)
+from services.assessment_prefetch import assessment_prefetch
 from services.session_service import sessions, get_session, update_session
 from services.supabase_service import supabase_service
 from services.prescreening_service import prescreening_service
@@ -64,30 +72,8 @@ async def start_followup_interview(request: QuestionRequest):
         logger.info(f"📊 [FOLLOWUP] Consultation data keys: {list(consultation_data.keys()) if consultation_data else 'None'}")
         
         # Extract previous medical record from raw_pradhi_response
-        previous_medical_record = "Previous consultation data available"
-        if consultation_data.get("raw_pradhi_response"):
-            try:
-                import json
-                pradhi_data = consultation_data["raw_pradhi_response"]
-                if isinstance(pradhi_data, str):
-                    pradhi_data = json.loads(pradhi_data)
-                
-                # Format previous medical record for follow-up service
-                previous_medical_record = f"""
-Previous Consultation Date: {consultation_data.get('consultation_date', 'N/A')}
-Doctor: {consultation_data.get('doctor_name', 'N/A')}
-Diagnosis: {pradhi_data.get('insights', {}).get('Diagnosis', ['N/A'])[0] if pradhi_data.get('insights', {}).get('Diagnosis') else 'N/A'}
-Prescription Data: {pradhi_data.get('prescription_data', [])}
-Investigation: {pradhi_data.get('investigation', [])}
-Next Steps: {pradhi_data.get('next_steps', [])}
-Associated Symptoms: {pradhi_data.get('associated_symptoms', [])}
-                """.strip()
-                
-                logger.info(f"📝 [FOLLOWUP] Formatted previous medical record")
-                
-            except Exception as e:
-                logger.error(f"❌ [FOLLOWUP] Error parsing previous medical record: {e}")
-                previous_medical_record = f"Previous consultation on {consultation_data.get('consultation_date', 'N/A')} with {consultation_data.get('doctor_name', 'N/A')}"
+        previous_medical_record = followup_service.format_previous_medical_record(consultation_data)
+        logger.info(f"📝 [FOLLOWUP] Formatted previous medical record")
         
         # Create interview session
         current_time = datetime.now().isoformat()
@@ -106,28 +92,34 @@ Associated Symptoms: {pradhi_data.get('associated_symptoms', [])}
         )
         
         followup_interview_sessions[request.session_id] = interview_session
+        # A restarted interview must not be served the previous interview's assessment
+        assessment_prefetch.discard_session("followup", request.session_id)
         logger.info(f"✅ [FOLLOWUP] Interview session created and stored")
         
         # Generate first follow-up question
+        reasoning_tokens = 0
         try:
-            first_question = followup_service.generate_followup_question(
-                patient_age=patient_info.get("age", 0),
-                patient_gender=patient_info.get("gender", ""),
-                doctor_department=selected_doctor_choice.get("doctor_specialty", "General Medicine"),
-                last_consultation_date=consultation_data.get("consultation_date", ""),
-                previous_medical_record=previous_medical_record,
-                question_number=1,
-                conversation_history=""
-            )
+            with turn_budget("followup_start"), usage_session(request.session_id) as usage:
+                first_question = await followup_service.generate_followup_question(
+                    patient_age=patient_info.get("age", 0),
+                    patient_gender=patient_info.get("gender", ""),
+                    doctor_department=selected_doctor_choice.get("doctor_specialty", "General Medicine"),
+                    last_consultation_date=consultation_data.get("consultation_date", ""),
+                    previous_medical_record=previous_medical_record,
+                    question_number=1,
+                    conversation_history=[]
+                )
+            reasoning_tokens = usage.totals["thinking_tokens"]
             
             logger.info(f"❓ [FOLLOWUP] Generated first question: {first_question[:100]}...")
             
         except Exception as e:
             logger.error(f"❌ [FOLLOWUP] Error generating first question: {e}")
-            first_question = "How are you feeling since your last visit?"
+            first_question = FOLLOWUP_FIRST_QUESTION_FALLBACK
         
         # Store the first question for next answer submission
         interview_session.last_question_asked = first_question
+        interview_session.total_reasoning_tokens = reasoning_tokens
         
         return QuestionResponse(
             success=True,
@@ -142,7 +134,7 @@ Associated Symptoms: {pradhi_data.get('associated_symptoms', [])}
             },
             interview_complete=False,
             response_id=None,
-            reasoning_tokens=0
+            reasoning_tokens=reasoning_tokens
         )
         logger.info(f"🩺 [FOLLOWUP] Doctor choice validation: {selected_doctor_choice}")
         
@@ -162,30 +154,8 @@ Associated Symptoms: {pradhi_data.get('associated_symptoms', [])}
         logger.info(f"📊 [FOLLOWUP] Consultation data keys: {list(consultation_data.keys()) if consultation_data else 'None'}")
         
         # Extract previous medical record from raw_pradhi_response
-        previous_medical_record = "Previous consultation data available"
-        if consultation_data.get("raw_pradhi_response"):
-            try:
-                import json
-                pradhi_data = consultation_data["raw_pradhi_response"]
-                if isinstance(pradhi_data, str):
-                    pradhi_data = json.loads(pradhi_data)
-                
-                # Format previous medical record for follow-up service
-                previous_medical_record = f"""
-Previous Consultation Date: {consultation_data.get('consultation_date', 'N/A')}
-Doctor: {consultation_data.get('doctor_name', 'N/A')}
-Diagnosis: {pradhi_data.get('insights', {}).get('Diagnosis', ['N/A'])[0] if pradhi_data.get('insights', {}).get('Diagnosis') else 'N/A'}
-Prescription Data: {pradhi_data.get('prescription_data', [])}
-Investigation: {pradhi_data.get('investigation', [])}
-Next Steps: {pradhi_data.get('next_steps', [])}
-Associated Symptoms: {pradhi_data.get('associated_symptoms', [])}
-                """.strip()
-                
-                logger.info(f"📝 [FOLLOWUP] Formatted previous medical record")
-                
-            except Exception as e:
-                logger.error(f"❌ [FOLLOWUP] Error parsing previous medical record: {e}")
-                previous_medical_record = f"Previous consultation on {consultation_data.get('consultation_date', 'N/A')} with {consultation_data.get('doctor_name', 'N/A')}"
+        previous_medical_record = followup_service.format_previous_medical_record(consultation_data)
+        logger.info(f"📝 [FOLLOWUP] Formatted previous medical record")
         
         # Create interview session
         current_time = datetime.now().isoformat()
@@ -204,25 +174,27 @@ Associated Symptoms: {pradhi_data.get('associated_symptoms', [])}
         )
         
         followup_interview_sessions[request.session_id] = interview_session
+        # A restarted interview must not be served the previous interview's assessment
+        assessment_prefetch.discard_session("followup", request.session_id)
         logger.info(f"✅ [FOLLOWUP] Interview session created and stored")
         
         # Generate first follow-up question
         try:
-            first_question = followup_service.generate_followup_question(
+            first_question = await followup_service.generate_followup_question(
                 patient_age=patient_info.get("age", 0),
                 patient_gender=patient_info.get("gender", ""),
                 doctor_department=selected_doctor_choice.get("doctor_specialty", "General Medicine"),
                 last_consultation_date=consultation_data.get("consultation_date", ""),
                 previous_medical_record=previous_medical_record,
                 question_number=1,
-                conversation_history=""
+                conversation_history=[]
             )
             
             logger.info(f"❓ [FOLLOWUP] Generated first question: {first_question[:100]}...")
             
         except Exception as e:
             logger.error(f"❌ [FOLLOWUP] Error generating first question: {e}")
-            first_question = "How are you feeling since your last visit?"
+            first_question = FOLLOWUP_FIRST_QUESTION_FALLBACK
         
         # Store the first question for next answer submission
         interview_session.last_question_asked = first_question
@@ -249,12 +221,8 @@ Associated Symptoms: {pradhi_data.get('associated_symptoms', [])}
         logger.error(f"❌ [FOLLOWUP] Error in start_followup_interview: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to start follow-up interview: {str(e)}")
 
-@router.post("/followup/submit-answer", response_model=AnswerResponse)
-async def submit_followup_answer(submission: AnswerSubmission):
-    """Submit patient answer and get next follow-up question"""
-    
-    logger.info(f"📝 [FOLLOWUP] Submit answer for session: {submission.session_id}")
-    logger.info(f"💬 [FOLLOWUP] Answer: {submission.answer}")
+async def _load_active_followup(submission: AnswerSubmission):
+    """Look up the active follow-up interview and main session for an answer submission"""
     
     # Get interview session
     if submission.session_id not in followup_interview_sessions:
@@ -269,25 +237,53 @@ async def submit_followup_answer(submission: AnswerSubmission):
         raise HTTPException(status_code=400, detail="Follow-up interview session is not active")
     
     # Get patient and consultation info from main session
-    session = await get_session(submission.session_id)
+    async with budget_stage("session_lookup"):
+        session = await get_session(submission.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    patient_info = session.get("patient_info")
-    consultation_data = session.get("consultation_data")
-    selected_doctor_choice = session.get("selected_doctor_choice", {})
+    return interview_session, session
+
+def _followup_progress(interview_session: InterviewSession, completion_percent: float) -> dict:
+    return {
+        "current_question": interview_session.question_number,
+        "max_questions": 6,
+        "unknown_count": interview_session.unknown_count,
+        "max_unknowns": 3,
+        "completion_percent": completion_percent
+    }
+
+def _followup_completion_response(interview_session: InterviewSession) -> AnswerResponse:
+    interview_session.status = InterviewStatus.COMPLETED
+    interview_session.updated_at = datetime.now().isoformat()
     
+    return AnswerResponse(
+        success=True,
+        message=FOLLOWUP_COMPLETE_MESSAGE,
+        next_question=None,
+        question_number=interview_session.question_number,
+        progress=_followup_progress(interview_session, 100),
+        interview_complete=True,
+        response_id=None,
+        reasoning_tokens=0
+    )
+
+def _record_followup_answer(interview_session: InterviewSession, answer: str) -> Optional[AnswerResponse]:
+    """
+    Store the answer and apply the follow-up stopping rules.
+    Returns the completion response if the interview is over, otherwise advances to the next question number.
+    """
     # Store the Q&A pair
-    current_question = interview_session.last_question_asked or "How are you feeling since your last visit?"
+    current_question = interview_session.last_question_asked or FOLLOWUP_FIRST_QUESTION_FALLBACK
     qa_pair = QuestionAnswer(
         question=current_question,
-        answer=submission.answer.strip(),
+        answer=answer.strip(),
         timestamp=datetime.now().isoformat()
     )
-    interview_session.conversation_history.append(qa_pair)
+    interview_session.add_exchange(qa_pair)
     
     # Check for "I don't know" responses
-    if "don't know" in submission.answer.lower() or "not sure" in submission.answer.lower():
+    if "don't know" in answer.lower() or "not sure" in answer.lower():
         interview_session.unknown_count += 1
         logger.info(f"🤷 [FOLLOWUP] Unknown response detected. Count: {interview_session.unknown_count}")
     
@@ -307,37 +303,69 @@ async def submit_followup_answer(submission: AnswerSubmission):
     
     if max_questions_reached or too_many_unknowns or early_completion_ready:
         logger.info(f"✅ [FOLLOWUP] Interview complete - generating assessment")
-        interview_session.status = InterviewStatus.COMPLETED
-        interview_session.updated_at = datetime.now().isoformat()
-        
-        return AnswerResponse(
-            success=True,
-            message="Follow-up interview completed. Ready for assessment.",
-            next_question=None,
-            question_number=interview_session.question_number,
-            progress={
-                "current_question": interview_session.question_number,
-                "max_questions": 6,
-                "unknown_count": interview_session.unknown_count,
-                "max_unknowns": 3,
-                "completion_percent": 100
-            },
-            interview_complete=True,
-            response_id=None,
-            reasoning_tokens=0
-        )
+        return _followup_completion_response(interview_session)
     
     # Generate next question
     interview_session.question_number += 1
+    return None
+
+def _followup_question_kwargs(interview_session: InterviewSession, session: dict) -> dict:
+    """Arguments for FollowupService question generation for the current turn"""
+    # A follow-up can be started without previous consultation data
+    patient_info = session.get("patient_info") or {}
+    consultation_data = session.get("consultation_data") or {}
+    selected_doctor_choice = session.get("selected_doctor_choice") or {}
+    
+    return {
+        "patient_age": patient_info.get("age", 0),
+        "patient_gender": patient_info.get("gender", ""),
+        "doctor_department": selected_doctor_choice.get("doctor_specialty", "General Medicine"),
+        "last_consultation_date": consultation_data.get("consultation_date", ""),
+        # Extract previous medical record again for context
+        "previous_medical_record": followup_service.format_previous_medical_record(consultation_data),
+        "question_number": interview_session.question_number,
+        # Rendered once per answer on the session, not rebuilt every turn
+        "conversation_history": interview_session.transcript
+    }
+
+def _finish_followup_turn(interview_session: InterviewSession, next_question: str,
+                          reasoning_tokens: int = 0) -> AnswerResponse:
+    """Apply the generated question to the session and build the turn response"""
+    interview_session.total_reasoning_tokens += reasoning_tokens
+    
+    # The AI can end the interview early
+    if "INTERVIEW_COMPLETE" in next_question:
+        logger.info(f"✅ [FOLLOWUP] AI indicates interview complete")
+        return _followup_completion_response(interview_session)
+    
+    # Store the question for next submission
+    interview_session.last_question_asked = next_question
+    interview_session.updated_at = datetime.now().isoformat()
+    
+    completion_percent = min((interview_session.question_number / 6) * 100, 100)
+    
+    logger.info(f"📊 [FOLLOWUP] Progress: {completion_percent}%")
+    
+    return AnswerResponse(
+        success=True,
+        message="Answer recorded successfully",
+        next_question=next_question,
+        question_number=interview_session.question_number,
+        progress=_followup_progress(interview_session, completion_percent),
+        interview_complete=False,
+        response_id=None,
+        reasoning_tokens=reasoning_tokens
+    )
+
+def _followup_assessment_job(interview_session: InterviewSession, session: dict):
+    """Factory for the assessment of a completed follow-up interview, run by the assessment prefetcher"""
+    patient_info = session.get("patient_info")
+    consultation_data = session.get("consultation_data")
     
-    # Build conversation history for context
-    conversation_history = "\n".join([
-        f"Q{i+1}: {qa.question}\nA{i+1}: {qa.answer}"
-        for i, qa in enumerate(interview_session.conversation_history)
-    ])
+    # Extract previous visit summary
+    previous_visit_summary = "Previous consultation data available"
+    chief_complaint = "Follow-up visit"
     
-    # Extract previous medical record again for context
-    previous_medical_record = "Previous consultation data available"
     if consultation_data and consultation_data.get("raw_pradhi_response"):
         try:
             import json
@@ -345,59 +373,146 @@ async def submit_followup_answer(submission: AnswerSubmission):
             if isinstance(pradhi_data, str):
                 pradhi_data = json.loads(pradhi_data)
             
-            previous_medical_record = f"""
-Previous Consultation Date: {consultation_data.get('consultation_date', 'N/A')}
+            diagnosis = pradhi_data.get('insights', {}).get('Diagnosis', ['N/A'])
+            chief_complaint = diagnosis[0] if diagnosis else "Follow-up visit"
+            
+            previous_visit_summary = f"""
+Previous Visit Date: {consultation_data.get('consultation_date', 'N/A')}
 Doctor: {consultation_data.get('doctor_name', 'N/A')}
-Diagnosis: {pradhi_data.get('insights', {}).get('Diagnosis', ['N/A'])[0] if pradhi_data.get('insights', {}).get('Diagnosis') else 'N/A'}
-Prescription Data: {pradhi_data.get('prescription_data', [])}
-Investigation: {pradhi_data.get('investigation', [])}
-Next Steps: {pradhi_data.get('next_steps', [])}
-Associated Symptoms: {pradhi_data.get('associated_symptoms', [])}
+Diagnosis: {chief_complaint}
+Treatment Plan: {pradhi_data.get('insights', {}).get('Treatment Plan', [])}
+Prescription: {pradhi_data.get('insights', {}).get('Prescription Data', [])}
             """.strip()
             
         except Exception as e:
-            logger.error(f"❌ [FOLLOWUP] Error parsing medical record for next question: {e}")
+            logger.error(f"❌ [FOLLOWUP] Error parsing previous visit data: {e}")
     
-    try:
-        next_question = followup_service.generate_followup_question(
-            patient_age=patient_info.get("age", 0),
-            patient_gender=patient_info.get("gender", ""),
-            doctor_department=selected_doctor_choice.get("doctor_specialty", "General Medicine"),
-            last_consultation_date=consultation_data.get("consultation_date", ""),
-            previous_medical_record=previous_medical_record,
-            question_number=interview_session.question_number,
-            conversation_history=conversation_history
-        )
+    async def job():
+        with usage_session(interview_session.session_id):
+            return await followup_service.generate_followup_assessment(
+                patient_age=patient_info.get("age", 0),
+                patient_gender=patient_info.get("gender", ""),
+                chief_complaint=chief_complaint,
+                previous_visit_summary=previous_visit_summary,
+                follow_up_interview=interview_session.transcript
+            )
+    
+    return job
+
+def _prefetch_followup_assessment(interview_session: InterviewSession, session: dict):
+    """Start the follow-up assessment as soon as the interview completes, before the client asks for it"""
+    if session.get("patient_info"):
+        assessment_prefetch.schedule("followup", interview_session.session_id,
+                                     _followup_assessment_job(interview_session, session))
+
+@router.post("/followup/submit-answer", response_model=AnswerResponse)
+async def submit_followup_answer(submission: AnswerSubmission):
+    """Submit patient answer and get next follow-up question"""
+    
+    logger.info(f"📝 [FOLLOWUP] Submit answer for session: {submission.session_id}")
+    logger.info(f"💬 [FOLLOWUP] Answer: {submission.answer}")
+    
+    with turn_budget("followup_answer"), usage_session(submission.session_id) as usage:
+        interview_session, session = await _load_active_followup(submission)
         
-        logger.info(f"❓ [FOLLOWUP] Generated question {interview_session.question_number}: {next_question[:100]}...")
+        completion_response = _record_followup_answer(interview_session, submission.answer)
+        if completion_response:
+            _prefetch_followup_assessment(interview_session, session)
+            return completion_response
         
-    except Exception as e:
-        logger.error(f"❌ [FOLLOWUP] Error generating next question: {e}")
-        next_question = "Can you tell me more about how you've been feeling?"
+        try:
+            # Falls back to a fixed question itself if the turn budget runs out
+            next_question = await followup_service.generate_followup_question(
+                **_followup_question_kwargs(interview_session, session)
+            )
+            
+            logger.info(f"❓ [FOLLOWUP] Generated question {interview_session.question_number}: {next_question[:100]}...")
+            
+        except Exception as e:
+            logger.error(f"❌ [FOLLOWUP] Error generating next question: {e}")
+            next_question = FOLLOWUP_NEXT_QUESTION_FALLBACK
+        
+        response = _finish_followup_turn(interview_session, next_question, usage.totals["thinking_tokens"])
+        if response.interview_complete:
+            _prefetch_followup_assessment(interview_session, session)
+        return response
+
+@router.post("/followup/submit-answer/stream")
+async def submit_followup_answer_stream(submission: AnswerSubmission):
+    """
+    Submit patient answer and stream the next follow-up question as Server-Sent Events.
     
-    # Store the question for next submission
-    interview_session.last_question_asked = next_question
-    interview_session.updated_at = datetime.now().isoformat()
+    Events:
+        token - {"text": "..."} partial question text as it is generated
+        done  - the same AnswerResponse body /followup/submit-answer returns
+    """
     
-    completion_percent = min((interview_session.question_number / 6) * 100, 100)
+    logger.info(f"📝 [FOLLOWUP] Streaming submit answer for session: {submission.session_id}")
     
-    logger.info(f"📊 [FOLLOWUP] Progress: {completion_percent}%")
+    # The budget starts now and is carried into the response generator
+    budget = TurnBudget("followup_answer_stream")
+    with use_budget(budget):
+        interview_session, session = await _load_active_followup(submission)
+    # The answer is recorded before the stream starts; undone if the patient never gets the done event
+    checkpoint = interview_session.checkpoint()
+    completion_response = _record_followup_answer(interview_session, submission.answer)
     
-    return AnswerResponse(
-        success=True,
-        message="Answer recorded successfully",
-        next_question=next_question,
-        question_number=interview_session.question_number,
-        progress={
-            "current_question": interview_session.question_number,
-            "max_questions": 6,
-            "unknown_count": interview_session.unknown_count,
-            "max_unknowns": 3,
-            "completion_percent": completion_percent
-        },
-        interview_complete=False,
-        response_id=None,
-        reasoning_tokens=0
+    async def event_stream():
+        delivered = False
+        events = turn_events()
+        try:
+            async for event in events:
+                yield event
+            delivered = True
+        finally:
+            await events.aclose()
+            if not delivered:
+                logger.warning(f"⚠️ [FOLLOWUP] Stream for session {submission.session_id} ended before done, rolling the turn back")
+                budget.finish()
+                interview_session.rollback(checkpoint)
+        if interview_session.status == InterviewStatus.COMPLETED:
+            _prefetch_followup_assessment(interview_session, session)
+    
+    async def turn_events():
+        if completion_response:
+            budget.finish()
+            yield sse_event("done", completion_response.model_dump())
+            return
+        
+        holdback = MarkerHoldback(["INTERVIEW_COMPLETE"])
+        usage = None
+        try:
+            question_kwargs = _followup_question_kwargs(interview_session, session)
+            with use_budget(budget), usage_session(submission.session_id) as usage:
+                async for delta in followup_service.stream_followup_question(**question_kwargs):
+                    released = holdback.feed(delta)
+                    if released:
+                        yield sse_event("token", {"text": released})
+            
+            next_question = holdback.text.strip()
+            if not next_question:
+                next_question = followup_service.get_fallback_question(interview_session.question_number)
+            
+            logger.info(f"❓ [FOLLOWUP] Streamed question {interview_session.question_number}: {next_question[:100]}...")
+            
+        except DeadlineExceeded as e:
+            logger.warning(f"⏱️ [FOLLOWUP] {e}, using fallback question")
+            next_question = followup_service.get_fallback_question(
+                interview_session.question_number, interview_session.transcript
+            )
+        except Exception as e:
+            logger.error(f"❌ [FOLLOWUP] Error streaming next question: {e}")
+            next_question = FOLLOWUP_NEXT_QUESTION_FALLBACK
+        finally:
+            budget.finish()
+        
+        response = _finish_followup_turn(interview_session, next_question, usage.totals["thinking_tokens"] if usage else 0)
+        yield sse_event("done", response.model_dump())
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 @router.get("/followup/interview/{session_id}")
@@ -464,46 +579,11 @@ async def generate_followup_assessment(request: FollowupAssessmentRequest):
             logger.error(f"❌ [FOLLOWUP] Patient ID not found in session data")
             raise HTTPException(status_code=400, detail="Patient ID not found in session data")
         
-        # Build interview responses
-        interview_responses = "\n".join([
-            f"Q{i+1}: {qa.question}\nA{i+1}: {qa.answer}"
-            for i, qa in enumerate(interview_session.conversation_history)
-        ])
-        
-        # Extract previous visit summary
-        previous_visit_summary = "Previous consultation data available"
-        chief_complaint = "Follow-up visit"
-        
-        if consultation_data and consultation_data.get("raw_pradhi_response"):
-            try:
-                import json
-                pradhi_data = consultation_data["raw_pradhi_response"]
-                if isinstance(pradhi_data, str):
-                    pradhi_data = json.loads(pradhi_data)
-                
-                diagnosis = pradhi_data.get('insights', {}).get('Diagnosis', ['N/A'])
-                chief_complaint = diagnosis[0] if diagnosis else "Follow-up visit"
-                
-                previous_visit_summary = f"""
-Previous Visit Date: {consultation_data.get('consultation_date', 'N/A')}
-Doctor: {consultation_data.get('doctor_name', 'N/A')}
-Diagnosis: {chief_complaint}
-Treatment Plan: {pradhi_data.get('insights', {}).get('Treatment Plan', [])}
-Prescription: {pradhi_data.get('insights', {}).get('Prescription Data', [])}
-                """.strip()
-                
-            except Exception as e:
-                logger.error(f"❌ [FOLLOWUP] Error parsing previous visit data: {e}")
-        
         logger.info(f"📝 [FOLLOWUP] Generating assessment with followup service")
         
-        # Generate assessment using followup service
-        assessment_result = followup_service.generate_followup_assessment(
-            patient_age=patient_info.get("age", 0),
-            patient_gender=patient_info.get("gender", ""),
-            chief_complaint=chief_complaint,
-            previous_visit_summary=previous_visit_summary,
-            follow_up_interview=interview_responses
+        # Usually already generated in the background when the interview completed; otherwise generated now
+        assessment_result = await assessment_prefetch.get(
+            "followup", request.session_id, _followup_assessment_job(interview_session, session)
         )
         
         logger.info(f"✅ [FOLLOWUP] Assessment generated successfully")
@@ -518,7 +598,7 @@ Prescription: {pradhi_data.get('insights', {}).get('Prescription Data', [])}
                 },
                 assessment_result=assessment_result,
                 diagnostics_result={"diagnostics": {}},  # Follow-up may not have diagnostics
-                conversation_history=[qa.__dict__ for qa in interview_session.conversation_history],
+                conversation_history=interview_session.transcript.records,
                 visit_type="follow-up"
             )
             
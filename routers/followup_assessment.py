@@ -94,7 +94,7 @@ Investigation: {len(pradhi_data.get('investigation', []))} tests ordered
         logger.info(f"📊 [FOLLOWUP_ASSESSMENT] Generating assessment with followup service")
         
         # Generate follow-up assessment
-        assessment_result = followup_service.generate_followup_assessment(
+        assessment_result = await followup_service.generate_followup_assessment(
             patient_age=patient_info.get("age", 0),
             patient_gender=patient_info.get("gender", ""),
             chief_complaint=chief_complaint,
@@ -2,7 +2,9 @@
 Medical interview API endpoints
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Header
+from fastapi.responses import Response, StreamingResponse
+import re
 import uuid
 from datetime import datetime
 from typing import Dict, List, Optional
@@ -11,9 +13,21 @@ from models.medical import (
     QuestionRequest, QuestionResponse, AnswerSubmission, 
     AnswerResponse, InterviewSession, QuestionAnswer, InterviewStatus
 )
+from core.streaming import sse_event, MarkerHoldback
+from core.byte_range import RangeNotSatisfiable, etag_matches, parse_byte_range
+from core.deadline import DeadlineExceeded, TurnBudget, budget_stage, turn_budget, use_budget
+from core.usage import usage_session
 from services.medical_expert_service import MedicalExpertService
+from services.first_question_pool import first_question_pool
+from services.assessment_prefetch import assessment_prefetch
+from services.diagnostics_jobs import diagnostics_jobs
 from services.session_service import sessions, get_session
-from services.tts_service import tts_service
+from services.patient_phrases import (
+    ASSESSMENT_READY_MESSAGE, FIRST_QUESTION_FALLBACK, INTERVIEW_COMPLETE_MESSAGE, NEXT_QUESTION_FALLBACK
+)
+from services.audio_pack import audio_pack
+from services.tts_cache import tts_cache
+from services.tts_service import AUDIO_MEDIA_TYPES, QUESTION_TTS_VOICE_SETTINGS, tts_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -72,27 +86,37 @@ async def start_medical_interview(request: QuestionRequest):
             raise
         
         interview_sessions[request.session_id] = interview_session
+        # A restarted interview must not be served the previous interview's assessment
+        assessment_prefetch.discard_session("medical", request.session_id)
+        diagnostics_jobs.discard(request.session_id)
         print("Interview session stored")
         
         # Generate first question with error handling
         if not medical_expert:
             print("Medical expert not initialized, using fallback")
-            first_question = "What is your main health concern or symptom that brought you here today?"
+            first_question = FIRST_QUESTION_FALLBACK
             response_id = None
             reasoning_tokens = 0
         else:
             try:
-                question_result = await medical_expert.generate_next_question(
-                    patient=patient_info,
-                    conversation_history=[],
-                    question_number=1,
-                    unknown_count=0,
-                    previous_response_id=None
-                )
+                # The opener only depends on demographics, so it usually comes from the pregenerated pool
+                pooled_question = first_question_pool.take(patient_info)
+                if pooled_question:
+                    print(f"[FIRST_QUESTION_POOL] Serving pooled opener")
+                    question_result = {"question": pooled_question, "response_id": None, "reasoning_tokens": 0}
+                else:
+                    with turn_budget("medical_start"), usage_session(request.session_id):
+                        question_result = await medical_expert.generate_next_question(
+                            patient=patient_info,
+                            conversation_history=[],
+                            question_number=1,
+                            unknown_count=0,
+                            previous_response_id=None
+                        )
                 
                 # Handle both dict and string returns for backwards compatibility
                 if isinstance(question_result, dict):
-                    first_question = question_result.get("question", "What is your main health concern or symptom that brought you here today?")
+                    first_question = question_result.get("question", FIRST_QUESTION_FALLBACK)
                     response_id = question_result.get("response_id")
                     reasoning_tokens = question_result.get("reasoning_tokens", 0)
                 else:
@@ -112,7 +136,7 @@ async def start_medical_interview(request: QuestionRequest):
                 import traceback
                 traceback.print_exc()
                 # Use fallback question
-                first_question = "What is your main health concern or symptom that brought you here today?"
+                first_question = FIRST_QUESTION_FALLBACK
                 response_id = None
                 reasoning_tokens = 0
         
@@ -138,12 +162,8 @@ async def start_medical_interview(request: QuestionRequest):
         print(f"Error in start_medical_interview: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to start interview: {str(e)}")
 
-@router.post("/medical/submit-answer", response_model=AnswerResponse)
-async def submit_patient_answer(submission: AnswerSubmission):
-    """Submit patient answer and get next question"""
-    
-    print(f"[DEBUG] Submit answer called with session_id: {submission.session_id}")
-    print(f"[DEBUG] Answer: {submission.answer}")
+async def _load_active_interview(submission: AnswerSubmission):
+    """Look up the active interview session and patient info for an answer submission"""
     
     # Get interview session
     if submission.session_id not in interview_sessions:
@@ -159,12 +179,27 @@ async def submit_patient_answer(submission: AnswerSubmission):
         raise HTTPException(status_code=400, detail="Interview session is not active")
     
     # Get patient info from main session
-    session = await get_session(submission.session_id)
+    async with budget_stage("session_lookup"):
+        session = await get_session(submission.session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    patient_info = session.get("patient_info")
-    
+    return interview_session, session.get("patient_info")
+
+def _progress(interview_session: InterviewSession, completion_percent: float) -> dict:
+    return {
+        "current_question": interview_session.question_number,
+        "max_questions": interview_session.max_questions,
+        "unknown_count": interview_session.unknown_count,
+        "max_unknowns": interview_session.max_unknowns,
+        "completion_percent": completion_percent
+    }
+
+def _record_answer(interview_session: InterviewSession, answer: str) -> Optional[AnswerResponse]:
+    """
+    Store the answer against the last question asked and apply the stopping rules.
+    Returns the completion response if the interview is over, otherwise advances to the next question number.
+    """
     # Store the Q&A pair using the last question asked by AI
     if interview_session.last_question_asked:
         current_question = interview_session.last_question_asked
@@ -176,13 +211,13 @@ async def submit_patient_answer(submission: AnswerSubmission):
     # Store the Q&A pair
     qa_pair = QuestionAnswer(
         question=current_question,
-        answer=submission.answer.strip(),
+        answer=answer.strip(),
         timestamp=datetime.now().isoformat()
     )
-    interview_session.conversation_history.append(qa_pair)
+    interview_session.add_exchange(qa_pair)
     
     # Check for "I don't know" responses
-    if "don't know" in submission.answer.lower() or "not sure" in submission.answer.lower():
+    if "don't know" in answer.lower() or "not sure" in answer.lower():
         interview_session.unknown_count += 1
     
     # Check stopping conditions
@@ -199,16 +234,10 @@ async def submit_patient_answer(submission: AnswerSubmission):
         
         return AnswerResponse(
             success=True,
-            message="Interview completed. Ready for assessment.",
+            message=INTERVIEW_COMPLETE_MESSAGE,
             next_question=None,
             question_number=interview_session.question_number,
-            progress={
-                "current_question": interview_session.question_number,
-                "max_questions": interview_session.max_questions,
-                "unknown_count": interview_session.unknown_count,
-                "max_unknowns": interview_session.max_unknowns,
-                "completion_percent": 100
-            },
+            progress=_progress(interview_session, 100),
             interview_complete=True,
             response_id=None,
             reasoning_tokens=0
@@ -219,41 +248,41 @@ async def submit_patient_answer(submission: AnswerSubmission):
     
     # Update previous response ID for conversation continuity
     interview_session.previous_response_id = interview_session.current_response_id
+    return None
+
+def final_assessment_job(interview_session: InterviewSession, patient_info: dict):
+    """Factory for the final assessment of a completed interview, run by the assessment prefetcher"""
+    transcript = interview_session.transcript
+    previous_response_id = interview_session.current_response_id
+    
+    async def job():
+        # Returned as soon as diagnosis and department are known; diagnostics follow as their own job
+        with usage_session(interview_session.session_id):
+            result = await medical_expert.generate_final_assessment(
+                patient=patient_info,
+                conversation_history=transcript,
+                previous_response_id=previous_response_id,
+                include_diagnostics=False
+            )
+        if result and not result.get("fallback"):
+            diagnostics_jobs.start(
+                interview_session.session_id,
+                possible_diagnosis=result["assessment"].possible_diagnosis,
+                investigative_history=result["assessment"].investigative_history
+            )
+        return result
     
-    try:
-        question_result = await medical_expert.generate_next_question(
-            patient=patient_info,
-            conversation_history=[qa.dict() for qa in interview_session.conversation_history],
-            question_number=interview_session.question_number,
-            unknown_count=interview_session.unknown_count,
-            previous_response_id=interview_session.previous_response_id
-        )
-        
-        # Handle both dict and string returns for backwards compatibility
-        if isinstance(question_result, dict):
-            next_question = question_result.get("question", "Can you tell me more about your symptoms?")
-            response_id = question_result.get("response_id")
-            reasoning_tokens = question_result.get("reasoning_tokens", 0)
-        else:
-            # Fallback for string return
-            next_question = str(question_result)
-            response_id = None
-            reasoning_tokens = 0
-        
-        # Update interview session state
-        interview_session.current_response_id = response_id
-        interview_session.total_reasoning_tokens += reasoning_tokens
-        # Store the question we just asked for the next answer submission
-        interview_session.last_question_asked = next_question
-        
-    except Exception as e:
-        print(f"Error generating next question: {e}")
-        import traceback
-        traceback.print_exc()
-        # Use fallback question
-        next_question = "Can you tell me more about your symptoms?"
-        response_id = None
-        reasoning_tokens = 0
+    return job
+
+def _prefetch_assessment(interview_session: InterviewSession, patient_info: dict):
+    """Start the final assessment as soon as the interview completes, before the client asks for it"""
+    if medical_expert and patient_info:
+        assessment_prefetch.schedule("medical", interview_session.session_id,
+                                     final_assessment_job(interview_session, patient_info))
+
+def _finish_turn(interview_session: InterviewSession, next_question: str,
+                 response_id: Optional[str], reasoning_tokens: int) -> AnswerResponse:
+    """Apply the generated question to the session and build the turn response"""
     
     # Check if AI thinks assessment is ready
     if "ASSESSMENT_READY" in next_question:
@@ -263,21 +292,17 @@ async def submit_patient_answer(submission: AnswerSubmission):
         
         return AnswerResponse(
             success=True,
-            message="Medical expert has sufficient information for assessment.",
+            message=ASSESSMENT_READY_MESSAGE,
             next_question=None,
             question_number=interview_session.question_number,
-            progress={
-                "current_question": interview_session.question_number,
-                "max_questions": interview_session.max_questions,
-                "unknown_count": interview_session.unknown_count,
-                "max_unknowns": interview_session.max_unknowns,
-                "completion_percent": 100
-            },
+            progress=_progress(interview_session, 100),
             interview_complete=True,
             response_id=response_id,
             reasoning_tokens=reasoning_tokens
         )
     
+    # Store the question we just asked for the next answer submission
+    interview_session.last_question_asked = next_question
     interview_session.updated_at = datetime.now().isoformat()
     
     completion_percent = min((interview_session.question_number / interview_session.max_questions) * 100, 100)
@@ -286,26 +311,160 @@ async def submit_patient_answer(submission: AnswerSubmission):
     print(f"[DEBUG] Response ID: {response_id}")
     print(f"[DEBUG] Completion percent: {completion_percent}")
     
-    response = AnswerResponse(
+    return AnswerResponse(
         success=True,
         message="Answer recorded successfully",
         next_question=next_question,
         question_number=interview_session.question_number,
-        progress={
-            "current_question": interview_session.question_number,
-            "max_questions": interview_session.max_questions,
-            "unknown_count": interview_session.unknown_count,
-            "max_unknowns": interview_session.max_unknowns,
-            "completion_percent": completion_percent
-        },
+        progress=_progress(interview_session, completion_percent),
         interview_complete=False,
         response_id=response_id,
         reasoning_tokens=reasoning_tokens
     )
+
+@router.post("/medical/submit-answer", response_model=AnswerResponse)
+async def submit_patient_answer(submission: AnswerSubmission):
+    """Submit patient answer and get next question"""
+    
+    print(f"[DEBUG] Submit answer called with session_id: {submission.session_id}")
+    print(f"[DEBUG] Answer: {submission.answer}")
     
-    print(f"[DEBUG] Final response: {response.dict()}")
+    with turn_budget("medical_answer"), usage_session(submission.session_id):
+        interview_session, patient_info = await _load_active_interview(submission)
+        
+        completion_response = _record_answer(interview_session, submission.answer)
+        if completion_response:
+            _prefetch_assessment(interview_session, patient_info)
+            return completion_response
+        
+        try:
+            question_result = await medical_expert.generate_next_question(
+                patient=patient_info,
+                conversation_history=interview_session.transcript,
+                question_number=interview_session.question_number,
+                unknown_count=interview_session.unknown_count,
+                previous_response_id=interview_session.previous_response_id
+            )
+            
+            # Handle both dict and string returns for backwards compatibility
+            if isinstance(question_result, dict):
+                next_question = question_result.get("question", NEXT_QUESTION_FALLBACK)
+                response_id = question_result.get("response_id")
+                reasoning_tokens = question_result.get("reasoning_tokens", 0)
+            else:
+                # Fallback for string return
+                next_question = str(question_result)
+                response_id = None
+                reasoning_tokens = 0
+            
+            # Update interview session state
+            interview_session.current_response_id = response_id
+            interview_session.total_reasoning_tokens += reasoning_tokens
+            
+        except DeadlineExceeded as e:
+            print(f"[DEADLINE] {e}, using fallback question")
+            next_question = NEXT_QUESTION_FALLBACK
+            response_id = None
+            reasoning_tokens = 0
+        except Exception as e:
+            print(f"Error generating next question: {e}")
+            import traceback
+            traceback.print_exc()
+            # Use fallback question
+            next_question = NEXT_QUESTION_FALLBACK
+            response_id = None
+            reasoning_tokens = 0
+        
+        response = _finish_turn(interview_session, next_question, response_id, reasoning_tokens)
+        if response.interview_complete:
+            _prefetch_assessment(interview_session, patient_info)
+    
+    print(f"[DEBUG] Final response: {response.model_dump()}")
     return response
 
+@router.post("/medical/submit-answer/stream")
+async def submit_patient_answer_stream(submission: AnswerSubmission):
+    """
+    Submit patient answer and stream the next question as Server-Sent Events.
+    
+    Events:
+        token - {"text": "..."} partial question text as it is generated
+        done  - the same AnswerResponse body /medical/submit-answer returns
+    """
+    
+    print(f"[DEBUG] Streaming submit answer called with session_id: {submission.session_id}")
+    
+    # The budget starts now and is carried into the response generator
+    budget = TurnBudget("medical_answer_stream")
+    with use_budget(budget):
+        interview_session, patient_info = await _load_active_interview(submission)
+    # The answer is recorded before the stream starts; undone if the patient never gets the done event
+    checkpoint = interview_session.checkpoint()
+    completion_response = _record_answer(interview_session, submission.answer)
+    
+    async def event_stream():
+        delivered = False
+        events = turn_events()
+        try:
+            async for event in events:
+                yield event
+            delivered = True
+        finally:
+            await events.aclose()
+            if not delivered:
+                print(f"[DEBUG] Stream for session {submission.session_id} ended before done, rolling the turn back")
+                budget.finish()
+                interview_session.rollback(checkpoint)
+        if interview_session.status == InterviewStatus.COMPLETED:
+            _prefetch_assessment(interview_session, patient_info)
+    
+    async def turn_events():
+        if completion_response:
+            budget.finish()
+            yield sse_event("done", completion_response.model_dump())
+            return
+        
+        holdback = MarkerHoldback(["ASSESSMENT_READY"])
+        usage = None
+        try:
+            with use_budget(budget), usage_session(submission.session_id) as usage:
+                async for delta in medical_expert.stream_next_question(
+                    patient=patient_info,
+                    conversation_history=interview_session.transcript,
+                    question_number=interview_session.question_number,
+                    unknown_count=interview_session.unknown_count
+                ):
+                    released = holdback.feed(delta)
+                    if released:
+                        yield sse_event("token", {"text": released})
+            
+            next_question = holdback.text.strip()
+            if not next_question:
+                raise Exception("Empty response from Gemini API")
+        except DeadlineExceeded as e:
+            print(f"[DEADLINE] {e}, using fallback question")
+            next_question = NEXT_QUESTION_FALLBACK
+        except Exception as e:
+            print(f"Error streaming next question: {e}")
+            import traceback
+            traceback.print_exc()
+            # Use fallback question
+            next_question = NEXT_QUESTION_FALLBACK
+        finally:
+            budget.finish()
+        
+        interview_session.current_response_id = None
+        reasoning_tokens = usage.totals["thinking_tokens"] if usage else 0
+        interview_session.total_reasoning_tokens += reasoning_tokens
+        response = _finish_turn(interview_session, next_question, None, reasoning_tokens)
+        yield sse_event("done", response.model_dump())
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/medical/interview/{session_id}")
 async def get_interview_status(session_id: str):
     """Get current interview session status"""
@@ -492,14 +651,7 @@ async def convert_text_to_speech(request: dict):
         
         # Use Tamil voice for better performance with Tamil text
         voice_id = tts_service.get_voice_for_language("ta")
-        
-        # Optimized voice settings for medical content
-        voice_settings = {
-            "stability": 0.0,
-            "similarity_boost": 0.75,
-            "style": 0.0,
-            "use_speaker_boost": False
-        }
+        voice_settings = QUESTION_TTS_VOICE_SETTINGS
         
         # Convert text to speech with timing
         import time
@@ -517,18 +669,19 @@ async def convert_text_to_speech(request: dict):
         logger.info(f"[TTS_TIMING] ElevenLabs API response received in {api_duration:.3f} seconds")
         
         if result["success"]:
-            audio_size_kb = len(result["audio_base64"]) * 3 / 4 / 1024  # Approximate size in KB
+            audio_size_kb = result["audio_size"] / 1024
             logger.info(f"[TTS_TIMING] Audio generated: {audio_size_kb:.1f}KB, text length: {len(text)} chars")
             
             return {
                 "success": True,
-                "audio_base64": result["audio_base64"],
+                "audio_url": result["audio_url"],
                 "audio_format": result["audio_format"],
                 "voice_id": result["voice_id"],
                 "language": language,
                 "timestamp": result["timestamp"],
                 "api_duration": api_duration,
-                "audio_size_kb": audio_size_kb
+                "audio_size_kb": audio_size_kb,
+                "cached": result.get("cached", False)
             }
         else:
             raise HTTPException(
@@ -542,6 +695,84 @@ async def convert_text_to_speech(request: dict):
         logger.error(f"TTS conversion error: {e}")
         raise HTTPException(status_code=500, detail=f"TTS conversion failed: {str(e)}")
 
+# Streaming Text-to-Speech Endpoint
+@router.get("/medical/question-tts/stream")
+async def stream_question_speech(text: str):
+    """
+    Same audio as /medical/question-tts, relayed to the client as ElevenLabs produces it.
+    A GET so an <audio> element can use it as its src and start playing on the first chunk.
+    """
+    text = text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Text is required")
+    
+    result = await tts_service.text_to_speech_stream(
+        text=text,
+        voice_id=tts_service.get_voice_for_language("ta"),
+        voice_settings=QUESTION_TTS_VOICE_SETTINGS
+    )
+    if not result["success"]:
+        raise HTTPException(
+            status_code=500,
+            detail=f"TTS conversion failed: {result.get('message', 'Unknown error')}"
+        )
+    
+    return StreamingResponse(
+        result["chunks"],
+        media_type=result["media_type"],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-TTS-Cache": "hit" if result["cached"] else "miss"}
+    )
+
+# Stored clips never change under their content hash, so browsers may keep them indefinitely
+IMMUTABLE_AUDIO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+AUDIO_CLIP_NAME = re.compile(r"^([0-9a-f]{64})\.([a-z0-9]+)$")
+
+# Raw Audio Endpoint
+@router.get("/medical/tts-audio/{clip}")
+async def get_tts_audio(
+    clip: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None),
+    if_range: Optional[str] = Header(None)
+):
+    """
+    A synthesized clip as raw bytes, addressed by the content hash in the question-tts audio_url.
+    Supports ETag revalidation and single byte-range requests for seeking and resumed downloads.
+    """
+    match = AUDIO_CLIP_NAME.match(clip)
+    if not match or match.group(2) not in AUDIO_MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    cache_key, extension = match.groups()
+    
+    etag = f'"{cache_key}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_AUDIO_CACHE_CONTROL, "Accept-Ranges": "bytes"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    # Prebuilt phrases first, then everything synthesized on demand
+    audio = audio_pack.get(cache_key) or await tts_cache.read(cache_key)
+    if audio is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    media_type = AUDIO_MEDIA_TYPES[extension]
+    
+    # A Range conditioned on another version of the clip gets the whole (current) clip
+    if if_range is not None and if_range.strip() != etag:
+        range_header = None
+    try:
+        byte_range = parse_byte_range(range_header, len(audio))
+    except RangeNotSatisfiable:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{len(audio)}"})
+    if byte_range is None:
+        return Response(content=audio, media_type=media_type, headers=headers)
+    
+    start, end = byte_range
+    return Response(
+        content=audio[start:end + 1],
+        status_code=206,
+        media_type=media_type,
+        headers={**headers, "Content-Range": f"bytes {start}-{end}/{len(audio)}"}
+    )
+
 # Get Available Voices Endpoint - Commented out for now
 # @router.get("/medical/tts-voices")
 # async def get_available_voices():
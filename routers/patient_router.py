@@ -9,6 +9,8 @@ from typing import Optional, Dict, Any
 from services.supabase_service import supabase_service
 from services.luxand_face_recognition_service import LuxandFaceRecognitionService
 from services.session_service import sessions, update_session, get_session
+from core.config import settings
+from core.deadline import turn_budget
 import logging
 
 logger = logging.getLogger(__name__)
@@ -54,67 +56,69 @@ async def manual_patient_lookup(request: ManualPatientRequest):
     Handle manual patient entry - lookup existing or create new patient
     """
     try:
-        logger.info(f"🔍 Manual patient lookup: {request.name}, {request.mobile}")
-        
-        # Step 1: Try to find existing patient
-        existing_patient = await supabase_service.find_patient_by_name_mobile(
-            request.name, request.mobile
-        )
-        
-        if existing_patient:
-            logger.info(f"✅ Found existing patient: {existing_patient['patient']['full_name']}")
+        # One deadline for the lookup and, for a new patient, the OneHat registration
+        with turn_budget("manual_lookup", settings.patient_lookup_budget_seconds):
+            logger.info(f"🔍 Manual patient lookup: {request.name}, {request.mobile}")
+            
+            # Step 1: Try to find existing patient
+            existing_patient = await supabase_service.find_patient_by_name_mobile(
+                request.name, request.mobile
+            )
+            
+            if existing_patient:
+                logger.info(f"✅ Found existing patient: {existing_patient['patient']['full_name']}")
+                
+                # Format for frontend
+                patient_info = existing_patient["patient"]
+                patient_data = {
+                    "patient_id": str(patient_info.get("onehat_patient_id") or patient_info["uuid"]),
+                    "patient_uuid": str(patient_info["uuid"]),  # Add UUID for session storage
+                    "name": patient_info["full_name"],
+                    "mobile": patient_info["phone_number"],
+                    "age": patient_info["age"],
+                    "gender": patient_info["gender"],
+                    "is_existing": True,
+                    "has_previous_consultations": existing_patient.get("has_previous_consultations", False),
+                    "recognition_confidence": None  # No face recognition for manual lookup
+                }
+                consultation_data = existing_patient.get("last_consultation")
+                return {
+                    "success": True,
+                    "message": "Patient found in database",
+                    "patient_data": patient_data,
+                    "consultation_data": consultation_data
+                }
+            
+            # Step 2: Create new patient if not found
+            logger.info(f"🆕 Creating new patient: {request.name}")
+            new_patient_data = await supabase_service.create_new_patient(
+                request.name, request.mobile, request.age, request.gender
+            )
+            
+            if not new_patient_data:
+                raise HTTPException(status_code=500, detail="Failed to create new patient")
+            
+            patient_info = new_patient_data["patient"]
+            
+            # Use OneHat ID as patient_id if available, otherwise use UUID
+            patient_id = str(patient_info.get("onehat_patient_id") or patient_info["id"])
             
-            # Format for frontend
-            patient_info = existing_patient["patient"]
-            patient_data = {
-                "patient_id": str(patient_info.get("onehat_patient_id") or patient_info["uuid"]),
-                "patient_uuid": str(patient_info["uuid"]),  # Add UUID for session storage
-                "name": patient_info["full_name"],
-                "mobile": patient_info["phone_number"],
-                "age": patient_info["age"],
-                "gender": patient_info["gender"],
-                "is_existing": True,
-                "has_previous_consultations": existing_patient.get("has_previous_consultations", False),
-                "recognition_confidence": None  # No face recognition for manual lookup
-            }
-            consultation_data = existing_patient.get("last_consultation")
             return {
                 "success": True,
-                "message": "Patient found in database",
-                "patient_data": patient_data,
-                "consultation_data": consultation_data
+                "message": "New patient created successfully",
+                "patient_data": {
+                    "patient_id": patient_id,  # OneHat ID if available, otherwise UUID
+                    "patient_uuid": str(patient_info["id"]),  # Always UUID for session storage
+                    "name": patient_info["full_name"],
+                    "mobile": patient_info["phone_number"],
+                    "age": patient_info["age"],
+                    "gender": patient_info["gender"],
+                    "is_existing": False,
+                    "has_previous_consultations": False
+                },
+                "consultation_data": None
             }
         
-        # Step 2: Create new patient if not found
-        logger.info(f"🆕 Creating new patient: {request.name}")
-        new_patient_data = await supabase_service.create_new_patient(
-            request.name, request.mobile, request.age, request.gender
-        )
-        
-        if not new_patient_data:
-            raise HTTPException(status_code=500, detail="Failed to create new patient")
-        
-        patient_info = new_patient_data["patient"]
-        
-        # Use OneHat ID as patient_id if available, otherwise use UUID
-        patient_id = str(patient_info.get("onehat_patient_id") or patient_info["id"])
-        
-        return {
-            "success": True,
-            "message": "New patient created successfully",
-            "patient_data": {
-                "patient_id": patient_id,  # OneHat ID if available, otherwise UUID
-                "patient_uuid": str(patient_info["id"]),  # Always UUID for session storage
-                "name": patient_info["full_name"],
-                "mobile": patient_info["phone_number"],
-                "age": patient_info["age"],
-                "gender": patient_info["gender"],
-                "is_existing": False,
-                "has_previous_consultations": False
-            },
-            "consultation_data": None
-        }
-        
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -135,7 +139,8 @@ async def face_recognition_lookup(image: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail="File must be an image")
         
         # Process face recognition
-        result = await face_recognition_service.recognize_and_get_patient_details(image)
+        with turn_budget("face_recognition", settings.face_recognition_budget_seconds):
+            result = await face_recognition_service.recognize_and_get_patient_details(image)
         
         if not result["success"]:
             return {
@@ -8,6 +8,8 @@ from pydantic import BaseModel
 from typing import Dict, Any
 from services.supabase_service import supabase_service
 from services.session_service import get_session
+from services.diagnostics_jobs import diagnostics_jobs, merge_diagnostics
+from core.usage import usage_tracker
 import logging
 
 # Configure logging
@@ -43,6 +45,14 @@ async def accept_prescreening(request: AcceptPrescreeningRequest):
                 detail="No pre-screening data found. Please complete the medical interview first."
             )
         
+        # Diagnostics are computed separately from the assessment; wait only if that job is still running
+        diagnostics_result = await diagnostics_jobs.wait_for_accept(request.session_id)
+        if diagnostics_result is not None:
+            merge_diagnostics(prescreening_data, diagnostics_result)
+        
+        # Every LLM call of the session has finished by now, diagnostics included
+        prescreening_data["llm_usage"] = usage_tracker.session_usage(request.session_id)
+        
         logger.info(f"💾 Storing pre-screening data: {prescreening_data.get('patient_uuid', 'Unknown')}")
         
         # Store in Supabase
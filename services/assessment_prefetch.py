@@ -0,0 +1,106 @@
+"""
+Assessment Prefetch - Start the final assessment as soon as an interview completes,
+so the assessment endpoints join the running task instead of generating it while the patient waits
+"""
+
+import asyncio
+import contextvars
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from core.config import settings
+
+PrefetchKey = Tuple[str, str]
+
+
+class AssessmentPrefetcher:
+    def __init__(self, ttl: Optional[float] = None):
+        # Finished results are kept for as long as the session lives
+        self.ttl = ttl if ttl is not None else settings.session_timeout
+        self._tasks: Dict[PrefetchKey, asyncio.Task] = {}
+        self._started: Dict[PrefetchKey, float] = {}
+        self.stats = {"scheduled": 0, "joined_running": 0, "joined_done": 0, "inline": 0, "failed": 0}
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.ttl
+        for key in [k for k, started in self._started.items() if started < cutoff and self._tasks[k].done()]:
+            self.discard(key)
+
+    def _start(self, key: PrefetchKey, factory: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        # The task outlives the turn that scheduled it, so it runs in a fresh context without that turn's budget
+        task = asyncio.create_task(factory(), context=contextvars.Context())
+        task.add_done_callback(lambda t: self._on_done(key, t))
+        self._tasks[key] = task
+        self._started[key] = time.monotonic()
+        return task
+
+    def _on_done(self, key: PrefetchKey, task: asyncio.Task):
+        if task.cancelled():
+            return
+        error = task.exception()
+        result = task.result() if error is None else None
+        if error is not None or (isinstance(result, dict) and result.get("fallback")):
+            self.stats["failed"] += 1
+            print(f"[ASSESSMENT_PREFETCH] {key[0]} assessment for {key[1]} failed: {error or 'fallback assessment'}")
+            # Whoever is waiting still gets it, but the next request generates the assessment again
+            if self._tasks.get(key) is task:
+                self.discard(key)
+
+    def schedule(self, kind: str, session_id: str, factory: Callable[[], Awaitable[Any]]):
+        """Start generating the assessment in the background (no-op if one is already running or done)"""
+        self._prune()
+        key = (kind, session_id)
+        if key in self._tasks:
+            return
+        self.stats["scheduled"] += 1
+        print(f"[ASSESSMENT_PREFETCH] Scheduled {kind} assessment for {session_id}")
+        self._start(key, factory)
+
+    async def get(self, kind: str, session_id: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        The assessment result for a session: joins the prefetch if it is running, returns it if it has finished,
+        otherwise generates it now (and shares that task with any concurrent request).
+        """
+        key = (kind, session_id)
+        task = self._tasks.get(key)
+        if task is None:
+            self.stats["inline"] += 1
+            task = self._start(key, factory)
+        elif task.done():
+            self.stats["joined_done"] += 1
+        else:
+            self.stats["joined_running"] += 1
+        # A client disconnect must not cancel the shared task
+        return await asyncio.shield(task)
+
+    def discard(self, key: PrefetchKey):
+        """Forget a session's assessment, e.g. when its interview restarts"""
+        task = self._tasks.pop(key, None)
+        self._started.pop(key, None)
+        if task and not task.done():
+            task.cancel()
+
+    def discard_session(self, kind: str, session_id: str):
+        self.discard((kind, session_id))
+
+    async def stop(self):
+        """Cancel running prefetches (called from the app lifespan)"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._started.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        requests = self.stats["joined_running"] + self.stats["joined_done"] + self.stats["inline"]
+        return {
+            **self.stats,
+            "running": sum(1 for task in self._tasks.values() if not task.done()),
+            "cached": sum(1 for task in self._tasks.values() if task.done()),
+            "prefetch_hit_rate": round((requests - self.stats["inline"]) / requests, 3) if requests else 0.0
+        }
+
+
+# Global assessment prefetcher instance
+assessment_prefetch = AssessmentPrefetcher()
@@ -0,0 +1,179 @@
+"""
+Audio Pack - The fixed patient-facing phrases synthesized ahead of time for every configured voice,
+kept on disk per pack version and served from memory without an ElevenLabs call.
+The version hashes the phrases and the synthesis settings, so any change to either builds a new pack;
+clips whose content key is unchanged are carried over from the previous pack instead of re-synthesized.
+
+Build ahead of deployment with: python -m services.audio_pack
+"""
+
+import asyncio
+import glob
+import hashlib
+import json
+import logging
+import os
+import shutil
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.config import settings
+from services.tts_cache import AUDIO_SUFFIX, tts_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Format of the prebuilt clips; the question audio endpoints use the same default
+PACK_OUTPUT_FORMAT = "mp3_44100_128"
+MANIFEST_NAME = "manifest.json"
+
+# content key -> (text, voice_id)
+PackEntries = Dict[str, Tuple[str, str]]
+
+
+def audio_pack_plan(phrases: List[str], voice_ids: List[str], model_id: str, voice_settings: Dict[str, Any],
+                    output_format: str = PACK_OUTPUT_FORMAT) -> Tuple[str, PackEntries]:
+    """Pack version and the clips it holds, keyed exactly as the TTS path looks them up"""
+    material = json.dumps({
+        "phrases": phrases,
+        "voice_ids": sorted(set(voice_ids)),
+        "model_id": model_id,
+        "voice_settings": voice_settings,
+        "output_format": output_format
+    }, sort_keys=True, ensure_ascii=False)
+    version = hashlib.sha256(material.encode("utf-8")).hexdigest()[:12]
+    entries = {
+        tts_cache_key(text, voice_id, model_id, voice_settings, output_format): (text, voice_id)
+        for voice_id in dict.fromkeys(voice_ids)
+        for text in phrases
+    }
+    return version, entries
+
+
+class AudioPack:
+    def __init__(self, directory: Optional[str] = None, enabled: Optional[bool] = None,
+                 concurrency: Optional[int] = None):
+        self.enabled = settings.tts_pack_enabled if enabled is None else enabled
+        self.directory = directory if directory is not None else settings.tts_pack_dir
+        self.concurrency = concurrency if concurrency is not None else settings.tts_pack_concurrency
+
+        self.version: Optional[str] = None
+        self.complete = False
+        self.expected = 0
+        # content key -> audio bytes
+        self.clips: Dict[str, bytes] = {}
+        self.stats = {"hits": 0, "loaded": 0, "carried_over": 0, "synthesized": 0, "failed": 0}
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        audio = self.clips.get(key)
+        if audio is not None:
+            self.stats["hits"] += 1
+        return audio
+
+    def _version_dir(self, version: str) -> str:
+        return os.path.join(self.directory, version)
+
+    def _find(self, version: str, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        A clip from this version's directory ("loaded"), else from an older pack holding the
+        same content key ("carried_over"), else (None, None)
+        """
+        own_path = os.path.join(self._version_dir(version), f"{key}{AUDIO_SUFFIX}")
+        for path in [own_path] + glob.glob(os.path.join(self.directory, "*", f"{key}{AUDIO_SUFFIX}")):
+            try:
+                with open(path, "rb") as file:
+                    return file.read(), "loaded" if path == own_path else "carried_over"
+            except OSError:
+                continue
+        return None, None
+
+    def _write(self, version: str, key: str, audio: bytes):
+        os.makedirs(self._version_dir(version), exist_ok=True)
+        path = os.path.join(self._version_dir(version), f"{key}{AUDIO_SUFFIX}")
+        with open(f"{path}.tmp", "wb") as file:
+            file.write(audio)
+        os.replace(f"{path}.tmp", path)
+
+    def _finish(self, version: str, entries: PackEntries):
+        """Record the complete pack and drop the older versions it replaces"""
+        manifest = {"version": version, "clips": {key: {"text": text, "voice_id": voice_id}
+                                                  for key, (text, voice_id) in entries.items()}}
+        with open(os.path.join(self._version_dir(version), MANIFEST_NAME), "w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name != version and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    async def build(self, version: str, entries: PackEntries,
+                    synthesize: Callable[[str, str], Awaitable[Optional[bytes]]]):
+        """
+        Load the pack for this version, carrying over or synthesizing the clips it lacks.
+        synthesize(text, voice_id) returns the audio, or None when it cannot (e.g. no API key);
+        missing clips are tried again on the next start.
+        """
+        if not self.enabled:
+            return
+        self.version, self.expected, self.complete = version, len(entries), False
+        self.clips = {key: audio for key, audio in self.clips.items() if key in entries}
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def fill(key: str, text: str, voice_id: str):
+            audio, source = await asyncio.to_thread(self._find, version, key)
+            if audio is None:
+                async with semaphore:
+                    audio = await synthesize(text, voice_id)
+                if not audio:
+                    self.stats["failed"] += 1
+                    return
+                source = "synthesized"
+            if source != "loaded":
+                await asyncio.to_thread(self._write, version, key, audio)
+            self.stats[source] += 1
+            self.clips[key] = audio
+
+        await asyncio.gather(*(fill(key, text, voice_id) for key, (text, voice_id) in entries.items()))
+
+        if len(self.clips) == len(entries):
+            await asyncio.to_thread(self._finish, version, entries)
+            self.complete = True
+            logger.info(f"[AUDIO_PACK] Pack {version} ready: {len(self.clips)} clips")
+        else:
+            logger.warning(f"[AUDIO_PACK] Pack {version} incomplete: {len(self.clips)}/{len(entries)} clips, "
+                           f"the rest are retried on the next start")
+
+    def start(self, version: str, entries: PackEntries,
+              synthesize: Callable[[str, str], Awaitable[Optional[bytes]]]):
+        """Build in the background (called from the app lifespan); requests are served as clips appear"""
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self.build(version, entries, synthesize))
+
+    async def stop(self):
+        """Cancel a build still in progress (called from the app lifespan)"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "version": self.version,
+            "complete": self.complete,
+            "clips": len(self.clips),
+            "expected_clips": self.expected,
+            "bytes": sum(len(audio) for audio in self.clips.values()),
+            **self.stats
+        }
+
+
+# Global audio pack instance
+audio_pack = AudioPack()
+
+
+if __name__ == "__main__":
+    # Imported here: tts_service holds the pack instance of the importable module, not of __main__
+    from services.tts_service import tts_service
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(tts_service.build_audio_pack())
+    print(json.dumps(tts_service.pack.get_metrics(), indent=2))
@@ -0,0 +1,187 @@
+"""
+Gemini Context Cache - Registers the large static system instructions once as cached content
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import time
+from typing import Any, Dict, Optional, Tuple
+from google.genai import types
+
+from core.config import settings
+from core.tokens import count_tokens
+from services.llm_gateway import llm_gateway
+
+# Refresh a cache entry this many seconds before Gemini expires it
+REFRESH_MARGIN = 300
+# Stop handing out an entry this close to its expiry, so a request never references an expired cache
+USE_MARGIN = 30
+# After a failed create wait before retrying
+RETRY_AFTER_FAILURE = 600
+# Cache calls run in the background, outside any turn budget
+CACHE_CALL_TIMEOUT = 30.0
+
+
+class ContextCacheManager:
+    def __init__(self):
+        self.enabled = settings.gemini_context_cache_enabled
+        self.ttl_seconds = settings.gemini_context_cache_ttl
+        self.min_tokens = settings.gemini_context_cache_min_tokens
+
+        # Entries are keyed by a hash of model + instruction text, so an edited prompt gets a new entry
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # (model, label) -> key of its current entry, so the entry an edited prompt replaces can be deleted
+        self._current: Dict[Tuple[str, str], str] = {}
+        self._failures: Dict[str, float] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats = {"created": 0, "refreshed": 0, "deleted": 0, "hits": 0, "fallbacks": 0, "too_small": 0}
+
+    def _key(self, model: str, system_instruction: str) -> str:
+        return hashlib.sha256(f"{model}\n{system_instruction}".encode("utf-8")).hexdigest()
+
+    def _min_tokens(self, model: str) -> int:
+        return self.min_tokens.get(model, self.min_tokens.get("default", 0))
+
+    async def get_cached_content(self, model: str, system_instruction: str, label: str = "prompt") -> Optional[str]:
+        """
+        Return the cached content name for this instruction, or None to send it inline.
+        Never waits on Gemini: creating and refreshing entries runs in the background,
+        so the first requests for a new prompt carry it inline.
+        """
+        if not self.enabled or not system_instruction or not llm_gateway.client:
+            return None
+
+        key = self._key(model, system_instruction)
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is None or entry["expires_at"] - REFRESH_MARGIN <= now:
+            self._schedule(key, model, system_instruction, label)
+
+        if entry and entry["expires_at"] - USE_MARGIN > now:
+            self.stats["hits"] += 1
+            return entry["name"]
+        self.stats["fallbacks"] += 1
+        return None
+
+    def _schedule(self, key: str, model: str, system_instruction: str, label: str):
+        task = self._tasks.get(key)
+        if task and not task.done():
+            return
+        if self._failures.get(key, 0) > time.time():
+            return
+
+        tokens = count_tokens(system_instruction)
+        if tokens < self._min_tokens(model):
+            # Gemini rejects it; the same text never grows, an edited prompt is a new key
+            print(f"[CONTEXT_CACHE] {label} (~{tokens} tokens) is below {model}'s minimum of "
+                  f"{self._min_tokens(model)} for caching, sending inline")
+            self._failures[key] = float("inf")
+            self.stats["too_small"] += 1
+            return
+
+        # A fresh context: the create is not part of the turn that triggered it (no budget, no usage session)
+        self._tasks[key] = asyncio.create_task(self._create_or_refresh(key, model, system_instruction, label),
+                                               context=contextvars.Context())
+
+    async def _create_or_refresh(self, key: str, model: str, system_instruction: str, label: str):
+        entry = self._entries.get(key)
+        if entry and entry["expires_at"] > time.time():
+            # Extend the live entry rather than create a second copy that bills storage alongside it
+            try:
+                await asyncio.wait_for(
+                    llm_gateway.client.aio.caches.update(
+                        name=entry["name"],
+                        config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s")
+                    ),
+                    timeout=CACHE_CALL_TIMEOUT
+                )
+                entry["expires_at"] = time.time() + self.ttl_seconds
+                self.stats["refreshed"] += 1
+                print(f"[CONTEXT_CACHE] Extended {label} ({entry['name']}) by {self.ttl_seconds}s")
+                return
+            except Exception as e:
+                print(f"[CONTEXT_CACHE] Could not extend {label} ({entry['name']}), creating it again: {e}")
+
+        try:
+            cache = await asyncio.wait_for(
+                llm_gateway.client.aio.caches.create(
+                    model=model,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=system_instruction,
+                        ttl=f"{self.ttl_seconds}s",
+                        display_name=f"prescreening-{label}-{key[:8]}"
+                    )
+                ),
+                timeout=CACHE_CALL_TIMEOUT
+            )
+        except Exception as e:
+            print(f"[CONTEXT_CACHE] Could not cache {label} ({len(system_instruction)} chars), sending inline: {e}")
+            self._failures[key] = time.time() + RETRY_AFTER_FAILURE
+            return
+
+        self.stats["created"] += 1
+        self._entries[key] = {
+            "name": cache.name,
+            "label": label,
+            "expires_at": time.time() + self.ttl_seconds
+        }
+        print(f"[CONTEXT_CACHE] Cached {label} as {cache.name} for {self.ttl_seconds}s")
+
+        # The entry for the previous version of this prompt, or one that could not be extended
+        replaced = [entry] if entry else []
+        previous_key = self._current.get((model, label))
+        self._current[(model, label)] = key
+        if previous_key and previous_key != key and previous_key in self._entries:
+            replaced.append(self._entries.pop(previous_key))
+        for old in replaced:
+            await self._delete(old["name"])
+
+    async def _delete(self, name: str):
+        """Delete an entry on Gemini's side, so it stops billing storage before its TTL"""
+        try:
+            await asyncio.wait_for(llm_gateway.client.aio.caches.delete(name=name), timeout=CACHE_CALL_TIMEOUT)
+            self.stats["deleted"] += 1
+        except Exception as e:
+            print(f"[CONTEXT_CACHE] Could not delete {name}, it expires on its own: {e}")
+
+    async def stop(self):
+        """Cancel pending creates and delete this process's entries (called from the app lifespan)"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        if llm_gateway.client:
+            await asyncio.gather(*(self._delete(entry["name"]) for entry in self._entries.values()))
+        self._entries.clear()
+        self._current.clear()
+
+    async def generation_config(self, model: str, system_instruction: str, label: str = "prompt",
+                                **config_kwargs) -> types.GenerateContentConfig:
+        """
+        Build a GenerateContentConfig that references the cached system instruction,
+        or carries it inline when caching is disabled or unavailable.
+        """
+        cached_content = await self.get_cached_content(model, system_instruction, label)
+        if cached_content:
+            return types.GenerateContentConfig(cached_content=cached_content, **config_kwargs)
+        return types.GenerateContentConfig(system_instruction=system_instruction, **config_kwargs)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "min_tokens": self.min_tokens,
+            "entries": [
+                {"label": entry["label"], "name": entry["name"], "expires_in": round(entry["expires_at"] - now)}
+                for entry in self._entries.values()
+            ],
+            **self.stats
+        }
+
+
+# Global context cache instance
+context_cache = ContextCacheManager()
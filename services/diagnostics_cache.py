@@ -0,0 +1,148 @@
+"""
+Diagnostics Cache - Remembers how free-text diagnoses map onto pre-diagonstics.csv,
+in memory (LRU + TTL) and on disk so recurring diagnoses skip the Gemini call across restarts
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from core.config import settings
+from services.medical_terms import medical_terms
+
+
+def normalize_diagnosis(diagnosis: str) -> str:
+    """Lower-case, strip punctuation, fold synonyms and ignore filler words and word order"""
+    return " ".join(sorted(set(medical_terms(diagnosis))))
+
+
+class DiagnosticsCache:
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                 enabled: Optional[bool] = None):
+        self.enabled = settings.diagnostics_cache_enabled if enabled is None else enabled
+        self.path = path if path is not None else settings.diagnostics_cache_path
+        self.max_entries = max_entries if max_entries is not None else settings.diagnostics_cache_max_entries
+        self.ttl = ttl if ttl is not None else settings.diagnostics_cache_ttl
+
+        # key -> {"result": ..., "stored_at": epoch seconds}; most recently used last
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.csv_version: Optional[str] = None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0, "disk_writes": 0}
+        # One disk write at a time, in the order the snapshots were taken
+        self._save_lock = asyncio.Lock()
+        self._load()
+
+    def key(self, diagnosis: str) -> Optional[str]:
+        normalized = normalize_diagnosis(diagnosis)
+        if not normalized or not self.csv_version:
+            return None
+        return f"{self.csv_version}:{normalized}"
+
+    def set_csv_version(self, version: str):
+        """Entries for any other version of the CSV are dropped, in memory and on disk"""
+        if version == self.csv_version:
+            return
+        previous = self.csv_version
+        self.csv_version = version
+        stale = [key for key in self.entries if not key.startswith(f"{version}:")]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self.stats["invalidations"] += len(stale)
+            print(f"[DIAGNOSTICS_CACHE] CSV changed ({previous} -> {version}), dropped {len(stale)} entries")
+            self._save(dict(self.entries))
+
+    def get(self, diagnosis: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        key = self.key(diagnosis)
+        entry = self.entries.get(key) if key else None
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        if time.time() - entry["stored_at"] > self.ttl:
+            del self.entries[key]
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry["result"]
+
+    async def put(self, diagnosis: str, result: Dict[str, Any]):
+        if not self.enabled:
+            return
+        key = self.key(diagnosis)
+        if not key:
+            return
+        self.entries[key] = {"result": result, "stored_at": time.time()}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["evictions"] += 1
+        # Misses are rare once warm, so rewriting the whole (small) file keeps the disk tier simple.
+        # The snapshot is taken here on the loop; the worker thread never sees self.entries change under it
+        snapshot = dict(self.entries)
+        async with self._save_lock:
+            await asyncio.to_thread(self._save, snapshot)
+
+    def _load(self):
+        if not self.enabled or not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+            now = time.time()
+            for key, entry in sorted(stored.items(), key=lambda item: item[1]["stored_at"]):
+                if now - entry["stored_at"] <= self.ttl:
+                    self.entries[key] = entry
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            print(f"[DIAGNOSTICS_CACHE] Loaded {len(self.entries)} entries from {self.path}")
+        except Exception as e:
+            self.entries.clear()
+            print(f"[DIAGNOSTICS_CACHE] Dropped corrupt cache file {self.path}, starting empty: {e}")
+
+    def _save(self, snapshot: Dict[str, Dict[str, Any]]):
+        if not self.path:
+            return
+        temp_path = None
+        try:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            # Write a uniquely named file then rename, so neither a crash nor a concurrent save
+            # can leave a half-written or interleaved cache file behind
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp",
+                                             prefix=f"{os.path.basename(self.path)}.", delete=False) as file:
+                temp_path = file.name
+                json.dump(snapshot, file, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            self.stats["disk_writes"] += 1
+        except Exception as e:
+            print(f"[DIAGNOSTICS_CACHE] Could not write {self.path}: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def clear(self):
+        self.entries.clear()
+        self._save({})
+
+    def get_metrics(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "csv_version": self.csv_version,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            **self.stats
+        }
+
+
+# Global diagnostics cache instance
+diagnostics_cache = DiagnosticsCache()
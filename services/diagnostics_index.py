@@ -0,0 +1,89 @@
+"""
+Diagnostics Index - BM25 over the condition and sub-condition text of pre-diagonstics.csv,
+so the diagnostics matcher only sees the few rows that can plausibly match
+"""
+
+import math
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from services.medical_terms import medical_terms
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+# The matcher focuses on the sub-condition, so its words count twice
+SUB_CONDITION_WEIGHT = 2
+# History words help rank but must not outweigh the diagnosis itself
+HISTORY_WEIGHT = 0.3
+
+
+def _stem(word: str) -> str:
+    """Plural folding only - enough for "seizures"/"seizure" and "injuries"/"injury" """
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "is", "us")):
+        return word[:-1]
+    return word
+
+
+def index_terms(text: str) -> List[str]:
+    return [_stem(word) for word in medical_terms(text) if len(word) > 1]
+
+
+class DiagnosticsIndex:
+    def __init__(self, conditions: List[Dict[str, str]]):
+        """conditions: rows with 'condition', 'sub_condition' and 'diagnostics'"""
+        self.conditions = conditions
+        self.term_counts: List[Counter] = []
+        self.lengths: List[int] = []
+        document_frequency: Counter = Counter()
+
+        for row in conditions:
+            terms = Counter(index_terms(row["condition"]))
+            for term in index_terms(row["sub_condition"]):
+                terms[term] += SUB_CONDITION_WEIGHT
+            self.term_counts.append(terms)
+            self.lengths.append(sum(terms.values()))
+            document_frequency.update(terms.keys())
+
+        count = len(conditions)
+        self.average_length = sum(self.lengths) / count if count else 0.0
+        self.idf = {
+            term: math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequency.items()
+        }
+        # Only rows containing a query term can score, so search touches those rows alone
+        self.postings: Dict[str, List[int]] = {}
+        for row_index, terms in enumerate(self.term_counts):
+            for term in terms:
+                self.postings.setdefault(term, []).append(row_index)
+
+    def search(self, diagnosis: str, history: str = "", k: int = 8) -> List[Tuple[float, Dict[str, str]]]:
+        """Top-k rows by BM25 score for the diagnosis (and, weighted down, the history); rows scoring 0 are left out"""
+        query: Dict[str, float] = {}
+        for term in index_terms(diagnosis):
+            query[term] = query.get(term, 0.0) + 1.0
+        for term in index_terms(history):
+            query[term] = query.get(term, 0.0) + HISTORY_WEIGHT
+
+        scores: Dict[int, float] = {}
+        for term, weight in query.items():
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for row_index in self.postings[term]:
+                frequency = self.term_counts[row_index][term]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[row_index] / self.average_length)
+                scores[row_index] = scores.get(row_index, 0.0) + weight * idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [(score, self.conditions[row_index]) for row_index, score in ranked]
+
+    def rows_containing(self, text: str) -> int:
+        """Number of rows whose condition or sub-condition contains every term of the text"""
+        terms = set(index_terms(text))
+        if not terms or any(term not in self.postings for term in terms):
+            return 0
+        rows = set.intersection(*(set(self.postings[term]) for term in terms))
+        return len(rows)
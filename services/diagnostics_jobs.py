@@ -0,0 +1,190 @@
+"""
+Diagnostics Jobs - Pre-consultation diagnostics computed per session as a separate background job,
+so the assessment does not wait for a second LLM round trip
+"""
+
+import asyncio
+import contextvars
+import time
+from typing import Any, Dict, Optional
+
+from core.config import settings
+from core.usage import usage_session
+from services.diagnostics_service import diagnostics_service
+from services.session_service import get_session, update_session
+
+
+def merge_diagnostics(prescreening_data: Dict[str, Any], diagnostics_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Put a finished diagnostics result into collected pre-screening data"""
+    prescreening_data["pre_consultation_diagnostics"] = diagnostics_result.get("diagnostics") or {}
+    return prescreening_data
+
+
+class DiagnosticsJob:
+    def __init__(self, session_id: str, possible_diagnosis: str, investigative_history: str, task: asyncio.Task):
+        self.session_id = session_id
+        self.inputs = (possible_diagnosis, investigative_history)
+        self.task = task
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        if not self.task.done():
+            return "pending"
+        if self.task.cancelled() or self.task.exception() is not None:
+            return "failed"
+        return "ready"
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        return self.task.result() if self.status == "ready" else None
+
+
+class DiagnosticsJobs:
+    def __init__(self, accept_timeout: Optional[float] = None, ttl: Optional[float] = None):
+        self.accept_timeout = accept_timeout if accept_timeout is not None else settings.diagnostics_accept_timeout
+        # Finished results are kept for as long as the session lives
+        self.ttl = ttl if ttl is not None else settings.session_timeout
+        self.jobs: Dict[str, DiagnosticsJob] = {}
+        self.stats = {
+            "started": 0, "completed": 0, "failed": 0, "merged_into_session": 0,
+            "accept_waits": 0, "accept_timeouts": 0, "total_job_time": 0.0, "total_accept_wait": 0.0
+        }
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.ttl
+        for session_id in [s for s, job in self.jobs.items() if job.started < cutoff and job.task.done()]:
+            del self.jobs[session_id]
+
+    def start(self, session_id: str, possible_diagnosis: str, investigative_history: str) -> DiagnosticsJob:
+        """Start the diagnostics job for a session's assessment (reuses a job already running for the same assessment)"""
+        self._prune()
+        job = self.jobs.get(session_id)
+        if job and job.inputs == (possible_diagnosis, investigative_history) and job.status != "failed":
+            return job
+        self.discard(session_id)
+
+        # Runs in a fresh context so it is not cut off by the budget of whichever turn started it
+        task = asyncio.create_task(
+            self._run(session_id, possible_diagnosis, investigative_history),
+            context=contextvars.Context()
+        )
+        job = DiagnosticsJob(session_id, possible_diagnosis, investigative_history, task)
+        task.add_done_callback(lambda t: self._on_done(job))
+        self.jobs[session_id] = job
+        self.stats["started"] += 1
+        print(f"[DIAGNOSTICS_JOBS] Started diagnostics for {session_id}")
+        return job
+
+    async def _run(self, session_id: str, possible_diagnosis: str, investigative_history: str) -> Dict[str, Any]:
+        with usage_session(session_id):
+            result = await diagnostics_service.get_pre_consultation_diagnostics(
+                possible_diagnosis=possible_diagnosis,
+                investigative_history=investigative_history
+            )
+        await self._merge_into_session(session_id, result)
+        return result
+
+    async def _merge_into_session(self, session_id: str, result: Dict[str, Any]):
+        """Best effort: fill in pre-screening data that was stored before the diagnostics finished"""
+        try:
+            session = await get_session(session_id)
+            prescreening_data = (session or {}).get("prescreening_data")
+            if prescreening_data:
+                merge_diagnostics(prescreening_data, result)
+                await update_session(session_id, session)
+                self.stats["merged_into_session"] += 1
+        except Exception as e:
+            print(f"[DIAGNOSTICS_JOBS] Could not merge diagnostics into session {session_id}: {e}")
+
+    def _on_done(self, job: DiagnosticsJob):
+        job.finished = time.monotonic()
+        if job.task.cancelled():
+            return
+        if job.task.exception() is not None:
+            self.stats["failed"] += 1
+            print(f"[DIAGNOSTICS_JOBS] Diagnostics for {job.session_id} failed: {job.task.exception()}")
+            return
+        self.stats["completed"] += 1
+        self.stats["total_job_time"] += job.finished - job.started
+        print(f"[DIAGNOSTICS_JOBS] Diagnostics for {job.session_id} ready in {job.finished - job.started:.2f}s")
+
+    def status(self, session_id: str) -> Dict[str, Any]:
+        """Polling view of a session's diagnostics job"""
+        job = self.jobs.get(session_id)
+        if job is None:
+            return {"status": "not_found"}
+        response = {"status": job.status}
+        result = job.result()
+        if result is not None:
+            response.update({
+                "pre_consultation_diagnostics": result.get("diagnostics") or {},
+                "matched_diagnostic_condition": result.get("matched_condition"),
+                "diagnostics_explanation": result.get("explanation", "")
+            })
+        return response
+
+    async def wait(self, session_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        The diagnostics result for a session, waiting only while the job is still running.
+        None if there is no job, it failed, or it did not finish within the timeout.
+        """
+        job = self.jobs.get(session_id)
+        if job is None:
+            return None
+        if not job.task.done():
+            try:
+                # A caller that gives up must not cancel the job itself
+                await asyncio.wait_for(asyncio.shield(job.task), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+            except Exception:
+                return None
+        return job.result()
+
+    async def wait_for_accept(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Used by /api/prescreening/accept: returns at once if the job already finished"""
+        job = self.jobs.get(session_id)
+        if job is None or job.task.done():
+            return job.result() if job else None
+
+        self.stats["accept_waits"] += 1
+        started = time.perf_counter()
+        result = await self.wait(session_id, timeout=self.accept_timeout)
+        self.stats["total_accept_wait"] += time.perf_counter() - started
+        if result is None and not job.task.done():
+            self.stats["accept_timeouts"] += 1
+            print(f"[DIAGNOSTICS_JOBS] Accept for {session_id} did not wait longer than {self.accept_timeout}s for diagnostics")
+        return result
+
+    def discard(self, session_id: str):
+        """Forget a session's job, e.g. when a new assessment replaces it"""
+        job = self.jobs.pop(session_id, None)
+        if job and not job.task.done():
+            job.task.cancel()
+
+    async def stop(self):
+        """Cancel running jobs (called from the app lifespan)"""
+        tasks = [job.task for job in self.jobs.values() if not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.jobs.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "running": sum(1 for job in self.jobs.values() if not job.task.done()),
+            "started": self.stats["started"],
+            "completed": self.stats["completed"],
+            "failed": self.stats["failed"],
+            "merged_into_session": self.stats["merged_into_session"],
+            "avg_job_ms": round(self.stats["total_job_time"] / self.stats["completed"] * 1000, 1) if self.stats["completed"] else 0.0,
+            "accept_waits": self.stats["accept_waits"],
+            "accept_timeouts": self.stats["accept_timeouts"],
+            "avg_accept_wait_ms": round(self.stats["total_accept_wait"] / self.stats["accept_waits"] * 1000, 1) if self.stats["accept_waits"] else 0.0,
+            "accept_timeout": self.accept_timeout
+        }
+
+
+# Global diagnostics jobs instance
+diagnostics_jobs = DiagnosticsJobs()
@@ -2,45 +2,133 @@
 Pre-consultation diagnostics service using LLM and CSV data
 """
 
+import asyncio
+import contextvars
 import csv
+import hashlib
+import io
 import os
 import json
+import random
+import re
+import time
+from collections import deque
+from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Any
-from google import genai
 from google.genai import types
+from pydantic import BaseModel
 from core.config import settings
+from services.llm_gateway import llm_gateway
+from services.diagnostics_cache import diagnostics_cache, normalize_diagnosis
+from services.diagnostics_index import DiagnosticsIndex
+
+class DiagnosticsMatch(BaseModel):
+    matched_condition: Optional[str]
+    imaging: List[str]
+    blood_tests: List[str]
+    clinical_tests: List[str]
+    other: List[str]
+
+# Schema field -> diagnostics group name used in pre-screening data
+DIAGNOSTIC_GROUPS = {
+    "imaging": "Imaging",
+    "blood_tests": "Blood Tests",
+    "clinical_tests": "Clinical Tests",
+    "other": "Other"
+}
+
+# Keyword rules for sorting the CSV's test names into the diagnostics groups, checked in this order
+TEST_GROUP_PATTERNS = [
+    ("Imaging", re.compile(r"\b(x-?ray|mri|ct|ultrasound|usg|doppler|imaging|scan|oct|echo\w*|mammogra\w*|dexa|angiogra\w*)\b", re.I)),
+    ("Blood Tests", re.compile(r"\b(blood|fbs|ppbs|hba1c|lipid|lft|rft|kft|renal function|thyroid|tsh|b12|vit\w*|cbc|esr|crp|coagulation|creatinine|glucose|electrolytes|uric acid)\b", re.I)),
+    ("Clinical Tests", re.compile(r"\b(clinical|phq-?9|gad-?7|screening|assessment|eval\w*|exam\w*|charting|ecg|eeg|nerve conduction|emg|bp check|bmi|audit|dast|spirometry)\b", re.I))
+]
+# The runner-up row must trail the best match by at least this much similarity
+FAST_PATH_MARGIN = 0.1
+# Fast-path disagreements kept for review
+RECENT_DISAGREEMENTS = 20
+
+
+def parse_diagnostics_column(text: str) -> Dict[str, List[str]]:
+    """Split a "Pre-Consultation (Diagnostics)" cell on ';' and top-level ',' into the diagnostics groups"""
+    tests, depth, current = [], 0, ""
+    for char in text:
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        if char == ";" or (char == "," and depth == 0):
+            tests.append(current)
+            current = ""
+        else:
+            current += char
+    tests.append(current)
+
+    groups: Dict[str, List[str]] = {}
+    for test in (t.strip() for t in tests):
+        if not test:
+            continue
+        group = next((name for name, pattern in TEST_GROUP_PATTERNS if pattern.search(test)), "Other")
+        groups.setdefault(group, []).append(test)
+    return groups
+
 
 class DiagnosticsService:
     def __init__(self):
         self.diagnostics_data = []
-        self.client = None
+        self.conditions = []
+        self.index = DiagnosticsIndex([])
         self.model = settings.gemini_model
+        self.top_k = settings.diagnostics_top_k
+        self.full_list_max_rows = settings.diagnostics_full_list_max_rows
+        self.retrieval_stats = {"requests": 0, "rows_sent": 0, "full_list": 0, "no_candidates": 0, "index_build_ms": 0.0}
+        self.fast_path_threshold = settings.diagnostics_fast_path_threshold
+        self.fast_path_audit_rate = settings.diagnostics_fast_path_audit_rate
+        self.fast_path_stats = {"lookups": 0, "fast_path": 0, "audits": 0, "agreements": 0, "disagreements": 0, "audit_errors": 0}
+        self.recent_disagreements = deque(maxlen=RECENT_DISAGREEMENTS)
+        self._audits = set()
+        self.csv_path = os.path.join(os.path.dirname(__file__), '..', 'pre-diagonstics.csv')
+        self.csv_version = None
+        self._csv_mtime = None
+        self.cache = diagnostics_cache
         self._load_diagnostics_data()
-        self._initialize_gemini()
         
     def _load_diagnostics_data(self):
         """Load pre-diagnostics CSV data"""
-        csv_path = os.path.join(os.path.dirname(__file__), '..', 'pre-diagonstics.csv')
-        
         try:
-            with open(csv_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                self.diagnostics_data = list(reader)
-            print(f"[DIAGNOSTICS_SERVICE] Loaded {len(self.diagnostics_data)} diagnostic entries")
+            with open(self.csv_path, 'rb') as file:
+                raw = file.read()
+            self._csv_mtime = os.path.getmtime(self.csv_path)
+            self.diagnostics_data = list(csv.DictReader(io.StringIO(raw.decode('utf-8-sig'))))
+            self.conditions = [
+                {
+                    'condition': entry.get('Condition', ''),
+                    'sub_condition': entry.get('Sub-Condition', ''),
+                    'diagnostics': entry.get('Pre-Consultation (Diagnostics)', ''),
+                    # Parsed once here so a confident local match needs no LLM call
+                    'tests': parse_diagnostics_column(entry.get('Pre-Consultation (Diagnostics)', ''))
+                }
+                for entry in self.diagnostics_data
+                if entry.get('Condition') and entry.get('Sub-Condition') and entry.get('Pre-Consultation (Diagnostics)')
+            ]
+            build_start = time.perf_counter()
+            self.index = DiagnosticsIndex(self.conditions)
+            self.retrieval_stats["index_build_ms"] = round((time.perf_counter() - build_start) * 1000, 1)
+            # Cached matches are only valid for the CSV content they were made against
+            self.csv_version = hashlib.sha256(raw).hexdigest()[:12]
+            self.cache.set_csv_version(self.csv_version)
+            print(f"[DIAGNOSTICS_SERVICE] Loaded {len(self.diagnostics_data)} diagnostic entries (version {self.csv_version})")
         except Exception as e:
             print(f"[DIAGNOSTICS_SERVICE] Error loading CSV: {e}")
             self.diagnostics_data = []
     
-    def _initialize_gemini(self):
-        """Initialize Gemini AI client"""
+    def _reload_if_changed(self):
+        """Pick up edits to the CSV without a restart"""
         try:
-            self.client = genai.Client(api_key=settings.gemini_api_key)
-            print(f"[DIAGNOSTICS_SERVICE] Gemini client initialized with model: {self.model}")
-        except Exception as e:
-            print(f"[DIAGNOSTICS_SERVICE] Error initializing Gemini: {e}")
-            self.client = None
+            mtime = os.path.getmtime(self.csv_path)
+        except OSError:
+            return
+        if mtime != self._csv_mtime:
+            self._load_diagnostics_data()
     
-    def get_pre_consultation_diagnostics(self, possible_diagnosis: str, investigative_history: str) -> Dict[str, Any]:
+    async def get_pre_consultation_diagnostics(self, possible_diagnosis: str, investigative_history: str) -> Dict[str, Any]:
         """
         Get pre-consultation diagnostics based on diagnosis and patient history
         
@@ -51,53 +139,183 @@ class DiagnosticsService:
         Returns:
             Dictionary with diagnostics suggestions grouped by type
         """
-        if not self.client or not self.diagnostics_data:
+        self._reload_if_changed()
+        if not self.diagnostics_data:
             return {"diagnostics": {}, "matched_condition": None, "explanation": "Diagnostics service unavailable"}
         
+        # Most diagnoses name exactly one CSV sub-condition; those skip the LLM entirely
+        fast_result = self.fast_path_match(possible_diagnosis)
+        if fast_result is not None:
+            print(f"[DIAGNOSTICS_DEBUG] Fast path match for '{possible_diagnosis}': {fast_result['matched_condition']}")
+            self._maybe_audit(possible_diagnosis, investigative_history, fast_result)
+            return fast_result
+        
+        if not llm_gateway.client:
+            return {"diagnostics": {}, "matched_condition": None, "explanation": "Diagnostics service unavailable"}
+        
+        # Recurring diagnoses map onto the same CSV rows, so the match is reused when the CSV has not changed
+        cached = self.cache.get(possible_diagnosis)
+        if cached is not None:
+            print(f"[DIAGNOSTICS_DEBUG] Cache hit for diagnosis: '{possible_diagnosis}'")
+            return cached
+        
         try:
-            # Create prompt for LLM to match diagnosis with CSV data
-            csv_conditions = []
-            for entry in self.diagnostics_data:
-                condition = entry.get('Condition', '')
-                sub_condition = entry.get('Sub-Condition', '')
-                pre_consultation = entry.get('Pre-Consultation (Diagnostics)', '')
-                
-                if condition and sub_condition and pre_consultation:
-                    csv_conditions.append({
-                        'condition': condition,
-                        'sub_condition': sub_condition,
-                        'diagnostics': pre_consultation
-                    })
-            
-            prompt = self._create_matching_prompt(
-                possible_diagnosis, 
-                investigative_history, 
-                csv_conditions
-            )
-            
-            print(f"[DIAGNOSTICS_DEBUG] Matching diagnosis: '{possible_diagnosis}'")
-            print(f"[DIAGNOSTICS_DEBUG] Available conditions: {len(csv_conditions)}")
-            
-            # Get LLM response using new API
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt
-            )
-            
-            if not response or not response.text:
+            result = await self._llm_match(possible_diagnosis, investigative_history)
+            if result is None:
                 return {"diagnostics": {}, "matched_condition": None}
-            
-            print(f"[DIAGNOSTICS_DEBUG] LLM response: {response.text[:200]}...")
-            
-            # Parse LLM response
-            result = self._parse_diagnostics_response(response.text)
-            
+            await self.cache.put(possible_diagnosis, result)
             return result
             
         except Exception as e:
             print(f"[DIAGNOSTICS_ERROR] Error getting diagnostics: {e}")
             return {"diagnostics": {}, "matched_condition": None}
     
+    async def _llm_match(self, possible_diagnosis: str, investigative_history: str) -> Optional[Dict[str, Any]]:
+        """Ask the LLM to pick among the candidate rows; None if it returned nothing"""
+        # Only the rows that can plausibly match go into the prompt
+        csv_conditions = self.candidate_conditions(possible_diagnosis, investigative_history)
+        if not csv_conditions:
+            print(f"[DIAGNOSTICS_DEBUG] No candidate conditions for diagnosis: '{possible_diagnosis}'")
+            return {"diagnostics": {}, "matched_condition": None}
+        
+        prompt = self._create_matching_prompt(
+            possible_diagnosis, 
+            investigative_history, 
+            csv_conditions
+        )
+        
+        print(f"[DIAGNOSTICS_DEBUG] Matching diagnosis: '{possible_diagnosis}'")
+        print(f"[DIAGNOSTICS_DEBUG] Candidate conditions: {len(csv_conditions)} of {len(self.conditions)}")
+        
+        # Get LLM response through the shared gateway, which routes it to the fastest healthy model
+        response = await llm_gateway.generate_content(
+            call_type="diagnostics",
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                response_schema=DiagnosticsMatch,
+                response_mime_type="application/json"
+            )
+        )
+        
+        if not response or not response.text:
+            return None
+        
+        print(f"[DIAGNOSTICS_DEBUG] LLM response: {response.text[:200]}...")
+        
+        # Parse LLM response
+        return self._parse_diagnostics_response(response.text)
+    
+    def fast_path_match(self, possible_diagnosis: str) -> Optional[Dict[str, Any]]:
+        """
+        The pre-parsed diagnostics of the one CSV row the diagnosis clearly names, or None if the match is
+        not confident: similarity below the threshold, a close runner-up, or several rows containing every term.
+        """
+        self.fast_path_stats["lookups"] += 1
+        diagnosis_key = normalize_diagnosis(possible_diagnosis)
+        if not diagnosis_key or not self.fast_path_threshold:
+            return None
+        
+        scored = []
+        for _, row in self.index.search(possible_diagnosis, k=self.top_k or 8):
+            similarity = max(
+                SequenceMatcher(None, diagnosis_key, normalize_diagnosis(row['sub_condition'])).ratio(),
+                SequenceMatcher(None, diagnosis_key, normalize_diagnosis(f"{row['condition']} {row['sub_condition']}")).ratio()
+            )
+            scored.append((similarity, row))
+        if not scored:
+            return None
+        
+        scored.sort(key=lambda item: -item[0])
+        best_similarity, best_row = scored[0]
+        runner_up = scored[1][0] if len(scored) > 1 else 0.0
+        if best_similarity < self.fast_path_threshold or best_similarity - runner_up < FAST_PATH_MARGIN:
+            return None
+        if self.index.rows_containing(possible_diagnosis) > 1:
+            return None
+        
+        self.fast_path_stats["fast_path"] += 1
+        return {
+            "matched_condition": f"{best_row['condition']} → {best_row['sub_condition']}",
+            "diagnostics": best_row['tests']
+        }
+    
+    def _maybe_audit(self, possible_diagnosis: str, investigative_history: str, fast_result: Dict[str, Any]):
+        """On a sample of fast-path matches, ask the LLM as well (in the background) and record whether they agree"""
+        if not llm_gateway.client or random.random() >= self.fast_path_audit_rate:
+            return
+        # Not tied to the request that triggered it, or to that request's turn budget
+        task = asyncio.create_task(
+            self._audit(possible_diagnosis, investigative_history, fast_result),
+            context=contextvars.Context()
+        )
+        self._audits.add(task)
+        task.add_done_callback(self._audits.discard)
+    
+    async def _audit(self, possible_diagnosis: str, investigative_history: str, fast_result: Dict[str, Any]):
+        self.fast_path_stats["audits"] += 1
+        try:
+            llm_result = await self._llm_match(possible_diagnosis, investigative_history)
+        except Exception as e:
+            self.fast_path_stats["audit_errors"] += 1
+            print(f"[DIAGNOSTICS_AUDIT] LLM check failed for '{possible_diagnosis}': {e}")
+            return
+        llm_condition = (llm_result or {}).get("matched_condition")
+        if normalize_diagnosis(llm_condition or "") == normalize_diagnosis(fast_result["matched_condition"]):
+            self.fast_path_stats["agreements"] += 1
+        else:
+            self.fast_path_stats["disagreements"] += 1
+            self.recent_disagreements.append({
+                "diagnosis": possible_diagnosis,
+                "fast_path": fast_result["matched_condition"],
+                "llm": llm_condition
+            })
+            print(f"[DIAGNOSTICS_AUDIT] Fast path '{fast_result['matched_condition']}' vs LLM '{llm_condition}' for '{possible_diagnosis}'")
+    
+    def get_fast_path_metrics(self) -> Dict[str, Any]:
+        stats = self.fast_path_stats
+        audited = stats["agreements"] + stats["disagreements"]
+        return {
+            "threshold": self.fast_path_threshold,
+            "audit_rate": self.fast_path_audit_rate,
+            **stats,
+            "fast_path_rate": round(stats["fast_path"] / stats["lookups"], 3) if stats["lookups"] else 0.0,
+            "agreement_rate": round(stats["agreements"] / audited, 3) if audited else None,
+            "recent_disagreements": list(self.recent_disagreements)
+        }
+    
+    def candidate_conditions(self, possible_diagnosis: str, investigative_history: str) -> List[Dict]:
+        """
+        Top-k CSV rows for the diagnosis from the BM25 index. Without any lexical match a small CSV is
+        sent whole so the model can still match semantically; a large one yields no candidates.
+        """
+        self.retrieval_stats["requests"] += 1
+        if not self.top_k:
+            candidates = self.conditions
+        else:
+            candidates = [row for _, row in self.index.search(possible_diagnosis, investigative_history, self.top_k)]
+            if not candidates:
+                if len(self.conditions) <= self.full_list_max_rows:
+                    self.retrieval_stats["full_list"] += 1
+                    candidates = self.conditions
+                else:
+                    self.retrieval_stats["no_candidates"] += 1
+        self.retrieval_stats["rows_sent"] += len(candidates)
+        return candidates
+    
+    def get_retrieval_metrics(self) -> Dict[str, Any]:
+        requests = self.retrieval_stats["requests"]
+        return {
+            "rows": len(self.conditions),
+            "top_k": self.top_k,
+            "full_list_max_rows": self.full_list_max_rows,
+            "csv_version": self.csv_version,
+            "index_build_ms": self.retrieval_stats["index_build_ms"],
+            "requests": requests,
+            "avg_rows_sent": round(self.retrieval_stats["rows_sent"] / requests, 1) if requests else 0.0,
+            "full_list": self.retrieval_stats["full_list"],
+            "no_candidates": self.retrieval_stats["no_candidates"]
+        }
+    
     def _create_matching_prompt(self, diagnosis: str, history: str, conditions: List[Dict]) -> str:
         """Create prompt for LLM to match diagnosis with CSV conditions"""
         
@@ -120,72 +338,31 @@ INSTRUCTIONS:
 2. Use fuzzy matching - look for similar medical terms, symptoms, or conditions
 3. Focus primarily on the SUB-CONDITION for matching
 4. If you find a relevant match, extract the pre-consultation diagnostics
-5. Group the diagnostics by type (Imaging, Blood Tests, Clinical Tests, etc.)
+5. Group the tests into imaging, blood_tests, clinical_tests and other
 6. Return ONLY the test names without any explanations or descriptions
 
-RESPONSE FORMAT (JSON only):
-{{
-    "matched_condition": "Condition → Sub-Condition" or null,
-    "diagnostics": {{
-        "Imaging": ["X-Ray", "MRI"],
-        "Blood Tests": ["CBC", "ESR"],
-        "Clinical Tests": ["Physical examination", "Range of motion test"],
-        "Other": ["Additional tests"]
-    }}
-}}
-
 IMPORTANT: Return only concise test names without explanations, descriptions, or reasoning. Example:
 - Good: "X-Ray (AP, Lateral, Sunrise views)", "MRI", "CBC"
 - Bad: "X-Ray (to rule out fractures)", "MRI of the knee for detailed assessment"
 
-If no relevant match is found, return:
-{{
-    "matched_condition": null,
-    "diagnostics": {{}}
-}}
+Set matched_condition to "Condition → Sub-Condition", or to null with empty test lists if no relevant match is found.
 
 Generate response:"""
         
         return prompt
     
     def _parse_diagnostics_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse LLM response and extract diagnostics information"""
-        try:
-            # Try to extract JSON from response
-            response_text = response_text.strip()
-            
-            # Find JSON in the response
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
-            
-            if start_idx != -1 and end_idx != -1:
-                json_text = response_text[start_idx:end_idx]
-                result = json.loads(json_text)
-                
-                # Validate structure
-                if not isinstance(result.get('diagnostics'), dict):
-                    result['diagnostics'] = {}
-                
-                return result
-            else:
-                # Fallback parsing if JSON not found
-                return {
-                    "matched_condition": None,
-                    "diagnostics": {}
-                }
-                
-        except json.JSONDecodeError as e:
-            print(f"[DIAGNOSTICS_ERROR] JSON parsing error: {e}")
-            return {
-                "matched_condition": None,
-                "diagnostics": {}
-            }
-        except Exception as e:
-            print(f"[DIAGNOSTICS_ERROR] Response parsing error: {e}")
-            return {
-                "matched_condition": None,
-                "diagnostics": {}
-            }
+        """Turn the schema-constrained LLM response into diagnostics grouped by type"""
+        result = json.loads(response_text)
+        diagnostics = {
+            group: result[field]
+            for field, group in DIAGNOSTIC_GROUPS.items()
+            if result.get(field)
+        }
+        return {
+            "matched_condition": result.get("matched_condition"),
+            "diagnostics": diagnostics
+        }
 
 # Global instance
 diagnostics_service = DiagnosticsService()
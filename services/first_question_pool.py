@@ -0,0 +1,178 @@
+"""
+First Question Pool - Pre-generated interview openers keyed by demographics and prompt version,
+so start-interview is a lookup instead of a Gemini round trip
+"""
+
+import asyncio
+import random
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.config import settings
+from services.medical_expert_service import MedicalExpertService
+from services.patient_phrases import QUESTION_ERROR_FALLBACK
+from services.prompt_registry import interview_prompts
+
+# The interview prompt adapts its wording for under-18s and over-65s, so those are the bands
+AGE_BANDS = [(17, "child", 10), (65, "adult", 40), (None, "senior", 72)]
+
+PoolKey = Tuple[str, str, str, str]
+
+
+def age_band(age: Any) -> Tuple[str, int]:
+    """Age band name and the representative age used to generate its openers"""
+    try:
+        age = int(age)
+    except (TypeError, ValueError):
+        age = 40
+    for upper, band, representative in AGE_BANDS:
+        if upper is None or age <= upper:
+            return band, representative
+    return AGE_BANDS[-1][1], AGE_BANDS[-1][2]
+
+
+class FirstQuestionPool:
+    def __init__(self, generate: Optional[Callable[[dict], Awaitable[Optional[str]]]] = None):
+        self.enabled = settings.first_question_pool_enabled
+        self.pool_size = settings.first_question_pool_size
+        self.low_water = settings.first_question_pool_low_water
+        self.warm = settings.first_question_pool_warm
+        self.warm_genders = settings.first_question_pool_warm_genders
+        self.warm_concurrency = settings.first_question_pool_warm_concurrency
+        self.generate = generate or self._generate
+
+        self.pools: Dict[PoolKey, deque] = {}
+        self._refills: Dict[PoolKey, asyncio.Task] = {}
+        self._expert: Optional[MedicalExpertService] = None
+        self.stats = {"hits": 0, "misses": 0, "refills": 0, "generated": 0, "failed": 0}
+
+    def key(self, patient: dict) -> PoolKey:
+        band, _ = age_band(patient.get("age"))
+        return (
+            band,
+            str(patient.get("gender", "")).strip().lower(),
+            str(patient.get("chosen_department") or "Not specified").strip().lower(),
+            interview_prompts.version
+        )
+
+    def _representative_patient(self, patient: dict) -> dict:
+        """The demographics the pool is keyed by, and nothing personal"""
+        _, representative_age = age_band(patient.get("age"))
+        return {
+            "name": "Patient",
+            "age": representative_age,
+            "gender": patient.get("gender", ""),
+            "chosen_department": patient.get("chosen_department") or "Not specified"
+        }
+
+    async def _generate(self, patient: dict) -> Optional[str]:
+        if self._expert is None:
+            self._expert = MedicalExpertService()
+        result = await self._expert.generate_next_question(
+            patient=patient,
+            conversation_history=[],
+            question_number=1,
+            unknown_count=0
+        )
+        question = (result or {}).get("question", "").strip()
+        # Error fallbacks and openers that address the placeholder name are not reusable
+        if not question or question == QUESTION_ERROR_FALLBACK or patient["name"].lower() in question.lower():
+            return None
+        return question
+
+    def take(self, patient: dict) -> Optional[str]:
+        """A random pooled opener for this patient's demographics, or None on a miss. Tops the pool up when low."""
+        if not self.enabled:
+            return None
+
+        key = self.key(patient)
+        self._drop_stale_versions(key[3])
+        pool = self.pools.setdefault(key, deque())
+
+        question = None
+        if pool:
+            index = random.randrange(len(pool))
+            question = pool[index]
+            del pool[index]
+            self.stats["hits"] += 1
+        else:
+            self.stats["misses"] += 1
+
+        if len(pool) < self.low_water:
+            self._schedule_refill(key, self._representative_patient(patient))
+        return question
+
+    def _drop_stale_versions(self, version: str):
+        """Openers from an older prompt version are never served once the prompts reload"""
+        for key in [k for k in self.pools if k[3] != version]:
+            del self.pools[key]
+
+    def start_warming(self, departments: List[str]):
+        """
+        Fill the pools of the common keys in the background (called from the app lifespan): every age band
+        for each warm gender and department, plus no department chosen. Uses the same refills as take().
+        """
+        if not (self.enabled and self.warm):
+            return
+        limit = asyncio.Semaphore(max(1, self.warm_concurrency))
+        patients = [
+            {"age": representative_age, "gender": gender, "chosen_department": department}
+            for _, _, representative_age in AGE_BANDS
+            for gender in self.warm_genders
+            for department in [*departments, None]
+        ]
+        for patient in patients:
+            self._schedule_refill(self.key(patient), self._representative_patient(patient), limit)
+        print(f"[FIRST_QUESTION_POOL] Warming {len(self._refills)} pools, {self.warm_concurrency} at a time")
+
+    def _schedule_refill(self, key: PoolKey, patient: dict, limit: Optional[asyncio.Semaphore] = None):
+        task = self._refills.get(key)
+        if task and not task.done():
+            return
+        self._refills[key] = asyncio.create_task(self._refill(key, patient, limit))
+
+    async def _refill(self, key: PoolKey, patient: dict, limit: Optional[asyncio.Semaphore] = None):
+        if limit is not None:
+            async with limit:
+                return await self._refill(key, patient)
+        pool = self.pools.setdefault(key, deque())
+        missing = self.pool_size - len(pool)
+        if missing <= 0:
+            return
+        self.stats["refills"] += 1
+        results = await asyncio.gather(*(self.generate(patient) for _ in range(missing)), return_exceptions=True)
+        added = 0
+        for question in results:
+            if isinstance(question, BaseException) or not question:
+                self.stats["failed"] += 1
+            elif question not in pool and len(pool) < self.pool_size:
+                pool.append(question)
+                added += 1
+        self.stats["generated"] += added
+        print(f"[FIRST_QUESTION_POOL] Refilled {key[:3]} ({key[3]}): +{added}, {len(pool)} pooled")
+
+    async def stop(self):
+        """Cancel background refills (called from the app lifespan)"""
+        tasks = [task for task in self._refills.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refills.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        served = self.stats["hits"] + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "pool_size": self.pool_size,
+            "low_water": self.low_water,
+            "hit_rate": round(self.stats["hits"] / served, 3) if served else 0.0,
+            **self.stats,
+            "pools": [
+                {"age_band": band, "gender": gender, "department": department, "prompt_version": version, "size": len(pool)}
+                for (band, gender, department, version), pool in self.pools.items()
+            ]
+        }
+
+
+# Global first question pool instance
+first_question_pool = FirstQuestionPool()
@@ -2,23 +2,32 @@
 Follow-up Service - Handles follow-up interviews and assessments for returning patients
 """
 
-import os
+import asyncio
 import warnings
-from google import genai
 from google.genai import types
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Union
 from datetime import datetime
 import json
 from pydantic import BaseModel
 
 from models.patient import PatientInfo
-from models.medical import QuestionAnswer, InterviewSession
+from models.medical import QuestionAnswer, InterviewSession, ConversationTranscript
 from models.assessment import InvestigativeResult
 from core.config import settings
+from core.deadline import DeadlineExceeded
+from core.streaming import PartialJsonStringField
+from services.llm_gateway import llm_gateway
+from services.context_cache import context_cache
+from services.prompt_builder import PromptBuilder
+from services.prompt_registry import followup_prompts, language_for
+from services.patient_phrases import (
+    FOLLOWUP_ALTERNATIVE_QUESTIONS, FOLLOWUP_CLOSING_QUESTIONS, FOLLOWUP_EMPTY_QUESTION_FALLBACK, FOLLOWUP_FALLBACK_QUESTIONS
+)
 
 # Suppress Pydantic field shadowing warnings from google-genai package
 warnings.filterwarnings("ignore", message="Field name .* shadows an attribute in parent", category=UserWarning)
 
+
 class FollowupQuestionResponse(BaseModel):
     question: str
 
@@ -28,24 +37,145 @@ class FollowupAssessmentResponse(BaseModel):
 
 class FollowupService:
     def __init__(self):
-        # Initialize Gemini client
-        self.client = genai.Client(api_key=settings.gemini_api_key)
+        # Gemini calls go through the shared gateway client
         self.model = settings.gemini_model
         
-        # Load follow-up prompts
-        self.prompts = self._load_followup_prompts()
+        # Follow-up prompts, reloaded by the registry when the file changes
+        self.prompts = followup_prompts
+    
+    def get_fallback_question(self, question_number: int,
+                              conversation_history: Optional[Union[ConversationTranscript, List[Dict]]] = None) -> str:
+        """
+        Fixed follow-up question used when the API fails. With the conversation so far,
+        picks one in the patient's language that avoids topics already covered.
+        """
+        transcript = ConversationTranscript.of(conversation_history or [])
+        if transcript:
+            return self._generate_alternative_question(question_number, transcript)
+        return FOLLOWUP_FALLBACK_QUESTIONS[min(question_number - 1, len(FOLLOWUP_FALLBACK_QUESTIONS) - 1)]
+    
+    def format_previous_medical_record(self, consultation_data: Optional[dict]) -> str:
+        """
+        Format the previous consultation from raw_pradhi_response for the follow-up prompts.
+        Prescription, next steps, symptom and investigation lists are cut from the tail,
+        least relevant list first, so the record stays inside followup_record_token_budget.
+        """
+        if not consultation_data or not consultation_data.get("raw_pradhi_response"):
+            return "Previous consultation data available"
         
-    def _load_followup_prompts(self) -> dict:
-        """Load follow-up prompts from JSON file"""
         try:
-            prompts_path = os.path.join(os.path.dirname(__file__), '..', 'prompts', 'followup_service_prompts.json')
-            with open(prompts_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            pradhi_data = consultation_data["raw_pradhi_response"]
+            if isinstance(pradhi_data, str):
+                pradhi_data = json.loads(pradhi_data)
+            
+            diagnosis = pradhi_data.get('insights', {}).get('Diagnosis')
+            builder = PromptBuilder("previous_medical_record", budget=settings.followup_record_token_budget)
+            builder.add("header", f"""Previous Consultation Date: {consultation_data.get('consultation_date', 'N/A')}
+Doctor: {consultation_data.get('doctor_name', 'N/A')}
+Diagnosis: {diagnosis[0] if diagnosis else 'N/A'}
+""")
+            # Follow-up questions start with treatment adherence, so prescriptions are trimmed last
+            for priority, (label, key) in enumerate([
+                ("Investigation", "investigation"),
+                ("Associated Symptoms", "associated_symptoms"),
+                ("Next Steps", "next_steps"),
+                ("Prescription Data", "prescription_data")
+            ], 1):
+                builder.add_items(
+                    key, [repr(item) for item in pradhi_data.get(key, [])], priority=priority,
+                    trim_from="end", separator=", ", prefix=f"{label}: [", suffix="]\n",
+                    omitted_note=", ... {count} more"
+                )
+            
+            sections = builder.build()
+            return (sections["header"] + sections["prescription_data"] + sections["investigation"]
+                    + sections["next_steps"] + sections["associated_symptoms"]).strip()
+            
         except Exception as e:
-            print(f"Error loading follow-up prompts: {e}")
-            return {}
+            print(f"[FOLLOWUP_DEBUG] Error parsing previous medical record: {e}")
+            return f"Previous consultation on {consultation_data.get('consultation_date', 'N/A')} with {consultation_data.get('doctor_name', 'N/A')}"
+    
+    def _budgeted_history(self, call_type: str, transcript: ConversationTranscript,
+                          system_prompt: str, user_prompt: str) -> str:
+        """
+        Follow-up transcript that fits the call type's token budget next to the system
+        prompt and the rest of the user prompt. The oldest exchanges are cut down to the
+        patient's answer first, then omitted; the last two always stay whole.
+        """
+        builder = PromptBuilder(call_type)
+        builder.add("system", system_prompt)
+        builder.add("template", user_prompt)
+        builder.add_items("history", transcript.exchanges, priority=1, compact=transcript.answers, keep=2,
+                          omitted_note="[{count} earlier exchanges omitted]\n\n")
+        return builder.build()["history"]
+    
+    async def _build_followup_question_request(
+        self,
+        patient_age: int,
+        patient_gender: str,
+        doctor_department: str,
+        last_consultation_date: str,
+        previous_medical_record: str,
+        question_number: int,
+        transcript: ConversationTranscript
+    ) -> Dict:
+        """Build the Gemini contents and config for the next follow-up question"""
+        # Determine current section based on question number (now 6 total)
+        current_section = "Treatment Adherence" if question_number <= 3 else "Condition Assessment"
+        
+        # One prompt version for the whole request
+        prompts = self.prompts.current()
+        
+        def render_user_prompt(history: str) -> str:
+            return prompts.render(
+                "User Instructions for Follow-up Interview",
+                patient_age=patient_age,
+                patient_gender=patient_gender,
+                doctor_department=doctor_department,
+                last_consultation_date=last_consultation_date,
+                previous_medical_record=previous_medical_record,
+                question_number=question_number,
+                current_section=current_section,
+                conversation_history=history
+            )
+        
+        # Precompiled system prompt with the language rule for this question number
+        enhanced_system_prompt = prompts.system_instruction(
+            "System Instructions for Follow-up Interview", language_for(question_number)
+        )
+        
+        # Format user prompt with patient data, keeping the history inside the question budget
+        formatted_user_prompt = render_user_prompt(self._budgeted_history(
+            "followup_question", transcript, enhanced_system_prompt, render_user_prompt("")
+        ))
+        
+        # Cached content belongs to one model, so pick the model before building the config
+        model = llm_gateway.route("followup_question")
+        
+        # The system prompt goes in as a (cached) system instruction rather than user text
+        return {
+            "model": model,
+            "prompt_version": prompts.version,
+            "contents": [
+                types.Content(
+                    role="user",
+                    parts=[
+                        types.Part(text=formatted_user_prompt)
+                    ]
+                )
+            ],
+            "config": await context_cache.generation_config(
+                model=model,
+                system_instruction=enhanced_system_prompt,
+                label="followup-question",
+                temperature=0.7,
+                max_output_tokens=500,
+                response_schema=FollowupQuestionResponse,
+                response_mime_type="application/json"
+            )
+        }
     
-    def generate_followup_question(
+    async def generate_followup_question(
         self,
         patient_age: int,
         patient_gender: str,
@@ -53,152 +183,124 @@ class FollowupService:
         last_consultation_date: str,
         previous_medical_record: str,
         question_number: int,
-        conversation_history: str
+        conversation_history: Union[ConversationTranscript, List[Dict]]
     ) -> str:
         """
-        Generate next follow-up question based on patient context and conversation history
+        Generate next follow-up question based on patient context and conversation history.
+        Pass the session's ConversationTranscript so the history is not re-rendered every turn.
         """
+        transcript = ConversationTranscript.of(conversation_history)
         try:
             print(f"[FOLLOWUP_DEBUG] Starting question generation for question {question_number}")
             print(f"[FOLLOWUP_DEBUG] Patient: {patient_age}y {patient_gender}, Dept: {doctor_department}")
-            print(f"[FOLLOWUP_DEBUG] Conversation history length: {len(conversation_history)}")
-            
-            # Add timeout protection for Gemini API calls
-            import asyncio
-            import signal
-            
-            # Fallback question in case of API issues
-            fallback_questions = [
-                "How have you been feeling since your last visit?",
-                "Are you taking your prescribed medications as directed?",
-                "Have you noticed any changes in your condition?",
-                "Are you experiencing any new symptoms?",
-                "How has your treatment been working for you?",
-                "Is there anything specific that's been bothering you?"
-            ]
-            
-            # Determine current section based on question number (now 6 total)
-            current_section = "Treatment Adherence" if question_number <= 3 else "Condition Assessment"
+            print(f"[FOLLOWUP_DEBUG] Conversation history length: {len(transcript)} exchanges")
             
-            # Get prompts
-            system_prompt = self.prompts.get("System Instructions for Follow-up Interview", "")
-            user_prompt = self.prompts.get("User Instructions for Follow-up Interview", "")
-            
-            # Format user prompt with patient data
-            formatted_user_prompt = user_prompt.format(
+            request = await self._build_followup_question_request(
                 patient_age=patient_age,
                 patient_gender=patient_gender,
                 doctor_department=doctor_department,
                 last_consultation_date=last_consultation_date,
                 previous_medical_record=previous_medical_record,
                 question_number=question_number,
-                current_section=current_section,
-                conversation_history=conversation_history
+                transcript=transcript
             )
             
             print(f"[FOLLOWUP_DEBUG] Calling Gemini API for question generation")
             
-            # Add language instruction to system prompt based on question number
-            if question_number == 1:
-                enhanced_system_prompt = f"{system_prompt}\n\nIMPORTANT: Respond in Tamil."
-            else:
-                enhanced_system_prompt = f"{system_prompt}\n\nIMPORTANT: Look at the patient's most recent answer in the conversation history. Respond in the same language the patient used in their last answer."
-            
             # Generate question using Gemini
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[
-                    types.Content(
-                        role="user",
-                        parts=[
-                            types.Part(text=f"{enhanced_system_prompt}\n\n{formatted_user_prompt}")
-                        ]
-                    )
-                ],
-                config=types.GenerateContentConfig(
-                    temperature=0.7,
-                    max_output_tokens=500,
-                    response_schema=FollowupQuestionResponse,
-                    response_mime_type="application/json"
-                )
+            response = await llm_gateway.generate_content(
+                call_type="followup_question",
+                model=request["model"],
+                contents=request["contents"],
+                config=request["config"],
+                prompt_version=request["prompt_version"]
             )
             
             if response and response.text:
-                try:
-                    # Try direct JSON parsing
-                    question_data = json.loads(response.text)
-                    generated_question = question_data.get("question", "")
-                    
-                    # Check if AI wants to end interview early
-                    if "INTERVIEW_COMPLETE" in generated_question:
-                        return "INTERVIEW_COMPLETE"
-                        
-                    return generated_question or "Can you tell me more about your current condition?"
-                    
-                except json.JSONDecodeError as e:
-                    print(f"[FOLLOWUP_DEBUG] JSON parse error: {e}, raw response: {response.text[:200]}")
-                    # Try to extract question from markdown or plain text
-                    import re
-                    question_match = re.search(r'"question":\s*"([^"]+)"', response.text)
-                    if question_match:
-                        return question_match.group(1)
+                # The response is constrained to the FollowupQuestionResponse schema
+                generated_question = json.loads(response.text).get("question", "")
+                
+                # Check if AI wants to end interview early
+                if "INTERVIEW_COMPLETE" in generated_question:
+                    return "INTERVIEW_COMPLETE"
                     
-                    # Use response as question if it seems reasonable
-                    if response.text and len(response.text.strip()) < 200:
-                        return response.text.strip()
+                return generated_question or FOLLOWUP_EMPTY_QUESTION_FALLBACK
             
             # Use fallback if no response
             print(f"[FOLLOWUP_DEBUG] No response from Gemini API, using fallback")
-            return fallback_questions[min(question_number - 1, len(fallback_questions) - 1)]
+            return self.get_fallback_question(question_number)
             
+        except DeadlineExceeded as e:
+            print(f"[DEADLINE] {e}, using fallback question")
+            return self.get_fallback_question(question_number, transcript)
         except Exception as e:
             print(f"[FOLLOWUP_DEBUG] Error generating follow-up question: {e}")
             import traceback
             traceback.print_exc()
-            return fallback_questions[min(question_number - 1, len(fallback_questions) - 1)]
+            return self.get_fallback_question(question_number)
+    
+    async def stream_followup_question(
+        self,
+        patient_age: int,
+        patient_gender: str,
+        doctor_department: str,
+        last_consultation_date: str,
+        previous_medical_record: str,
+        question_number: int,
+        conversation_history: Union[ConversationTranscript, List[Dict]]
+    ) -> AsyncIterator[str]:
+        """
+        Stream the next follow-up question as text deltas decoded from the JSON response.
+        Errors are raised to the caller, which owns the fallback question.
+        """
+        print(f"[FOLLOWUP_DEBUG] Streaming question {question_number}")
+        
+        request = await self._build_followup_question_request(
+            patient_age=patient_age,
+            patient_gender=patient_gender,
+            doctor_department=doctor_department,
+            last_consultation_date=last_consultation_date,
+            previous_medical_record=previous_medical_record,
+            question_number=question_number,
+            transcript=ConversationTranscript.of(conversation_history)
+        )
+        
+        question_field = PartialJsonStringField("question")
+        async for chunk in llm_gateway.generate_content_stream(
+            call_type="followup_question",
+            model=request["model"],
+            contents=request["contents"],
+            config=request["config"],
+            prompt_version=request["prompt_version"]
+        ):
+            if chunk and chunk.text:
+                delta = question_field.feed(chunk.text)
+                if delta:
+                    yield delta
     
-    def _generate_alternative_question(self, question_number: int, conversation_history: str) -> str:
+    def _generate_alternative_question(self, question_number: int, transcript: ConversationTranscript) -> str:
         """Generate alternative questions when AI fails or repeats"""
-        # Detect language from conversation history
+        # Detect language from the patient's answers
         patient_using_english = False
-        if conversation_history:
-            # Look for patient answers (A1, A2, etc.)
-            lines = conversation_history.split('\n')
-            for line in lines:
-                if line.strip().startswith('A') and ':' in line:
-                    answer = line.split(':', 1)[1].strip()
-                    # Simple check: if answer contains English alphabet without Tamil script
-                    has_english = any(c.isascii() and c.isalpha() for c in answer)
-                    has_tamil = any('\u0b80' <= c <= '\u0bff' for c in answer)
-                    if has_english and not has_tamil:
-                        patient_using_english = True
-                        break
+        for record in transcript.records:
+            answer = record["answer"]
+            # Simple check: if answer contains English alphabet without Tamil script
+            has_english = any(c.isascii() and c.isalpha() for c in answer)
+            has_tamil = any('\u0b80' <= c <= '\u0bff' for c in answer)
+            if has_english and not has_tamil:
+                patient_using_english = True
+                break
         
         # Analyze what has been asked already
-        asked_about_medications = "medic" in conversation_history.lower()
-        asked_about_feelings = "feel" in conversation_history.lower() or "how are" in conversation_history.lower()
-        asked_about_symptoms = "symptom" in conversation_history.lower()
-        asked_about_activities = "activit" in conversation_history.lower() or "exercise" in conversation_history.lower()
+        history = transcript.text.lower()
+        asked_about_medications = "medic" in history
+        asked_about_feelings = "feel" in history or "how are" in history
+        asked_about_symptoms = "symptom" in history
+        asked_about_activities = "activit" in history or "exercise" in history
         
         # Generate unique questions based on what hasn't been covered and language preference
-        if patient_using_english:
-            alternative_questions = [
-                "Have you been taking your prescribed medications as directed?",
-                "Are you experiencing any pain or discomfort currently?", 
-                "Have you noticed any changes in your condition since the last visit?",
-                "Are you following any specific dietary or activity restrictions?",
-                "Have you completed any recommended tests or follow-up procedures?",
-                "Is there anything specific that's been bothering you lately?"
-            ]
-        else:
-            alternative_questions = [
-                "நீங்கள் பரிந்துரைக்கப்பட்ட மருந்துகளை தவறாமல் எடுத்துக்கொள்கிறீர்களா?",
-                "தற்போது உங்களுக்கு ஏதேனும் வலி அல்லது அசௌகரியம் இருக்கிறதா?",
-                "கடைசி வருகைக்குப் பிறகு உங்கள் நிலையில் ஏதேனும் மாற்றங்கள் கவனித்தீர்களா?",
-                "நீங்கள் ஏதேனும் குறிப்பிட்ட உணவு அல்லது செயல்பாட்டு கட்டுப்பாடுகளை பின்பற்றுகிறீர்களா?",
-                "பரிந்துரைக்கப்பட்ட பரிசோதனைகள் அல்லது பின்தொடர்தல் நடைமுறைகளை நீங்கள் முடித்துவிட்டீர்களா?",
-                "உங்களை குறிப்பாக தொந்தரவு செய்யும் ஏதாவது இருக்கிறதா?"
-            ]
+        language = "en" if patient_using_english else "ta"
+        alternative_questions = FOLLOWUP_ALTERNATIVE_QUESTIONS[language]
         
         # Filter out questions similar to what's already been asked
         available_questions = []
@@ -215,73 +317,72 @@ class FollowupService:
             return available_questions[0]
         
         # Final fallback based on question number and language
-        if patient_using_english:
-            if question_number <= 3:
-                return "Can you tell me about your current treatment plan?"
-            else:
-                return "Is there anything else you'd like to discuss about your condition?"
-        else:
-            if question_number <= 3:
-                return "உங்கள் தற்போதைய சிகிச்சை திட்டத்தைப் பற்றி சொல்ல முடியுமா?"
-            else:
-                return "உங்கள் நிலையைப் பற்றி வேறு ஏதாவது விவாதிக்க விரும்புகிறீர்களா?"
+        early, late = FOLLOWUP_CLOSING_QUESTIONS[language]
+        return early if question_number <= 3 else late
     
-    def generate_followup_assessment(
+    async def generate_followup_assessment(
         self,
         patient_age: int,
         patient_gender: str,
         chief_complaint: str,
         previous_visit_summary: str,
-        follow_up_interview: str
+        follow_up_interview: Union[ConversationTranscript, List[Dict]]
     ) -> Dict:
         """
         Generate comprehensive follow-up assessment based on interview data
         """
+        transcript = ConversationTranscript.of(follow_up_interview)
         try:
-            # Get prompts
-            system_prompt = self.prompts.get("System Instructions for Follow-up Assessment", "")
-            user_prompt = self.prompts.get("User Instructions for Follow-up Assessment", "")
+            # One prompt version for the whole assessment
+            prompts = self.prompts.current()
+            system_prompt = prompts.system_instruction("System Instructions for Follow-up Assessment")
             
-            # Format user prompt with patient data
-            formatted_user_prompt = user_prompt.format(
-                patient_age=patient_age,
-                patient_gender=patient_gender,
-                chief_complaint=chief_complaint,
-                previous_visit_summary=previous_visit_summary,
-                follow_up_interview=follow_up_interview
-            )
+            def render_user_prompt(interview: str) -> str:
+                return prompts.render(
+                    "User Instructions for Follow-up Assessment",
+                    patient_age=patient_age,
+                    patient_gender=patient_gender,
+                    chief_complaint=chief_complaint,
+                    previous_visit_summary=previous_visit_summary,
+                    follow_up_interview=interview
+                )
+            
+            # Format user prompt with patient data, trimming the interview only if it outgrows the budget
+            formatted_user_prompt = render_user_prompt(self._budgeted_history(
+                "followup_assessment", transcript, system_prompt, render_user_prompt("")
+            ))
             
             # Generate assessment using Gemini
-            response = self.client.models.generate_content(
-                model=self.model,
+            model = llm_gateway.route("followup_assessment")
+            response = await llm_gateway.generate_content(
+                call_type="followup_assessment",
+                model=model,
                 contents=[
                     types.Content(
                         role="user",
                         parts=[
-                            types.Part(text=f"{system_prompt}\n\n{formatted_user_prompt}")
+                            types.Part(text=formatted_user_prompt)
                         ]
                     )
                 ],
-                config=types.GenerateContentConfig(
+                config=await context_cache.generation_config(
+                    model=model,
+                    system_instruction=system_prompt,
+                    label="followup-assessment",
                     temperature=0.3,
-                    max_output_tokens=2000
-                )
+                    max_output_tokens=2000,
+                    response_schema=FollowupAssessmentResponse,
+                    response_mime_type="application/json"
+                ),
+                prompt_version=prompts.version
             )
             
             if response and response.text:
-                try:
-                    # Try to parse as JSON first
-                    assessment_data = json.loads(response.text)
-                    return {
-                        "investigative_history": assessment_data.get("investigative_history", ""),
-                        "possible_diagnosis": assessment_data.get("possible_diagnosis", "")
-                    }
-                except json.JSONDecodeError:
-                    # If not JSON, treat as plain text and structure it
-                    return {
-                        "investigative_history": response.text,
-                        "possible_diagnosis": "Assessment based on follow-up interview responses"
-                    }
+                assessment_data = json.loads(response.text)
+                return {
+                    "investigative_history": assessment_data.get("investigative_history", ""),
+                    "possible_diagnosis": assessment_data.get("possible_diagnosis", "")
+                }
             
             return self._generate_fallback_assessment()
             
@@ -293,10 +394,11 @@ class FollowupService:
         """Generate a basic fallback assessment structure"""
         return {
             "investigative_history": "Follow-up interview completed. Patient provided responses regarding treatment adherence and symptom progression.",
-            "possible_diagnosis": "Assessment based on follow-up interview responses"
+            "possible_diagnosis": "Assessment based on follow-up interview responses",
+            "fallback": True
         }
     
-    def conduct_followup_interview(
+    async def conduct_followup_interview(
         self,
         patient_age: int,
         patient_gender: str,
@@ -309,14 +411,17 @@ class FollowupService:
         """
         interview_data = {
             "questions_and_answers": [],
-            "conversation_history": "",
+            "conversation_history": ConversationTranscript(),
             "completed": False
         }
         
-        try:
-            # Generate up to 6 questions with early stopping capability
-            for question_num in range(1, 7):
-                question = self.generate_followup_question(
+        # Every question sees the same (empty) conversation history, so the whole plan is generated at once;
+        # the semaphore bounds how many of these calls one interview puts on the shared gateway
+        semaphore = asyncio.Semaphore(max(1, settings.followup_plan_concurrency))
+        
+        async def plan_question(question_num: int) -> str:
+            async with semaphore:
+                return await self.generate_followup_question(
                     patient_age=patient_age,
                     patient_gender=patient_gender,
                     doctor_department=doctor_department,
@@ -325,9 +430,16 @@ class FollowupService:
                     question_number=question_num,
                     conversation_history=interview_data["conversation_history"]
                 )
+        
+        # The plan always ends at question 6 without keeping it, so only questions 1-5 are generated
+        tasks = [asyncio.create_task(plan_question(question_num)) for question_num in range(1, 6)]
+        try:
+            # Walk the plan in order, so the first INTERVIEW_COMPLETE still ends it exactly where it did
+            for question_num, task in enumerate(tasks, 1):
+                question = await task
                 
                 # Check if AI wants to stop early (indicated by specific response)
-                if "INTERVIEW_COMPLETE" in question or question_num >= 6:
+                if "INTERVIEW_COMPLETE" in question:
                     interview_data["early_completion"] = True
                     break
                     
@@ -337,6 +449,9 @@ class FollowupService:
                     "answer": "",  # To be filled by frontend
                     "section": "Treatment Adherence" if question_num <= 3 else "Condition Assessment"
                 })
+            else:
+                # Reached question 6
+                interview_data["early_completion"] = True
             
             interview_data["completed"] = True
             return interview_data
@@ -344,6 +459,10 @@ class FollowupService:
         except Exception as e:
             print(f"Error conducting follow-up interview: {e}")
             return interview_data
+        finally:
+            # Questions after an early stop are not needed; ones still waiting on the semaphore never reach the model
+            for task in tasks:
+                task.cancel()
 
 # Create service instance
 followup_service = FollowupService()
@@ -0,0 +1,371 @@
+"""
+LLM Gateway - Single shared Gemini client with a global concurrency limit and queue metrics
+"""
+
+import asyncio
+import time
+import warnings
+from collections import deque
+from typing import Any, Dict, List, Optional
+from contextlib import asynccontextmanager
+from google import genai
+from google.genai import types
+
+from core.config import settings
+from core.deadline import budget_stage, call_timeout, deadline_passed
+from core.usage import usage_tracker
+from services.model_router import model_router
+
+# Suppress Pydantic field shadowing warnings from google-genai package
+warnings.filterwarnings("ignore", message="Field name .* shadows an attribute in parent", category=UserWarning)
+
+# Call types reported in the gateway metrics
+CALL_TYPES = ["question", "assessment", "diagnostics", "followup_question", "followup_assessment"]
+
+# Recent call latencies kept per call type for the hedge threshold
+LATENCY_WINDOW = 200
+# Use the configured percentile only once this many latencies have been seen
+HEDGE_MIN_SAMPLES = 20
+# Background recovery probes give up after this long
+PROBE_TIMEOUT = 10.0
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class LLMQueueTimeout(Exception):
+    """Raised when a call waits longer than the queue timeout for a free slot"""
+
+
+class LLMGateway:
+    def __init__(self):
+        self.model = settings.gemini_model
+        self.max_concurrency = settings.llm_max_concurrency
+        self.queue_timeout = settings.llm_queue_timeout
+        
+        self.hedging_enabled = settings.llm_hedging_enabled
+        self.hedge_call_types = set(settings.llm_hedge_call_types)
+        self.hedge_percentile = settings.llm_hedge_percentile
+        self.hedge_min_delay = settings.llm_hedge_min_delay
+        self.hedge_max_ratio = settings.llm_hedge_max_ratio
+
+        # One client for the whole process so every call shares the same connection pool
+        try:
+            self.client = genai.Client(api_key=settings.gemini_api_key)
+            print(f"[LLM_GATEWAY] Gemini client initialized (max concurrency {self.max_concurrency}, queue timeout {self.queue_timeout}s)")
+        except Exception as e:
+            print(f"[LLM_GATEWAY] Error initializing Gemini client: {e}")
+            self.client = None
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+        self.stats: Dict[str, Dict[str, Any]] = {call_type: self._empty_stats() for call_type in CALL_TYPES}
+
+    def _empty_stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": 0,
+            "queued": 0,
+            "completed": 0,
+            "failed": 0,
+            "queue_timeouts": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+            "last_wait": 0.0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "latencies": deque(maxlen=LATENCY_WINDOW),
+            "hedge_eligible": 0,
+            "hedges_fired": 0,
+            "hedges_won": 0,
+            "hedge_loser_tokens": 0
+        }
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semaphores bind to the running loop, so rebuild it if the loop changed (tests, reloads)"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _stats_for(self, call_type: str) -> Dict[str, Any]:
+        if call_type not in self.stats:
+            self.stats[call_type] = self._empty_stats()
+        return self.stats[call_type]
+
+    @asynccontextmanager
+    async def slot(self, call_type: str):
+        """Wait for a free concurrency slot, recording queue depth and wait time"""
+        stats = self._stats_for(call_type)
+        semaphore = self._get_semaphore()
+
+        stats["queued"] += 1
+        wait_start = time.perf_counter()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=call_timeout(self.queue_timeout))
+        except asyncio.TimeoutError:
+            if deadline_passed():
+                # The turn budget ran out first; budget_stage reports it as DeadlineExceeded
+                raise
+            stats["queue_timeouts"] += 1
+            print(f"[LLM_GATEWAY] {call_type} call timed out after {self.queue_timeout}s in queue")
+            raise LLMQueueTimeout(f"No LLM slot free within {self.queue_timeout}s for {call_type}")
+        finally:
+            stats["queued"] -= 1
+
+        wait = time.perf_counter() - wait_start
+        stats["last_wait"] = wait
+        stats["total_wait"] += wait
+        stats["max_wait"] = max(stats["max_wait"], wait)
+
+        stats["in_flight"] += 1
+        try:
+            yield
+            stats["completed"] += 1
+        except Exception:
+            stats["failed"] += 1
+            raise
+        finally:
+            stats["in_flight"] -= 1
+            semaphore.release()
+
+    def _record_usage(self, call_type: str, usage_metadata):
+        """Track prompt tokens served from the context cache versus sent fresh"""
+        if not usage_metadata:
+            return
+        prompt_tokens = usage_metadata.prompt_token_count or 0
+        cached_tokens = usage_metadata.cached_content_token_count or 0
+
+        stats = self._stats_for(call_type)
+        stats["prompt_tokens"] += prompt_tokens
+        stats["cached_tokens"] += cached_tokens
+        print(f"[LLM_GATEWAY] {call_type} prompt tokens: {prompt_tokens} ({cached_tokens} cached, {prompt_tokens - cached_tokens} fresh)")
+
+    def route(self, call_type: str) -> str:
+        """Model to use for this call type, chosen by the latency-aware model router"""
+        return model_router.choose(call_type)
+
+    def _record_model_outcome(self, model: str, start: float, error: Optional[BaseException] = None):
+        """Feed the model router's latency and error window"""
+        elapsed = time.perf_counter() - start
+        if error is None:
+            model_router.record_success(model, elapsed)
+        elif isinstance(error, asyncio.TimeoutError) and deadline_passed():
+            # Cut off by the turn budget: the model was slow, not broken
+            model_router.record_latency(model, elapsed)
+        elif not isinstance(error, asyncio.CancelledError):
+            model_router.record_failure(model, error)
+
+    async def _call(self, call_type: str, contents, config, model: str):
+        """One generate_content request under a concurrency slot, recording its latency"""
+        async with self.slot(call_type):
+            start = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    self.client.aio.models.generate_content(
+                        model=model,
+                        contents=contents,
+                        config=config
+                    ),
+                    timeout=call_timeout()
+                )
+            except BaseException as e:
+                self._record_model_outcome(model, start, e)
+                raise
+            self._record_model_outcome(model, start)
+            self._stats_for(call_type)["latencies"].append(time.perf_counter() - start)
+        return response
+
+    def hedge_delay(self, call_type: str) -> float:
+        """How long to wait on the first request before firing a duplicate"""
+        latencies = self._stats_for(call_type)["latencies"]
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return self.hedge_min_delay
+        return max(self.hedge_min_delay, _percentile(list(latencies), self.hedge_percentile))
+
+    def _hedge_allowed(self, call_type: str) -> bool:
+        """Cost cap: hedges fired stay within the configured fraction of eligible calls"""
+        stats = self._stats_for(call_type)
+        return stats["hedges_fired"] < stats["hedge_eligible"] * self.hedge_max_ratio
+
+    def _total_tokens(self, response) -> int:
+        usage_metadata = getattr(response, "usage_metadata", None)
+        if not usage_metadata:
+            return 0
+        return (usage_metadata.prompt_token_count or 0) + (usage_metadata.candidates_token_count or 0)
+
+    async def _hedged_call(self, call_type: str, contents, config, model: str):
+        """
+        Send the request and, if it has not answered by the hedge threshold, one duplicate.
+        The first successful response wins and the other request is cancelled.
+        """
+        stats = self._stats_for(call_type)
+        stats["hedge_eligible"] += 1
+        
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(self._call(call_type, contents, config, model))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay(call_type))
+            if done or not self._hedge_allowed(call_type):
+                return await primary
+            
+            stats["hedges_fired"] += 1
+            print(f"[LLM_GATEWAY] {call_type} slower than {self.hedge_delay(call_type):.2f}s, sending hedge request")
+            hedge = asyncio.ensure_future(self._call(call_type, contents, config, model))
+            
+            pending = {primary, hedge}
+            winner = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer a success; a failed request leaves the other one running
+                winner = next((task for task in done if not task.cancelled() and task.exception() is None), None)
+            
+            if winner is None:
+                return await primary
+            
+            if winner is hedge:
+                stats["hedges_won"] += 1
+            
+            # Both may finish together; otherwise the loser is cancelled and its prompt was still sent
+            loser = hedge if winner is primary else primary
+            if loser.done() and not loser.cancelled() and loser.exception() is None:
+                stats["hedge_loser_tokens"] += self._total_tokens(loser.result())
+            else:
+                usage_metadata = getattr(winner.result(), "usage_metadata", None)
+                stats["hedge_loser_tokens"] += (usage_metadata.prompt_token_count or 0) if usage_metadata else 0
+            return winner.result()
+        finally:
+            if not primary.done():
+                # Keep the slow tail in the latency window, or the threshold would drift down
+                stats["latencies"].append(time.perf_counter() - started)
+            for task in (primary, hedge):
+                if task and not task.done():
+                    task.cancel()
+
+    async def generate_content(self, call_type: str, contents, config=None, model: Optional[str] = None,
+                               prompt_version: Optional[str] = None):
+        """
+        Run a Gemini generate_content call through the shared client and concurrency limit.
+        Without an explicit model the call is routed to the fastest healthy model for its call type.
+        prompt_version (from the prompt registry) groups latency, tokens and cost per prompt revision.
+        """
+        if not self.client:
+            raise RuntimeError("Gemini client not initialized")
+        
+        model = model or self.route(call_type)
+        start = time.perf_counter()
+        async with budget_stage(f"gemini:{call_type}"):
+            if self.hedging_enabled and call_type in self.hedge_call_types:
+                response = await self._hedged_call(call_type, contents, config, model)
+            else:
+                response = await self._call(call_type, contents, config, model)
+        usage_metadata = getattr(response, "usage_metadata", None)
+        self._record_usage(call_type, usage_metadata)
+        # Tokens, latency and cost per session, call type and prompt version
+        usage_tracker.record(call_type, model, usage_metadata, time.perf_counter() - start, prompt_version)
+        return response
+
+    async def generate_content_stream(self, call_type: str, contents, config=None, model: Optional[str] = None,
+                                      prompt_version: Optional[str] = None):
+        """Stream a Gemini response chunk by chunk, holding one concurrency slot for the whole stream"""
+        if not self.client:
+            raise RuntimeError("Gemini client not initialized")
+        
+        model = model or self.route(call_type)
+        stream_start = time.perf_counter()
+        async with budget_stage(f"gemini:{call_type}"):
+            async with self.slot(call_type):
+                start = time.perf_counter()
+                try:
+                    stream = await asyncio.wait_for(
+                        self.client.aio.models.generate_content_stream(
+                            model=model,
+                            contents=contents,
+                            config=config
+                        ),
+                        timeout=call_timeout()
+                    )
+                    usage_metadata = None
+                    while True:
+                        # Each chunk must arrive within what is left of the turn budget
+                        try:
+                            chunk = await asyncio.wait_for(stream.__anext__(), timeout=call_timeout())
+                        except StopAsyncIteration:
+                            break
+                        # Usage is reported on the final chunk
+                        usage_metadata = getattr(chunk, "usage_metadata", None) or usage_metadata
+                        yield chunk
+                except GeneratorExit:
+                    # The consumer stopped reading; says nothing about the model
+                    raise
+                except BaseException as e:
+                    self._record_model_outcome(model, start, e)
+                    raise
+                self._record_model_outcome(model, start)
+        self._record_usage(call_type, usage_metadata)
+        usage_tracker.record(call_type, model, usage_metadata, time.perf_counter() - stream_start, prompt_version)
+
+    async def probe_model(self, model: str) -> float:
+        """Minimal request used by the model router's background probes; returns its latency"""
+        if not self.client:
+            raise RuntimeError("Gemini client not initialized")
+        
+        async with self.slot("probe"):
+            start = time.perf_counter()
+            await asyncio.wait_for(
+                self.client.aio.models.generate_content(
+                    model=model,
+                    contents="ping",
+                    config=types.GenerateContentConfig(max_output_tokens=1)
+                ),
+                timeout=PROBE_TIMEOUT
+            )
+            return time.perf_counter() - start
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of in-flight calls, queue depth and queue wait time per call type"""
+        call_types = {}
+        for call_type, stats in self.stats.items():
+            calls = stats["completed"] + stats["failed"]
+            call_types[call_type] = {
+                "in_flight": stats["in_flight"],
+                "queue_depth": stats["queued"],
+                "completed": stats["completed"],
+                "failed": stats["failed"],
+                "queue_timeouts": stats["queue_timeouts"],
+                "avg_queue_wait_ms": round(stats["total_wait"] / calls * 1000, 1) if calls else 0.0,
+                "max_queue_wait_ms": round(stats["max_wait"] * 1000, 1),
+                "last_queue_wait_ms": round(stats["last_wait"] * 1000, 1),
+                "prompt_tokens": stats["prompt_tokens"],
+                "cached_tokens": stats["cached_tokens"],
+                "fresh_tokens": stats["prompt_tokens"] - stats["cached_tokens"],
+                "p50_latency_ms": round(_percentile(list(stats["latencies"]), 50) * 1000, 1) if stats["latencies"] else 0.0,
+                "p99_latency_ms": round(_percentile(list(stats["latencies"]), 99) * 1000, 1) if stats["latencies"] else 0.0,
+                "hedge_delay_ms": round(self.hedge_delay(call_type) * 1000, 1),
+                "hedges_fired": stats["hedges_fired"],
+                "hedges_won": stats["hedges_won"],
+                "hedge_loser_tokens": stats["hedge_loser_tokens"]
+            }
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queue_timeout": self.queue_timeout,
+            "hedging": {
+                "enabled": self.hedging_enabled,
+                "call_types": sorted(self.hedge_call_types),
+                "percentile": self.hedge_percentile,
+                "max_ratio": self.hedge_max_ratio
+            },
+            "in_flight": sum(s["in_flight"] for s in self.stats.values()),
+            "queue_depth": sum(s["queued"] for s in self.stats.values()),
+            "call_types": call_types,
+            "prompt_versions": usage_tracker.prompt_version_metrics()
+        }
+
+
+# Global gateway instance
+llm_gateway = LLMGateway()
@@ -4,12 +4,12 @@ Integrates with Luxand Cloud API for face recognition and Supabase patient looku
 """
 
 import os
-import tempfile
-import requests
+import httpx
 from typing import Optional, Dict, Any
 from fastapi import UploadFile, HTTPException
 from dotenv import load_dotenv
 from services.supabase_service import supabase_service
+from core.deadline import DeadlineExceeded, budget_stage, call_timeout
 import logging
 
 load_dotenv()
@@ -33,97 +33,87 @@ class LuxandFaceRecognitionService:
         Add patient face to Luxand database using onehat_patient_id as name
         """
         try:
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-                content = await image_file.read()
-                tmp_file.write(content)
-                tmp_file_path = tmp_file.name
-            
-            try:
-                url = f"{self.base_url}/v2/person"
-                
-                # Use onehat_patient_id as name for Luxand
-                data = {
-                    "name": str(onehat_patient_id),
-                    "store": "1",
-                    "collections": collections
-                }
-                
-                files = {"photos": open(tmp_file_path, "rb")}
-                
-                response = requests.post(url, headers=self.headers, data=data, files=files, timeout=30)
-                files["photos"].close()
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    logger.info(f"✅ Added patient face to Luxand - OneHat ID: {onehat_patient_id}, UUID: {result['uuid']}")
-                    return {"success": True, "uuid": result["uuid"], "data": result}
-                else:
-                    logger.error(f"❌ Failed to add patient face to Luxand: {response.text}")
-                    return {"success": False, "message": response.text}
-                    
-            finally:
-                os.unlink(tmp_file_path)
+            content = await image_file.read()
+            url = f"{self.base_url}/v2/person"
+            
+            # Use onehat_patient_id as name for Luxand
+            data = {
+                "name": str(onehat_patient_id),
+                "store": "1",
+                "collections": collections
+            }
+            
+            files = {"photos": self._photo(image_file, content)}
+            
+            async with httpx.AsyncClient(timeout=call_timeout(30.0)) as client:
+                async with budget_stage("luxand"):
+                    response = await client.post(url, headers=self.headers, data=data, files=files)
+            
+            if response.status_code == 200:
+                result = response.json()
+                logger.info(f"✅ Added patient face to Luxand - OneHat ID: {onehat_patient_id}, UUID: {result['uuid']}")
+                return {"success": True, "uuid": result["uuid"], "data": result}
+            else:
+                logger.error(f"❌ Failed to add patient face to Luxand: {response.text}")
+                return {"success": False, "message": response.text}
                 
         except Exception as e:
             logger.error(f"❌ Error adding patient face to Luxand: {e}")
             return {"success": False, "message": str(e)}
     
+    def _photo(self, image_file: UploadFile, content: bytes):
+        """Multipart file tuple for an uploaded image, sent from memory"""
+        return (image_file.filename or "photo.jpg", content, image_file.content_type or "image/jpeg")
+    
     async def recognize_patient_from_image(self, image_file: UploadFile, confidence_threshold: float = 0.9) -> Optional[Dict[str, Any]]:
         """
         Recognize patient from uploaded image file using Luxand API
         Returns onehat_patient_id and confidence if recognized, None otherwise
         """
         try:
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-                content = await image_file.read()
-                tmp_file.write(content)
-                tmp_file_path = tmp_file.name
-            
-            try:
-                url = f"{self.base_url}/photo/search/v2"
-                files = {"photo": open(tmp_file_path, "rb")}
+            content = await image_file.read()
+            url = f"{self.base_url}/photo/search/v2"
+            files = {"photo": self._photo(image_file, content)}
+            
+            async with httpx.AsyncClient(timeout=call_timeout(30.0)) as client:
+                async with budget_stage("luxand"):
+                    response = await client.post(url, headers=self.headers, files=files)
+            
+            if response.status_code == 200:
+                result = response.json()
                 
-                response = requests.post(url, headers=self.headers, files=files, timeout=30)
-                files["photo"].close()
+                # Parse Luxand response - it returns a list of matches
+                if not result or len(result) == 0:
+                    logger.info("❌ No face matches found in Luxand database")
+                    return None
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    
-                    # Parse Luxand response - it returns a list of matches
-                    if not result or len(result) == 0:
-                        logger.info("❌ No face matches found in Luxand database")
-                        return None
-                    
-                    # Get the best match (first result is highest confidence)
-                    best_match = result[0]
-                    onehat_patient_id = best_match['name']  # onehat_id stored as name
-                    probability = best_match['probability']
-                    
-                    logger.info(f"🎯 Luxand recognition result - OneHat ID: {onehat_patient_id}, Probability: {probability:.4f}")
-                    
-                    if probability >= confidence_threshold:
-                        return {
-                            'onehat_patient_id': int(onehat_patient_id),  # Convert to int for Supabase lookup
-                            'confidence': probability,
-                            'face_info': {
-                                'uuid': best_match.get('uuid'),
-                                'rectangle': best_match.get('rectangle'),
-                                'collections': best_match.get('collections', [])
-                            }
+                # Get the best match (first result is highest confidence)
+                best_match = result[0]
+                onehat_patient_id = best_match['name']  # onehat_id stored as name
+                probability = best_match['probability']
+                
+                logger.info(f"🎯 Luxand recognition result - OneHat ID: {onehat_patient_id}, Probability: {probability:.4f}")
+                
+                if probability >= confidence_threshold:
+                    return {
+                        'onehat_patient_id': int(onehat_patient_id),  # Convert to int for Supabase lookup
+                        'confidence': probability,
+                        'face_info': {
+                            'uuid': best_match.get('uuid'),
+                            'rectangle': best_match.get('rectangle'),
+                            'collections': best_match.get('collections', [])
                         }
-                    else:
-                        logger.info(f"❌ Recognition confidence {probability:.4f} below threshold {confidence_threshold}")
-                        return None
-                        
+                    }
                 else:
-                    logger.error(f"❌ Luxand recognition failed: {response.text}")
+                    logger.info(f"❌ Recognition confidence {probability:.4f} below threshold {confidence_threshold}")
                     return None
                     
-            finally:
-                os.unlink(tmp_file_path)
-                
+            else:
+                logger.error(f"❌ Luxand recognition failed: {response.text}")
+                return None
+            
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"❌ Face recognition failed: {e}")
             raise HTTPException(status_code=500, detail=f"Face recognition failed: {str(e)}")
@@ -235,6 +225,14 @@ class LuxandFaceRecognitionService:
                 "onehat_patient_id": onehat_patient_id
             }
             
+        except DeadlineExceeded as e:
+            logger.warning(f"⏱️ Luxand face recognition: {e}")
+            return {
+                "success": False,
+                "message": "Face recognition timed out, please enter your details manually",
+                "patient_data": None,
+                "consultation_data": None
+            }
         except Exception as e:
             logger.error(f"❌ Error in Luxand face recognition workflow: {e}")
             return {
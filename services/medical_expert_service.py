@@ -2,19 +2,25 @@
 Medical Expert AI Service - Core logic for medical interviews
 """
 
-import os
 import warnings
-from google import genai
 from google.genai import types
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Union
 from datetime import datetime
 
 from models.patient import PatientInfo
-from models.medical import QuestionAnswer, InterviewSession
+from models.medical import QuestionAnswer, InterviewSession, ConversationTranscript
 from models.assessment import InvestigativeResult
 from core.config import settings
+from core.deadline import DeadlineExceeded
+from core.streaming import PartialJsonStringField
+from core.usage import thinking_tokens
 from services.department_service import department_service
 from services.diagnostics_service import diagnostics_service
+from services.llm_gateway import llm_gateway
+from services.context_cache import context_cache
+from services.prompt_builder import PromptBuilder
+from services.patient_phrases import QUESTION_ERROR_FALLBACK
+from services.prompt_registry import LANGUAGE_INSTRUCTIONS, interview_prompts, language_for
 import json
 from pydantic import BaseModel
 
@@ -24,6 +30,14 @@ warnings.filterwarnings("ignore", message="Field name .* shadows an attribute in
 class QuestionResponse(BaseModel):
     question: str
 
+class MedicalAssessment(BaseModel):
+    investigative_history: str
+    possible_diagnosis: str
+    confidence_level: int
+    recommended_department: str
+    recommended_doctor: str
+    doctor_comparison_analysis: str
+
 class AssessmentResponse(BaseModel):
     summary: str
     severity_level: str
@@ -34,111 +48,136 @@ class AssessmentResponse(BaseModel):
 
 class MedicalExpertService:
     def __init__(self):
-        # Initialize Gemini client
-        self.client = genai.Client(api_key=settings.gemini_api_key)
+        # Gemini calls go through the shared gateway client
         self.model = settings.gemini_model
         
-        # Load optimized prompts
-        self.prompts = self._load_optimized_prompts()
-        
-    def _load_optimized_prompts(self) -> dict:
-        """Load optimized prompts from JSON file"""
-        try:
-            prompts_path = os.path.join(os.path.dirname(__file__), '..', 'prompts', 'optimized_prompts_fixed.json')
-            with open(prompts_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading optimized prompts: {e}")
-            return {}
+        # Optimized prompts, reloaded by the registry when the file changes
+        self.prompts = interview_prompts
     
-    def get_medical_expert_system_instruction(self, patient: dict) -> str:
+    def get_medical_expert_system_instruction(self, patient: dict, language: Optional[str] = None) -> str:
         """Generate system instruction for Medical Expert LLM using optimized prompts"""
-        system_prompt = self.prompts.get('System Instructions for Interview', '')
-        return system_prompt
+        return self.prompts.current().system_instruction('System Instructions for Interview', language)
 
-    async def generate_next_question(self, patient: dict, conversation_history: List[Dict], 
-                                   question_number: int, unknown_count: int, previous_response_id: str = None) -> Dict:
-        """Generate next medical question based on conversation context"""
+    async def _build_question_request(self, patient: dict, transcript: ConversationTranscript,
+                                question_number: int, unknown_count: int) -> Dict:
+        """Build the Gemini contents and config for the next interview question"""
+        # Debug conversation history for language detection
+        print(f"[LANGUAGE_DEBUG] Question {question_number} - Conversation history: {len(transcript)} exchanges")
+        if transcript:
+            last_answer = transcript.records[-1]['answer']
+            print(f"[LANGUAGE_DEBUG] Last patient answer: '{last_answer}'")
+            # Simple language detection
+            has_english = any(c.isascii() and c.isalpha() for c in last_answer)
+            has_tamil = any('\u0b80' <= c <= '\u0bff' for c in last_answer)
+            print(f"[LANGUAGE_DEBUG] Contains English: {has_english}, Contains Tamil: {has_tamil}")
         
-        print(f"[AI_DEBUG] Generating question {question_number} for patient {patient.get('name', 'Unknown')}")
-        print(f"[AI_DEBUG] Conversation history length: {len(conversation_history)}")
-        print(f"[AI_DEBUG] Unknown count: {unknown_count}")
-        print(f"[AI_DEBUG] Previous response ID: {previous_response_id}")
+        # One prompt version for the whole request
+        prompts = self.prompts.current()
+        has_user_template = bool(prompts.get('user instructions for interview'))
         
-        try:
-            # Format conversation history
-            history_text = ""
-            for i, exchange in enumerate(conversation_history, 1):
-                history_text += f"Q{i}: {exchange['question']}\nA{i}: {exchange['answer']}\n\n"
-            
-            # Debug conversation history for language detection
-            print(f"[LANGUAGE_DEBUG] Question {question_number} - Conversation history:")
-            print(f"[LANGUAGE_DEBUG] {history_text}")
-            if conversation_history:
-                last_answer = conversation_history[-1]['answer']
-                print(f"[LANGUAGE_DEBUG] Last patient answer: '{last_answer}'")
-                # Simple language detection
-                has_english = any(c.isascii() and c.isalpha() for c in last_answer)
-                has_tamil = any('\u0b80' <= c <= '\u0bff' for c in last_answer)
-                print(f"[LANGUAGE_DEBUG] Contains English: {has_english}, Contains Tamil: {has_tamil}")
-            
-            # Use optimized user prompt template
-            user_prompt_template = self.prompts.get('user instructions for interview', '')
-            
-            # Debug: Check if prompts are loaded correctly
-            print(f"[AI_DEBUG] System prompt loaded: {len(self.prompts.get('System Instructions for Interview', ''))}")
-            print(f"[AI_DEBUG] User prompt loaded: {len(user_prompt_template)}")
-            
-            if not user_prompt_template:
+        # Debug: Check if prompts are loaded correctly
+        print(f"[AI_DEBUG] Prompt version: {prompts.version}")
+        print(f"[AI_DEBUG] User prompt loaded: {has_user_template}")
+        
+        def render_question_input(history_text: str) -> str:
+            if not has_user_template:
                 # Fallback if prompt loading fails
-                question_input = f"""Generate the next medical question for patient (Question {question_number}/6).
-                
+                return f"""Generate the next medical question for patient (Question {question_number}/6).
+            
 Patient Context: {patient['age']}y, {patient['gender']}
 Conversation History: {history_text if history_text else "No previous questions - start with chief complaint"}
 
 Instructions: Ask ONE focused medical question. If this is question 1, ask about their main complaint."""
-            else:
-                question_input = user_prompt_template.format(
-                    patient_name=patient['name'],
-                    patient_age=patient['age'],
-                    patient_gender=patient['gender'],
-                    chosen_doctor=patient.get('chosen_doctor', 'Not specified'),
-                    chosen_department=patient.get('chosen_department', 'Not specified'),
-                    question_number=question_number,
-                    unknown_count=unknown_count,
-                    conversation_history=history_text if history_text else "No previous questions - start with chief complaint"
+            return prompts.render(
+                'user instructions for interview',
+                patient_name=patient['name'],
+                patient_age=patient['age'],
+                patient_gender=patient['gender'],
+                chosen_doctor=patient.get('chosen_doctor', 'Not specified'),
+                chosen_department=patient.get('chosen_department', 'Not specified'),
+                question_number=question_number,
+                unknown_count=unknown_count,
+                conversation_history=history_text if history_text else "No previous questions - start with chief complaint"
+            )
+        
+        # Precompiled system instruction with the language rule for this question number
+        enhanced_system_instruction = prompts.system_instruction(
+            'System Instructions for Interview', language_for(question_number)
+        )
+        
+        # Keep the prompt inside the question budget by shortening the oldest exchanges first
+        history_text = self._budgeted_history("question", transcript, enhanced_system_instruction,
+                                              render_question_input(""))
+        question_input = render_question_input(history_text)
+        
+        print(f"[AI_DEBUG] System instruction length: {len(enhanced_system_instruction)}")
+        print(f"[AI_DEBUG] System instruction preview: {enhanced_system_instruction[:200]}...")
+        print(f"[AI_DEBUG] User prompt: {question_input}")
+        # Cached content belongs to one model, so pick the model before building the config
+        model = llm_gateway.route("question")
+        print(f"[AI_DEBUG] Making Gemini API call with model: {model}")
+        
+        return {
+            "model": model,
+            "prompt_version": prompts.version,
+            "contents": [
+                types.Content(
+                    role="user",
+                    parts=[
+                        types.Part(text=question_input)
+                    ]
                 )
-            
-            # Get system instruction and debug it
-            system_instruction = self.get_medical_expert_system_instruction(patient)
-            
-            # Add language instruction to system prompt based on question number
-            if question_number == 1:
-                enhanced_system_instruction = f"{system_instruction}\n\nIMPORTANT: Respond in Tamil."
-            else:
-                enhanced_system_instruction = f"{system_instruction}\n\nIMPORTANT: Look at the patient's most recent answer in the conversation history. Respond in the same language the patient used in their last answer."
-            
-            print(f"[AI_DEBUG] System instruction length: {len(enhanced_system_instruction)}")
-            print(f"[AI_DEBUG] System instruction preview: {enhanced_system_instruction[:200]}...")
-            print(f"[AI_DEBUG] User prompt: {question_input}")
-            print(f"[AI_DEBUG] Making Gemini API call with model: {self.model}")
+            ],
+            # The static system instruction is served from the Gemini context cache when available
+            "config": await context_cache.generation_config(
+                model=model,
+                system_instruction=enhanced_system_instruction,
+                label="interview-question",
+                max_output_tokens=500,  # Increased to accommodate reasoning tokens
+                temperature=0.7,
+                response_schema=QuestionResponse,
+                response_mime_type="application/json"
+            )
+        }
+
+    def _budgeted_history(self, call_type: str, transcript: ConversationTranscript,
+                          system_instruction: str, user_prompt: str) -> str:
+        """
+        Conversation history text that fits the call type's token budget next to the
+        system instruction and the rest of the user prompt. The oldest exchanges are cut
+        down to the patient's answer first, then omitted; the last two stay whole so the
+        model still sees the current topic and the language the patient is using.
+        """
+        builder = PromptBuilder(call_type)
+        builder.add("system", system_instruction)
+        builder.add("template", user_prompt)
+        builder.add_items("history", transcript.exchanges, priority=1, compact=transcript.answers, keep=2,
+                          omitted_note="[{count} earlier exchanges omitted]\n\n")
+        return builder.build()["history"]
+
+    async def generate_next_question(self, patient: dict, conversation_history: Union[ConversationTranscript, List[Dict]], 
+                                   question_number: int, unknown_count: int, previous_response_id: str = None) -> Dict:
+        """
+        Generate next medical question based on conversation context.
+        Pass the session's ConversationTranscript so the history is not re-rendered every turn.
+        """
+        transcript = ConversationTranscript.of(conversation_history)
+        
+        print(f"[AI_DEBUG] Generating question {question_number} for patient {patient.get('name', 'Unknown')}")
+        print(f"[AI_DEBUG] Conversation history length: {len(transcript)}")
+        print(f"[AI_DEBUG] Unknown count: {unknown_count}")
+        print(f"[AI_DEBUG] Previous response ID: {previous_response_id}")
+        
+        try:
+            request = await self._build_question_request(patient, transcript, question_number, unknown_count)
             
             # Use Gemini with system instruction and user prompt
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=[
-                    types.Content(
-                        role="user",
-                        parts=[
-                            types.Part(text=question_input)
-                        ]
-                    )
-                ],
-                config=types.GenerateContentConfig(
-                    system_instruction=enhanced_system_instruction,
-                    max_output_tokens=500,  # Increased to accommodate reasoning tokens
-                    temperature=0.7
-                )
+            response = await llm_gateway.generate_content(
+                call_type="question",
+                model=request["model"],
+                contents=request["contents"],
+                config=request["config"],
+                prompt_version=request["prompt_version"]
             )
             
             # Check if response and response.text are valid
@@ -149,184 +188,130 @@ Instructions: Ask ONE focused medical question. If this is question 1, ask about
                     print(f"[AI_DEBUG] Response text: {response.text}")
                 raise Exception("Empty response from Gemini API")
             
-            question_text = response.text.strip()
-            print(f"[AI_DEBUG] Generated question: {question_text}")
-            
-            # Parse JSON response if it contains structured data
-            try:
-                if question_text.startswith('```json'):
-                    # Extract JSON from code block
-                    json_start = question_text.find('{')
-                    json_end = question_text.rfind('}') + 1
-                    if json_start != -1 and json_end > json_start:
-                        json_str = question_text[json_start:json_end]
-                        parsed_response = json.loads(json_str)
-                        if 'question' in parsed_response:
-                            question_text = parsed_response['question']
-                            print(f"[AI_DEBUG] Extracted question: {question_text}")
-                elif question_text.startswith('{') and question_text.endswith('}'):
-                    # Direct JSON response
-                    parsed_response = json.loads(question_text)
-                    if 'question' in parsed_response:
-                        question_text = parsed_response['question']
-                        print(f"[AI_DEBUG] Extracted question: {question_text}")
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"[AI_DEBUG] Could not parse JSON response, using raw text: {e}")
-                # Keep the original response if parsing fails
+            print(f"[AI_DEBUG] Generated question: {response.text.strip()}")
+            question_text = json.loads(response.text)["question"].strip()
             
             return {
                 "question": question_text,
                 "response_id": None,  # Gemini doesn't use response IDs like OpenAI
-                "reasoning_tokens": 0  # Not available in Gemini API
+                "reasoning_tokens": thinking_tokens(response)
             }
             
+        except DeadlineExceeded:
+            # Out of turn budget - the router picks the fallback that fits this turn
+            raise
         except Exception as e:
             print(f"[AI_DEBUG] Error generating question: {e}")
             import traceback
             traceback.print_exc()
             return {
-                "question": "Could you please tell me about your main health concern today?",
+                "question": QUESTION_ERROR_FALLBACK,
                 "response_id": None,
                 "reasoning_tokens": 0
             }
 
-    async def generate_final_assessment(self, patient: dict, conversation_history: List[Dict], 
-                                      previous_response_id: str = None) -> Optional[Dict]:
-        """Generate final medical assessment using Responses API with structured outputs"""
+    async def stream_next_question(self, patient: dict, conversation_history: Union[ConversationTranscript, List[Dict]],
+                                   question_number: int, unknown_count: int) -> AsyncIterator[str]:
+        """
+        Stream the next medical question as text deltas, decoded from the "question" field
+        of the schema-constrained JSON response as it arrives.
+        Errors are raised to the caller, which owns the fallback question.
+        """
+        print(f"[AI_DEBUG] Streaming question {question_number} for patient {patient.get('name', 'Unknown')}")
+        
+        transcript = ConversationTranscript.of(conversation_history)
+        request = await self._build_question_request(patient, transcript, question_number, unknown_count)
+        question_field = PartialJsonStringField("question")
+        
+        async for chunk in llm_gateway.generate_content_stream(
+            call_type="question",
+            model=request["model"],
+            contents=request["contents"],
+            config=request["config"],
+            prompt_version=request["prompt_version"]
+        ):
+            if chunk and chunk.text:
+                delta = question_field.feed(chunk.text)
+                if delta:
+                    yield delta
+
+    async def generate_final_assessment(self, patient: dict, conversation_history: Union[ConversationTranscript, List[Dict]], 
+                                      previous_response_id: str = None, include_diagnostics: bool = True) -> Optional[Dict]:
+        """
+        Generate final medical assessment using Responses API with structured outputs.
+        With include_diagnostics=False the result is returned as soon as diagnosis and department are known,
+        and the caller runs the pre-consultation diagnostics as a separate job.
+        """
         
         try:
-            # Format complete conversation
-            history_text = ""
-            for i, exchange in enumerate(conversation_history, 1):
-                history_text += f"Q{i}: {exchange['question']}\nA{i}: {exchange['answer']}\n\n"
+            transcript = ConversationTranscript.of(conversation_history)
             
-            # Use optimized user prompt template for assessment
-            user_assessment_template = self.prompts.get('user instructions for assessment', '')
-            assessment_input = user_assessment_template.format(
-                patient_name=patient['name'],
-                patient_age=patient['age'],
-                patient_gender=patient['gender'],
-                chosen_doctor=patient.get('chosen_doctor', 'Not specified'),
-                chosen_department=patient.get('chosen_department', 'Not specified'),
-                conversation_history=history_text,
-                doctors_list="Available doctors list not provided"  # This would need to be passed from the calling function
-            )
+            # One prompt version for the whole assessment
+            prompts = self.prompts.current()
             
-            # Define the assessment schema for structured output
-            class MedicalAssessment(BaseModel):
-                investigative_history: str
-                possible_diagnosis: str
-                confidence_level: int
-                recommended_department: str
-                recommended_doctor: str
-                doctor_comparison_analysis: str
+            def render_assessment_input(history_text: str) -> str:
+                return prompts.render(
+                    'user instructions for assessment',
+                    patient_name=patient['name'],
+                    patient_age=patient['age'],
+                    patient_gender=patient['gender'],
+                    chosen_doctor=patient.get('chosen_doctor', 'Not specified'),
+                    chosen_department=patient.get('chosen_department', 'Not specified'),
+                    conversation_history=history_text,
+                    doctors_list="Available doctors list not provided"  # This would need to be passed from the calling function
+                )
             
             # Get system instruction for assessment
-            assessment_system_prompt = self.prompts.get('sytem instructions for assessment', '')
+            assessment_system_prompt = prompts.system_instruction('sytem instructions for assessment')
             
-            print(f"[MEDICAL_DEBUG] Calling Gemini API for question generation")
+            # Format complete conversation, trimmed only if it outgrows the assessment budget
+            history_text = self._budgeted_history("assessment", transcript, assessment_system_prompt,
+                                                  render_assessment_input(""))
+            assessment_input = render_assessment_input(history_text)
             
-            # Add language instruction to system prompt based on question number
-            if len(conversation_history) == 1:
-                enhanced_system_prompt = f"{assessment_system_prompt}\n\nIMPORTANT: Respond in Tamil."
-            else:
-                enhanced_system_prompt = f"{assessment_system_prompt}\n\nIMPORTANT: Look at the patient's most recent answer in the conversation history. Respond in the same language the patient used in their last answer."
+            # The language rule varies per call, so it rides with the user text and the
+            # system instruction stays identical (and cacheable) across assessments
+            language_instruction = LANGUAGE_INSTRUCTIONS[language_for(len(transcript))]
             
-            # Generate question using Gemini
-            response = self.client.models.generate_content(
-                model=self.model,
+            print(f"[MEDICAL_DEBUG] Calling Gemini API for assessment generation")
+            
+            # Generate assessment using Gemini, constrained to the MedicalAssessment schema
+            model = llm_gateway.route("assessment")
+            response = await llm_gateway.generate_content(
+                call_type="assessment",
+                model=model,
                 contents=[
                     types.Content(
                         role="user",
                         parts=[
-                            types.Part(text=f"{enhanced_system_prompt}\n\n{assessment_input}")
+                            types.Part(text=f"{assessment_input}\n\n{language_instruction}")
                         ]
                     )
                 ],
-                config=types.GenerateContentConfig(
+                config=await context_cache.generation_config(
+                    model=model,
                     system_instruction=assessment_system_prompt,
+                    label="assessment",
                     max_output_tokens=2000,  # Increased for assessment generation
-                    temperature=0.3
-                )
+                    temperature=0.3,
+                    response_schema=MedicalAssessment,
+                    response_mime_type="application/json"
+                ),
+                prompt_version=prompts.version
             )
             
-            # Parse structured output with fallback handling
             print(f"[ASSESSMENT_DEBUG] Raw Gemini response text: {response.text[:500]}...")
-            
-            # Initialize default assessment data - avoid hardcoded department fallbacks
-            assessment_data = {
-                "investigative_history": response.text,
-                "possible_diagnosis": "Assessment based on interview responses", 
-                "confidence_level": 70,
-                "recommended_department": None,  # Will be extracted from AI response
-                "recommended_doctor": None,      # Will be extracted from AI response  
-                "doctor_comparison_analysis": "Based on symptoms and patient responses"
-            }
-            
-            # Try different parsing strategies
-            import re
-            
-            # Strategy 1: Direct JSON parsing (if response is clean JSON)
-            try:
-                parsed_json = json.loads(response.text)
-                assessment_data = parsed_json
-                print(f"[ASSESSMENT_DEBUG] ✅ Direct JSON parse successful: {list(assessment_data.keys())}")
-            except json.JSONDecodeError:
-                print(f"[ASSESSMENT_DEBUG] ❌ Direct JSON parse failed, trying markdown extraction")
-                
-                # Strategy 2: Extract JSON from markdown code blocks
-                json_match = re.search(r'```json\s*({.*?})\s*```', response.text, re.DOTALL)
-                if json_match:
-                    print(f"[ASSESSMENT_DEBUG] 🔍 Found JSON in markdown block")
-                    try:
-                        markdown_json = json.loads(json_match.group(1))
-                        assessment_data = markdown_json
-                        print(f"[ASSESSMENT_DEBUG] ✅ Markdown JSON parse successful")
-                        print(f"[ASSESSMENT_DEBUG] 🎯 Extracted recommended_department: {assessment_data.get('recommended_department')}")
-                    except json.JSONDecodeError as e:
-                        print(f"[ASSESSMENT_DEBUG] ❌ Markdown JSON parse failed: {e}")
-                else:
-                    print(f"[ASSESSMENT_DEBUG] ❌ No markdown JSON block found")
-            
-            # Ensure we have investigative_history as clean text
-            if isinstance(assessment_data.get("investigative_history"), str) and assessment_data["investigative_history"].startswith("```json"):
-                # Clean up investigative_history if it contains the full markdown response
-                clean_history = assessment_data.get("investigative_history", "Assessment summary")
-                json_match = re.search(r'"investigative_history":\s*"([^"]*)"', assessment_data["investigative_history"])
-                if json_match:
-                    clean_history = json_match.group(1)
-                assessment_data["investigative_history"] = clean_history
-                print(f"[ASSESSMENT_DEBUG] 🧹 Cleaned investigative_history")
+            assessment_data = json.loads(response.text)
             
             print(f"[ASSESSMENT_DEBUG] 📊 Final parsing result:")
             print(f"[ASSESSMENT_DEBUG]   - recommended_department: {assessment_data.get('recommended_department')}")
             print(f"[ASSESSMENT_DEBUG]   - possible_diagnosis: {assessment_data.get('possible_diagnosis')}")
             print(f"[ASSESSMENT_DEBUG]   - confidence_level: {assessment_data.get('confidence_level')}")
             
-            # Extract AI recommended department - try multiple strategies if JSON parsing failed
             ai_suggested_dept = assessment_data.get("recommended_department")
-            
-            # If JSON parsing failed and we don't have the department, try text extraction
             if not ai_suggested_dept:
-                print("[ASSESSMENT_DEBUG] 🔍 Department not found in JSON, attempting text extraction")
-                dept_patterns = [
-                    r'"recommended_department":\s*"([^"]+)"',
-                    r'recommended_department[:\s]+([A-Za-z\s]+)(?:\n|,|\})',
-                    r'department[:\s]+([A-Za-z\s]+)(?:\n|,|\})',
-                    r'(Orthopedics?|Cardiology|Urology|Pediatrics?|Diabetologist|General Medicine)'
-                ]
-                
-                for pattern in dept_patterns:
-                    match = re.search(pattern, response.text, re.IGNORECASE)
-                    if match:
-                        ai_suggested_dept = match.group(1).strip()
-                        print(f"[ASSESSMENT_DEBUG] ✅ Extracted department from text: '{ai_suggested_dept}'")
-                        break
-                
-                # Last resort fallback only if no department found anywhere
-                if not ai_suggested_dept:
-                    ai_suggested_dept = "General Medicine"
-                    print("[ASSESSMENT_DEBUG] ⚠️ Using final fallback: General Medicine")
+                ai_suggested_dept = "General Medicine"
+                print("[ASSESSMENT_DEBUG] ⚠️ No department in assessment, using fallback: General Medicine")
             
             # For AI help option, ignore previous consultation doctor to avoid conflicts
             # Patient specifically chose AI help, so prioritize AI recommendation
@@ -383,12 +368,14 @@ Instructions: Ask ONE focused medical question. If this is question 1, ask about
             print(f"[ASSESSMENT_DEBUG] Enhanced comparison: '{enhanced_comparison[:100]}...'")
             
             # Get pre-consultation diagnostics
-            diagnostics_result = diagnostics_service.get_pre_consultation_diagnostics(
-                possible_diagnosis=assessment_data.get("possible_diagnosis", ""),
-                investigative_history=assessment_data.get("investigative_history", "")
-            )
-            
-            print(f"[ASSESSMENT_DEBUG] Diagnostics result: {diagnostics_result}")
+            if include_diagnostics:
+                diagnostics_result = await diagnostics_service.get_pre_consultation_diagnostics(
+                    possible_diagnosis=assessment_data.get("possible_diagnosis", ""),
+                    investigative_history=assessment_data.get("investigative_history", "")
+                )
+                print(f"[ASSESSMENT_DEBUG] Diagnostics result: {diagnostics_result}")
+            else:
+                diagnostics_result = {"diagnostics": None, "matched_condition": None, "explanation": None}
             
             return {
                 "assessment": InvestigativeResult(
@@ -403,7 +390,7 @@ Instructions: Ask ONE focused medical question. If this is question 1, ask about
                 "pre_consultation_diagnostics": diagnostics_result.get("diagnostics", {}),
                 "matched_diagnostic_condition": diagnostics_result.get("matched_condition"),
                 "diagnostics_explanation": diagnostics_result.get("explanation", ""),
-                "reasoning_tokens": 0,  # Not available in Gemini API
+                "reasoning_tokens": thinking_tokens(response),
                 "department_recommendations": doctor_recommendations  # Additional metadata
             }
             
@@ -421,7 +408,8 @@ Instructions: Ask ONE focused medical question. If this is question 1, ask about
                 "recommended_department": "General Medicine",
                 "recommended_doctor": "General Practitioner",
                 "doctor_comparison_analysis": "Error occurred during assessment",
-                "reasoning_tokens": 0
+                "reasoning_tokens": 0,
+                "fallback": True
             }
 
     def _generate_enhanced_comparison(self, original_analysis: str, doctor_recommendations: Dict) -> str:
@@ -0,0 +1,84 @@
+"""
+Medical term normalization shared by the diagnostics cache and retrieval index -
+lower-casing, punctuation stripping and a synonym table for abbreviations and lay terms
+"""
+
+import re
+from typing import List
+
+# Words that qualify a diagnosis without changing which CSV row it matches
+FILLER_WORDS = {
+    "a", "an", "the", "of", "possible", "probable", "likely", "suspected", "query", "suggestive",
+    "early", "mild", "acute", "left", "right", "bilateral", "mellitus"
+}
+
+# Abbreviations, spelling variants and lay terms folded onto one canonical phrase (applied to the normalized text)
+SYNONYMS = {
+    "oa": "osteoarthritis",
+    "osteoarthrosis": "osteoarthritis",
+    "degenerative joint disease": "osteoarthritis",
+    "t2dm": "type 2 diabetes",
+    "dm2": "type 2 diabetes",
+    "dm type 2": "type 2 diabetes",
+    "type ii diabetes": "type 2 diabetes",
+    "t1dm": "type 1 diabetes",
+    "type i diabetes": "type 1 diabetes",
+    "diabetic": "diabetes",
+    "high sugar": "diabetes",
+    "sugar": "diabetes",
+    "htn": "hypertension",
+    "high blood pressure": "hypertension",
+    "hypertensive": "hypertension",
+    "bp": "hypertension",
+    "hyperlipidemia": "dyslipidemia",
+    "high cholesterol": "dyslipidemia",
+    "cholesterol": "dyslipidemia",
+    "overweight": "obesity",
+    "obese": "obesity",
+    "uti": "urinary tract infection",
+    "urti": "upper respiratory tract infection",
+    "uri": "upper respiratory tract infection",
+    "common cold": "upper respiratory tract infection",
+    "pyrexia": "fever",
+    "gerd": "gastroesophageal reflux disease",
+    "acid reflux": "gastroesophageal reflux disease",
+    "copd": "chronic obstructive pulmonary disease",
+    "mdd": "major depression",
+    "major depressive disorder": "major depression",
+    "depressive": "depression",
+    "depressed": "depression",
+    "gad": "generalized anxiety",
+    "generalised anxiety": "generalized anxiety",
+    "generalized anxiety disorder": "generalized anxiety",
+    "anxious": "anxiety",
+    "panic": "anxiety",
+    "alcoholism": "alcohol",
+    "fits": "seizures",
+    "convulsions": "seizures",
+    "cva": "stroke",
+    "mini stroke": "tia",
+    "transient ischemic attack": "tia",
+    "lumbago": "low back pain",
+    "backache": "back pain",
+    "sciatica": "disc herniation",
+    "slipped disc": "disc herniation",
+    "herniated disc": "disc herniation",
+    "pivd": "disc herniation",
+    "adhesive capsulitis": "frozen shoulder",
+    "torn meniscus": "meniscus injury",
+    "broken": "fracture",
+    "fractured": "fracture",
+    "sprain": "ligament injury",
+    "diabetic kidney disease": "nephropathy",
+    "tingling": "neuropathy"
+}
+
+_SYNONYM_PATTERN = re.compile(r"\b(" + "|".join(sorted(map(re.escape, SYNONYMS), key=len, reverse=True)) + r")\b")
+
+
+def medical_terms(text: str) -> List[str]:
+    """Lower-cased words of the text with punctuation stripped, synonyms folded and filler words dropped"""
+    text = re.sub(r"[^a-z0-9\s]", " ", (text or "").lower())
+    text = re.sub(r"\s+", " ", text).strip()
+    text = _SYNONYM_PATTERN.sub(lambda match: SYNONYMS[match.group(1)], text)
+    return [word for word in text.split() if word not in FILLER_WORDS]
@@ -0,0 +1,191 @@
+"""
+Model Router - Routes each call type to the fastest healthy Gemini model, with a circuit breaker per model
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from core.config import settings
+
+# Recent outcomes kept per model for latency and error rate
+HEALTH_WINDOW = 50
+# A closed model is still skipped once its recent error rate reaches this...
+MAX_ERROR_RATE = 0.5
+# ...provided there are at least this many outcomes to judge by
+MIN_OUTCOMES_FOR_ERROR_RATE = 10
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ModelHealth:
+    def __init__(self, model: str):
+        self.model = model
+        self.latencies = deque(maxlen=HEALTH_WINDOW)
+        self.results = deque(maxlen=HEALTH_WINDOW)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.last_error: Optional[str] = None
+
+    def avg_latency(self) -> Optional[float]:
+        return sum(self.latencies) / len(self.latencies) if self.latencies else None
+
+    def error_rate(self) -> float:
+        return self.results.count(False) / len(self.results) if self.results else 0.0
+
+    def healthy(self) -> bool:
+        if self.state != CLOSED:
+            return False
+        return len(self.results) < MIN_OUTCOMES_FOR_ERROR_RATE or self.error_rate() < MAX_ERROR_RATE
+
+    def snapshot(self) -> Dict[str, Any]:
+        avg_latency = self.avg_latency()
+        return {
+            "state": self.state,
+            "healthy": self.healthy(),
+            "avg_latency_ms": round(avg_latency * 1000, 1) if avg_latency is not None else None,
+            "error_rate": round(self.error_rate(), 3),
+            "samples": len(self.results),
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "last_error": self.last_error
+        }
+
+
+class ModelRouter:
+    def __init__(self):
+        self.default_preferences = settings.gemini_model_preferences or [settings.gemini_model]
+        self.routes = settings.gemini_model_routes
+        self.failure_threshold = settings.model_circuit_failure_threshold
+        self.open_seconds = settings.model_circuit_open_seconds
+        self.probe_interval = settings.model_probe_interval
+
+        self.health: Dict[str, ModelHealth] = {}
+        self._probe_task: Optional[asyncio.Task] = None
+
+    def preferences(self, call_type: str) -> List[str]:
+        """Ordered model preference list for a call type"""
+        return self.routes.get(call_type) or self.default_preferences
+
+    def _health(self, model: str) -> ModelHealth:
+        if model not in self.health:
+            self.health[model] = ModelHealth(model)
+        return self.health[model]
+
+    def _all_models(self) -> List[str]:
+        models = list(self.default_preferences)
+        for preferences in self.routes.values():
+            models.extend(m for m in preferences if m not in models)
+        return models
+
+    def choose(self, call_type: str) -> str:
+        """Fastest healthy model for this call type, earlier preferences winning ties and unmeasured models"""
+        preferences = self.preferences(call_type)
+        healthy = [model for model in preferences if self._health(model).healthy()]
+        if not healthy:
+            # Every circuit is open - keep serving from the first preference rather than failing outright
+            return preferences[0]
+
+        measured = [model for model in healthy if self._health(model).avg_latency() is not None]
+        if not measured:
+            return healthy[0]
+        return min(measured, key=lambda model: (self._health(model).avg_latency(), preferences.index(model)))
+
+    def record_latency(self, model: str, latency: float):
+        """Latency sample that says nothing about errors, e.g. a call cut off by the turn budget"""
+        self._health(model).latencies.append(latency)
+
+    def record_success(self, model: str, latency: float):
+        health = self._health(model)
+        health.latencies.append(latency)
+        health.results.append(True)
+        health.consecutive_failures = 0
+        if health.state != CLOSED:
+            print(f"[MODEL_ROUTER] {model} recovered, closing circuit")
+            health.state = CLOSED
+
+    def record_failure(self, model: str, error: Exception):
+        health = self._health(model)
+        health.results.append(False)
+        health.consecutive_failures += 1
+        health.last_error = str(error)[:200]
+        if health.state == HALF_OPEN or (health.state == CLOSED and health.consecutive_failures >= self.failure_threshold):
+            health.state = OPEN
+            health.opened_at = time.time()
+            health.times_opened += 1
+            print(f"[MODEL_ROUTER] Opening circuit for {model} after {health.consecutive_failures} failures: {health.last_error}")
+
+    async def probe_models(self, probe: Callable[[str], Awaitable[float]]):
+        """
+        One probe pass: retry open circuits whose cool-down has passed, and measure
+        alternative models that have no latency data yet so routing can compare them.
+        """
+        models = self._all_models()
+        for model in models:
+            health = self._health(model)
+            due_for_recovery = health.state == OPEN and time.time() - health.opened_at >= self.open_seconds
+            unmeasured = len(models) > 1 and health.state == CLOSED and not health.latencies
+            if not (due_for_recovery or unmeasured):
+                continue
+
+            if due_for_recovery:
+                health.state = HALF_OPEN
+            try:
+                latency = await probe(model)
+            except Exception as e:
+                print(f"[MODEL_ROUTER] Probe of {model} failed: {e}")
+                self.record_failure(model, e)
+            else:
+                self.record_success(model, latency)
+
+    async def _probe_loop(self, probe: Callable[[str], Awaitable[float]]):
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            try:
+                await self.probe_models(probe)
+            except Exception as e:
+                print(f"[MODEL_ROUTER] Probe pass error: {e}")
+
+    def start_probing(self, probe: Callable[[str], Awaitable[float]]):
+        """Start the background recovery probes (called from the app lifespan)"""
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe_loop(probe))
+            print(f"[MODEL_ROUTER] Background probes every {self.probe_interval}s for {', '.join(self._all_models())}")
+
+    async def stop_probing(self):
+        if self._probe_task and not self._probe_task.done():
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+        self._probe_task = None
+
+    def get_route_table(self) -> Dict[str, Any]:
+        """Current model choice per call type plus the health of every model"""
+        from services.llm_gateway import CALL_TYPES
+
+        return {
+            "routes": {
+                call_type: {
+                    "preferences": self.preferences(call_type),
+                    "selected": self.choose(call_type)
+                }
+                for call_type in CALL_TYPES
+            },
+            "models": {model: self._health(model).snapshot() for model in self._all_models()},
+            "circuit": {
+                "failure_threshold": self.failure_threshold,
+                "open_seconds": self.open_seconds,
+                "probe_interval": self.probe_interval
+            }
+        }
+
+
+# Global model router instance
+model_router = ModelRouter()
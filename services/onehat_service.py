@@ -13,6 +13,7 @@ import httpx
 from typing import Optional, Dict, Any
 from dotenv import load_dotenv
 import logging
+from core.deadline import DeadlineExceeded, budget_stage, call_timeout
 
 # Load environment variables
 load_dotenv()
@@ -91,8 +92,9 @@ class OneHatService:
             }
             
             # Make API call
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, params=params)
+            async with httpx.AsyncClient(timeout=call_timeout(30.0)) as client:
+                async with budget_stage("onehat"):
+                    response = await client.post(url, params=params)
                 
                 if response.status_code != 200:
                     logger.error(f"❌ OneHat auth failed with status {response.status_code}: {response.text}")
@@ -110,7 +112,7 @@ class OneHatService:
                 
                 return access_token
                 
-        except httpx.TimeoutException:
+        except (httpx.TimeoutException, DeadlineExceeded):
             logger.error("❌ OneHat authentication timeout")
             raise OneHatAuthError("Authentication request timed out")
         except httpx.RequestError as e:
@@ -159,8 +161,9 @@ class OneHatService:
             }
             
             # Make API call
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, headers=headers, json=patient_data)
+            async with httpx.AsyncClient(timeout=call_timeout(30.0)) as client:
+                async with budget_stage("onehat"):
+                    response = await client.post(url, headers=headers, json=patient_data)
                 
                 if response.status_code != 200:
                     logger.error(f"❌ OneHat patient creation failed with status {response.status_code}: {response.text}")
@@ -182,7 +185,7 @@ class OneHatService:
         except OneHatAuthError:
             # Re-raise auth errors as-is
             raise
-        except httpx.TimeoutException:
+        except (httpx.TimeoutException, DeadlineExceeded):
             logger.error("❌ OneHat patient creation timeout")
             raise OneHatAPIError("Patient creation request timed out")
         except httpx.RequestError as e:
@@ -0,0 +1,85 @@
+"""
+Patient Phrases - Fixed patient-facing strings (fallback questions and completion messages).
+Kept in one place so the prebuilt audio pack can synthesize every one of them ahead of time.
+"""
+
+from typing import List
+
+# Pre-screening interview fallbacks (routers/medical.py)
+FIRST_QUESTION_FALLBACK = "What is your main health concern or symptom that brought you here today?"
+NEXT_QUESTION_FALLBACK = "Can you tell me more about your symptoms?"
+# Returned by generate_next_question when Gemini fails, so callers can tell it from a generated question
+QUESTION_ERROR_FALLBACK = "Could you please tell me about your main health concern today?"
+
+# Follow-up interview fallbacks (routers/followup.py, FollowupService.generate_followup_question)
+FOLLOWUP_FIRST_QUESTION_FALLBACK = "How are you feeling since your last visit?"
+FOLLOWUP_NEXT_QUESTION_FALLBACK = "Can you tell me more about how you've been feeling?"
+FOLLOWUP_EMPTY_QUESTION_FALLBACK = "Can you tell me more about your current condition?"
+
+# Completion messages
+INTERVIEW_COMPLETE_MESSAGE = "Interview completed. Ready for assessment."
+ASSESSMENT_READY_MESSAGE = "Medical expert has sufficient information for assessment."
+FOLLOWUP_COMPLETE_MESSAGE = "Follow-up interview completed. Ready for assessment."
+
+# Fallback questions in case of API issues (FollowupService.get_fallback_question)
+FOLLOWUP_FALLBACK_QUESTIONS = [
+    "How have you been feeling since your last visit?",
+    "Are you taking your prescribed medications as directed?",
+    "Have you noticed any changes in your condition?",
+    "Are you experiencing any new symptoms?",
+    "How has your treatment been working for you?",
+    "Is there anything specific that's been bothering you?"
+]
+
+# Unique questions for when the model fails or repeats itself, by patient language
+# (FollowupService._generate_alternative_question)
+FOLLOWUP_ALTERNATIVE_QUESTIONS = {
+    "en": [
+        "Have you been taking your prescribed medications as directed?",
+        "Are you experiencing any pain or discomfort currently?",
+        "Have you noticed any changes in your condition since the last visit?",
+        "Are you following any specific dietary or activity restrictions?",
+        "Have you completed any recommended tests or follow-up procedures?",
+        "Is there anything specific that's been bothering you lately?"
+    ],
+    "ta": [
+        "நீங்கள் பரிந்துரைக்கப்பட்ட மருந்துகளை தவறாமல் எடுத்துக்கொள்கிறீர்களா?",
+        "தற்போது உங்களுக்கு ஏதேனும் வலி அல்லது அசௌகரியம் இருக்கிறதா?",
+        "கடைசி வருகைக்குப் பிறகு உங்கள் நிலையில் ஏதேனும் மாற்றங்கள் கவனித்தீர்களா?",
+        "நீங்கள் ஏதேனும் குறிப்பிட்ட உணவு அல்லது செயல்பாட்டு கட்டுப்பாடுகளை பின்பற்றுகிறீர்களா?",
+        "பரிந்துரைக்கப்பட்ட பரிசோதனைகள் அல்லது பின்தொடர்தல் நடைமுறைகளை நீங்கள் முடித்துவிட்டீர்களா?",
+        "உங்களை குறிப்பாக தொந்தரவு செய்யும் ஏதாவது இருக்கிறதா?"
+    ]
+}
+
+# Last resort once every alternative has been covered: (up to question 3, after question 3) by language
+FOLLOWUP_CLOSING_QUESTIONS = {
+    "en": (
+        "Can you tell me about your current treatment plan?",
+        "Is there anything else you'd like to discuss about your condition?"
+    ),
+    "ta": (
+        "உங்கள் தற்போதைய சிகிச்சை திட்டத்தைப் பற்றி சொல்ல முடியுமா?",
+        "உங்கள் நிலையைப் பற்றி வேறு ஏதாவது விவாதிக்க விரும்புகிறீர்களா?"
+    )
+}
+
+
+def all_phrases() -> List[str]:
+    """Every fixed patient-facing string, once each, in a stable order"""
+    phrases = [
+        FIRST_QUESTION_FALLBACK,
+        NEXT_QUESTION_FALLBACK,
+        QUESTION_ERROR_FALLBACK,
+        FOLLOWUP_FIRST_QUESTION_FALLBACK,
+        FOLLOWUP_NEXT_QUESTION_FALLBACK,
+        FOLLOWUP_EMPTY_QUESTION_FALLBACK,
+        INTERVIEW_COMPLETE_MESSAGE,
+        ASSESSMENT_READY_MESSAGE,
+        FOLLOWUP_COMPLETE_MESSAGE,
+        *FOLLOWUP_FALLBACK_QUESTIONS
+    ]
+    for language in ("en", "ta"):
+        phrases.extend(FOLLOWUP_ALTERNATIVE_QUESTIONS[language])
+        phrases.extend(FOLLOWUP_CLOSING_QUESTIONS[language])
+    return list(dict.fromkeys(phrases))
@@ -0,0 +1,156 @@
+"""
+Prompt Builder - Keeps prompts inside a per-call-type token budget, trimming the oldest
+and least relevant material first, and logs the per-section token breakdown
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from core.config import settings
+from core.tokens import count_tokens
+
+
+@dataclass
+class PromptSection:
+    name: str
+    items: List[str]
+    # Shorter rendering per item (None = no shorter form), used before dropping the item
+    compact: List[Optional[str]] = field(default_factory=list)
+    # Sections with a lower priority are trimmed first; None means the section is never trimmed
+    priority: Optional[int] = None
+    # Items at the protected end that are never dropped
+    keep: int = 0
+    # "start" trims the oldest items of a chronological list, "end" the tail of a ranked list
+    trim_from: str = "start"
+    separator: str = ""
+    prefix: str = ""
+    suffix: str = ""
+    omitted_note: str = ""
+    dropped: int = 0
+    compacted: int = 0
+
+    def _trim_order(self) -> List[int]:
+        """Indexes that may be trimmed, in the order they should go"""
+        removable = max(0, len(self.items) - self.keep)
+        if self.trim_from == "start":
+            return list(range(removable))
+        return list(range(len(self.items) - 1, len(self.items) - 1 - removable, -1))
+
+    def trimmable(self) -> bool:
+        return self.priority is not None and bool(self._trim_order())
+
+    def trim_one(self):
+        """Compact the next item that still has a shorter form, otherwise drop the next item"""
+        order = self._trim_order()
+        for index in order:
+            if index < len(self.compact) and self.compact[index] is not None:
+                self.items[index] = self.compact[index]
+                self.compact[index] = None
+                self.compacted += 1
+                return
+        index = order[0]
+        del self.items[index]
+        if index < len(self.compact):
+            del self.compact[index]
+        self.dropped += 1
+
+    def tokens(self) -> int:
+        """
+        Token count summed per item. Transcript fragments are the same strings every turn,
+        so their counts come from the count_tokens cache and only new items are tokenized.
+        """
+        if not self.items:
+            return count_tokens(self.render())
+        frame = self.prefix + self.suffix + self.separator * (len(self.items) - 1)
+        if self.dropped and self.omitted_note:
+            frame += self.omitted_note.format(count=self.dropped)
+        return sum(count_tokens(item) for item in self.items) + count_tokens(frame)
+
+    def render(self) -> str:
+        body = self.separator.join(self.items)
+        if self.dropped and self.omitted_note:
+            note = self.omitted_note.format(count=self.dropped)
+            body = note + body if self.trim_from == "start" else body + note
+        return f"{self.prefix}{body}{self.suffix}"
+
+
+class PromptBuilder:
+    def __init__(self, call_type: str, budget: Optional[int] = None):
+        self.call_type = call_type
+        self.budget = budget if budget is not None else settings.prompt_token_budgets.get(call_type)
+        self.sections: List[PromptSection] = []
+
+    def add(self, name: str, text: str):
+        """A section that is always sent whole (system instruction, filled-in template)"""
+        self.sections.append(PromptSection(name=name, items=[text] if text else []))
+
+    def add_items(self, name: str, items: List[str], priority: int, compact: Optional[List[Optional[str]]] = None,
+                  keep: int = 0, trim_from: str = "start", **render):
+        """A list section (history exchanges, prescription entries) that can be trimmed item by item"""
+        self.sections.append(PromptSection(
+            name=name, items=list(items), compact=list(compact or []),
+            priority=priority, keep=keep, trim_from=trim_from, **render
+        ))
+
+    def build(self) -> Dict[str, str]:
+        """Trim to the budget and return the rendered text of each section"""
+        tokens = {section.name: section.tokens() for section in self.sections}
+        if self.budget:
+            while sum(tokens.values()) > self.budget:
+                candidates = [section for section in self.sections if section.trimmable()]
+                if not candidates:
+                    break
+                section = min(candidates, key=lambda s: s.priority)
+                section.trim_one()
+                tokens[section.name] = section.tokens()
+
+        total = sum(tokens.values())
+        breakdown = ", ".join(f"{name} {count}" for name, count in tokens.items())
+        trims = ", ".join(
+            f"{s.name}: {s.dropped} dropped, {s.compacted} compacted"
+            for s in self.sections if s.dropped or s.compacted
+        )
+        over = " OVER BUDGET" if self.budget and total > self.budget else ""
+        print(f"[PROMPT_BUDGET] {self.call_type}: {total}/{self.budget or '-'} tokens{over} - {breakdown}"
+              + (f" (trimmed {trims})" if trims else ""))
+        prompt_budget_stats.record(self.call_type, self.budget, tokens, bool(trims))
+
+        return {section.name: section.render() for section in self.sections}
+
+
+class PromptBudgetStats:
+    """Per call type prompt sizes and how often trimming was needed"""
+
+    def __init__(self):
+        self.call_types: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, call_type: str, budget: Optional[int], tokens: Dict[str, int], trimmed: bool):
+        stats = self.call_types.setdefault(call_type, {
+            "prompts": 0, "trimmed": 0, "over_budget": 0, "total_tokens": 0, "max_tokens": 0, "last": {}
+        })
+        total = sum(tokens.values())
+        stats["prompts"] += 1
+        stats["trimmed"] += int(trimmed)
+        stats["over_budget"] += int(bool(budget) and total > budget)
+        stats["total_tokens"] += total
+        stats["max_tokens"] = max(stats["max_tokens"], total)
+        stats["last"] = tokens
+        stats["budget"] = budget
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            call_type: {
+                "budget": stats["budget"],
+                "prompts": stats["prompts"],
+                "trimmed": stats["trimmed"],
+                "over_budget": stats["over_budget"],
+                "avg_tokens": round(stats["total_tokens"] / stats["prompts"], 1),
+                "max_tokens": stats["max_tokens"],
+                "last_breakdown": stats["last"]
+            }
+            for call_type, stats in self.call_types.items()
+        }
+
+
+# Global prompt budget stats instance
+prompt_budget_stats = PromptBudgetStats()
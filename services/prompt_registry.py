@@ -0,0 +1,167 @@
+"""
+Prompt Registry - Loads each prompt file once, precompiles its templates and language
+variants, hot-reloads it when the file changes, and stamps every load with a version
+"""
+
+import hashlib
+import json
+import os
+import time
+from string import Formatter
+from typing import Any, Dict, Optional
+
+from core.config import settings
+
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'prompts')
+
+# Language rules appended to system instructions: Tamil for the opening question,
+# afterwards whatever language the patient answered in
+LANGUAGE_INSTRUCTIONS = {
+    "tamil": "IMPORTANT: Respond in Tamil.",
+    "same": "IMPORTANT: Look at the patient's most recent answer in the conversation history. Respond in the same language the patient used in their last answer."
+}
+
+
+def language_for(question_number: int) -> str:
+    """Language variant for a question: Tamil to open the interview, then the patient's own language"""
+    return "tamil" if question_number == 1 else "same"
+
+
+class CompiledTemplate:
+    """A str.format template parsed once into literal text and field names"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts = list(Formatter().parse(text))
+        # Format specs, conversions and attribute/index lookups go through str.format
+        self.simple = all(
+            not spec and conversion is None and (name is None or name.isidentifier())
+            for _, name, spec, conversion in self.parts
+        )
+
+    def render(self, **fields) -> str:
+        if not self.simple:
+            return self.text.format(**fields)
+        pieces = []
+        for literal, name, _, _ in self.parts:
+            pieces.append(literal)
+            if name is not None:
+                pieces.append(str(fields[name]))
+        return "".join(pieces)
+
+
+class LoadedPrompts:
+    """One version of a prompt file. Immutable, so a call sees a single version throughout."""
+
+    def __init__(self, name: str, prompts: Dict[str, Any], digest: str, mtime: float):
+        self.name = name
+        self.prompts = prompts
+        self.version = f"{name}-{digest[:8]}"
+        self.mtime = mtime
+        self.loaded_at = time.time()
+        self.templates = {key: CompiledTemplate(value) for key, value in prompts.items() if isinstance(value, str)}
+        self._variants: Dict[tuple, str] = {}
+
+    def get(self, key: str, default: Any = "") -> Any:
+        return self.prompts.get(key, default)
+
+    def render(self, key: str, **fields) -> str:
+        """Fill in a precompiled template ("" if the prompt is missing)"""
+        template = self.templates.get(key)
+        return template.render(**fields) if template else ""
+
+    def system_instruction(self, key: str, language: Optional[str] = None) -> str:
+        """System instruction with its language rule appended, built once per variant"""
+        if language is None:
+            return self.get(key, "")
+        variant = self._variants.get((key, language))
+        if variant is None:
+            variant = f"{self.get(key, '')}\n\n{LANGUAGE_INSTRUCTIONS[language]}"
+            self._variants[(key, language)] = variant
+        return variant
+
+
+class PromptSet:
+    """A prompt file that is reloaded when its mtime changes"""
+
+    def __init__(self, name: str, path: str, check_interval: float):
+        self.name = name
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        self._last_check = 0.0
+        self._loaded = self._load() or LoadedPrompts(name, {}, "unavailable", 0.0)
+
+    def _load(self) -> Optional[LoadedPrompts]:
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+            prompts = json.loads(raw.decode('utf-8'))
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"[PROMPT_REGISTRY] Error loading {self.name} prompts from {self.path}: {e}")
+            return None
+        loaded = LoadedPrompts(self.name, prompts, hashlib.sha256(raw).hexdigest(), mtime)
+        self.last_error = None
+        print(f"[PROMPT_REGISTRY] Loaded {self.name} prompts {loaded.version} ({len(loaded.templates)} templates)")
+        return loaded
+
+    def current(self) -> LoadedPrompts:
+        """The latest version, re-reading the file if it changed since the last check"""
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            try:
+                changed = os.path.getmtime(self.path) != self._loaded.mtime
+            except OSError:
+                changed = False
+            if changed:
+                # A broken edit keeps the previous version serving
+                loaded = self._load()
+                if loaded:
+                    self._loaded = loaded
+                    self.reloads += 1
+        return self._loaded
+
+    def get(self, key: str, default: Any = "") -> Any:
+        return self.current().get(key, default)
+
+    @property
+    def version(self) -> str:
+        return self.current().version
+
+
+class PromptRegistry:
+    def __init__(self, directory: str = PROMPTS_DIR):
+        self.directory = directory
+        self.check_interval = settings.prompt_reload_check_interval
+        self.sets: Dict[str, PromptSet] = {}
+
+    def register(self, name: str, filename: str) -> PromptSet:
+        if name not in self.sets:
+            self.sets[name] = PromptSet(name, os.path.join(self.directory, filename), self.check_interval)
+        return self.sets[name]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "check_interval": self.check_interval,
+            "prompt_sets": {
+                name: {
+                    "file": os.path.basename(prompt_set.path),
+                    "version": prompt_set.version,
+                    "templates": len(prompt_set.current().templates),
+                    "loaded_at": prompt_set.current().loaded_at,
+                    "reloads": prompt_set.reloads,
+                    "last_error": prompt_set.last_error
+                }
+                for name, prompt_set in self.sets.items()
+            }
+        }
+
+
+# Global prompt registry instance
+prompt_registry = PromptRegistry()
+interview_prompts = prompt_registry.register("interview", "optimized_prompts_fixed.json")
+followup_prompts = prompt_registry.register("followup", "followup_service_prompts.json")
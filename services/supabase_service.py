@@ -27,6 +27,8 @@ class SupabaseService:
         """Initialize Supabase client with service role key"""
         self.supabase_url = os.getenv("SUPABASE_URL")
         self.supabase_service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+        # Cleared when the deployed pre_screening_records table turns out not to have llm_usage yet
+        self.prescreening_llm_usage_column = True
         
         if not self.supabase_url or not self.supabase_service_key:
             raise ValueError("Missing Supabase credentials. Please check SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY in .env file")
@@ -419,10 +421,11 @@ class SupabaseService:
                 "possible_diagnosis": prescreening_data.get("possible_diagnosis"),
                 "chief_complaint": prescreening_data.get("chief_complaint"),
                 "symptoms_mentioned": prescreening_data.get("symptoms_mentioned", []),
-                "diagnostics": prescreening_data.get("pre_consultation_diagnostics", {})
+                "diagnostics": prescreening_data.get("pre_consultation_diagnostics", {}),
+                "llm_usage": prescreening_data.get("llm_usage")
             }
             
-            response = self.client.table("pre_screening_records").insert(db_data).execute()
+            response = self._insert_prescreening_record(db_data)
             
             if response.data and len(response.data) > 0:
                 created_record = response.data[0]
@@ -443,6 +446,23 @@ class SupabaseService:
             logger.error(f"Error in create_prescreening_record: {e}")
             return None
 
+    def _insert_prescreening_record(self, db_data: Dict[str, Any]):
+        """
+        Insert a pre-screening record. A table that predates the llm_usage column
+        (migrations/20261016_pre_screening_llm_usage.sql) gets the record without usage.
+        """
+        if not self.prescreening_llm_usage_column:
+            db_data = {key: value for key, value in db_data.items() if key != "llm_usage"}
+        try:
+            return self.client.table("pre_screening_records").insert(db_data).execute()
+        except Exception as e:
+            if "llm_usage" not in db_data or "llm_usage" not in str(e):
+                raise
+            logger.warning("⚠️ pre_screening_records has no llm_usage column, storing records without usage - "
+                           "apply migrations/20261016_pre_screening_llm_usage.sql")
+            self.prescreening_llm_usage_column = False
+            return self._insert_prescreening_record(db_data)
+
     async def _update_doctor_patient_relations(self, patient_uuid: str, patient_chosen_doctor_onehat_id: Optional[int]) -> None:
         """
         Update or create doctor-patient relations record
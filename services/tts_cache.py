@@ -0,0 +1,205 @@
+"""
+TTS Cache - Content-addressed ElevenLabs audio, keyed on the normalized text and every synthesis setting,
+in memory (LRU, bounded by bytes) and on disk (bounded by bytes, least recently used evicted first).
+The same store backs the audio URLs, so clips are kept even when reuse for new requests is disabled.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+AUDIO_SUFFIX = ".audio"
+
+
+def normalize_tts_text(text: str) -> str:
+    """Text exactly as it is sent to ElevenLabs: NFC, trimmed, runs of whitespace collapsed"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def tts_cache_key(text: str, voice_id: str, model_id: str, voice_settings: Dict[str, Any], output_format: str) -> str:
+    """sha256 over everything that changes the audio, so equal keys always mean identical audio"""
+    material = json.dumps({
+        "text": normalize_tts_text(text),
+        "voice_id": voice_id,
+        "model_id": model_id,
+        "voice_settings": voice_settings,
+        "output_format": output_format
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    def __init__(self, directory: Optional[str] = None, memory_max_bytes: Optional[int] = None,
+                 disk_max_bytes: Optional[int] = None, enabled: Optional[bool] = None):
+        self.enabled = settings.tts_cache_enabled if enabled is None else enabled
+        self.directory = directory if directory is not None else settings.tts_cache_dir
+        self.memory_max_bytes = memory_max_bytes if memory_max_bytes is not None else settings.tts_cache_memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes if disk_max_bytes is not None else settings.tts_cache_disk_max_bytes
+
+        # key -> audio bytes; most recently used last
+        self.memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self.memory_bytes = 0
+        # key -> file size; most recently used last, rebuilt from file access times on start
+        self.disk: "OrderedDict[str, int]" = OrderedDict()
+        self.disk_bytes = 0
+        self.stats = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0,
+            "memory_evictions": 0, "disk_evictions": 0, "bytes_saved": 0, "characters_saved": 0, "disk_errors": 0,
+            "clips_served": 0, "clips_not_found": 0
+        }
+        self._scan_disk()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{AUDIO_SUFFIX}")
+
+    def _scan_disk(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(AUDIO_SUFFIX):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, name[:-len(AUDIO_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self.disk[key] = size
+            self.disk_bytes += size
+        self._evict_disk()
+        logger.info(f"[TTS_CACHE] Found {len(self.disk)} cached clips ({self.disk_bytes} bytes) in {self.directory}")
+
+    def _remember(self, key: str, audio: bytes):
+        """Put audio in the memory tier, evicting least recently used clips beyond the byte budget"""
+        if len(audio) > self.memory_max_bytes:
+            return
+        if key in self.memory:
+            self.memory_bytes -= len(self.memory.pop(key))
+        self.memory[key] = audio
+        self.memory_bytes += len(audio)
+        while self.memory_bytes > self.memory_max_bytes:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= len(evicted)
+            self.stats["memory_evictions"] += 1
+
+    def _evict_disk(self):
+        while self.disk_bytes > self.disk_max_bytes and self.disk:
+            key, size = self.disk.popitem(last=False)
+            self.disk_bytes -= size
+            self.stats["disk_evictions"] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as file:
+                audio = file.read()
+            # The access time orders disk eviction across restarts
+            os.utime(self._path(key))
+            return audio
+        except OSError:
+            return None
+
+    def _write(self, key: str, audio: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename, so a crash never leaves a truncated clip behind
+        temp_path = f"{self._path(key)}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(audio)
+        os.replace(temp_path, self._path(key))
+
+    async def _lookup(self, key: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """The clip and the tier it came from ("memory" or "disk"), refreshing its recency"""
+        audio = self.memory.get(key)
+        if audio is not None:
+            self.memory.move_to_end(key)
+            if key in self.disk:
+                # Recency on disk follows use, wherever the clip was served from
+                self.disk.move_to_end(key)
+            return audio, "memory"
+        if key in self.disk and self.directory:
+            audio = await asyncio.to_thread(self._read, key)
+            if audio is None:
+                # Removed behind our back
+                self.disk_bytes -= self.disk.pop(key, 0)
+                return None, None
+            self.disk.move_to_end(key)
+            self._remember(key, audio)
+            return audio, "disk"
+        return None, None
+
+    async def get(self, key: str, text: str = "") -> Optional[bytes]:
+        """Stored audio for a synthesis about to be made, counted as ElevenLabs work saved"""
+        if not self.enabled:
+            return None
+        audio, tier = await self._lookup(key)
+        if tier:
+            self.stats[f"{tier}_hits"] += 1
+        if audio is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["bytes_saved"] += len(audio)
+        self.stats["characters_saved"] += len(normalize_tts_text(text))
+        return audio
+
+    async def read(self, key: str) -> Optional[bytes]:
+        """Stored audio for its audio URL; served whether or not reuse is enabled"""
+        audio, _ = await self._lookup(key)
+        self.stats["clips_served" if audio is not None else "clips_not_found"] += 1
+        return audio
+
+    async def put(self, key: str, audio: bytes):
+        if not audio:
+            return
+        self._remember(key, audio)
+        self.stats["stores"] += 1
+        if not self.directory or len(audio) > self.disk_max_bytes:
+            return
+        try:
+            await asyncio.to_thread(self._write, key, audio)
+        except OSError as e:
+            self.stats["disk_errors"] += 1
+            logger.warning(f"[TTS_CACHE] Could not write {self._path(key)}: {e}")
+            return
+        self.disk_bytes += len(audio) - self.disk.pop(key, 0)
+        self.disk[key] = len(audio)
+        self._evict_disk()
+
+    def clear(self):
+        for key in list(self.disk):
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+        self.memory.clear()
+        self.disk.clear()
+        self.memory_bytes = self.disk_bytes = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "memory_clips": len(self.memory),
+            "memory_bytes": self.memory_bytes,
+            "memory_max_bytes": self.memory_max_bytes,
+            "disk_clips": len(self.disk),
+            "disk_bytes": self.disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes,
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+            **self.stats
+        }
+
+
+# Global TTS cache instance
+tts_cache = TTSCache()
@@ -6,13 +6,94 @@ Handles text-to-speech conversion using ElevenLabs API
 import httpx
 import logging
 import os
-from typing import Optional, Dict, Any, Union
-import base64
+import re
+import time
+from collections import deque
+from typing import AsyncIterator, List, Optional, Dict, Any, Union
 import asyncio
 from datetime import datetime
 
+from core.config import settings
+from core.deadline import DeadlineExceeded, budget_stage, call_timeout
+from services.audio_pack import PACK_OUTPUT_FORMAT, audio_pack, audio_pack_plan
+from services.patient_phrases import all_phrases
+from services.tts_cache import normalize_tts_text, tts_cache, tts_cache_key
+
 logger = logging.getLogger(__name__)
 
+# Content types for the ElevenLabs output_format families
+AUDIO_MEDIA_TYPES = {
+    "mp3": "audio/mpeg",
+    "opus": "audio/ogg",
+    "pcm": "audio/pcm",
+    "ulaw": "audio/basic"
+}
+# Voice settings for question audio, shared by the buffered and streamed endpoints and the audio pack
+QUESTION_TTS_VOICE_SETTINGS = {
+    "stability": 0.0,
+    "similarity_boost": 0.75,
+    "style": 0.0,
+    "use_speaker_boost": False
+}
+# Served by routers/medical.py straight from the TTS cache
+AUDIO_URL_PATH = "/api/medical/tts-audio"
+# Recent time-to-first-audio samples kept per delivery path
+FIRST_AUDIO_WINDOW = 200
+
+# Sentence ends: Tamil questions use the Latin . ? ! as English ones do; the danda marks cover other Indic text.
+# Closing quotes and brackets stay with their sentence, and a boundary needs whitespace after it ("2.5 mg" is not one)
+SENTENCE_END = re.compile(r"[.?!।॥]+[\"'”’)\]]*(?=\s)")
+# Titles whose period does not end a sentence ("Dr. Priya will see you")
+ABBREVIATIONS = {"dr", "mr", "mrs", "ms", "st", "no", "vs", "etc", "approx"}
+
+
+def audio_extension(output_format: str) -> str:
+    return (output_format or "mp3").split("_")[0]
+
+
+def audio_media_type(output_format: str) -> str:
+    return AUDIO_MEDIA_TYPES.get(audio_extension(output_format), "application/octet-stream")
+
+
+def tts_audio_url(cache_key: str, output_format: str) -> str:
+    """Immutable URL of a stored clip; the content hash changes whenever the audio would"""
+    return f"{AUDIO_URL_PATH}/{cache_key}.{audio_extension(output_format)}"
+
+
+def split_sentences(text: str, min_chars: int = 0) -> List[str]:
+    """
+    Normalized text cut at sentence boundaries. Pieces shorter than min_chars are joined
+    with the next, so a short "Okay." does not cost an ElevenLabs request of its own.
+    """
+    text = normalize_tts_text(text)
+    pieces, start = [], 0
+    for match in SENTENCE_END.finditer(text):
+        words = text[start:match.start()].split()
+        if match.group().startswith(".") and words and words[-1].lower() in ABBREVIATIONS:
+            continue
+        pieces.append(text[start:match.end()].strip())
+        start = match.end()
+    pieces.append(text[start:].strip())
+
+    sentences, current = [], ""
+    for piece in filter(None, pieces):
+        current = f"{current} {piece}".strip()
+        if len(current) >= min_chars:
+            sentences.append(current)
+            current = ""
+    if current:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {current}"
+        else:
+            sentences.append(current)
+    return sentences
+
+
+def _percentile(values, percentile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered)) - 1))]
+
+
 class TTSService:
     def __init__(self):
         self.api_key = os.getenv("ELEVENLABS_API_KEY")
@@ -24,6 +105,13 @@ class TTSService:
         self.voice_id_english = os.getenv("ELEVENLABS_VOICE_ID_EN", "JBFqnCBsd6RMkjVDRZzb")  # Default voice
         self.tts_model = os.getenv("ELEVENLABS_TTS_MODEL", "eleven_multilingual_v2")
         
+        # Identical text and settings always give identical audio, so repeated questions are served from here
+        self.cache = tts_cache
+        # Fixed phrases (fallback questions, completion messages) synthesized ahead of time
+        self.pack = audio_pack
+        # Seconds from request to the first audio byte the client can play, buffered versus streamed
+        self.first_audio = {"buffered": deque(maxlen=FIRST_AUDIO_WINDOW), "streamed": deque(maxlen=FIRST_AUDIO_WINDOW)}
+        
         if not self.api_key:
             logger.warning("ElevenLabs API key not found in environment variables")
     
@@ -54,13 +142,34 @@ class TTSService:
             logger.warning(f"ElevenLabs health check failed: {e}")
             return False
     
+    def _synthesis_settings(self, voice_id: Optional[str], model_id: Optional[str],
+                            voice_settings: Optional[Dict[str, float]]):
+        """Voice, model and voice settings actually sent to ElevenLabs"""
+        # Use provided voice_id or default to English voice
+        selected_voice_id = voice_id or self.voice_id_english
+        selected_model_id = model_id or self.tts_model
+        
+        # Default voice settings optimized for medical conversations
+        default_voice_settings = {
+            "stability": 0.0,
+            "similarity_boost": 0.75,
+            "style": 0.0,
+            "use_speaker_boost": False
+        }
+        
+        if voice_settings:
+            default_voice_settings.update(voice_settings)
+        
+        return selected_voice_id, selected_model_id, default_voice_settings
+    
     async def text_to_speech(
         self, 
         text: str, 
         voice_id: Optional[str] = None,
         model_id: Optional[str] = None,
         voice_settings: Optional[Dict[str, float]] = None,
-        output_format: str = "mp3_44100_128"
+        output_format: str = "mp3_44100_128",
+        latency_path: Optional[str] = "buffered"
     ) -> Dict[str, Any]:
         """
         Convert text to speech using ElevenLabs API
@@ -71,17 +180,12 @@ class TTSService:
             model_id: Model to use (defaults to eleven_multilingual_v2)
             voice_settings: Voice settings (stability, similarity_boost, style, use_speaker_boost)
             output_format: Audio output format
+            latency_path: first_audio series the request latency is recorded in, or None when
+                no listener is waiting on this clip (later sentences, audio pack builds)
             
         Returns:
-            Dict with audio data or error information
+            Dict with the stored clip's audio_url or error information
         """
-        if not self.api_key:
-            return {
-                "success": False,
-                "error": "api_key_missing",
-                "message": "ElevenLabs API key not configured"
-            }
-        
         if not text or not text.strip():
             return {
                 "success": False,
@@ -89,24 +193,27 @@ class TTSService:
                 "message": "Text cannot be empty"
             }
         
-        # Use provided voice_id or default to English voice
-        selected_voice_id = voice_id or self.voice_id_english
-        selected_model_id = model_id or self.tts_model
+        selected_voice_id, selected_model_id, default_voice_settings = self._synthesis_settings(
+            voice_id, model_id, voice_settings
+        )
         
-        # Default voice settings optimized for medical conversations
-        default_voice_settings = {
-            "stability": 0.0,
-            "similarity_boost": 0.75,
-            "style": 0.0,
-            "use_speaker_boost": False
-        }
+        cache_key = tts_cache_key(text, selected_voice_id, selected_model_id, default_voice_settings, output_format)
+        cached_audio = self.pack.get(cache_key) or await self.cache.get(cache_key, text)
+        if cached_audio is not None:
+            logger.info(f"TTS cache hit: {len(text)} chars -> {len(cached_audio)} bytes")
+            return self._audio_result(cached_audio, text, output_format, selected_voice_id, selected_model_id,
+                                      cache_key, cached=True)
         
-        if voice_settings:
-            default_voice_settings.update(voice_settings)
+        if not self.api_key:
+            return {
+                "success": False,
+                "error": "api_key_missing",
+                "message": "ElevenLabs API key not configured"
+            }
         
         try:
             payload = {
-                "text": text.strip(),
+                "text": normalize_tts_text(text),
                 "model_id": selected_model_id,
                 "voice_settings": default_voice_settings
             }
@@ -115,29 +222,24 @@ class TTSService:
             if output_format:
                 url += f"?output_format={output_format}"
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    url,
-                    json=payload,
-                    headers=self._get_headers()
-                )
+            start = time.perf_counter()
+            async with httpx.AsyncClient(timeout=call_timeout(self.timeout)) as client:
+                async with budget_stage("elevenlabs_tts"):
+                    response = await client.post(
+                        url,
+                        json=payload,
+                        headers=self._get_headers()
+                    )
                 
                 if response.status_code == 200:
-                    # Convert audio bytes to base64 for JSON transport
-                    audio_base64 = base64.b64encode(response.content).decode('utf-8')
-                    
+                    # Nothing is playable until the whole clip has arrived
+                    if latency_path:
+                        self.first_audio[latency_path].append(time.perf_counter() - start)
                     logger.info(f"TTS successful: {len(text)} chars -> {len(response.content)} bytes")
+                    await self.cache.put(cache_key, response.content)
                     
-                    return {
-                        "success": True,
-                        "audio_base64": audio_base64,
-                        "audio_format": output_format,
-                        "voice_id": selected_voice_id,
-                        "model_id": selected_model_id,
-                        "text_length": len(text),
-                        "audio_size": len(response.content),
-                        "timestamp": datetime.now().isoformat()
-                    }
+                    return self._audio_result(response.content, text, output_format, selected_voice_id,
+                                              selected_model_id, cache_key, cached=False)
                 else:
                     error_detail = response.text
                     logger.error(f"ElevenLabs API error: {response.status_code} - {error_detail}")
@@ -149,7 +251,7 @@ class TTSService:
                         "status_code": response.status_code
                     }
                     
-        except httpx.TimeoutException:
+        except (httpx.TimeoutException, DeadlineExceeded):
             logger.error("ElevenLabs API timeout")
             return {
                 "success": False,
@@ -164,25 +266,69 @@ class TTSService:
                 "message": "TTS conversion failed"
             }
     
+    def _audio_result(self, audio: bytes, text: str, output_format: str, voice_id: str, model_id: str,
+                      cache_key: str, cached: bool) -> Dict[str, Any]:
+        return {
+            "success": True,
+            # The clip itself is fetched as raw bytes from its URL, never inlined in JSON
+            "audio_url": tts_audio_url(cache_key, output_format),
+            "audio_format": output_format,
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "text_length": len(text),
+            "audio_size": len(audio),
+            "timestamp": datetime.now().isoformat(),
+            "cache_key": cache_key,
+            "cached": cached,
+            # Raw bytes for callers inside the service (sentence streams); routers return audio_url only
+            "audio": audio
+        }
+    
     async def text_to_speech_stream(
-        self, 
-        text: str, 
+        self,
+        text: str,
         voice_id: Optional[str] = None,
         model_id: Optional[str] = None,
-        voice_settings: Optional[Dict[str, float]] = None
+        voice_settings: Optional[Dict[str, float]] = None,
+        output_format: str = "mp3_44100_128"
     ) -> Dict[str, Any]:
         """
-        Convert text to speech with streaming response
+        Start a synthesis whose audio is relayed chunk by chunk as ElevenLabs produces it
         
-        Args:
-            text: Text to convert to speech
-            voice_id: ElevenLabs voice ID
-            model_id: Model to use
-            voice_settings: Voice settings
-            
         Returns:
-            Dict with streaming audio data or error information
+            Dict with "chunks" (async iterator of audio bytes) and "media_type" once ElevenLabs
+            has accepted the request, or error information. The complete clip is added to the
+            TTS cache when the stream finishes; text of several sentences is synthesized and
+            cached sentence by sentence (see _sentence_stream).
         """
+        if not text or not text.strip():
+            return {
+                "success": False,
+                "error": "empty_text",
+                "message": "Text cannot be empty"
+            }
+        
+        selected_voice_id, selected_model_id, default_voice_settings = self._synthesis_settings(
+            voice_id, model_id, voice_settings
+        )
+        media_type = audio_media_type(output_format)
+        cache_key = tts_cache_key(text, selected_voice_id, selected_model_id, default_voice_settings, output_format)
+        
+        # A prebuilt phrase is one clip, whatever its sentence count
+        cached_audio = self.pack.get(cache_key)
+        if cached_audio is None and settings.tts_sentence_concurrency > 0:
+            sentences = split_sentences(text, settings.tts_sentence_min_chars)
+            if len(sentences) > 1:
+                return await self._sentence_stream(sentences, voice_id, model_id, voice_settings, output_format)
+        
+        if cached_audio is None:
+            cached_audio = await self.cache.get(cache_key, text)
+        if cached_audio is not None:
+            async def replay() -> AsyncIterator[bytes]:
+                yield cached_audio
+            
+            return {"success": True, "chunks": replay(), "media_type": media_type, "cache_key": cache_key, "cached": True}
+        
         if not self.api_key:
             return {
                 "success": False,
@@ -190,77 +336,152 @@ class TTSService:
                 "message": "ElevenLabs API key not configured"
             }
         
-        selected_voice_id = voice_id or self.voice_id_english
-        selected_model_id = model_id or self.tts_model
-        
-        default_voice_settings = {
-            "stability": 0.5,
-            "similarity_boost": 0.75,
-            "style": 0.0,
-            "use_speaker_boost": True
+        payload = {
+            "text": normalize_tts_text(text),
+            "model_id": selected_model_id,
+            "voice_settings": default_voice_settings
         }
+        url = f"{self.base_url}/text-to-speech/{selected_voice_id}/stream?output_format={output_format}"
         
-        if voice_settings:
-            default_voice_settings.update(voice_settings)
-        
+        start = time.perf_counter()
+        client = httpx.AsyncClient(timeout=self.timeout)
         try:
-            payload = {
-                "text": text.strip(),
-                "model_id": selected_model_id,
-                "voice_settings": default_voice_settings
-            }
-            
-            url = f"{self.base_url}/text-to-speech/{selected_voice_id}/stream"
-            
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                async with client.stream(
-                    "POST",
-                    url,
-                    json=payload,
-                    headers=self._get_headers()
-                ) as response:
-                    
-                    if response.status_code == 200:
-                        # Collect all chunks
-                        audio_chunks = []
-                        async for chunk in response.aiter_bytes():
-                            audio_chunks.append(chunk)
-                        
-                        # Combine all chunks
-                        audio_data = b''.join(audio_chunks)
-                        audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-                        
-                        logger.info(f"Streaming TTS successful: {len(text)} chars -> {len(audio_data)} bytes")
-                        
-                        return {
-                            "success": True,
-                            "audio_base64": audio_base64,
-                            "audio_format": "mp3",
-                            "voice_id": selected_voice_id,
-                            "model_id": selected_model_id,
-                            "text_length": len(text),
-                            "audio_size": len(audio_data),
-                            "timestamp": datetime.now().isoformat(),
-                            "streaming": True
-                        }
-                    else:
-                        error_detail = await response.aread()
-                        logger.error(f"ElevenLabs streaming API error: {response.status_code} - {error_detail}")
-                        
-                        return {
-                            "success": False,
-                            "error": f"streaming_api_error_{response.status_code}",
-                            "message": f"Streaming TTS conversion failed: {error_detail.decode()}",
-                            "status_code": response.status_code
-                        }
-                        
+            response = await client.send(
+                client.build_request("POST", url, json=payload, headers=self._get_headers()),
+                stream=True
+            )
         except Exception as e:
-            logger.error(f"Streaming TTS conversion error: {e}")
+            await client.aclose()
+            logger.error(f"Streaming TTS request error: {e}")
             return {
                 "success": False,
-                "error": str(e),
+                "error": "timeout" if isinstance(e, httpx.TimeoutException) else str(e),
                 "message": "Streaming TTS conversion failed"
             }
+        
+        if response.status_code != 200:
+            error_detail = (await response.aread()).decode(errors="replace")
+            await response.aclose()
+            await client.aclose()
+            logger.error(f"ElevenLabs streaming API error: {response.status_code} - {error_detail}")
+            return {
+                "success": False,
+                "error": f"streaming_api_error_{response.status_code}",
+                "message": f"Streaming TTS conversion failed: {error_detail}",
+                "status_code": response.status_code
+            }
+        
+        async def relay() -> AsyncIterator[bytes]:
+            audio = bytearray()
+            try:
+                async for chunk in response.aiter_bytes():
+                    if not audio:
+                        self.first_audio["streamed"].append(time.perf_counter() - start)
+                    audio.extend(chunk)
+                    yield chunk
+            finally:
+                await response.aclose()
+                await client.aclose()
+            # Only reached when the whole clip arrived; a listener who hung up leaves no partial clip behind
+            logger.info(f"Streaming TTS successful: {len(text)} chars -> {len(audio)} bytes")
+            await self.cache.put(cache_key, bytes(audio))
+        
+        return {"success": True, "chunks": relay(), "media_type": media_type, "cache_key": cache_key, "cached": False}
+    
+    async def _sentence_stream(
+        self,
+        sentences: List[str],
+        voice_id: Optional[str],
+        model_id: Optional[str],
+        voice_settings: Optional[Dict[str, float]],
+        output_format: str
+    ) -> Dict[str, Any]:
+        """
+        One stream for several sentences: the first is relayed live while the others are
+        synthesized concurrently (at most tts_sentence_concurrency at a time) and appended in
+        order as soon as the listener reaches them. Every sentence is cached on its own, so a
+        question sharing a sentence with an earlier one only pays for the new sentences.
+        Concatenated MP3 (and PCM) clips play back as one continuous clip.
+        """
+        semaphore = asyncio.Semaphore(settings.tts_sentence_concurrency)
+        
+        async def render(sentence: str) -> Dict[str, Any]:
+            async with semaphore:
+                # Played after the first sentence, so its latency is not time to first audio
+                return await self.text_to_speech(sentence, voice_id, model_id, voice_settings, output_format,
+                                                 latency_path=None)
+        
+        rest = [asyncio.create_task(render(sentence)) for sentence in sentences[1:]]
+        first = await self.text_to_speech_stream(sentences[0], voice_id, model_id, voice_settings, output_format)
+        if not first["success"]:
+            for task in rest:
+                task.cancel()
+            return first
+        
+        async def relay() -> AsyncIterator[bytes]:
+            try:
+                async for chunk in first["chunks"]:
+                    yield chunk
+                for number, task in enumerate(rest, start=2):
+                    result = await task
+                    if not result["success"]:
+                        # Audio already sent cannot be retracted; end the clip at the last good sentence
+                        logger.error(f"Sentence {number}/{len(sentences)} TTS failed: {result.get('message')}")
+                        return
+                    yield result["audio"]
+            finally:
+                await first["chunks"].aclose()
+                for task in rest:
+                    task.cancel()
+        
+        logger.info(f"Sentence TTS stream: {len(sentences)} sentences, {len(rest)} rendering in parallel")
+        return {
+            "success": True,
+            "chunks": relay(),
+            "media_type": first["media_type"],
+            # Each sentence has its own cache entry; there is no key for the whole text
+            "cache_key": None,
+            "cached": first["cached"],
+            "sentences": len(sentences)
+        }
+    
+    def _audio_pack_plan(self):
+        """The audio pack for the configured voices, synthesized exactly as question audio is"""
+        _, model_id, voice_settings = self._synthesis_settings(None, None, QUESTION_TTS_VOICE_SETTINGS)
+        voice_ids = [self.voice_id_english, self.voice_id_tamil]
+        return audio_pack_plan(all_phrases(), voice_ids, model_id, voice_settings, PACK_OUTPUT_FORMAT)
+    
+    async def _pack_audio(self, text: str, voice_id: str) -> Optional[bytes]:
+        if not self.api_key:
+            # Without a key only clips already on disk are served; build() logs what is missing
+            return None
+        result = await self.text_to_speech(text, voice_id=voice_id, voice_settings=QUESTION_TTS_VOICE_SETTINGS,
+                                           output_format=PACK_OUTPUT_FORMAT, latency_path=None)
+        if not result["success"]:
+            logger.warning(f"Audio pack phrase not synthesized: {result.get('message')}")
+            return None
+        return result["audio"]
+    
+    def start_audio_pack(self):
+        """Load or build the audio pack in the background (called from the app lifespan)"""
+        version, entries = self._audio_pack_plan()
+        self.pack.start(version, entries, self._pack_audio)
+    
+    async def build_audio_pack(self):
+        """Load or build the audio pack and wait for it (the offline build step)"""
+        version, entries = self._audio_pack_plan()
+        await self.pack.build(version, entries, self._pack_audio)
+    
+    def get_latency_metrics(self) -> Dict[str, Any]:
+        """Time to first playable audio byte for ElevenLabs requests, full-buffer versus streamed"""
+        return {
+            path: {
+                "samples": len(samples),
+                "p50_ms": round(_percentile(samples, 50) * 1000, 1) if samples else None,
+                "p95_ms": round(_percentile(samples, 95) * 1000, 1) if samples else None
+            }
+            for path, samples in self.first_audio.items()
+        }
     
     async def get_available_voices(self) -> Dict[str, Any]:
         """
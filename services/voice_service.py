@@ -9,6 +9,8 @@ from typing import Optional, Dict, Any
 import base64
 import asyncio
 
+from core.deadline import DeadlineExceeded, budget_stage, call_timeout
+
 logger = logging.getLogger(__name__)
 
 class VoiceService:
@@ -59,13 +61,14 @@ class VoiceService:
                 "timestamps": timestamps
             }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.voice_modal_url}/v1/listen",
-                    files=files,
-                    data=data,
-                    headers=headers
-                )
+            async with httpx.AsyncClient(timeout=call_timeout(self.timeout)) as client:
+                async with budget_stage("voice_modal"):
+                    response = await client.post(
+                        f"{self.voice_modal_url}/v1/listen",
+                        files=files,
+                        data=data,
+                        headers=headers
+                    )
                 
                 if response.status_code == 200:
                     result = response.json()
@@ -87,7 +90,7 @@ class VoiceService:
                         "message": "Voice transcription failed"
                     }
                     
-        except httpx.TimeoutException:
+        except (httpx.TimeoutException, DeadlineExceeded):
             logger.error("Voice_Modal API timeout")
             return {
                 "success": False,
@@ -122,12 +125,13 @@ class VoiceService:
                 "timestamps": False
             }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.voice_modal_url}/v1/listen",
-                    data=data,
-                    headers=headers
-                )
+            async with httpx.AsyncClient(timeout=call_timeout(self.timeout)) as client:
+                async with budget_stage("voice_modal"):
+                    response = await client.post(
+                        f"{self.voice_modal_url}/v1/listen",
+                        data=data,
+                        headers=headers
+                    )
                 
                 if response.status_code == 200:
                     result = response.json()
@@ -149,7 +153,7 @@ class VoiceService:
                         "message": "Voice transcription failed"
                     }
                     
-        except httpx.TimeoutException:
+        except (httpx.TimeoutException, DeadlineExceeded):
             logger.error("Voice_Modal API timeout")
             return {
                 "success": False,
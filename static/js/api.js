@@ -126,6 +126,69 @@ class APIClient {
         });
     }
 
+    // Streaming answer submission - reads Server-Sent Events from a POST response
+    async streamAnswer(endpoint, patientId, answer, onToken) {
+        const response = await fetch(`${this.baseURL}/api${endpoint}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            body: JSON.stringify({
+                session_id: this.sessionId,
+                patient_id: String(patientId),  // Ensure patient_id is always a string
+                answer: answer
+            })
+        });
+
+        if (!response.ok) {
+            const data = await response.json().catch(() => ({}));
+            throw new Error(data.detail || `HTTP error! status: ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let result = null;
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+
+            // Each SSE frame ends with a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const frame = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+
+                let eventName = 'message';
+                let data = '';
+                for (const line of frame.split('\n')) {
+                    if (line.startsWith('event: ')) eventName = line.slice(7);
+                    else if (line.startsWith('data: ')) data += line.slice(6);
+                }
+
+                const payload = JSON.parse(data);
+                if (eventName === 'token' && onToken) {
+                    onToken(payload.text);
+                } else if (eventName === 'done') {
+                    result = payload;
+                }
+            }
+        }
+
+        if (!result) {
+            throw new Error('Answer stream ended without a result');
+        }
+        return result;
+    }
+
+    async submitAnswerStream(patientId, answer, onToken) {
+        return await this.streamAnswer('/medical/submit-answer/stream', patientId, answer, onToken);
+    }
+
     async getInterviewStatus() {
         return await this.makeRequest(`/medical/interview/${this.sessionId}`);
     }
@@ -167,6 +230,10 @@ class APIClient {
         });
     }
 
+    async submitFollowupAnswerStream(patientId, answer, onToken) {
+        return await this.streamAnswer('/followup/submit-answer/stream', patientId, answer, onToken);
+    }
+
     async getFollowupInterviewStatus() {
         return await this.makeRequest(`/followup/interview/${this.sessionId}`);
     }
@@ -235,8 +235,11 @@ class MedicalInterviewHandler {
     }
 
     displayQuestion(question) {
-        this.currentQuestion = question;
-        
+        const messageDiv = this.createQuestionMessage();
+        this.finalizeQuestion(messageDiv, question);
+    }
+
+    createQuestionMessage() {
         const messageDiv = document.createElement('div');
         messageDiv.className = 'message system question';
         
@@ -245,13 +248,25 @@ class MedicalInterviewHandler {
                 <i class="fas fa-robot"></i>
             </div>
             <div class="message-content">
-                <div class="message-text">${question}</div>
+                <div class="message-text"></div>
                 <div class="message-time">${utils.formatTime()}</div>
             </div>
         `;
         
         this.chatMessages.appendChild(messageDiv);
         this.scrollToBottom();
+        return messageDiv;
+    }
+
+    appendQuestionText(messageDiv, text) {
+        messageDiv.querySelector('.message-text').textContent += text;
+        this.scrollToBottom();
+    }
+
+    finalizeQuestion(messageDiv, question) {
+        this.currentQuestion = question;
+        messageDiv.querySelector('.message-text').textContent = question;
+        this.scrollToBottom();
         
         // TTS Integration: Convert AI question to speech
         if (window.simpleTTS) {
@@ -304,22 +319,34 @@ class MedicalInterviewHandler {
             utils.showLoading('Processing your answer...');
             
             let response;
+            let streamingMessage = null;
             const interviewType = this.interviewType || sessionStorage.getItem('interviewType') || 'help';
             
+            // Render the next question as it streams in instead of waiting for the full text
+            const onToken = (text) => {
+                if (!streamingMessage) {
+                    utils.hideLoading();
+                    streamingMessage = this.createQuestionMessage();
+                }
+                this.appendQuestionText(streamingMessage, text);
+            };
+            
             // Route to appropriate service based on interview type
             if (interviewType === 'followup') {
                 console.log('[FRONTEND_DEBUG] Submitting follow-up answer');
-                response = await api.submitFollowupAnswer(this.patientData.patient_id, answer);
+                response = await api.submitFollowupAnswerStream(this.patientData.patient_id, answer, onToken);
             } else {
                 console.log('[FRONTEND_DEBUG] Submitting regular medical answer');
-                response = await api.submitAnswer(this.patientData.patient_id, answer);
+                response = await api.submitAnswerStream(this.patientData.patient_id, answer, onToken);
             }
             
             if (response.success) {
                 if (response.interview_complete) {
+                    if (streamingMessage) streamingMessage.remove();
                     this.completeInterview();
                 } else if (response.next_question) {
-                    this.displayQuestion(response.next_question);
+                    // The final text replaces the streamed preview (fallbacks and cleanup happen server-side)
+                    this.finalizeQuestion(streamingMessage || this.createQuestionMessage(), response.next_question);
                     this.updateProgress(response.progress);
                     this.enableInput();
                 } else {
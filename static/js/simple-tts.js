@@ -104,9 +104,9 @@ class SimpleTTS {
             console.log('[TTS_TIMING] Server reported API duration:', data.api_duration ? `${(data.api_duration * 1000).toFixed(1)}ms` : 'N/A');
             console.log('[TTS_TIMING] Audio size:', data.audio_size_kb ? `${data.audio_size_kb.toFixed(1)}KB` : 'N/A');
             
-            if (data.success && data.audio_base64) {
+            if (data.success && data.audio_url) {
                 return { 
-                    audio: data.audio_base64, 
+                    audioUrl: data.audio_url, 
                     timing: {
                         totalRequest: apiCallDuration,
                         serverApi: data.api_duration * 1000,
@@ -122,7 +122,54 @@ class SimpleTTS {
         }
     }
 
+    streamUrl(question) {
+        return `/api/medical/question-tts/stream?text=${encodeURIComponent(question)}`;
+    }
+
     async playQuestion(question) {
+        if (!this.isEnabled || !question) return;
+
+        // Stop any currently playing audio
+        if (this.currentAudio) {
+            this.currentAudio.pause();
+            this.currentAudio = null;
+        }
+
+        const requestStart = performance.now();
+        console.log('[TTS_TIMING] Starting streamed playQuestion at:', requestStart);
+
+        // The <audio> element starts playing on the first chunk the server relays
+        const audio = new Audio(this.streamUrl(question));
+        this.currentAudio = audio;
+        let started = false;
+
+        audio.addEventListener('playing', () => {
+            if (started) return;
+            started = true;
+            console.log(`[TTS_TIMING] Streamed time to first audio: ${(performance.now() - requestStart).toFixed(1)}ms`);
+        });
+
+        audio.addEventListener('ended', () => {
+            console.log(`[TTS_TIMING] Streamed audio playback ended. Total time from request to playback end: ${(performance.now() - requestStart).toFixed(1)}ms`);
+            if (this.currentAudio === audio) this.currentAudio = null;
+        });
+
+        audio.addEventListener('error', () => {
+            // Fall back to the full-buffer endpoint if the stream failed before any audio played
+            if (started || this.currentAudio !== audio) return;
+            console.warn('Streamed TTS failed, falling back to full-buffer audio');
+            this.currentAudio = null;
+            this.playBufferedQuestion(question);
+        });
+
+        try {
+            await audio.play();
+        } catch (error) {
+            console.warn('Streamed audio playback did not start:', error);
+        }
+    }
+
+    async playBufferedQuestion(question) {
         if (!this.isEnabled) return;
 
         try {
@@ -141,28 +188,20 @@ class SimpleTTS {
             const conversionComplete = performance.now();
             console.log(`[TTS_TIMING] TTS conversion completed in ${(conversionComplete - playbackStart).toFixed(1)}ms`);
 
-            // Create and play audio
-            const blobStart = performance.now();
-            const audioBlob = this.base64ToBlob(ttsResult.audio, 'audio/mpeg');
-            const audioUrl = URL.createObjectURL(audioBlob);
-            const blobComplete = performance.now();
-            console.log(`[TTS_TIMING] Audio blob created in ${(blobComplete - blobStart).toFixed(1)}ms`);
-            
-            this.currentAudio = new Audio(audioUrl);
+            // Play the clip from its immutable URL; the browser caches it and fetches ranges as needed
+            this.currentAudio = new Audio(ttsResult.audioUrl);
             
-            // Clean up URL when audio ends
             this.currentAudio.addEventListener('ended', () => {
                 const playbackEnd = performance.now();
                 const totalPlaybackTime = playbackEnd - playbackStart;
                 console.log(`[TTS_TIMING] Audio playback ended. Total time from request to playback end: ${totalPlaybackTime.toFixed(1)}ms`);
-                URL.revokeObjectURL(audioUrl);
                 this.currentAudio = null;
             });
 
             // Track when audio actually starts playing
             this.currentAudio.addEventListener('loadeddata', () => {
                 const audioLoaded = performance.now();
-                console.log(`[TTS_TIMING] Audio loaded and ready to play in ${(audioLoaded - blobComplete).toFixed(1)}ms`);
+                console.log(`[TTS_TIMING] Audio loaded and ready to play in ${(audioLoaded - conversionComplete).toFixed(1)}ms`);
             });
 
             this.currentAudio.addEventListener('play', () => {
@@ -173,8 +212,7 @@ class SimpleTTS {
                     'API Request': `${ttsResult.timing.totalRequest.toFixed(1)}ms`,
                     'ElevenLabs API': `${ttsResult.timing.serverApi.toFixed(1)}ms`,
                     'Response Parse': `${ttsResult.timing.parsing.toFixed(1)}ms`,
-                    'Blob Creation': `${(blobComplete - blobStart).toFixed(1)}ms`,
-                    'Audio Load': `${(playStart - blobComplete).toFixed(1)}ms`,
+                    'Audio Load': `${(playStart - conversionComplete).toFixed(1)}ms`,
                     'Total to Play': `${totalToPlay.toFixed(1)}ms`
                 });
             });
@@ -187,18 +225,6 @@ class SimpleTTS {
         }
     }
 
-    base64ToBlob(base64, mimeType) {
-        const byteCharacters = atob(base64);
-        const byteNumbers = new Array(byteCharacters.length);
-        
-        for (let i = 0; i < byteCharacters.length; i++) {
-            byteNumbers[i] = byteCharacters.charCodeAt(i);
-        }
-        
-        const byteArray = new Uint8Array(byteNumbers);
-        return new Blob([byteArray], { type: mimeType });
-    }
-
     // Clean up resources
     destroy() {
         if (this.currentAudio) {
@@ -431,8 +431,7 @@ class TTSPlayer {
                     'Content-Type': 'application/json',
                 },
                 body: JSON.stringify({
-                    session_id: sessionId,
-                    question: questionText,
+                    text: questionText,
                     language: this.currentLanguage
                 })
             });
@@ -441,7 +440,7 @@ class TTSPlayer {
             
             if (result.success) {
                 console.log('TTS conversion successful');
-                return result.audio_base64;
+                return result.audio_url;
             } else {
                 console.error('TTS conversion failed:', result);
                 return null;
@@ -455,26 +454,71 @@ class TTSPlayer {
     }
 
     /**
-     * Play audio from base64 data
+     * URL of the streamed question audio; an <audio> element plays it as the chunks arrive
      */
-    async playAudio(audioBase64) {
-        if (!audioBase64) return;
+    streamUrl(questionText) {
+        return `/api/medical/question-tts/stream?text=${encodeURIComponent(questionText)}`;
+    }
 
-        try {
-            // Stop current audio if playing
-            this.stopAudio();
+    /**
+     * Play question audio straight from the streaming endpoint, starting on the first chunk.
+     * Falls back to the full-buffer endpoint if the stream fails before playback starts.
+     */
+    async playStream(questionText, sessionId) {
+        if (!this.ttsEnabled || !questionText) return;
 
-            // Create audio blob from base64
-            const audioData = atob(audioBase64);
-            const arrayBuffer = new ArrayBuffer(audioData.length);
-            const uint8Array = new Uint8Array(arrayBuffer);
-            
-            for (let i = 0; i < audioData.length; i++) {
-                uint8Array[i] = audioData.charCodeAt(i);
+        this.stopAudio();
+        const requestStart = performance.now();
+        let started = false;
+
+        const audio = new Audio(this.streamUrl(questionText));
+        audio.volume = this.volume;
+        this.currentAudio = audio;
+        this.showLoading(true);
+
+        audio.addEventListener('playing', () => {
+            if (started) return;
+            started = true;
+            this.showLoading(false);
+            this.updatePlayButton(true);
+            console.log(`[TTS_TIMING] Streamed time to first audio: ${(performance.now() - requestStart).toFixed(1)}ms`);
+        });
+
+        audio.addEventListener('ended', () => {
+            this.updatePlayButton(false);
+            this.currentAudio = null;
+        });
+
+        audio.addEventListener('error', async () => {
+            if (started || this.currentAudio !== audio) return;
+            console.warn('Streamed TTS failed, falling back to full-buffer audio');
+            this.currentAudio = null;
+            const audioUrl = await this.convertQuestionToSpeech(questionText, sessionId);
+            if (audioUrl) {
+                console.log(`[TTS_TIMING] Full-buffer time to audio: ${(performance.now() - requestStart).toFixed(1)}ms`);
+                await this.playAudio(audioUrl);
             }
+        });
 
-            const audioBlob = new Blob([arrayBuffer], { type: 'audio/mpeg' });
-            const audioUrl = URL.createObjectURL(audioBlob);
+        try {
+            await audio.play();
+            this.isPlaying = true;
+        } catch (error) {
+            // Autoplay refused or stream failed; the error listener handles the latter
+            console.warn('Streamed audio playback did not start:', error);
+            this.showLoading(false);
+        }
+    }
+
+    /**
+     * Play audio from its URL; the browser caches the immutable clip and fetches ranges as needed
+     */
+    async playAudio(audioUrl) {
+        if (!audioUrl) return;
+
+        try {
+            // Stop current audio if playing
+            this.stopAudio();
 
             // Create and play audio
             this.currentAudio = new Audio(audioUrl);
@@ -521,10 +565,7 @@ class TTSPlayer {
      * Clean up audio resources
      */
     cleanup() {
-        if (this.currentAudio) {
-            URL.revokeObjectURL(this.currentAudio.src);
-            this.currentAudio = null;
-        }
+        this.currentAudio = null;
     }
 
     /**
@@ -586,10 +627,7 @@ class TTSPlayer {
             return;
         }
 
-        const audioBase64 = await this.convertQuestionToSpeech(questionText, sessionId);
-        if (audioBase64) {
-            await this.playAudio(audioBase64);
-        }
+        await this.playStream(questionText, sessionId);
     }
 
     /**
@@ -602,15 +640,9 @@ class TTSPlayer {
         this.currentQuestionText = questionText;
         this.currentSessionId = sessionId;
 
-        // Auto-play if enabled
+        // Auto-play if enabled; audio starts as soon as the first chunk arrives
         if (this.autoPlay) {
-            const audioBase64 = await this.convertQuestionToSpeech(questionText, sessionId);
-            if (audioBase64) {
-                // Small delay to let the question appear in UI
-                setTimeout(() => {
-                    this.playAudio(audioBase64);
-                }, 500);
-            }
+            await this.playStream(questionText, sessionId);
         }
     }
 }
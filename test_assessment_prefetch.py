@@ -0,0 +1,145 @@
+"""
+Tests for the background assessment prefetch started on interview completion
+"""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import FastAPI
+
+from core.deadline import current_budget, turn_budget
+from models.medical import InterviewSession
+from routers import followup
+from services.assessment_prefetch import AssessmentPrefetcher
+from services.llm_gateway import llm_gateway
+
+
+def test_endpoint_joins_running_prefetch():
+    prefetcher = AssessmentPrefetcher()
+    calls = []
+
+    async def assess():
+        calls.append(current_budget())
+        await asyncio.sleep(0.05)
+        return {"assessment": "done"}
+
+    async def run():
+        with turn_budget("medical_answer", seconds=0.01):
+            prefetcher.schedule("medical", "s1", assess)
+        # Scheduling again (e.g. a retried final answer) does not start a second assessment
+        prefetcher.schedule("medical", "s1", assess)
+        joined = await prefetcher.get("medical", "s1", assess)
+        cached = await prefetcher.get("medical", "s1", assess)
+        return joined, cached
+
+    joined, cached = asyncio.run(run())
+
+    assert joined == cached == {"assessment": "done"}
+    assert len(calls) == 1
+    # Outlives the answer turn, so it is not cut off by that turn's budget
+    assert calls[0] is None
+    assert prefetcher.stats["joined_running"] == 1 and prefetcher.stats["joined_done"] == 1
+    assert prefetcher.get_metrics()["prefetch_hit_rate"] == 1.0
+
+
+def test_failed_or_fallback_assessment_is_regenerated():
+    prefetcher = AssessmentPrefetcher()
+    results = iter([{"assessment": "fallback", "fallback": True}, {"assessment": "real"}])
+
+    async def assess():
+        return next(results)
+
+    async def run():
+        prefetcher.schedule("followup", "s2", assess)
+        first = await prefetcher.get("followup", "s2", assess)
+        await asyncio.sleep(0)
+        second = await prefetcher.get("followup", "s2", assess)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first["fallback"] and second == {"assessment": "real"}
+    assert prefetcher.stats["failed"] == 1 and prefetcher.stats["inline"] == 1
+
+
+class AssessmentModels:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        return SimpleNamespace(
+            text=json.dumps({"investigative_history": "Knee pain improving", "possible_diagnosis": "Healing sprain"}),
+            usage_metadata=None
+        )
+
+
+def test_followup_completion_prefetches_assessment():
+    models = AssessmentModels()
+    original_client = llm_gateway.client
+    original_get_session = followup.get_session
+    original_update_session = followup.update_session
+    llm_gateway.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+
+    async def fake_get_session(session_id):
+        return {
+            "patient_info": {"name": "Test Patient", "age": 45, "gender": "Male", "patient_id": "p-1"},
+            "consultation_data": {"consultation_date": "2025-08-25"}
+        }
+
+    async def fake_update_session(session_id, session):
+        return True
+
+    followup.get_session = fake_get_session
+    followup.update_session = fake_update_session
+
+    now = datetime.now().isoformat()
+    followup.followup_interview_sessions["prefetch-test"] = InterviewSession(
+        session_id="prefetch-test",
+        patient_id="p-1",
+        question_number=6,
+        max_questions=6,
+        created_at=now,
+        updated_at=now,
+        last_question_asked="Any other symptoms?"
+    )
+    followup.assessment_prefetch.discard_session("followup", "prefetch-test")
+    stats_before = dict(followup.assessment_prefetch.stats)
+
+    app = FastAPI()
+    app.include_router(followup.router, prefix="/api")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            answer = await client.post("/api/followup/submit-answer",
+                                       json={"session_id": "prefetch-test", "patient_id": "p-1", "answer": "No, nothing else"})
+            assessment = await client.post("/api/followup/generate-assessment", json={"session_id": "prefetch-test"})
+            return answer.json(), assessment.json()
+
+    try:
+        answer, assessment = asyncio.run(run())
+    finally:
+        llm_gateway.client = original_client
+        followup.get_session = original_get_session
+        followup.update_session = original_update_session
+        followup.followup_interview_sessions.pop("prefetch-test", None)
+        followup.assessment_prefetch.discard_session("followup", "prefetch-test")
+
+    assert answer["interview_complete"] is True
+    assert assessment["assessment"] == "Knee pain improving"
+    assert models.calls == 1
+    assert followup.assessment_prefetch.stats["scheduled"] == stats_before["scheduled"] + 1
+    assert followup.assessment_prefetch.stats["inline"] == stats_before["inline"]
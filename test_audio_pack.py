@@ -0,0 +1,98 @@
+"""
+Tests for the prebuilt audio pack of fixed patient-facing phrases
+"""
+
+import asyncio
+import os
+import sys
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from services.audio_pack import AudioPack, audio_pack_plan
+from services.patient_phrases import (
+    FOLLOWUP_ALTERNATIVE_QUESTIONS, FOLLOWUP_EMPTY_QUESTION_FALLBACK, FOLLOWUP_FIRST_QUESTION_FALLBACK,
+    FOLLOWUP_NEXT_QUESTION_FALLBACK, NEXT_QUESTION_FALLBACK, QUESTION_ERROR_FALLBACK, all_phrases
+)
+from services.tts_cache import TTSCache
+from services.tts_service import QUESTION_TTS_VOICE_SETTINGS, TTSService
+
+PHRASES = ["Can you tell me more about your symptoms?", "Interview completed. Ready for assessment."]
+
+
+def build(pack, phrases, voice_ids):
+    calls = []
+
+    async def synthesize(text, voice_id):
+        calls.append((text, voice_id))
+        return f"{voice_id}:{text}".encode()
+
+    version, entries = audio_pack_plan(phrases, voice_ids, "model", QUESTION_TTS_VOICE_SETTINGS)
+    asyncio.run(pack.build(version, entries, synthesize))
+    return version, calls
+
+
+def test_all_phrases_covers_fallbacks_and_both_languages():
+    phrases = all_phrases()
+    assert {NEXT_QUESTION_FALLBACK, QUESTION_ERROR_FALLBACK, FOLLOWUP_FIRST_QUESTION_FALLBACK,
+            FOLLOWUP_NEXT_QUESTION_FALLBACK, FOLLOWUP_EMPTY_QUESTION_FALLBACK} <= set(phrases)
+    assert set(FOLLOWUP_ALTERNATIVE_QUESTIONS["en"] + FOLLOWUP_ALTERNATIVE_QUESTIONS["ta"]) <= set(phrases)
+    assert len(phrases) == len(set(phrases))
+
+
+def test_pack_rebuilds_only_what_changed(tmp_path):
+    version, calls = build(AudioPack(directory=str(tmp_path), enabled=True), PHRASES, ["en-voice", "ta-voice"])
+    assert len(calls) == 4
+    assert os.path.exists(tmp_path / version / "manifest.json")
+
+    # A restart with the same strings and voices loads from disk without synthesizing
+    restarted = AudioPack(directory=str(tmp_path), enabled=True)
+    same_version, calls = build(restarted, PHRASES, ["en-voice", "ta-voice"])
+    assert same_version == version and calls == []
+    assert restarted.get_metrics()["loaded"] == 4 and restarted.complete
+
+    # A new phrase is a new pack version; unchanged clips are carried over and the old version removed
+    changed = AudioPack(directory=str(tmp_path), enabled=True)
+    new_version, calls = build(changed, PHRASES + ["Please wait for the doctor."], ["en-voice", "ta-voice"])
+    assert new_version != version
+    assert sorted(calls) == [("Please wait for the doctor.", "en-voice"), ("Please wait for the doctor.", "ta-voice")]
+    assert changed.get_metrics()["carried_over"] == 4
+    assert sorted(os.listdir(tmp_path)) == [new_version]
+
+    # So is a voice change
+    assert build(AudioPack(directory=str(tmp_path), enabled=True), PHRASES, ["en-voice", "new-voice"])[0] != version
+
+
+def test_prebuilt_phrase_needs_no_elevenlabs_call(tmp_path, monkeypatch):
+    def handler(request):
+        raise AssertionError("ElevenLabs was called for a prebuilt phrase")
+
+    original_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: original_client(transport=httpx.MockTransport(handler), **kwargs))
+    service = TTSService()
+    service.cache = TTSCache(directory=str(tmp_path / "cache"), enabled=True)
+    service.pack = AudioPack(directory=str(tmp_path / "pack"), enabled=True)
+
+    async def prebuilt(text, voice_id):
+        return f"pack:{text}".encode()
+
+    async def speak():
+        version, entries = service._audio_pack_plan()
+        await service.pack.build(version, entries, prebuilt)
+        buffered = await service.text_to_speech(NEXT_QUESTION_FALLBACK, voice_id=service.voice_id_tamil,
+                                                voice_settings=QUESTION_TTS_VOICE_SETTINGS)
+        # Two sentences, but served as the one prebuilt clip rather than split
+        streamed = await service.text_to_speech_stream("Interview completed. Ready for assessment.",
+                                                       voice_id=service.voice_id_tamil,
+                                                       voice_settings=QUESTION_TTS_VOICE_SETTINGS)
+        return buffered, b"".join([chunk async for chunk in streamed["chunks"]])
+
+    buffered, streamed = asyncio.run(speak())
+
+    assert buffered["success"] and buffered["cached"] and buffered["audio"] == f"pack:{NEXT_QUESTION_FALLBACK}".encode()
+    assert streamed == b"pack:Interview completed. Ready for assessment."
+    assert service.pack.get_metrics()["hits"] == 2
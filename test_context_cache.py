@@ -0,0 +1,166 @@
+"""
+Tests for the Gemini context cache of static system instructions
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.deadline import current_budget, turn_budget
+from services.context_cache import ContextCacheManager
+from services.llm_gateway import llm_gateway
+
+
+class StubCaches:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.created = []
+        self.updated = []
+        self.deleted = []
+        self.attempts = 0
+
+    async def create(self, model, config):
+        self.attempts += 1
+        if self.fail:
+            raise ValueError("Cached content is too small")
+        self.created.append(config.system_instruction)
+        return SimpleNamespace(name=f"cachedContents/{len(self.created)}")
+
+    async def update(self, name, config):
+        self.updated.append((name, config.ttl))
+        return SimpleNamespace(name=name)
+
+    async def delete(self, name):
+        self.deleted.append(name)
+
+
+def _manager() -> ContextCacheManager:
+    manager = ContextCacheManager()
+    manager.enabled = True
+    manager.min_tokens = {"default": 0}
+    return manager
+
+
+async def _drain(manager: ContextCacheManager):
+    await asyncio.gather(*manager._tasks.values())
+
+
+def _run_with_caches(caches: StubCaches, coro_factory):
+    original_client = llm_gateway.client
+    llm_gateway.client = SimpleNamespace(aio=SimpleNamespace(caches=caches))
+    try:
+        return asyncio.run(coro_factory())
+    finally:
+        llm_gateway.client = original_client
+
+
+def test_instruction_is_cached_in_the_background_and_referenced():
+    caches = StubCaches()
+    manager = _manager()
+
+    async def run():
+        # The turns that arrive before the entry exists go inline instead of waiting on the create
+        first = await manager.generation_config("gemini-test", "SYSTEM", temperature=0.7)
+        concurrent = await manager.generation_config("gemini-test", "SYSTEM", temperature=0.7)
+        await _drain(manager)
+        later = await manager.generation_config("gemini-test", "SYSTEM", temperature=0.7)
+        return first, concurrent, later
+
+    first, concurrent, later = _run_with_caches(caches, run)
+
+    assert caches.created == ["SYSTEM"]
+    assert first.system_instruction == concurrent.system_instruction == "SYSTEM"
+    assert first.cached_content is None
+    assert later.cached_content == "cachedContents/1" and later.system_instruction is None
+
+
+def test_expiring_entry_is_extended_and_replaced_prompt_deleted():
+    caches = StubCaches()
+    manager = _manager()
+
+    async def run():
+        await manager.get_cached_content("gemini-test", "SYSTEM v1", "question")
+        await _drain(manager)
+        # Force the v1 entry into its refresh window: it is still served while being extended
+        entry = next(iter(manager._entries.values()))
+        entry["expires_at"] = time.time() + 120
+        during_refresh = await manager.get_cached_content("gemini-test", "SYSTEM v1", "question")
+        await _drain(manager)
+        # An edited prompt gets its own entry and the v1 entry is deleted
+        await manager.get_cached_content("gemini-test", "SYSTEM v2", "question")
+        await _drain(manager)
+        return during_refresh, await manager.get_cached_content("gemini-test", "SYSTEM v2", "question")
+
+    during_refresh, name = _run_with_caches(caches, run)
+
+    assert during_refresh == "cachedContents/1"
+    assert caches.updated == [("cachedContents/1", f"{manager.ttl_seconds}s")]
+    assert caches.created == ["SYSTEM v1", "SYSTEM v2"]
+    assert caches.deleted == ["cachedContents/1"]
+    assert name == "cachedContents/2"
+    assert [entry["name"] for entry in manager._entries.values()] == ["cachedContents/2"]
+
+
+def test_create_failure_falls_back_to_inline_instruction():
+    caches = StubCaches(fail=True)
+    manager = _manager()
+
+    async def run():
+        first = await manager.generation_config("gemini-test", "SYSTEM")
+        await _drain(manager)
+        second = await manager.generation_config("gemini-test", "SYSTEM")
+        await _drain(manager)
+        return first, second
+
+    first, second = _run_with_caches(caches, run)
+
+    assert first.system_instruction == "SYSTEM" and first.cached_content is None
+    assert second.system_instruction == "SYSTEM"
+    assert manager.stats["fallbacks"] == 2
+    # The failed create is not retried on every turn
+    assert caches.attempts == 1
+
+
+def test_prompt_below_the_model_minimum_is_never_sent_to_the_cache():
+    caches = StubCaches()
+    manager = _manager()
+    manager.min_tokens = {"default": 1024}
+
+    async def run():
+        configs = [await manager.generation_config("gemini-test", "SHORT SYSTEM") for _ in range(3)]
+        await _drain(manager)
+        return configs
+
+    configs = _run_with_caches(caches, run)
+
+    assert caches.created == []
+    assert all(config.system_instruction == "SHORT SYSTEM" for config in configs)
+    assert manager.stats["too_small"] == 1
+
+
+def test_create_does_not_run_inside_the_turn_budget():
+    seen = []
+
+    class BudgetCaches(StubCaches):
+        async def create(self, model, config):
+            seen.append(current_budget())
+            return await super().create(model, config)
+
+    caches = BudgetCaches()
+    manager = _manager()
+
+    async def run():
+        with turn_budget("question", 5.0):
+            await manager.get_cached_content("gemini-test", "SYSTEM")
+        await _drain(manager)
+
+    _run_with_caches(caches, run)
+
+    assert seen == [None]
@@ -0,0 +1,121 @@
+"""
+Tests for the persistent diagnostics match cache
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.diagnostics_cache import DiagnosticsCache, normalize_diagnosis
+from services.diagnostics_service import DiagnosticsService
+from services.llm_gateway import llm_gateway
+
+MATCH = {"matched_condition": "Osteoarthritis → Knee", "diagnostics": {"Imaging": ["X-Ray"]}}
+
+
+def test_normalization_folds_case_punctuation_synonyms_and_order():
+    assert normalize_diagnosis("Knee Osteoarthritis.") == normalize_diagnosis("possible OA of the knee")
+    assert normalize_diagnosis("Type II Diabetes Mellitus") == normalize_diagnosis("T2DM")
+    assert normalize_diagnosis("Viral fever") != normalize_diagnosis("Typhoid fever")
+
+
+def test_lru_ttl_and_disk_tier(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = DiagnosticsCache(path=path, max_entries=2, ttl=60, enabled=True)
+    cache.set_csv_version("v1")
+
+    async def fill():
+        await cache.put("knee osteoarthritis", MATCH)
+        await cache.put("viral fever", {"matched_condition": None, "diagnostics": {}})
+        cache.get("knee osteoarthritis")  # most recently used
+        await cache.put("type 2 diabetes", {"matched_condition": "Diabetes → Type 2", "diagnostics": {}})
+
+    asyncio.run(fill())
+
+    assert cache.get("Viral Fever") is None  # least recently used, evicted
+    assert cache.stats["evictions"] == 1
+
+    # A fresh instance (a restart) reads the disk tier
+    restarted = DiagnosticsCache(path=path, max_entries=2, ttl=60, enabled=True)
+    restarted.set_csv_version("v1")
+    assert restarted.get("OA knee") == MATCH
+
+    # Expired entries are misses
+    restarted.entries[restarted.key("OA knee")]["stored_at"] -= 120
+    assert restarted.get("OA knee") is None
+    assert restarted.stats["expirations"] == 1
+
+
+def test_concurrent_saves_leave_a_valid_file(tmp_path, capsys):
+    path = str(tmp_path / "cache.json")
+    cache = DiagnosticsCache(path=path, max_entries=100, ttl=60, enabled=True)
+    cache.set_csv_version("v1")
+    diagnoses = [f"condition number {i}" for i in range(20)]
+
+    async def fill():
+        await asyncio.gather(*(cache.put(diagnosis, MATCH) for diagnosis in diagnoses))
+
+    asyncio.run(fill())
+
+    with open(path, encoding="utf-8") as file:
+        assert len(json.load(file)) == len(diagnoses)
+    assert os.listdir(tmp_path) == ["cache.json"]
+
+    # A corrupt file is dropped with a message rather than silently
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('{"v1:truncated": {"result": ')
+    restarted = DiagnosticsCache(path=path, max_entries=100, ttl=60, enabled=True)
+    assert not restarted.entries
+    assert "Dropped corrupt cache file" in capsys.readouterr().out
+
+
+def test_csv_change_invalidates_cached_matches(tmp_path):
+    csv_path = tmp_path / "pre-diagonstics.csv"
+    csv_path.write_text("﻿Condition,Sub-Condition,Pre-Consultation (Diagnostics)\nOsteoarthritis,Knee,X-Ray\n",
+                        encoding="utf-8")
+
+    calls = []
+
+    async def generate_content(call_type, contents, model=None, config=None, prompt_version=None):
+        calls.append(contents)
+        return SimpleNamespace(text=json.dumps({
+            "matched_condition": "Osteoarthritis → Knee", "imaging": ["X-Ray"],
+            "blood_tests": [], "clinical_tests": [], "other": []
+        }))
+
+    service = DiagnosticsService()
+    service.cache = DiagnosticsCache(path=str(tmp_path / "cache.json"), enabled=True)
+    service.csv_path = str(csv_path)
+    service._load_diagnostics_data()
+    # A one-row CSV would otherwise be matched locally, without the model
+    service.fast_path_threshold = 0
+
+    original_generate, original_client = llm_gateway.generate_content, llm_gateway.client
+    llm_gateway.generate_content = generate_content
+    llm_gateway.client = llm_gateway.client or SimpleNamespace()
+    try:
+        async def run():
+            first = await service.get_pre_consultation_diagnostics("Knee osteoarthritis", "Knee pain for months")
+            second = await service.get_pre_consultation_diagnostics("osteoarthritis, knee", "Stiff knee")
+            csv_path.write_text(csv_path.read_text(encoding="utf-8") + "Osteoarthritis,Hip,X-Ray\n", encoding="utf-8")
+            os.utime(csv_path, (os.path.getmtime(csv_path) + 10,) * 2)
+            third = await service.get_pre_consultation_diagnostics("Knee osteoarthritis", "Knee pain for months")
+            return first, second, third
+
+        first, second, third = asyncio.run(run())
+    finally:
+        llm_gateway.generate_content, llm_gateway.client = original_generate, original_client
+
+    assert first == second == third
+    # The BOM-prefixed header is read, so the CSV rows reach the prompt
+    assert "Osteoarthritis → Knee: X-Ray" in calls[0]
+    # Second lookup was a hit; the CSV edit forced a fresh match
+    assert len(calls) == 2
+    assert service.cache.stats["hits"] == 1 and service.cache.stats["invalidations"] == 1
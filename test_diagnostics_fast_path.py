@@ -0,0 +1,81 @@
+"""
+Tests for the deterministic diagnostics fast path that skips the LLM for confident matches
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.diagnostics_cache import DiagnosticsCache
+from services.diagnostics_service import DiagnosticsService, parse_diagnostics_column
+from services.llm_gateway import llm_gateway
+
+
+def _service(monkeypatch, llm_condition="Knee Pain → Osteoarthritis Knee"):
+    calls = []
+
+    async def generate_content(call_type, contents, model=None, config=None, prompt_version=None):
+        calls.append(contents)
+        return SimpleNamespace(text=json.dumps({
+            "matched_condition": llm_condition, "imaging": ["X-Ray Knee"],
+            "blood_tests": [], "clinical_tests": [], "other": []
+        }))
+
+    monkeypatch.setattr(llm_gateway, "generate_content", generate_content)
+    monkeypatch.setattr(llm_gateway, "client", llm_gateway.client or SimpleNamespace())
+    service = DiagnosticsService()
+    service.cache = DiagnosticsCache(path="", enabled=False)
+    service.fast_path_audit_rate = 0
+    return service, calls
+
+
+def test_diagnostics_column_is_split_into_groups():
+    assert parse_diagnostics_column("FBS, PPBS, HbA1c; Lipid profile") == {"Blood Tests": ["FBS", "PPBS", "HbA1c", "Lipid profile"]}
+    assert parse_diagnostics_column("MRI / CT Brain (if indicated); Blood tests (thyroid, Vit D, B12)") == {
+        "Imaging": ["MRI / CT Brain (if indicated)"], "Blood Tests": ["Blood tests (thyroid, Vit D, B12)"]
+    }
+    assert parse_diagnostics_column("HbA1c; Fundus exam; OCT; Urine microalbumin") == {
+        "Blood Tests": ["HbA1c"], "Clinical Tests": ["Fundus exam"], "Imaging": ["OCT"], "Other": ["Urine microalbumin"]
+    }
+    assert parse_diagnostics_column("") == {}
+
+
+def test_confident_match_skips_the_llm_and_ambiguous_ones_do_not(monkeypatch):
+    service, calls = _service(monkeypatch)
+
+    result = asyncio.run(service.get_pre_consultation_diagnostics("Knee osteoarthritis", "Pain on stairs"))
+    assert result == {"matched_condition": "Knee Pain → Osteoarthritis Knee",
+                      "diagnostics": {"Imaging": ["X-Ray Knee (AP / Lateral / Standing)"]}}
+    assert calls == []
+
+    # "Depression" and "Type 2 diabetes" each name several rows, so the model decides
+    for diagnosis in ["Depression", "Type 2 diabetes", "Likely knee osteoarthritis with meniscal involvement"]:
+        assert service.fast_path_match(diagnosis) is None
+    asyncio.run(service.get_pre_consultation_diagnostics("Depression", "Low mood"))
+    assert len(calls) == 1
+    assert service.get_fast_path_metrics()["fast_path_rate"] == 0.2
+
+
+def test_sampled_audit_records_agreement_with_the_llm(monkeypatch):
+    service, calls = _service(monkeypatch, llm_condition="Headache → Tension Headache")
+    service.fast_path_audit_rate = 1.0
+
+    async def run():
+        await service.get_pre_consultation_diagnostics("Knee osteoarthritis", "")
+        await service.get_pre_consultation_diagnostics("Tension headache", "")
+        await asyncio.gather(*service._audits)
+
+    asyncio.run(run())
+    metrics = service.get_fast_path_metrics()
+    assert len(calls) == 2 and metrics["audits"] == 2
+    assert metrics["agreements"] == 1 and metrics["agreement_rate"] == 0.5
+    assert metrics["recent_disagreements"] == [
+        {"diagnosis": "Knee osteoarthritis", "fast_path": "Knee Pain → Osteoarthritis Knee", "llm": "Headache → Tension Headache"}
+    ]
@@ -0,0 +1,47 @@
+"""
+Tests for the BM25 retrieval index that picks candidate rows for the diagnostics prompt
+"""
+
+import os
+import sys
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.diagnostics_index import DiagnosticsIndex
+from services.diagnostics_service import DiagnosticsService, diagnostics_service
+
+
+def _top(diagnosis, history=""):
+    return [f"{row['condition']} / {row['sub_condition']}" for _, row in diagnostics_service.index.search(diagnosis, history, 3)]
+
+
+def test_ranks_the_matching_row_first_with_synonyms():
+    assert _top("Knee OA")[0] == "Knee Pain / Osteoarthritis Knee"
+    assert _top("Uncontrolled T2DM")[0] == "Type 2 Diabetes / Uncontrolled"
+    assert _top("Sciatica", "pain radiating down the leg")[0] == "Low Back Pain / Disc Herniation"
+    assert _top("Generalized seizure")[0] == "Epilepsy / Generalized Seizures"
+    assert _top("Viral fever") == []
+
+
+def test_prompt_lists_only_candidate_rows():
+    service = DiagnosticsService()
+    service.top_k = 3
+    candidates = service.candidate_conditions("Migraine", "Throbbing headache")
+    prompt = service._create_matching_prompt("Migraine", "Throbbing headache", candidates)
+
+    assert len(candidates) <= 3
+    assert "Headache → Migraine" in prompt
+    assert "Schizophrenia" not in prompt
+
+
+def test_no_lexical_match_sends_small_csv_whole_but_not_large():
+    service = DiagnosticsService()
+    assert service.candidate_conditions("Viral fever", "") == service.conditions
+
+    rows = [{"condition": f"Site {i}", "sub_condition": f"Disorder {i}", "diagnostics": "CBC"} for i in range(200)]
+    service.conditions, service.index = rows, DiagnosticsIndex(rows)
+    assert service.candidate_conditions("Viral fever", "") == []
+    assert service.retrieval_stats["full_list"] == 1 and service.retrieval_stats["no_candidates"] == 1
@@ -0,0 +1,105 @@
+"""
+Tests for pre-consultation diagnostics run as a separate job from the assessment
+"""
+
+import asyncio
+import os
+import sys
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import FastAPI
+
+from routers import prescreening
+from services import diagnostics_jobs as diagnostics_jobs_module
+from services.diagnostics_jobs import DiagnosticsJobs
+
+DIAGNOSTICS = {"diagnostics": {"Imaging": ["X-Ray"]}, "matched_condition": "Knee → Sprain"}
+
+
+def _slow_diagnostics(monkeypatch, delay, calls):
+    async def get_pre_consultation_diagnostics(possible_diagnosis, investigative_history):
+        calls.append(possible_diagnosis)
+        await asyncio.sleep(delay)
+        return DIAGNOSTICS
+
+    monkeypatch.setattr(diagnostics_jobs_module.diagnostics_service, "get_pre_consultation_diagnostics",
+                        get_pre_consultation_diagnostics)
+
+
+def test_job_is_polled_then_merged_into_stored_prescreening(monkeypatch):
+    calls = []
+    _slow_diagnostics(monkeypatch, 0.02, calls)
+    stored = {"prescreening_data": {"possible_diagnosis": "Sprain", "pre_consultation_diagnostics": {}}}
+
+    async def fake_get_session(session_id):
+        return stored
+
+    async def fake_update_session(session_id, session):
+        return True
+
+    monkeypatch.setattr(diagnostics_jobs_module, "get_session", fake_get_session)
+    monkeypatch.setattr(diagnostics_jobs_module, "update_session", fake_update_session)
+    jobs = DiagnosticsJobs(accept_timeout=1.0)
+
+    async def run():
+        jobs.start("s1", "Sprain", "Twisted knee")
+        # The same assessment does not start a second job
+        jobs.start("s1", "Sprain", "Twisted knee")
+        pending = jobs.status("s1")
+        result = await jobs.wait("s1")
+        return pending, result
+
+    pending, result = asyncio.run(run())
+
+    assert pending == {"status": "pending"}
+    assert result == DIAGNOSTICS and calls == ["Sprain"]
+    assert jobs.status("s1")["pre_consultation_diagnostics"] == {"Imaging": ["X-Ray"]}
+    assert stored["prescreening_data"]["pre_consultation_diagnostics"] == {"Imaging": ["X-Ray"]}
+    assert jobs.status("other")["status"] == "not_found"
+
+
+def test_accept_waits_only_for_running_job(monkeypatch):
+    calls = []
+    _slow_diagnostics(monkeypatch, 0.05, calls)
+    jobs = DiagnosticsJobs(accept_timeout=1.0)
+    created = []
+
+    async def fake_get_session(session_id):
+        return {"prescreening_data": {"patient_uuid": "p-1", "pre_consultation_diagnostics": {}}}
+
+    async def fake_update_session(session_id, session):
+        return True
+
+    async def fake_create_record(prescreening_data):
+        created.append(dict(prescreening_data))
+        return {"id": len(created), "patient_uuid": "p-1"}
+
+    monkeypatch.setattr(diagnostics_jobs_module, "get_session", fake_get_session)
+    monkeypatch.setattr(diagnostics_jobs_module, "update_session", fake_update_session)
+    monkeypatch.setattr(prescreening, "get_session", fake_get_session)
+    monkeypatch.setattr(prescreening, "diagnostics_jobs", jobs)
+    monkeypatch.setattr(prescreening.supabase_service, "create_prescreening_record", fake_create_record)
+
+    app = FastAPI()
+    app.include_router(prescreening.router)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            jobs.start("s2", "Sprain", "Twisted knee")
+            running = await client.post("/api/prescreening/accept", json={"session_id": "s2"})
+            finished = await client.post("/api/prescreening/accept", json={"session_id": "s2"})
+            return running.json(), finished.json()
+
+    running, finished = asyncio.run(run())
+
+    assert running["success"] and finished["success"]
+    assert all(record["pre_consultation_diagnostics"] == {"Imaging": ["X-Ray"]} for record in created)
+    # Only the first accept found the job still running
+    assert jobs.stats["accept_waits"] == 1 and jobs.stats["accept_timeouts"] == 0
@@ -0,0 +1,169 @@
+"""
+Tests for the pregenerated first-question pool
+"""
+
+import asyncio
+import itertools
+import json
+from collections import deque
+import os
+import sys
+from types import SimpleNamespace
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import FastAPI
+
+from routers import medical
+from services.first_question_pool import FirstQuestionPool, age_band
+from services.llm_gateway import llm_gateway
+
+PATIENT = {"name": "Meena", "age": 34, "gender": "Female", "chosen_department": "Orthopedics"}
+
+
+def _counting_generator():
+    counter = itertools.count(1)
+    seen = []
+
+    async def generate(patient):
+        seen.append(patient)
+        return f"Opener {next(counter)}"
+
+    return generate, seen
+
+
+def test_age_bands_follow_prompt_adaptations():
+    assert age_band(8)[0] == "child"
+    assert age_band(34)[0] == "adult"
+    assert age_band(80)[0] == "senior"
+    assert age_band("unknown")[0] == "adult"
+
+
+def test_miss_fills_pool_then_serves_from_it():
+    generate, seen = _counting_generator()
+    pool = FirstQuestionPool(generate=generate)
+    pool.enabled, pool.pool_size, pool.low_water = True, 4, 2
+
+    async def run():
+        first = pool.take(PATIENT)
+        await asyncio.gather(*pool._refills.values())
+        served = [pool.take(PATIENT) for _ in range(3)]
+        await asyncio.gather(*pool._refills.values())
+        return first, served
+
+    first, served = asyncio.run(run())
+
+    assert first is None
+    assert all(question and question.startswith("Opener") for question in served)
+    assert len(set(served)) == 3
+    # Generated from demographics only, never the patient's name
+    assert all(patient["name"] == "Patient" and patient["age"] == 40 for patient in seen)
+    # Ran low after two takes and topped back up
+    assert pool.stats["refills"] == 2
+    assert pool.stats["hits"] == 3 and pool.stats["misses"] == 1
+
+    # Another age band is a separate pool
+    assert pool.key({**PATIENT, "age": 70}) != pool.key(PATIENT)
+
+
+def test_stale_prompt_version_is_dropped():
+    generate, _ = _counting_generator()
+    pool = FirstQuestionPool(generate=generate)
+    pool.enabled = True
+    stale_key = pool.key(PATIENT)[:3] + ("interview-old",)
+    pool.pools[stale_key] = deque(["Old opener"])
+
+    async def run():
+        question = pool.take(PATIENT)
+        await asyncio.gather(*pool._refills.values())
+        return question
+
+    assert asyncio.run(run()) is None
+    assert stale_key not in pool.pools
+
+
+def test_warming_fills_common_pools_through_bounded_refills(monkeypatch):
+    state = {"running": 0, "peak": 0}
+    counter = itertools.count(1)
+
+    async def generate(patient):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        return f"Opener {next(counter)}"
+
+    pool = FirstQuestionPool(generate=generate)
+    pool.enabled, pool.pool_size, pool.warm_genders, pool.warm_concurrency = True, 2, ["Female"], 1
+
+    async def run():
+        pool.start_warming(["Orthopedics", "orthopedics "])
+        # A patient arriving mid-warm-up waits on the same refill instead of starting another
+        pool.take({**PATIENT, "age": 70})
+        await asyncio.gather(*pool._refills.values())
+
+    asyncio.run(run())
+
+    # Three age bands, each for Orthopedics (however it is spelled) and for no department chosen
+    assert len(pool.pools) == 6 and pool.stats["refills"] == 6
+    assert all(len(questions) == 2 for questions in pool.pools.values())
+    # One pool at a time, each generating its openers together
+    assert state["peak"] == 2
+
+
+class OpenerModels:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        return SimpleNamespace(text=json.dumps({"question": f"இன்று நீங்கள் என்ன பிரச்சனைக்காக வந்திருக்கிறீர்கள்? ({self.calls})"}),
+                               usage_metadata=None)
+
+
+def test_start_interview_serves_pooled_opener_without_gemini_call():
+    models = OpenerModels()
+    original_client = llm_gateway.client
+    original_get_session = medical.get_session
+    original_pool = medical.first_question_pool
+    llm_gateway.client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    pool = FirstQuestionPool()
+    pool.enabled, pool.pool_size, pool.low_water = True, 3, 1
+    medical.first_question_pool = pool
+
+    async def fake_get_session(session_id):
+        return {"patient_info": PATIENT}
+
+    medical.get_session = fake_get_session
+    app = FastAPI()
+    app.include_router(medical.router, prefix="/api")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            body = {"session_id": "pool-1", "patient_id": "p"}
+            first = await client.post("/api/medical/start-interview", json=body)
+            await asyncio.gather(*pool._refills.values())
+            calls_after_fill = models.calls
+            second = await client.post("/api/medical/start-interview", json={**body, "session_id": "pool-2"})
+            return first.json(), second.json(), calls_after_fill
+
+    try:
+        first, second, calls_after_fill = asyncio.run(run())
+    finally:
+        llm_gateway.client = original_client
+        medical.get_session = original_get_session
+        medical.first_question_pool = original_pool
+        medical.interview_sessions.pop("pool-1", None)
+        medical.interview_sessions.pop("pool-2", None)
+
+    assert first["question"] and second["question"]
+    # One call for the first patient's opener plus three to fill the pool; the second start used none
+    assert calls_after_fill == 4
+    assert models.calls == calls_after_fill
+    assert pool.stats["hits"] == 1
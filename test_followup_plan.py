@@ -0,0 +1,74 @@
+"""
+Tests for concurrent generation of the follow-up question plan
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.config import settings
+from services.followup_service import FollowupService
+
+LATENCY = 0.2
+
+
+def _service(monkeypatch, complete_at=None):
+    service = FollowupService()
+    state = {"running": 0, "peak": 0, "started": []}
+
+    async def generate_followup_question(question_number, **kwargs):
+        state["started"].append(question_number)
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            await asyncio.sleep(LATENCY)
+        finally:
+            state["running"] -= 1
+        if question_number == complete_at:
+            return "INTERVIEW_COMPLETE"
+        return f"Question {question_number}?"
+
+    monkeypatch.setattr(service, "generate_followup_question", generate_followup_question)
+    return service, state
+
+
+def _plan(service):
+    return asyncio.run(service.conduct_followup_interview(
+        patient_age=52, patient_gender="Male", doctor_department="Orthopedics",
+        last_consultation_date="2026-09-01", previous_medical_record="Knee osteoarthritis"
+    ))
+
+
+def test_plan_takes_about_one_llm_latency_and_keeps_order(monkeypatch):
+    # Runs with the shipped followup_plan_concurrency
+    service, state = _service(monkeypatch)
+
+    start = time.perf_counter()
+    interview = _plan(service)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < LATENCY * 2
+    # Question 6 only ends the plan, so it is never generated
+    assert state["peak"] == 5 and sorted(state["started"]) == [1, 2, 3, 4, 5]
+    assert [qa["question"] for qa in interview["questions_and_answers"]] == [f"Question {n}?" for n in range(1, 6)]
+    assert [qa["section"] for qa in interview["questions_and_answers"]] == ["Treatment Adherence"] * 3 + ["Condition Assessment"] * 2
+    assert interview["completed"] and interview["early_completion"]
+
+
+def test_interview_complete_stops_the_plan_and_fan_out_is_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "followup_plan_concurrency", 2)
+    service, state = _service(monkeypatch, complete_at=2)
+
+    interview = _plan(service)
+
+    assert [qa["question_number"] for qa in interview["questions_and_answers"]] == [1]
+    assert interview["early_completion"]
+    assert state["peak"] == 2
+    # Question 3 took question 1's slot; the rest were cancelled before reaching the model
+    assert sorted(state["started"]) == [1, 2, 3]
@@ -0,0 +1,123 @@
+"""
+Tests for the shared LLM gateway concurrency limit, queue metrics and hedged requests
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.llm_gateway import LLMGateway, LLMQueueTimeout
+from test_medical_concurrency import SlowGeminiClient
+
+
+def _gateway(max_concurrency: int, queue_timeout: float, latency: float) -> LLMGateway:
+    gateway = LLMGateway()
+    gateway.client = SlowGeminiClient(latency)
+    gateway.max_concurrency = max_concurrency
+    gateway.queue_timeout = queue_timeout
+    return gateway
+
+
+def test_concurrency_cap_queues_excess_calls():
+    """With a cap of 2, four 0.2s calls run in two waves and the second wave records queue wait"""
+    gateway = _gateway(max_concurrency=2, queue_timeout=5.0, latency=0.2)
+
+    async def run():
+        return await asyncio.gather(*[
+            gateway.generate_content(call_type="question", contents="hi") for _ in range(4)
+        ])
+
+    responses = asyncio.run(run())
+    metrics = gateway.get_metrics()["call_types"]["question"]
+
+    assert len(responses) == 4
+    assert metrics["completed"] == 4
+    assert metrics["in_flight"] == 0 and metrics["queue_depth"] == 0
+    assert metrics["max_queue_wait_ms"] >= 150
+
+
+def test_queue_timeout_raises():
+    """A call that cannot get a slot within the queue timeout fails fast instead of piling up"""
+    gateway = _gateway(max_concurrency=1, queue_timeout=0.05, latency=0.5)
+
+    async def run():
+        return await asyncio.gather(
+            gateway.generate_content(call_type="diagnostics", contents="hi"),
+            gateway.generate_content(call_type="diagnostics", contents="hi"),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    metrics = gateway.get_metrics()["call_types"]["diagnostics"]
+
+    assert sum(isinstance(r, LLMQueueTimeout) for r in results) == 1
+    assert metrics["queue_timeouts"] == 1
+    assert metrics["completed"] == 1
+
+
+
+class TailLatencyModels:
+    """First call hangs in the slow tail, every later call answers quickly"""
+
+    def __init__(self, slow: float, fast: float):
+        self.slow = slow
+        self.fast = fast
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.slow if self.calls == 1 else self.fast)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        usage = SimpleNamespace(prompt_token_count=120, cached_content_token_count=0, candidates_token_count=10)
+        return SimpleNamespace(text='{"question": "ok"}', usage_metadata=usage)
+
+
+def _hedging_gateway(max_ratio: float, slow: float = 2.0) -> LLMGateway:
+    gateway = _gateway(max_concurrency=4, queue_timeout=5.0, latency=0)
+    gateway.client = SimpleNamespace(aio=SimpleNamespace(models=TailLatencyModels(slow=slow, fast=0.05)))
+    gateway.hedging_enabled = True
+    gateway.hedge_min_delay = 0.1
+    gateway.hedge_max_ratio = max_ratio
+    return gateway
+
+
+def test_hedge_beats_slow_request_and_cancels_loser():
+    """A call stuck in the tail is overtaken by its hedge and the stuck request is cancelled"""
+    gateway = _hedging_gateway(max_ratio=1.0)
+
+    start = time.perf_counter()
+    response = asyncio.run(gateway.generate_content(call_type="question", contents="hi"))
+    elapsed = time.perf_counter() - start
+
+    models = gateway.client.aio.models
+    metrics = gateway.get_metrics()["call_types"]["question"]
+
+    assert response.text == '{"question": "ok"}'
+    assert elapsed < 1.0
+    assert models.calls == 2 and models.cancelled == 1
+    assert metrics["hedges_fired"] == 1 and metrics["hedges_won"] == 1
+    assert metrics["hedge_loser_tokens"] == 120
+    assert metrics["in_flight"] == 0
+
+
+def test_hedge_cost_cap_and_call_types():
+    """No hedges beyond the cost cap, and call types outside the hedge list are never hedged"""
+    gateway = _hedging_gateway(max_ratio=0.0, slow=0.3)
+    asyncio.run(gateway.generate_content(call_type="question", contents="hi"))
+    assert gateway.client.aio.models.calls == 1
+    assert gateway.get_metrics()["call_types"]["question"]["hedges_fired"] == 0
+
+    gateway = _hedging_gateway(max_ratio=1.0, slow=0.3)
+    asyncio.run(gateway.generate_content(call_type="assessment", contents="hi"))
+    assert gateway.client.aio.models.calls == 1
@@ -0,0 +1,147 @@
+"""
+Concurrency test for the interview endpoints
+Fires simultaneous submit-answer calls against a slow local Gemini stub and checks
+that they overlap instead of queueing behind one another on the event loop
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import FastAPI
+
+from models.medical import InterviewSession, InterviewStatus
+from routers import medical, followup
+from services.llm_gateway import llm_gateway
+
+CONCURRENT_REQUESTS = 20
+STUB_LATENCY = 1.0
+STUB_QUESTION = "How long have you had this problem?"
+
+
+class SlowGeminiModels:
+    """Stand-in for client.aio.models that answers after a fixed delay"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(text='{"question": "%s"}' % STUB_QUESTION)
+
+
+class SlowGeminiClient:
+    def __init__(self, latency: float):
+        self.aio = SimpleNamespace(models=SlowGeminiModels(latency))
+
+
+# Router module, interview session store, endpoint
+FLOWS = {
+    "medical": (medical, medical.interview_sessions, "/api/medical/submit-answer"),
+    "followup": (followup, followup.followup_interview_sessions, "/api/followup/submit-answer"),
+}
+
+
+async def run_concurrent_submissions(flow: str = "medical", count: int = CONCURRENT_REQUESTS,
+                                     latency: float = STUB_LATENCY) -> dict:
+    """Submit `count` answers at once to the given interview flow and return timing information"""
+    router_module, interview_sessions, path = FLOWS[flow]
+
+    stub_client = SlowGeminiClient(latency)
+    original_client = llm_gateway.client
+    original_get_session = router_module.get_session
+    llm_gateway.client = stub_client
+
+    session_data = {
+        "patient_info": {"name": "Test Patient", "age": 45, "gender": "Male"},
+        "consultation_data": {"consultation_date": "2025-08-25", "doctor_name": "Previous Doctor"},
+        "selected_doctor_choice": {"type": "followup", "doctor_specialty": "Orthopedics"}
+    }
+
+    async def fake_get_session(session_id: str):
+        return {"session_id": session_id, **session_data}
+
+    router_module.get_session = fake_get_session
+
+    now = datetime.now().isoformat()
+    session_ids = [f"concurrency-{flow}-{i}" for i in range(count)]
+    for session_id in session_ids:
+        interview_sessions[session_id] = InterviewSession(
+            session_id=session_id,
+            patient_id="patient",
+            status=InterviewStatus.ACTIVE,
+            question_number=1,
+            created_at=now,
+            updated_at=now,
+            last_question_asked="What brings you here today?"
+        )
+
+    app = FastAPI()
+    app.include_router(router_module.router, prefix="/api")
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60.0) as client:
+            start = time.perf_counter()
+            responses = await asyncio.gather(*[
+                client.post(path, json={
+                    "session_id": session_id,
+                    "patient_id": "patient",
+                    "answer": "I have knee pain"
+                })
+                for session_id in session_ids
+            ])
+            elapsed = time.perf_counter() - start
+    finally:
+        llm_gateway.client = original_client
+        router_module.get_session = original_get_session
+        for session_id in session_ids:
+            interview_sessions.pop(session_id, None)
+
+    return {
+        "flow": flow,
+        "requests": count,
+        "stub_latency": latency,
+        "elapsed": elapsed,
+        "llm_calls": stub_client.aio.models.calls,
+        "status_codes": [r.status_code for r in responses],
+        "questions": [r.json().get("next_question") for r in responses]
+    }
+
+
+def _assert_concurrent(result: dict):
+    assert all(code == 200 for code in result["status_codes"])
+    assert result["llm_calls"] == result["requests"]
+    assert all(q == STUB_QUESTION for q in result["questions"])
+    # Serialised calls would take ~20s; concurrent ones finish close to a single call
+    assert result["elapsed"] < result["stub_latency"] * 2, f"took {result['elapsed']:.2f}s"
+
+
+def test_concurrent_medical_submit_answers():
+    """20 simultaneous medical submissions should take about as long as one"""
+    _assert_concurrent(asyncio.run(run_concurrent_submissions("medical")))
+
+
+def test_concurrent_followup_submit_answers():
+    """20 simultaneous follow-up submissions should take about as long as one"""
+    _assert_concurrent(asyncio.run(run_concurrent_submissions("followup")))
+
+
+if __name__ == "__main__":
+    for flow in FLOWS:
+        result = asyncio.run(run_concurrent_submissions(flow))
+        print(f"📊 [{flow}] {result['requests']} concurrent submit-answer calls, stub latency {result['stub_latency']:.1f}s")
+        print(f"⏱️  [{flow}] Wall clock: {result['elapsed']:.2f}s (serial would be ~{result['requests'] * result['stub_latency']:.0f}s)")
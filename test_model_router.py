@@ -0,0 +1,117 @@
+"""
+Tests for latency-aware model routing and the per-model circuit breaker
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.llm_gateway import LLMGateway
+from services.model_router import ModelRouter, model_router, OPEN, CLOSED
+
+
+def _router(preferences, failure_threshold=2, open_seconds=0.0) -> ModelRouter:
+    router = ModelRouter()
+    router.default_preferences = preferences
+    router.routes = {}
+    router.failure_threshold = failure_threshold
+    router.open_seconds = open_seconds
+    return router
+
+
+def test_routes_to_fastest_healthy_model():
+    router = _router(["model-a", "model-b"])
+
+    # Nothing measured yet - first preference
+    assert router.choose("question") == "model-a"
+
+    router.record_success("model-a", 0.8)
+    router.record_success("model-b", 0.2)
+    assert router.choose("question") == "model-b"
+
+    # Per call type preference lists override the default
+    router.routes = {"assessment": ["model-a"]}
+    assert router.choose("assessment") == "model-a"
+
+
+def test_circuit_opens_on_repeated_failures_and_recovers_by_probe():
+    router = _router(["model-a", "model-b"])
+    router.record_success("model-a", 0.8)
+    router.record_success("model-b", 0.2)
+
+    router.record_failure("model-b", RuntimeError("503"))
+    assert router.choose("question") == "model-b"
+    router.record_failure("model-b", RuntimeError("503"))
+    assert router.health["model-b"].state == OPEN
+    assert router.choose("question") == "model-a"
+
+    async def probe(model):
+        return 0.1
+
+    asyncio.run(router.probe_models(probe))
+    assert router.health["model-b"].state == CLOSED
+    assert router.choose("question") == "model-b"
+
+    table = router.get_route_table()
+    assert table["routes"]["question"]["selected"] == "model-b"
+    assert table["models"]["model-b"]["times_opened"] == 1
+
+
+def test_failed_probe_keeps_circuit_open():
+    router = _router(["model-a", "model-b"], failure_threshold=1)
+    router.record_failure("model-a", RuntimeError("500"))
+
+    async def probe(model):
+        if model == "model-a":
+            raise RuntimeError("still down")
+        return 0.3
+
+    asyncio.run(router.probe_models(probe))
+    assert router.health["model-a"].state == OPEN
+    assert router.choose("question") == "model-b"
+
+
+class FlakyModels:
+    """model-a always errors, model-b answers"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls.append(model)
+        if model == "model-a":
+            raise RuntimeError("503 UNAVAILABLE")
+        return SimpleNamespace(text="ok", usage_metadata=None)
+
+
+def test_gateway_fails_over_when_circuit_opens():
+    saved = (model_router.default_preferences, model_router.routes, model_router.failure_threshold, model_router.health)
+    model_router.default_preferences = ["model-a", "model-b"]
+    model_router.routes = {}
+    model_router.failure_threshold = 2
+    model_router.health = {}
+
+    gateway = LLMGateway()
+    gateway.client = SimpleNamespace(aio=SimpleNamespace(models=FlakyModels()))
+
+    async def call():
+        try:
+            return await gateway.generate_content(call_type="diagnostics", contents="hi")
+        except RuntimeError as e:
+            return e
+
+    try:
+        results = []
+        for _ in range(4):
+            results.append(asyncio.run(call()))
+    finally:
+        model_router.default_preferences, model_router.routes, model_router.failure_threshold, model_router.health = saved
+
+    assert [isinstance(r, RuntimeError) for r in results] == [True, True, False, False]
+    assert gateway.client.aio.models.calls == ["model-a", "model-a", "model-b", "model-b"]
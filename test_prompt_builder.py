@@ -0,0 +1,145 @@
+"""
+Tests for the token-budgeted prompt builder
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.config import settings
+from core import tokens
+from core.tokens import count_tokens
+from models.medical import ConversationTranscript, InterviewSession, QuestionAnswer
+from services.prompt_builder import PromptBuilder, prompt_budget_stats
+from services.patient_phrases import FOLLOWUP_ALTERNATIVE_QUESTIONS
+from services.followup_service import followup_service
+from services.medical_expert_service import MedicalExpertService
+
+LONG_QUESTION = "Could you describe exactly when the pain started, what you were doing and how it has changed since? " * 3
+
+
+def _history(count):
+    return [{"question": f"{LONG_QUESTION} ({i})", "answer": f"Answer number {i}"} for i in range(1, count + 1)]
+
+
+def test_history_within_budget_is_untouched():
+    service = MedicalExpertService()
+    history = _history(3)
+    text = service._budgeted_history("question", ConversationTranscript.of(history), "system", "template")
+    assert text == "".join(f"Q{i}: {e['question']}\nA{i}: {e['answer']}\n\n" for i, e in enumerate(history, 1))
+
+
+def test_oldest_exchanges_are_compacted_then_dropped():
+    service = MedicalExpertService()
+    history = _history(12)
+    full = service._budgeted_history("question", ConversationTranscript.of(history), "", "")
+    budget = count_tokens(full) // 3
+
+    builder = PromptBuilder("unit", budget=budget)
+    exchanges = [f"Q{i}: {e['question']}\nA{i}: {e['answer']}\n\n" for i, e in enumerate(history, 1)]
+    answers = [f"A{i}: {e['answer']}\n\n" for i, e in enumerate(history, 1)]
+    builder.add_items("history", exchanges, priority=1, compact=answers, keep=2,
+                      omitted_note="[{count} earlier exchanges omitted]\n\n")
+    text = builder.build()["history"]
+
+    assert count_tokens(text) <= budget
+    # The last two exchanges stay whole
+    assert f"Q11: {history[10]['question']}" in text and f"Q12: {history[11]['question']}" in text
+    # Older ones lose their question before anything is omitted
+    assert "Q1: " not in text
+    assert "A10: Answer number 10" in text
+
+
+def test_history_is_dropped_when_compacting_is_not_enough():
+    builder = PromptBuilder("unit", budget=60)
+    builder.add("system", "You are a careful medical interviewer.")
+    exchanges = [f"Q{i}: {LONG_QUESTION}\nA{i}: The answer is {i}" for i in range(1, 8)]
+    builder.add_items("history", exchanges, priority=1, keep=2, separator="\n",
+                      omitted_note="[{count} earlier exchanges omitted]\n")
+    sections = builder.build()
+
+    assert sections["history"].startswith("[5 earlier exchanges omitted]\n")
+    assert sections["system"] == "You are a careful medical interviewer."
+    assert prompt_budget_stats.get_metrics()["unit"]["trimmed"] >= 1
+
+
+def test_tokenizer_load_times_out_to_byte_estimates(monkeypatch):
+    monkeypatch.setattr(tokens, "_encoding", None)
+    release = threading.Event()
+    # A tokenizer download that hangs, as on a host without internet access
+    monkeypatch.setattr(tokens, "_load_encoding", lambda: release.wait(5))
+
+    async def start():
+        began = time.perf_counter()
+        await tokens.load_encoding(0.05)
+        return time.perf_counter() - began
+
+    # Not asyncio.run, which would wait for the hung thread on exit
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(start()) < 1
+    finally:
+        release.set()
+        loop.close()
+    assert count_tokens("byte estimate " * 8) == len("byte estimate " * 8) // tokens.BYTES_PER_TOKEN
+
+
+def test_followup_history_uses_session_transcript():
+    transcript = ConversationTranscript.of([
+        {"question": "Are you taking your medicines?", "answer": "Yes"},
+        {"question": "Any side effects?", "answer": "Mild nausea"}
+    ])
+    history = followup_service._budgeted_history("followup_question", transcript, "system", "template")
+    assert history == transcript.text == "Q1: Are you taking your medicines?\nA1: Yes\n\nQ2: Any side effects?\nA2: Mild nausea\n\n"
+    # English answers pick an English fallback that avoids the medication topic already covered
+    assert "medic" not in followup_service.get_fallback_question(3, transcript).lower()
+    assert followup_service.get_fallback_question(3, transcript) in FOLLOWUP_ALTERNATIVE_QUESTIONS["en"]
+
+
+def test_medical_record_trims_investigations_before_prescriptions():
+    consultation = {
+        "consultation_date": "2026-09-01",
+        "doctor_name": "Dr. Rao",
+        "raw_pradhi_response": {
+            "insights": {"Diagnosis": ["Type 2 diabetes"]},
+            "prescription_data": [{"drug": "Metformin", "dose": "500mg", "frequency": "twice daily"}],
+            "investigation": [f"Lab panel {i} with fasting glucose, HbA1c and lipid profile" for i in range(200)],
+            "next_steps": ["Review in 4 weeks"],
+            "associated_symptoms": ["Fatigue"]
+        }
+    }
+    record = followup_service.format_previous_medical_record(consultation)
+
+    assert count_tokens(record) <= settings.followup_record_token_budget
+    assert "Diagnosis: Type 2 diabetes" in record
+    assert "Prescription Data: [{'drug': 'Metformin', 'dose': '500mg', 'frequency': 'twice daily'}]" in record
+    assert "Next Steps: ['Review in 4 weeks']" in record
+    assert "Investigation: ['Lab panel 0 " in record and "more]" in record
+
+
+def test_medical_record_fallbacks():
+    assert followup_service.format_previous_medical_record(None) == "Previous consultation data available"
+    broken = {"raw_pradhi_response": "{not json", "consultation_date": "2026-09-01", "doctor_name": "Dr. Rao"}
+    assert followup_service.format_previous_medical_record(broken) == "Previous consultation on 2026-09-01 with Dr. Rao"
+
+
+def test_session_transcript_is_rendered_once_per_answer():
+    session = InterviewSession(session_id="s", patient_id="p", created_at="now", updated_at="now")
+    history = _history(3)
+    for exchange in history:
+        session.add_exchange(QuestionAnswer(timestamp="now", **exchange))
+
+    transcript = session.transcript
+    assert len(transcript) == len(session.conversation_history) == 3
+    assert transcript.text == "".join(transcript.exchanges) == ConversationTranscript.of(history).text
+    assert transcript.answers[0] == "A1: Answer number 1\n\n"
+    assert transcript.records[2]["answer"] == "Answer number 3"
+    # Passing the transcript through does not re-render it
+    assert ConversationTranscript.of(transcript) is transcript
@@ -0,0 +1,64 @@
+"""
+Tests for the versioned prompt registry and its hot reload
+"""
+
+import json
+import os
+import sys
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.prompt_registry import CompiledTemplate, LANGUAGE_INSTRUCTIONS, PromptSet, interview_prompts, followup_prompts
+
+
+def _write(path, prompts, mtime):
+    path.write_text(json.dumps(prompts), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_compiled_template_matches_str_format():
+    for text in ["Patient {patient_name}, {patient_age}y\n{{literal braces}}", "Score {value:.1f}", "No fields"]:
+        assert CompiledTemplate(text).render(patient_name="Asha", patient_age=40, value=2.345) == \
+            text.format(patient_name="Asha", patient_age=40, value=2.345)
+
+
+def test_reloads_when_file_changes(tmp_path):
+    path = tmp_path / "prompts.json"
+    _write(path, {"system": "Be brief.", "user": "Hello {name}"}, mtime=1000)
+    prompt_set = PromptSet("unit", str(path), check_interval=0)
+
+    first = prompt_set.current()
+    assert first.render("user", name="Ravi") == "Hello Ravi"
+    assert first.system_instruction("system", "tamil") == f"Be brief.\n\n{LANGUAGE_INSTRUCTIONS['tamil']}"
+    # Variants are built once per version
+    assert first.system_instruction("system", "tamil") is first.system_instruction("system", "tamil")
+
+    # Unchanged file - same loaded version
+    assert prompt_set.current() is first
+
+    _write(path, {"system": "Be very brief.", "user": "Hi {name}"}, mtime=2000)
+    second = prompt_set.current()
+    assert second is not first and second.version != first.version
+    assert second.render("user", name="Ravi") == "Hi Ravi"
+    assert prompt_set.reloads == 1
+
+
+def test_broken_edit_keeps_previous_version(tmp_path):
+    path = tmp_path / "prompts.json"
+    _write(path, {"user": "Hello {name}"}, mtime=1000)
+    prompt_set = PromptSet("unit", str(path), check_interval=0)
+    version = prompt_set.version
+
+    path.write_text("{not json", encoding="utf-8")
+    os.utime(path, (2000, 2000))
+    assert prompt_set.version == version
+    assert prompt_set.last_error
+
+
+def test_service_prompt_sets_are_loaded():
+    assert interview_prompts.get("System Instructions for Interview")
+    assert followup_prompts.get("User Instructions for Follow-up Interview")
+    assert interview_prompts.version.startswith("interview-")
@@ -0,0 +1,199 @@
+"""
+Tests for the SSE question streaming endpoints
+Uses a local Gemini stub that yields the response in small chunks
+"""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+from types import SimpleNamespace
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import FastAPI
+
+from core.streaming import MarkerHoldback, PartialJsonStringField
+from models.medical import AnswerSubmission, InterviewSession, InterviewStatus
+from routers import medical, followup
+from services.llm_gateway import llm_gateway
+
+
+class ChunkedGeminiModels:
+    """Stand-in for client.aio.models whose stream yields the response a few characters at a time"""
+
+    def __init__(self, response_text: str, chunk_size: int = 4):
+        self.response_text = response_text
+        self.chunk_size = chunk_size
+
+    async def generate_content_stream(self, model, contents, config=None):
+        async def chunks():
+            for i in range(0, len(self.response_text), self.chunk_size):
+                await asyncio.sleep(0)
+                yield SimpleNamespace(text=self.response_text[i:i + self.chunk_size])
+        return chunks()
+
+
+def _parse_sse(body: str) -> list:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+DEFAULT_SESSION = {
+    "patient_info": {"name": "Test Patient", "age": 45, "gender": "Male"},
+    "consultation_data": {"consultation_date": "2025-08-25"},
+    "selected_doctor_choice": {"type": "followup"}
+}
+
+
+async def _stream_answer(router_module, interview_sessions, path: str, response_text: str, session: dict = DEFAULT_SESSION):
+    original_client = llm_gateway.client
+    original_get_session = router_module.get_session
+    llm_gateway.client = SimpleNamespace(aio=SimpleNamespace(models=ChunkedGeminiModels(response_text)))
+
+    async def fake_get_session(session_id: str):
+        return session
+
+    router_module.get_session = fake_get_session
+
+    now = datetime.now().isoformat()
+    interview_sessions["stream-test"] = InterviewSession(
+        session_id="stream-test",
+        patient_id="patient",
+        question_number=1,
+        created_at=now,
+        updated_at=now,
+        last_question_asked="What brings you here today?"
+    )
+
+    app = FastAPI()
+    app.include_router(router_module.router, prefix="/api")
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(path, json={
+                "session_id": "stream-test",
+                "patient_id": "patient",
+                "answer": "My knee hurts"
+            })
+        return response, interview_sessions.pop("stream-test")
+    finally:
+        llm_gateway.client = original_client
+        router_module.get_session = original_get_session
+
+
+def test_medical_stream_emits_tokens_then_done():
+    question = "How long have you had the knee pain?"
+    response, interview_session = asyncio.run(_stream_answer(
+        medical, medical.interview_sessions, "/api/medical/submit-answer/stream",
+        json.dumps({"question": question})
+    ))
+    events = _parse_sse(response.text)
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [name for name, _ in events[:-1]] == ["token"] * (len(events) - 1)
+    assert "".join(data["text"] for _, data in events[:-1]) == question
+    assert events[-1][0] == "done"
+    assert events[-1][1]["next_question"] == question
+    assert events[-1][1]["question_number"] == 2
+    assert interview_session.last_question_asked == question
+    assert interview_session.question_number == 2
+
+
+def test_medical_stream_assessment_ready_completes_interview():
+    response, interview_session = asyncio.run(_stream_answer(
+        medical, medical.interview_sessions, "/api/medical/submit-answer/stream",
+        '{"question": "ASSESSMENT_READY"}'
+    ))
+    events = _parse_sse(response.text)
+
+    assert [name for name, _ in events] == ["done"]
+    assert events[0][1]["interview_complete"] is True
+    assert interview_session.status == InterviewStatus.COMPLETED
+
+
+def test_followup_stream_decodes_json_question():
+    response, interview_session = asyncio.run(_stream_answer(
+        followup, followup.followup_interview_sessions, "/api/followup/submit-answer/stream",
+        '{"question": "Are you taking your \\"new\\" tablets?"}'
+    ))
+    events = _parse_sse(response.text)
+
+    assert "".join(data["text"] for name, data in events if name == "token") == 'Are you taking your "new" tablets?'
+    assert events[-1][1]["next_question"] == 'Are you taking your "new" tablets?'
+    assert interview_session.last_question_asked == 'Are you taking your "new" tablets?'
+
+
+def test_followup_stream_without_consultation_data_still_asks_a_question():
+    # start_followup_interview allows a session with no previous consultation
+    response, interview_session = asyncio.run(_stream_answer(
+        followup, followup.followup_interview_sessions, "/api/followup/submit-answer/stream",
+        '{"question": "Has the knee pain eased since your last visit?"}',
+        session={"patient_info": {"name": "Test Patient", "age": 45, "gender": "Male"}, "consultation_data": None}
+    ))
+    events = _parse_sse(response.text)
+
+    assert events[-1][0] == "done"
+    assert events[-1][1]["next_question"] == "Has the knee pain eased since your last visit?"
+    assert interview_session.question_number == 2
+
+
+def test_disconnect_before_done_rolls_the_turn_back(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "client", SimpleNamespace(aio=SimpleNamespace(
+        models=ChunkedGeminiModels('{"question": "How long have you had the knee pain?"}')
+    )))
+
+    async def fake_get_session(session_id: str):
+        return DEFAULT_SESSION
+
+    monkeypatch.setattr(medical, "get_session", fake_get_session)
+    now = datetime.now().isoformat()
+    interview_session = InterviewSession(session_id="disconnect-test", patient_id="patient", created_at=now,
+                                         updated_at=now, last_question_asked="What brings you here today?")
+    monkeypatch.setitem(medical.interview_sessions, "disconnect-test", interview_session)
+
+    async def listen_then_leave():
+        response = await medical.submit_patient_answer_stream(AnswerSubmission(
+            session_id="disconnect-test", patient_id="patient", answer="My knee hurts"
+        ))
+        events = response.body_iterator
+        first = await events.__anext__()
+        # The client goes away after the first token, as when the tab is closed
+        await events.aclose()
+        return first
+
+    assert asyncio.run(listen_then_leave()).startswith("event: token")
+    # Retrying the answer asks question 2 again instead of skipping it
+    assert interview_session.question_number == 1
+    assert interview_session.conversation_history == [] and len(interview_session.transcript) == 0
+    assert interview_session.transcript.text == ""
+    assert interview_session.last_question_asked == "What brings you here today?"
+    assert interview_session.status == InterviewStatus.ACTIVE
+
+
+def test_marker_holdback_never_releases_partial_marker():
+    holdback = MarkerHoldback(["ASSESSMENT_READY"])
+    released = "".join(holdback.feed(part) for part in ["ASSESS", "MENT_", "READY"])
+
+    assert released == ""
+    assert holdback.marker_seen
+
+
+def test_partial_json_field_waits_for_complete_escapes():
+    field = PartialJsonStringField("question")
+    parts = ['{"quest', 'ion": "Caf', '\\u00', 'e9 or tea?"', '}']
+    decoded = [field.feed(part) for part in parts]
+
+    assert decoded == ["", "Caf", "", "é or tea?", ""]
+    assert field.complete
@@ -0,0 +1,91 @@
+"""
+Tests for question audio delivered by immutable URL instead of base64 JSON
+"""
+
+import asyncio
+import os
+import sys
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from core.byte_range import RangeNotSatisfiable, parse_byte_range
+from routers import medical
+from services.tts_cache import TTSCache
+
+AUDIO = bytes(range(10)) * 10
+
+
+def test_parse_byte_range():
+    assert parse_byte_range(None, 100) is None
+    assert parse_byte_range("bytes=10-19", 100) == (10, 19)
+    assert parse_byte_range("bytes=90-", 100) == (90, 99)
+    assert parse_byte_range("bytes=90-500", 100) == (90, 99)
+    assert parse_byte_range("bytes=-5", 100) == (95, 99)
+    assert parse_byte_range("bytes=-500", 100) == (0, 99)
+    # Multi-range and malformed headers fall back to the whole clip
+    assert parse_byte_range("bytes=0-1,5-6", 100) is None
+    assert parse_byte_range("bytes=9-2", 100) is None
+    assert parse_byte_range("items=0-1", 100) is None
+    with pytest.raises(RangeNotSatisfiable):
+        parse_byte_range("bytes=100-", 100)
+
+
+def test_question_tts_returns_url_served_with_etag_and_ranges(tmp_path, monkeypatch):
+    original_client = httpx.AsyncClient
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=AUDIO))
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: original_client(transport=transport, **kwargs))
+    # Reuse disabled: the clip must still be stored so its URL resolves
+    store = TTSCache(directory=str(tmp_path), enabled=False)
+    monkeypatch.setattr(medical, "tts_cache", store)
+    monkeypatch.setattr(medical.tts_service, "cache", store)
+    monkeypatch.setattr(medical.tts_service, "api_key", "test-key")
+
+    app = FastAPI()
+    app.include_router(medical.router, prefix="/api")
+
+    async def exchange():
+        async with original_client(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            question = await client.post("/api/medical/question-tts", json={"text": "Any fever?", "language": "en"})
+            url = question.json()["audio_url"]
+            return question.json(), {
+                "full": await client.get(url),
+                "revalidate": await client.get(url, headers={"If-None-Match": f'W/"{url.split("/")[-1][:64]}"'}),
+                "range": await client.get(url, headers={"Range": "bytes=10-19"}),
+                "stale_if_range": await client.get(url, headers={"Range": "bytes=10-19", "If-Range": '"other"'}),
+                "unsatisfiable": await client.get(url, headers={"Range": "bytes=500-"}),
+                "unknown": await client.get(url.replace(url.split("/")[-1][:8], "00000000")),
+                "bad_name": await client.get("/api/medical/tts-audio/..%2F..%2Fmain.py")
+            }
+
+    body, responses = asyncio.run(exchange())
+
+    assert "audio_base64" not in body
+    assert body["audio_url"].startswith("/api/medical/tts-audio/") and body["audio_url"].endswith(".mp3")
+
+    full = responses["full"]
+    assert full.status_code == 200 and full.content == AUDIO
+    assert full.headers["content-type"] == "audio/mpeg"
+    assert "immutable" in full.headers["cache-control"]
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["etag"] == f'"{body["audio_url"].split("/")[-1][:64]}"'
+
+    assert responses["revalidate"].status_code == 304 and responses["revalidate"].content == b""
+
+    partial = responses["range"]
+    assert partial.status_code == 206 and partial.content == AUDIO[10:20]
+    assert partial.headers["content-range"] == f"bytes 10-19/{len(AUDIO)}"
+
+    assert responses["stale_if_range"].status_code == 200 and responses["stale_if_range"].content == AUDIO
+    assert responses["unsatisfiable"].status_code == 416
+    assert responses["unsatisfiable"].headers["content-range"] == f"bytes */{len(AUDIO)}"
+    assert responses["unknown"].status_code == 404
+    assert responses["bad_name"].status_code == 404
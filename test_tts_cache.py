@@ -0,0 +1,76 @@
+"""
+Tests for the content-addressed TTS audio cache
+"""
+
+import asyncio
+import os
+import sys
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from services.tts_cache import TTSCache, tts_cache_key
+from services.tts_service import TTSService
+
+SETTINGS = {"stability": 0.0, "similarity_boost": 0.75, "style": 0.0, "use_speaker_boost": False}
+
+
+def test_key_covers_text_and_every_synthesis_setting():
+    key = tts_cache_key("How are you  feeling?", "voice", "model", SETTINGS, "mp3_44100_128")
+    assert key == tts_cache_key(" How are you feeling? ", "voice", "model", dict(reversed(SETTINGS.items())), "mp3_44100_128")
+    assert key != tts_cache_key("How are you feeling?", "other-voice", "model", SETTINGS, "mp3_44100_128")
+    assert key != tts_cache_key("How are you feeling?", "voice", "model", {**SETTINGS, "stability": 0.5}, "mp3_44100_128")
+    assert key != tts_cache_key("How are you feeling?", "voice", "model", SETTINGS, "mp3_22050_32")
+    assert key != tts_cache_key("how are you feeling?", "voice", "model", SETTINGS, "mp3_44100_128")
+
+
+def test_memory_and_disk_tiers_evict_by_bytes(tmp_path):
+    cache = TTSCache(directory=str(tmp_path), memory_max_bytes=250, disk_max_bytes=250, enabled=True)
+
+    async def fill():
+        await cache.put("a", b"a" * 100)
+        await cache.put("b", b"b" * 100)
+        assert await cache.get("a", "clip a") == b"a" * 100  # most recently used
+        await cache.put("c", b"c" * 100)
+
+    asyncio.run(fill())
+
+    assert list(cache.memory) == ["a", "c"] and cache.stats["memory_evictions"] == 1
+    assert sorted(os.listdir(tmp_path)) == ["a.audio", "c.audio"] and cache.stats["disk_evictions"] == 1
+
+    # A fresh instance (a restart) serves from disk and warms memory
+    restarted = TTSCache(directory=str(tmp_path), memory_max_bytes=250, disk_max_bytes=250, enabled=True)
+    assert asyncio.run(restarted.get("c", "clip c")) == b"c" * 100
+    assert asyncio.run(restarted.get("b")) is None
+    metrics = restarted.get_metrics()
+    assert metrics["disk_hits"] == 1 and metrics["misses"] == 1 and metrics["hit_ratio"] == 0.5
+    assert metrics["bytes_saved"] == 100 and metrics["characters_saved"] == 6
+    assert "c" in restarted.memory
+
+
+def test_repeated_text_calls_elevenlabs_once(tmp_path, monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=b"ID3-audio")
+
+    original_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: original_client(transport=httpx.MockTransport(handler), **kwargs))
+    service = TTSService()
+    service.api_key = "test-key"
+    service.cache = TTSCache(directory=str(tmp_path), enabled=True)
+
+    async def speak():
+        return [await service.text_to_speech("Can you tell me more about your symptoms?", voice_id="v") for _ in range(3)]
+
+    results = asyncio.run(speak())
+
+    assert len(requests) == 1
+    assert [r["cached"] for r in results] == [False, True, True]
+    assert len({r["audio_url"] for r in results}) == 1
+    assert service.cache.get_metrics()["characters_saved"] == 2 * len("Can you tell me more about your symptoms?")
@@ -0,0 +1,84 @@
+"""
+Tests for sentence-chunked TTS: splitting, parallel synthesis and in-order delivery
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from services.tts_cache import TTSCache
+from services.tts_service import TTSService, split_sentences
+
+QUESTION = "When did the pain in your knee start? Does it get worse on the stairs? Have you taken anything for it?"
+
+
+def test_split_sentences():
+    assert split_sentences(QUESTION, 20) == [
+        "When did the pain in your knee start?",
+        "Does it get worse on the stairs?",
+        "Have you taken anything for it?"
+    ]
+    # Titles and decimals are not boundaries; closing brackets stay with their sentence
+    assert split_sentences("Dr. Priya will see you. Take 2.5 mg (twice daily). Any questions?") == [
+        "Dr. Priya will see you.", "Take 2.5 mg (twice daily).", "Any questions?"
+    ]
+    # Short pieces are joined with the next one, and a short tail with the last one
+    assert split_sentences("Okay. When did the pain start? Thanks.", 20) == ["Okay. When did the pain start? Thanks."]
+    assert split_sentences("வலி எப்போது தொடங்கியது? உங்களுக்கு காய்ச்சல் இருக்கிறதா?", 10) == [
+        "வலி எப்போது தொடங்கியது?", "உங்களுக்கு காய்ச்சல் இருக்கிறதா?"
+    ]
+    assert split_sentences("   ") == []
+
+
+def test_sentences_render_in_parallel_and_play_in_order(tmp_path, monkeypatch):
+    in_flight, peak, requested = 0, 0, []
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        text = json.loads(request.content)["text"]
+        requested.append(text)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later sentences finish first, so order must come from the stream, not from completion
+        await asyncio.sleep(0.05 if text.startswith("When") else 0.01)
+        in_flight -= 1
+        return httpx.Response(200, content=f"<{text}>".encode())
+
+    original_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: original_client(transport=httpx.MockTransport(handler), **kwargs))
+    service = TTSService()
+    service.api_key = "test-key"
+    service.cache = TTSCache(directory=str(tmp_path), enabled=True)
+
+    async def listen():
+        result = await service.text_to_speech_stream(QUESTION)
+        return result, b"".join([chunk async for chunk in result["chunks"]])
+
+    result, audio = asyncio.run(listen())
+
+    sentences = split_sentences(QUESTION, 20)
+    assert result["sentences"] == 3
+    assert audio == "".join(f"<{sentence}>" for sentence in sentences).encode()
+    assert sorted(requested) == sorted(sentences) and peak == 3
+    # Only the first sentence counts toward time to first audio
+    latency = service.get_latency_metrics()
+    assert latency["streamed"]["samples"] == 1 and latency["buffered"]["samples"] == 0
+
+    # Each sentence is cached on its own; a question repeating one only synthesizes the new sentence
+    assert service.cache.get_metrics()["stores"] == 3
+    requested.clear()
+
+    async def listen_again():
+        result = await service.text_to_speech_stream("Does it get worse on the stairs? Is the knee swollen in the morning?")
+        return b"".join([chunk async for chunk in result["chunks"]])
+
+    assert asyncio.run(listen_again()) == b"<Does it get worse on the stairs?><Is the knee swollen in the morning?>"
+    assert requested == ["Is the knee swollen in the morning?"]
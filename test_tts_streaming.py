@@ -0,0 +1,81 @@
+"""
+Tests for the streamed question audio endpoint
+Uses an ElevenLabs stand-in that sends the clip in several chunks
+"""
+
+import asyncio
+import os
+import sys
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import FastAPI
+
+from routers import medical
+from services.tts_cache import TTSCache
+
+CHUNKS = [b"ID3-", b"frame-1-", b"frame-2"]
+QUESTION = "When did the pain start?"
+
+
+def test_stream_relays_chunks_and_fills_the_cache(tmp_path, monkeypatch):
+    upstream = []
+
+    async def audio_chunks():
+        for chunk in CHUNKS:
+            await asyncio.sleep(0)
+            yield chunk
+
+    def handler(request):
+        upstream.append(request)
+        return httpx.Response(200, content=audio_chunks())
+
+    original_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: original_client(transport=httpx.MockTransport(handler), **kwargs))
+    service = medical.tts_service
+    monkeypatch.setattr(service, "api_key", "test-key")
+    monkeypatch.setattr(service, "cache", TTSCache(directory=str(tmp_path), enabled=True))
+    service.first_audio["streamed"].clear()
+
+    app = FastAPI()
+    app.include_router(medical.router, prefix="/api")
+
+    async def listen():
+        transport = httpx.ASGITransport(app=app)
+        async with original_client(transport=transport, base_url="http://test") as client:
+            responses = []
+            for _ in range(2):
+                async with client.stream("GET", "/api/medical/question-tts/stream", params={"text": QUESTION}) as response:
+                    responses.append((response.status_code, response.headers, [chunk async for chunk in response.aiter_bytes()]))
+            return responses
+
+    (first_status, first_headers, first_chunks), (second_status, second_headers, second_chunks) = asyncio.run(listen())
+
+    assert first_status == second_status == 200
+    assert first_headers["content-type"] == "audio/mpeg"
+    assert first_headers["x-tts-cache"] == "miss" and second_headers["x-tts-cache"] == "hit"
+    assert b"".join(first_chunks) == b"".join(second_chunks) == b"".join(CHUNKS)
+
+    # One ElevenLabs call, to the streaming endpoint; the replay came from the cache
+    assert len(upstream) == 1
+    assert upstream[0].url.path.endswith("/stream")
+    assert upstream[0].url.params["output_format"] == "mp3_44100_128"
+    assert service.cache.get_metrics()["stores"] == 1
+    assert service.get_latency_metrics()["streamed"]["samples"] == 1
+
+
+def test_stream_rejects_empty_text():
+    app = FastAPI()
+    app.include_router(medical.router, prefix="/api")
+
+    async def request():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get("/api/medical/question-tts/stream", params={"text": "  "})
+
+    assert asyncio.run(request()).status_code == 400
@@ -0,0 +1,110 @@
+"""
+Turn latency budget test
+Runs submit-answer turns against a Gemini stub slower than the budget and checks that
+the turn answers with its fallback question on time and records the stage that ran out
+"""
+
+import asyncio
+import io
+import os
+import sys
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("LUXAND_API_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from test_medical_concurrency import run_concurrent_submissions, STUB_QUESTION
+from core.config import settings
+from core.deadline import call_timeout, turn_budget, turn_budget_stats
+from services.luxand_face_recognition_service import LuxandFaceRecognitionService
+from services.patient_phrases import FOLLOWUP_FALLBACK_QUESTIONS
+
+BUDGET = 0.3
+SLOW_LATENCY = 2.0
+
+
+def _run_with_budget(flow: str) -> dict:
+    original_budget = settings.turn_budget_seconds
+    settings.turn_budget_seconds = BUDGET
+    try:
+        return asyncio.run(run_concurrent_submissions(flow, count=5, latency=SLOW_LATENCY))
+    finally:
+        settings.turn_budget_seconds = original_budget
+
+
+def test_medical_turn_falls_back_when_budget_runs_out():
+    result = _run_with_budget("medical")
+
+    assert all(code == 200 for code in result["status_codes"])
+    assert all(q == "Can you tell me more about your symptoms?" for q in result["questions"])
+    assert result["elapsed"] < SLOW_LATENCY / 2, f"took {result['elapsed']:.2f}s"
+
+    stats = turn_budget_stats.get_metrics()["turns"]["medical_answer"]
+    assert stats["exhausted_by"].get("gemini:question", 0) >= 5
+
+
+def test_followup_turn_falls_back_when_budget_runs_out():
+    result = _run_with_budget("followup")
+
+    assert all(code == 200 for code in result["status_codes"])
+    assert all(q and q != STUB_QUESTION for q in result["questions"])
+    assert result["elapsed"] < SLOW_LATENCY / 2, f"took {result['elapsed']:.2f}s"
+
+    stats = turn_budget_stats.get_metrics()["turns"]["followup_answer"]
+    assert stats["exhausted_by"].get("gemini:followup_question", 0) >= 5
+
+
+def test_fast_turn_is_not_cut_short():
+    result = asyncio.run(run_concurrent_submissions("medical", count=3, latency=0.05))
+    assert all(q == STUB_QUESTION for q in result["questions"])
+
+
+def test_call_timeout_is_capped_by_turn_budget():
+    assert call_timeout(30.0) == 30.0
+    assert call_timeout() is None
+
+    with turn_budget("unit", seconds=1.0):
+        assert call_timeout(30.0) <= 1.0
+        assert call_timeout(0.2) == 0.2
+
+    assert call_timeout(30.0) == 30.0
+    assert FOLLOWUP_FALLBACK_QUESTIONS
+
+
+def test_httpx_timeout_becomes_deadline_without_blocking_the_loop(monkeypatch):
+    async def handler(request):
+        # Luxand answers only after the budget is gone; the client's timeout fires
+        await asyncio.sleep(BUDGET + 0.1)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    original_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: original_client(transport=httpx.MockTransport(handler), **kwargs))
+    image = UploadFile(file=io.BytesIO(b"jpeg"), filename="face.jpg", headers=Headers({"content-type": "image/jpeg"}))
+
+    async def recognize():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        try:
+            with turn_budget("face_recognition", seconds=BUDGET):
+                return await LuxandFaceRecognitionService().recognize_and_get_patient_details(image), ticks
+        finally:
+            ticker.cancel()
+
+    result, ticks = asyncio.run(recognize())
+
+    assert not result["success"] and "timed out" in result["message"]
+    # The event loop kept running other work while Luxand was waited on
+    assert ticks >= 10
+    assert turn_budget_stats.get_metrics()["turns"]["face_recognition"]["exhausted_by"] == {"luxand": 1}
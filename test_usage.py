@@ -0,0 +1,144 @@
+"""
+Tests for token and cost accounting from Gemini usage metadata
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+# Dummy credentials so the service modules can be imported without a .env file
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi import FastAPI
+from postgrest.exceptions import APIError
+
+import services.llm_gateway as gateway_module
+from core.usage import UsageTracker, usage_session
+from services.first_question_pool import FirstQuestionPool
+from services.llm_gateway import LLMGateway, llm_gateway
+from services.supabase_service import SupabaseService
+from routers import medical
+
+PATIENT = {"name": "Meena", "age": 34, "gender": "Female", "chosen_department": "Orthopedics"}
+
+
+class MeteredModels:
+    """Every response reports 1000 prompt tokens (400 cached), 50 output and 200 thinking tokens"""
+
+    async def generate_content(self, model, contents, config=None):
+        usage = SimpleNamespace(prompt_token_count=1000, cached_content_token_count=400,
+                                candidates_token_count=50, thoughts_token_count=200)
+        return SimpleNamespace(text=json.dumps({"question": "How long have you had the pain?"}), usage_metadata=usage)
+
+
+def _tracker(monkeypatch) -> UsageTracker:
+    tracker = UsageTracker()
+    monkeypatch.setattr(gateway_module, "usage_tracker", tracker)
+    return tracker
+
+
+def test_usage_is_aggregated_per_session_call_type_and_prompt_version(monkeypatch):
+    tracker = _tracker(monkeypatch)
+    gateway = LLMGateway()
+    gateway.client = SimpleNamespace(aio=SimpleNamespace(models=MeteredModels()))
+
+    def call(call_type, model="gemini-2.5-flash-lite"):
+        return gateway.generate_content(call_type=call_type, contents="hi", model=model, prompt_version="v1")
+
+    async def run():
+        with usage_session("s1") as turn:
+            await call("question")
+            await call("question")
+        with usage_session("s2"):
+            await call("assessment", model="some-unpriced-model")
+            # A task started with a fresh context belongs to no session
+            await asyncio.create_task(call("diagnostics"), context=contextvars.Context())
+        return turn
+
+    turn = asyncio.run(run())
+
+    # 600 fresh input, 400 cached input and 250 billed output tokens at the flash-lite prices
+    per_call = (600 * 0.10 + 400 * 0.025 + 250 * 0.40) / 1_000_000
+    s1 = tracker.session_usage("s1")
+    assert s1["calls"] == 2 and s1["thinking_tokens"] == 400 and s1["cached_tokens"] == 800
+    assert s1["cost_usd"] == round(2 * per_call, 6)
+    assert s1["call_types"]["question"]["calls"] == 2
+    assert turn.totals["thinking_tokens"] == 400
+
+    s2 = tracker.session_usage("s2")
+    assert s2["calls"] == 1 and s2["unpriced_calls"] == 1 and s2["cost_usd"] == 0
+
+    metrics = tracker.get_metrics()
+    assert metrics["totals"]["calls"] == 4
+    assert set(metrics["call_types"]) == {"question", "assessment", "diagnostics"}
+    question_v1 = next(v for v in metrics["prompt_versions"] if v["call_type"] == "question")
+    assert question_v1["calls"] == 2 and question_v1["avg_thinking_tokens"] == 200
+    assert gateway.get_metrics()["prompt_versions"] == metrics["prompt_versions"]
+
+
+def test_interview_turn_reports_thinking_tokens(monkeypatch):
+    tracker = _tracker(monkeypatch)
+    pool = FirstQuestionPool()
+    pool.enabled = False
+    monkeypatch.setattr(llm_gateway, "client", SimpleNamespace(aio=SimpleNamespace(models=MeteredModels())))
+    monkeypatch.setattr(medical, "first_question_pool", pool)
+
+    async def fake_get_session(session_id):
+        return {"patient_info": PATIENT}
+
+    monkeypatch.setattr(medical, "get_session", fake_get_session)
+    app = FastAPI()
+    app.include_router(medical.router, prefix="/api")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/api/medical/start-interview", json={"session_id": "usage-1", "patient_id": "p"})
+            return response.json()
+
+    try:
+        body = asyncio.run(run())
+        interview_session = medical.interview_sessions["usage-1"]
+    finally:
+        medical.interview_sessions.pop("usage-1", None)
+
+    assert body["reasoning_tokens"] == 200
+    assert interview_session.total_reasoning_tokens == 200
+    assert tracker.session_usage("usage-1")["calls"] == 1
+
+
+def test_prescreening_record_is_stored_without_usage_on_an_old_table(monkeypatch):
+    inserted = []
+
+    class Table:
+        def insert(self, data):
+            inserted.append(data)
+            return self
+
+        def execute(self):
+            if "llm_usage" in inserted[-1]:
+                raise APIError({"code": "PGRST204", "message": "Could not find the 'llm_usage' column of "
+                                "'pre_screening_records' in the schema cache"})
+            return SimpleNamespace(data=[{"id": f"record-{len(inserted)}"}])
+
+    async def no_relations(**kwargs):
+        return None
+
+    service = SupabaseService()
+    monkeypatch.setattr(service, "client", SimpleNamespace(table=lambda name: Table()))
+    monkeypatch.setattr(service, "_update_doctor_patient_relations", no_relations)
+    record = {"patient_uuid": "patient", "llm_usage": {"total_tokens": 1250}}
+
+    first = asyncio.run(service.create_prescreening_record(record))
+    second = asyncio.run(service.create_prescreening_record(record))
+
+    assert first == {"id": "record-2"} and second == {"id": "record-3"}
+    # Only the first insert tries the missing column
+    assert ["llm_usage" in data for data in inserted] == [True, False, False]